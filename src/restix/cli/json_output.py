@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Ausgabe der Kommandozeile im JSON-Format.
+Jedes Ereignis wird als einzelnes JSON-Objekt in einer eigenen Zeile auf die Standard-Ausgabe geschrieben (NDJSON).
+Alle Objekte enthalten die Attribute 'schema' (Version des Formats), 'event' (Art des Ereignisses) und 'time'
+(Zeitpunkt im Format ISO 8601). Je nach Art kommen hinzu:
+progress: 'percent' (Fortschritt in Prozent), 'message' (Fortschritt-Zeile von restic)
+log:      'severity' (info, warning oder error), 'message_id' (ID aus dem Nachrichtenkatalog oder null bei Ausgaben
+          von restic), 'message' (lokalisierter Text)
+error:    'message_id', 'message', 'restic_rc' (Return code von restic oder null)
+result:   'command', 'target', 'exit_code' und 'data' (Ergebnisdaten des Befehls oder null); das Ereignis wird
+          immer als letztes geschrieben
+"""
+
+import datetime
+import json
+import sys
+import threading
+
+from typing import Any, TextIO
+
+from restix.core import SEVERITY_ERROR, SEVERITY_WARNING
+from restix.core.restix_exception import RestixException
+from restix.core.task import TaskExecutor, TaskProgress
+
+
+# Version des Ausgabeformats, wird bei inkompatiblen Änderungen erhöht
+JSON_OUTPUT_SCHEMA_VERSION = 1
+
+# Ereignisse
+EVENT_ERROR = 'error'
+EVENT_LOG = 'log'
+EVENT_PROGRESS = 'progress'
+EVENT_RESULT = 'result'
+
+# Schweregrade im Ausgabeformat
+_SEVERITY_NAMES = {SEVERITY_ERROR: 'error', SEVERITY_WARNING: 'warning'}
+
+
+class JsonOutput(TaskExecutor):
+    """
+    Schreibt die Ereignisse eines restix-Befehls im JSON-Format, kann als Handler für einen TaskMonitor dienen.
+    """
+    def __init__(self, stream: TextIO | None = None):
+        """
+        Konstruktor.
+        :param stream: Ausgabe-Stream; bei None die Standard-Ausgabe
+        """
+        super().__init__()
+        self.__stream = sys.stdout if stream is None else stream
+        self.__lock = threading.Lock()
+
+    def emit_progress(self, progress_data: TaskProgress):
+        """
+        Schreibt eine Fortschritt-Nachricht.
+        :param progress_data: Informationen über den Fortschritt des Befehls.
+        """
+        if progress_data.is_status_update():
+            self._write(EVENT_PROGRESS, percent=progress_data.completion_status(),
+                        message=progress_data.message_text())
+            return
+        self._write(EVENT_LOG, severity=_SEVERITY_NAMES.get(progress_data.message_severity(), 'info'),
+                    message_id=progress_data.message_id(), message=progress_data.message_text())
+
+    def log_text(self, msg: str, severity: str, msg_id: str | None = None):
+        """
+        Schreibt eine Nachricht, die nicht über einen TaskMonitor ausgegeben wird.
+        :param msg: lokalisierte Nachricht
+        :param severity: Schweregrad der Nachricht
+        :param msg_id: optional ID der Nachricht
+        """
+        self.emit_progress(TaskProgress(50, severity, msg, False, msg_id))
+
+    def error(self, exception: Exception):
+        """
+        Schreibt einen Fehler.
+        :param exception: aufgetretener Fehler
+        """
+        _is_restix_exception = isinstance(exception, RestixException)
+        self._write(EVENT_ERROR, message_id=exception.id() if _is_restix_exception else None,
+                    message=str(exception), restic_rc=exception.restic_rc() if _is_restix_exception else None)
+
+    def result(self, command: str | None, target: str | None, exit_code: int, data: Any = None):
+        """
+        Schreibt das Ergebnis eines Befehls.
+        :param command: ausgeführter Befehl; None, falls die Kommandozeile fehlerhaft ist
+        :param target: Aliasname des Backup-Ziels; None, falls der Befehl kein Backup-Ziel benötigt
+        :param exit_code: Exit-Code von restix
+        :param data: optional Ergebnisdaten, nur Basistypen sind erlaubt
+        """
+        self._write(EVENT_RESULT, command=command, target=target or None, exit_code=exit_code, data=data)
+
+    def _write(self, event: str, **attributes: Any):
+        """
+        Schreibt ein Ereignis als einzelne Zeile.
+        :param event: Art des Ereignisses
+        :param attributes: Attribute des Ereignisses
+        """
+        _event = {'schema': JSON_OUTPUT_SCHEMA_VERSION, 'event': event,
+                  'time': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='milliseconds'),
+                  **attributes}
+        _line = json.dumps(_event, ensure_ascii=False, default=str)
+        with self.__lock:
+            self.__stream.write(f'{_line}\n')
+            self.__stream.flush()
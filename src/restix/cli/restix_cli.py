@@ -34,26 +34,30 @@
 
 """
 Command line interface für restix.
+Module, die nur zur Ausführung eines restic-Befehls benötigt werden, werden erst bei Bedarf importiert. Damit bleibt
+die Startzeit für häufig aufgerufene Befehle wie --version, help oder targets gering.
+Mit der Option --output json werden alle Ausgaben im JSON-Format geschrieben, siehe Modul json_output.
 """
 
 import datetime
-import getpass
 import platform
 import sys
 
+from typing import Any
+
 from restix.core import *
 from restix.core.action import RestixAction
 from restix.core.restix_exception import RestixException
 from restix.core.config import config_root_path, LocalConfig
 from restix.core.messages import *
-from restix.core.restic_interface import check_restic_for_action, execute_restic_command
-from restix.core.task import TaskMonitor
 from restix.core.util import current_user
 
 _COMMAND_HELP_IDS = {CLI_COMMAND_BACKUP: T_CLI_HELP_BACKUP, CLI_COMMAND_CLEANUP: T_CLI_HELP_CLEANUP,
-                     CLI_COMMAND_FIND: T_CLI_HELP_FIND, CLI_COMMAND_INIT: T_CLI_HELP_INIT,
+                     CLI_COMMAND_FIND: T_CLI_HELP_FIND, CLI_COMMAND_HISTORY: T_CLI_HELP_HISTORY,
+                     CLI_COMMAND_INIT: T_CLI_HELP_INIT,
                      CLI_COMMAND_LS: T_CLI_HELP_LS, CLI_COMMAND_RESTORE: T_CLI_HELP_RESTORE,
-                     CLI_COMMAND_SNAPSHOTS: T_CLI_HELP_SHAPSHOTS, CLI_COMMAND_UNLOCK: T_CLI_HELP_UNLOCK}
+                     CLI_COMMAND_SNAPSHOTS: T_CLI_HELP_SHAPSHOTS, CLI_COMMAND_UNLOCK: T_CLI_HELP_UNLOCK,
+                     CLI_COMMAND_WATCH: T_CLI_HELP_WATCH}
 
 
 def read_restix_config_file(action: RestixAction) -> LocalConfig:
@@ -73,20 +77,31 @@ def read_restix_config_file(action: RestixAction) -> LocalConfig:
         _vars[CFG_VAR_YEAR] = _year_opt
     _config_root_path, _error_info = config_root_path()
     _local_config = LocalConfig.from_file(os.path.join(_config_root_path, RESTIX_CONFIG_FN))
-    return _local_config.for_cli(_vars)
+    # die Konfiguration wird nur für diesen Befehl benutzt, eine Kopie ist überflüssig
+    return _local_config.for_cli(_vars, True)
+
+
+def confirmation_required(action: RestixAction) -> bool:
+    """
+    Falls einer der Optionen --batch oder --dry-run gesetzt sind oder die Aktion keine Datenänderung bewirkt, ist
+    keine Bestätigung durch den Benutzer nötig.
+    :param action: auszuführende Aktion.
+    :returns: True, falls die Aktion vom Benutzer bestätigt werden muss
+    """
+    _base_action = action.action_id()
+    return not (_base_action == ACTION_SNAPSHOTS or _base_action == ACTION_LS or _base_action == ACTION_FIND or
+                action.option(OPTION_BATCH) or action.option(OPTION_DRY_RUN))
 
 
 def prompt_confirmation(action: RestixAction) -> bool:
     """
-    Verlangt vom Benutzer eine Bestätigung der Aktion. Falls einer der Optionen --batch oder --dry-run gesetzt sind
-    oder die Aktion keine Datenänderung bewirkt, ist keine Bestätigung nötig.
+    Verlangt vom Benutzer eine Bestätigung der Aktion, falls nötig.
     :param action: auszuführende Aktion.
     :returns: True, falls die Aktion bestätigt wurde; ansonsten False
     """
-    _base_action = action.action_id()
-    if (_base_action == ACTION_SNAPSHOTS or _base_action == ACTION_LS or
-            _base_action == ACTION_FIND or action.option(OPTION_BATCH) or action.option(OPTION_DRY_RUN)):
+    if not confirmation_required(action):
         return True
+    _base_action = action.action_id()
     _target_alias = action.target_alias()
     if _base_action == ACTION_BACKUP:
         print(localized_message(T_CLI_CONFIRM_BACKUP, _target_alias))
@@ -111,22 +126,28 @@ def prompt_confirmation(action: RestixAction) -> bool:
     return ch.lower() == localized_label(T_CLI_YES_CHAR)
 
 
-def show_help(cmd: str = None):
+def show_help(cmd: str = None, json_output: Any = None):
     """
     Zeigt Hilfe über restix oder einen speziellen Befehl an.
     :param cmd: Befehl, über den Hilfe angezeigt werden soll
+    :param json_output: JsonOutput-Instanz bei Ausgabe im JSON-Format, sonst None
     """
-    if cmd is None or cmd not in _COMMAND_HELP_IDS:
-        print(localized_message(T_CLI_USAGE_INFO))
+    _help_id = _COMMAND_HELP_IDS.get(cmd, T_CLI_USAGE_INFO)
+    if json_output is None:
+        print(localized_message(_help_id))
         return
-    print(localized_message(_COMMAND_HELP_IDS[cmd]))
+    json_output.log_text(localized_message(_help_id), SEVERITY_INFO, _help_id)
 
 
-def show_targets(targets: dict):
+def show_targets(targets: dict, json_output: Any = None) -> list[dict] | None:
     """
     Zeigt die in der restix-Konfiguration definierten Backup-Ziele an.
     :param targets: Backup-Ziele aus der restix-Konfiguration
+    :param json_output: JsonOutput-Instanz bei Ausgabe im JSON-Format, sonst None
+    :returns: Backup-Ziele als Ergebnisdaten bei Ausgabe im JSON-Format, sonst None
     """
+    if json_output is not None:
+        return [{'alias': _t[CFG_PAR_ALIAS], 'comment': _t[CFG_PAR_COMMENT]} for _t in targets.values()]
     print()
     print(localized_message(T_CLI_BACKUP_TARGETS_HEADER))
     for _target in targets.values():
@@ -134,62 +155,197 @@ def show_targets(targets: dict):
     print()
 
 
+def show_history(target_alias: str, json_output: Any = None) -> list[dict] | None:
+    """
+    Zeigt die Historie der Backups zu einem Backup-Ziel an.
+    :param target_alias: Aliasname des Backup-Ziels
+    :param json_output: JsonOutput-Instanz bei Ausgabe im JSON-Format, sonst None
+    :returns: Backups als Ergebnisdaten bei Ausgabe im JSON-Format, sonst None
+    :raises RestixException: falls die Historie nicht gelesen werden kann
+    """
+    import sqlite3
+    from restix.core.history import BackupHistory
+    from restix.core.util import format_byte_count
+    try:
+        _backups = BackupHistory().backups(target_alias)
+    except (OSError, sqlite3.Error) as _e:
+        raise RestixException(E_BACKUP_HISTORY_READ_FAILED, _e)
+    if json_output is not None:
+        return [_backup.as_dict() for _backup in _backups]
+    print()
+    if len(_backups) == 0:
+        print(localized_message(T_CLI_BACKUP_HISTORY_EMPTY, target_alias))
+        print()
+        return
+    print(localized_message(T_CLI_BACKUP_HISTORY_HEADER, target_alias))
+    for _backup in _backups:
+        _throughput = _backup.throughput()
+        print(localized_message(T_CLI_BACKUP_HISTORY_INFO, _backup.finished().strftime('%Y-%m-%d %H:%M'),
+                                f'{_backup.total_duration():.1f}',
+                                '-' if _throughput is None else format_byte_count(_throughput),
+                                _backup.files_new(), _backup.files_changed(), _backup.files_unmodified(),
+                                format_byte_count(_backup.data_added()), _backup.snapshot_id()))
+    print()
+
+
+def execute_action(action: RestixAction, restix_config: LocalConfig, json_output: Any = None) -> tuple[int, Any]:
+    """
+    Führt eine Aktion aus, für die ein restic-Befehl benötigt wird.
+    :param action: auszuführende Aktion
+    :param restix_config: restix-Konfiguration mit ersetzten Variablen
+    :param json_output: JsonOutput-Instanz bei Ausgabe im JSON-Format, sonst None
+    :returns: Exit-Code für die Kommando-Zeile und ggf. Ergebnisdaten für die Ausgabe im JSON-Format
+    :raises RestixException: falls die Aktion nicht ausgeführt werden kann
+    """
+    import getpass
+    from restix.core.restic_interface import check_restic_for_action, execute_restic_command, run_backup, run_forget
+    from restix.core.task import TaskMonitor
+    _target_alias = action.target_alias()
+    # restic-Version prüfen
+    _credentials = restix_config.credentials_for_target(_target_alias)
+    _warning = check_restic_for_action(action, _credentials)
+    if _warning is not None:
+        if json_output is None:
+            print(_warning)
+        else:
+            json_output.log_text(_warning, SEVERITY_WARNING)
+    # Zugangsdaten in die Aktion eintragen
+    _options = None
+    if _credentials.get(CFG_PAR_TYPE) == CFG_VALUE_CREDENTIALS_TYPE_PROMPT:
+        # Passwort einlesen, der Prompt geht bei Ausgabe im JSON-Format auf stderr
+        _pw = getpass.getpass(localized_message(T_CLI_ENTER_PASSWORD),
+                              stream=None if json_output is None else sys.stderr)
+        _options = {OPTION_PASSWORD: _pw}
+    action.set_basic_options(restix_config, _options)
+    if action.action_id() == ACTION_BACKUP:
+        action.set_scope_options(restix_config.scope_for_target(_target_alias))
+    # Prüfen, ob notwendige Optionen angegeben wurden
+    action.verify_mandatory_options()
+    # Aktion ausführen
+    _task_monitor = TaskMonitor(json_output)
+    if action.option(OPTION_WATCH):
+        # Include-Pfade überwachen und bei Änderungen sichern
+        from restix.core.watcher import watch_target
+        watch_target(action, _task_monitor)
+    elif action.action_id() == ACTION_BACKUP:
+        # Backup inklusive Prüfung des Repositories und ggf. Überspringen unveränderter Backup-Umfänge
+        _result = run_backup(action, _task_monitor)
+        if not _result.task_succeeded():
+            # Details wurden bereits über den TaskMonitor ausgegeben
+            if json_output is None:
+                print(localized_message(E_CLI_RESTIX_COMMAND_FAILED))
+            return CLI_RC_FAILED, None
+        _summary = _result.details()
+        if _summary is None:
+            # Backup wurde übersprungen
+            return CLI_RC_OK, None
+        # Regressionen wurden bereits als Warnung ausgegeben
+        return CLI_RC_BACKUP_REGRESSION if len(_summary.regressions()) > 0 else CLI_RC_OK, _summary.as_dict()
+    elif action.action_id() == ACTION_FORGET:
+        # über run_forget, damit ggf. Kennzahlen exportiert werden
+        _result = run_forget(action, _task_monitor)
+        if not _result.task_succeeded():
+            if json_output is None:
+                print(localized_message(E_CLI_RESTIX_COMMAND_FAILED))
+                print(f'> {_result.summary()}')
+                print()
+            else:
+                json_output.log_text(_result.summary(), SEVERITY_ERROR)
+            return CLI_RC_FAILED, None
+    else:
+        # init wird nicht wiederholt, ein abgebrochener Versuch kann ein unvollständiges Repository hinterlassen
+        from restix.core.priority import ProcessPriority
+        from restix.core.retry import RetryPolicy
+        _retry_policy = None if action.action_id() == ACTION_INIT else RetryPolicy.for_action(action)
+        execute_restic_command(action.to_restic_command(), _task_monitor, action.is_potential_long_runner(),
+                               _retry_policy, ProcessPriority.for_action(action))
+    return CLI_RC_OK, None
+
+
+def json_output_requested(cmd_line: list[str]) -> bool:
+    """
+    Prüft vor der eigentlichen Analyse der Kommandozeile, ob die Ausgabe im JSON-Format erfolgen soll. Damit werden
+    auch Fehler in der Kommandozeile im JSON-Format gemeldet.
+    :param cmd_line: Kommandozeile
+    :returns: True, falls die Option --output mit Wert json angegeben wurde
+    """
+    for _i, _arg in enumerate(cmd_line[:-1]):
+        if _arg.strip() == OPTION_OUTPUT:
+            return cmd_line[_i + 1].strip() == CLI_OUTPUT_FORMAT_JSON
+    return False
+
+
 def cli_main():
     """
     Hauptprogramm für die Kommandozeile.
     """
+    _json_output = None
+    if json_output_requested(sys.argv[1:]):
+        from restix.cli.json_output import JsonOutput
+        _json_output = JsonOutput()
+    _command = None
+    _target_alias = None
     try:
         # interne Aktion aus den Daten der Kommandozeile erzeugen
         _action = RestixAction.from_command_line(sys.argv[1:])
+        _command = _action.action_id()
         if _action.action_id() == ACTION_HELP:
-            show_help(_action.option(OPTION_HELP))
-            sys.exit(0)
+            show_help(_action.option(OPTION_HELP), _json_output)
+            if _json_output is not None:
+                _json_output.result(ACTION_HELP, None, CLI_RC_OK)
+            sys.exit(CLI_RC_OK)
         if _action.action_id() == ACTION_VERSION:
-            print(localized_message(T_CLI_RESTIX_VERSION, VERSION))
-            sys.exit(0)
+            if _json_output is None:
+                print(localized_message(T_CLI_RESTIX_VERSION, VERSION))
+            else:
+                _json_output.result(ACTION_VERSION, None, CLI_RC_OK, {'version': VERSION})
+            sys.exit(CLI_RC_OK)
     except RestixException as _e:
-        print(str(_e))
-        show_help()
-        sys.exit(1)
+        if _json_output is None:
+            print(str(_e))
+            show_help()
+        else:
+            _json_output.error(_e)
+            _json_output.result(_command, None, CLI_RC_FAILED)
+        sys.exit(CLI_RC_FAILED)
+    _data = None
     try:
         # restix-Konfiguration einlesen
         _restix_config = read_restix_config_file(_action)
         if _action.action_id() == CLI_COMMAND_TARGETS:
             # Sonderfall Sicherungsziele anzeigen (resultiert nicht in einem restic-Befehl)
-            show_targets(_restix_config.targets())
-            sys.exit(0)
-        _action.set_config(_restix_config)
-        # Prüfen, ob das Sicherungsziel existiert
-        _target_alias = _action.target_alias()
-        if _target_alias not in _restix_config.targets():
-            raise RestixException(E_CLI_INVALID_TARGET, _target_alias)
-        # Bei Befehlen, die Daten verändern, Bestätigung vom Benutzer einholen
-        if not prompt_confirmation(_action):
-            sys.exit(0)
-        # restic-Version prüfen
-        _credentials = _restix_config.credentials_for_target(_target_alias)
-        _warning = check_restic_for_action(_action, _credentials)
-        if _warning is not None:
-            print(_warning)
-        # Zugangsdaten in die Aktion eintragen
-        _options = None
-        if _credentials.get(CFG_PAR_TYPE) == CFG_VALUE_CREDENTIALS_TYPE_PROMPT:
-            # Passwort einlesen
-            _pw = getpass.getpass(localized_message(T_CLI_ENTER_PASSWORD))
-            _options = {OPTION_PASSWORD: _pw}
-        _action.set_basic_options(_restix_config, _options)
-        if _action.action_id() == ACTION_BACKUP:
-            _action.set_scope_options(_restix_config.scope_for_target(_target_alias))
-        # Prüfen, ob notwendige Optionen angegeben wurden
-        _action.verify_mandatory_options()
-        # Aktion ausführen
-        execute_restic_command(_action.to_restic_command(), TaskMonitor(),
-                               _action.is_potential_long_runner())
+            _data = show_targets(_restix_config.targets(), _json_output)
+            _rc = CLI_RC_OK
+        else:
+            _action.set_config(_restix_config)
+            # Prüfen, ob das Sicherungsziel existiert
+            _target_alias = _action.target_alias()
+            if _target_alias not in _restix_config.targets():
+                raise RestixException(E_CLI_INVALID_TARGET, _target_alias)
+            if _action.action_id() == CLI_COMMAND_HISTORY:
+                # Sonderfall Historie anzeigen (resultiert nicht in einem restic-Befehl)
+                _data = show_history(_target_alias, _json_output)
+                _rc = CLI_RC_OK
+            elif _json_output is not None and confirmation_required(_action):
+                # bei Ausgabe im JSON-Format ist keine Eingabe möglich
+                raise RestixException(E_CLI_BATCH_REQUIRED, _command)
+            elif _json_output is None and not prompt_confirmation(_action):
+                # Bei Befehlen, die Daten verändern, Bestätigung vom Benutzer einholen
+                sys.exit(CLI_RC_OK)
+            else:
+                _rc, _data = execute_action(_action, _restix_config, _json_output)
     except Exception as _e:
-        print(localized_message(E_CLI_RESTIX_COMMAND_FAILED))
-        print(f'> {_e}')
-        print()
+        if _json_output is None:
+            print(localized_message(E_CLI_RESTIX_COMMAND_FAILED))
+            print(f'> {_e}')
+            print()
+        else:
+            _json_output.error(_e)
+        _rc = CLI_RC_FAILED
     _action.action_executed()
+    if _json_output is not None:
+        _json_output.result(_command, _target_alias, _rc, _data)
+    sys.exit(_rc)
 
 
 if __name__ == "__main__":
@@ -39,12 +39,24 @@ VERSION = '0.9.6'
 USER_MANUAL_STEM = 'user_manual_'
 
 # Umgebungsvariablen
+ENVA_GOGC = 'GOGC'
+ENVA_GOMAXPROCS = 'GOMAXPROCS'
+ENVA_GOMEMLIMIT = 'GOMEMLIMIT'
 ENVA_HOME = 'HOME'
+ENVA_RESTIC_CACHE_DIR = 'RESTIC_CACHE_DIR'
 ENVA_RESTIX_CONFIG_PATH = 'RESTIX_CONFIG_PATH'
+ENVA_RESTIX_DRY_RUN = 'RESTIX_DRY_RUN'
+ENVA_RESTIX_HOOK = 'RESTIX_HOOK'
+ENVA_RESTIX_REPOSITORY = 'RESTIX_REPOSITORY'
+ENVA_RESTIX_RESULT = 'RESTIX_RESULT'
+ENVA_RESTIX_SCOPE = 'RESTIX_SCOPE'
+ENVA_RESTIX_TARGET = 'RESTIX_TARGET'
 ENVA_USER = 'USER'
 ENVA_WIN_HOME = 'HOMEPATH'
 ENVA_WIN_LOCAL_APP_DATA = 'LOCALAPPDATA'
 ENVA_WIN_USER = 'USERNAME'
+ENVA_XDG_CACHE_HOME = 'XDG_CACHE_HOME'
+ENVA_XDG_DATA_HOME = 'XDG_DATA_HOME'
 
 # Unterverzeichnis für Bilder und die Benutzerhandbücher
 RESTIX_ASSETS_DIR = 'assets'
@@ -62,21 +74,66 @@ RESTIX_CONFIG_FN = 'config.toml'
 # Default-Unterverzeichnis für die restix-Konfiguration
 RESTIX_CONFIG_SUBDIR = ['.config', 'restix']
 
+# Default-Unterverzeichnisse für zwischengespeicherte und persistente Laufzeitdaten
+RESTIX_CACHE_SUBDIR = ['.cache', 'restix']
+RESTIX_DATA_SUBDIR = ['.local', 'share', 'restix']
+
+# Name der Datei mit den Fingerprints der zuletzt gesicherten Backup-Umfänge
+RESTIX_FINGERPRINTS_FN = 'fingerprints.toml'
+
+# Name der Datenbank mit der Historie der ausgeführten Backups
+RESTIX_HISTORY_FN = 'history.sqlite'
+
+# Name der Datei mit der Auftrags-Warteschlange der GUI
+RESTIX_JOB_QUEUE_FN = 'jobs.toml'
+
 # Parameter in der Konfigurationsdatei
 CFG_GROUP_CREDENTIALS = 'credentials'
 CFG_GROUP_SCOPE = 'scope'
 CFG_GROUP_TARGET = 'target'
 CFG_PAR_ALIAS = 'alias'
+CFG_PAR_APPEND_ONLY = 'append_only'
+CFG_PAR_COMMAND = 'command'
+CFG_PAR_COMMANDS = 'commands'
 CFG_PAR_COMMENT = 'comment'
+CFG_PAR_CONNECTIONS = 'connections'
+CFG_PAR_CPU_AFFINITY = 'cpu_affinity'
 CFG_PAR_CREDENTIALS = 'credentials'
 CFG_PAR_EXCLUDES = 'excludes'
+CFG_PAR_FILENAME = 'filename'
+CFG_PAR_FORCE_AFTER_DAYS = 'force_after_days'
+CFG_PAR_GOGC = 'gogc'
+CFG_PAR_GOMAXPROCS = 'gomaxprocs'
+CFG_PAR_GOMEMLIMIT = 'gomemlimit'
+CFG_PAR_HOOK_TIMEOUT = 'hook_timeout'
 CFG_PAR_IGNORES = 'ignores'
 CFG_PAR_INCLUDES = 'includes'
+CFG_PAR_IONICE_CLASS = 'ionice_class'
+CFG_PAR_IONICE_PRIORITY = 'ionice_priority'
 CFG_PAR_LOCATION = 'location'
+CFG_PAR_LOCK_WAIT = 'lock_wait'
+CFG_PAR_METRICS_PATH = 'metrics_path'
+CFG_PAR_NICE = 'nice'
+CFG_PAR_POST_HOOK = 'post_hook'
+CFG_PAR_PRE_HOOK = 'pre_hook'
+CFG_PAR_REGRESSION_BAND = 'regression_band'
+CFG_PAR_REGRESSION_WINDOW = 'regression_window'
 CFG_PAR_RESTIC = 'restic'
+CFG_PAR_RETRY_ATTEMPTS = 'retry_attempts'
+CFG_PAR_RETRY_CODES = 'retry_codes'
+CFG_PAR_RETRY_DELAY = 'retry_delay'
+CFG_PAR_RETRY_PATTERNS = 'retry_patterns'
 CFG_PAR_SCOPE = 'scope'
+CFG_PAR_SKIP_UNCHANGED = 'skip_unchanged'
+CFG_PAR_SSH_MULTIPLEXING = 'ssh_multiplexing'
+CFG_PAR_THROTTLE_INTERVAL = 'throttle_interval'
+CFG_PAR_THROTTLE_MAX_PAUSE = 'throttle_max_pause'
+CFG_PAR_THROTTLE_RESUME = 'throttle_resume'
+CFG_PAR_THROTTLE_THRESHOLD = 'throttle_threshold'
 CFG_PAR_TYPE = 'type'
+CFG_PAR_UNLOCK_STALE = 'unlock_stale'
 CFG_PAR_VALUE = 'value'
+CFG_PAR_WATCH_DELAY = 'watch_delay'
 CFG_VALUE_CREDENTIALS_TYPE_FILE = 'file'
 CFG_VALUE_CREDENTIALS_TYPE_NONE = 'none'
 CFG_VALUE_CREDENTIALS_TYPE_PGP = 'pgp'
@@ -85,6 +142,10 @@ CFG_VALUE_CREDENTIALS_TYPE_TEXT = 'text'
 CFG_CREDENTIAL_TYPES = [CFG_VALUE_CREDENTIALS_TYPE_FILE, CFG_VALUE_CREDENTIALS_TYPE_NONE,
                         CFG_VALUE_CREDENTIALS_TYPE_PGP,
                         CFG_VALUE_CREDENTIALS_TYPE_PROMPT, CFG_VALUE_CREDENTIALS_TYPE_TEXT]
+CFG_VALUE_IONICE_CLASS_BEST_EFFORT = 'best-effort'
+CFG_VALUE_IONICE_CLASS_IDLE = 'idle'
+CFG_VALUE_IONICE_CLASS_REALTIME = 'realtime'
+CFG_IONICE_CLASSES = [CFG_VALUE_IONICE_CLASS_REALTIME, CFG_VALUE_IONICE_CLASS_BEST_EFFORT, CFG_VALUE_IONICE_CLASS_IDLE]
 
 # unterstützte Variablen in der restix-Konfigurationsdatei
 CFG_VAR_HOME = 'HOME'
@@ -98,20 +159,35 @@ CLI_COMMAND_BACKUP = 'backup'
 CLI_COMMAND_CLEANUP = 'cleanup'
 CLI_COMMAND_FIND = 'find'
 CLI_COMMAND_HELP = 'help'
+CLI_COMMAND_HISTORY = 'history'
 CLI_COMMAND_INIT = 'init'
 CLI_COMMAND_LS = 'ls'
 CLI_COMMAND_RESTORE = 'restore'
 CLI_COMMAND_SNAPSHOTS = 'snapshots'
 CLI_COMMAND_TARGETS = 'targets'
 CLI_COMMAND_UNLOCK = 'unlock'
-ALL_CLI_COMMANDS = (CLI_COMMAND_BACKUP, CLI_COMMAND_CLEANUP, CLI_COMMAND_FIND, CLI_COMMAND_HELP, CLI_COMMAND_INIT,
-                    CLI_COMMAND_LS, CLI_COMMAND_RESTORE, CLI_COMMAND_SNAPSHOTS, CLI_COMMAND_TARGETS, CLI_COMMAND_UNLOCK)
+CLI_COMMAND_WATCH = 'watch'
+ALL_CLI_COMMANDS = (CLI_COMMAND_BACKUP, CLI_COMMAND_CLEANUP, CLI_COMMAND_FIND, CLI_COMMAND_HELP, CLI_COMMAND_HISTORY,
+                    CLI_COMMAND_INIT, CLI_COMMAND_LS, CLI_COMMAND_RESTORE, CLI_COMMAND_SNAPSHOTS, CLI_COMMAND_TARGETS,
+                    CLI_COMMAND_UNLOCK, CLI_COMMAND_WATCH)
+
+# Exit-Codes der restix Kommando-Zeile
+CLI_RC_OK = 0
+CLI_RC_FAILED = 1
+CLI_RC_BACKUP_REGRESSION = 2
+
+# Ausgabeformate der restix Kommando-Zeile
+CLI_OUTPUT_FORMAT_JSON = 'json'
+CLI_OUTPUT_FORMAT_TEXT = 'text'
+CLI_OUTPUT_FORMATS = (CLI_OUTPUT_FORMAT_JSON, CLI_OUTPUT_FORMAT_TEXT)
 
 # restic Befehle
 RESTIC_COMMAND_BACKUP = 'backup'
+RESTIC_COMMAND_CAT = 'cat'
 RESTIC_COMMAND_FIND = 'find'
 RESTIC_COMMAND_FORGET = 'forget'
 RESTIC_COMMAND_INIT = 'init'
+RESTIC_COMMAND_LIST = 'list'
 RESTIC_COMMAND_LS = 'ls'
 RESTIC_COMMAND_RESTORE = 'restore'
 RESTIC_COMMAND_SNAPSHOTS = 'snapshots'
@@ -154,6 +230,7 @@ OPTION_AUTO_CREATE = '--auto-create'
 OPTION_BATCH = '--batch'
 OPTION_DRY_RUN = '--dry-run'
 OPTION_EXCLUDE_FILE = '--exclude-file'
+OPTION_EXTENDED = '--option'
 OPTION_FILES_FROM = '--files-from'
 OPTION_PATTERN = '--pattern'
 OPTION_HELP= '--help'
@@ -163,7 +240,9 @@ OPTION_INCLUDE_FILE = '--include-file'
 OPTION_JSON = '--json'
 OPTION_KEEP_LAST = '--keep-last'
 OPTION_KEEP_MONTHLY = '--keep-monthly'
+OPTION_NO_LOCK = '--no-lock'
 OPTION_NO_PASSWORD = '--insecure-no-password'
+OPTION_OUTPUT = '--output'
 OPTION_PASSWORD = '--PWD'
 OPTION_PASSWORD_COMMAND = '--password-command'
 OPTION_PASSWORD_FILE = '--password-file'
@@ -172,14 +251,25 @@ OPTION_REPO = '--repo'
 OPTION_RESTORE_PATH = '--restore-path'
 OPTION_SET = '--set'
 OPTION_SNAPSHOT = '--snapshot'
+OPTION_STDIN = '--stdin'
+OPTION_STDIN_FILENAME = '--stdin-filename'
+OPTION_STDIN_FROM_COMMAND = '--stdin-from-command'
 OPTION_TARGET = '--target'
 OPTION_UNTAGGED = '--untagged'
 OPTION_USER = '--user'
 OPTION_VERSION = '--version'
+OPTION_WATCH = '--watch'
 OPTION_YEAR = '--year'
 
 # restic Sondervariablen
 RESTIC_SNAPSHOT_LATEST = 'latest'
+RESTIC_OPTION_CONNECTIONS = 'connections'
+RESTIC_OPTION_SFTP_COMMAND = 'sftp.command'
+
+# restic Backends
+RESTIC_BACKEND_LOCAL = 'local'
+RESTIC_BACKEND_REST = 'rest'
+RESTIC_BACKEND_SFTP = 'sftp'
 RESTIC_RC_OK = 0
 RESTIC_RC_CMD_FAILED = 1
 RESTIC_RC_GO_RUNTIME_ERROR = 2
@@ -195,3 +285,10 @@ SEVERITY_INFO = 'i'
 SEVERITY_WARNING = 'w'
 TASK_SUCCEEDED = 0
 TASK_FAILED = 1
+
+# Status eines Auftrags in der Auftrags-Warteschlange
+JOB_STATE_CANCELLED = 'cancelled'
+JOB_STATE_FAILED = 'failed'
+JOB_STATE_PENDING = 'pending'
+JOB_STATE_RUNNING = 'running'
+JOB_STATE_SUCCEEDED = 'succeeded'
@@ -37,18 +37,25 @@ Daten für alle restix-Aktionen.
 """
 
 import datetime
+import glob
+import hashlib
 import os.path
 import platform
 import re
 import shlex
 import tempfile
+import time
+
+from typing import Any
 
 from restix.core import *
 from restix.core import OPTION_AUTO_CREATE, OPTION_PATTERN
 from restix.core.config import LocalConfig
 from restix.core.messages import *
 from restix.core.restix_exception import RestixException
-from restix.core.util import current_user
+from restix.core.secret_broker import SecretBroker
+from restix.core.ssh_session import SshMultiplexer
+from restix.core.util import current_user, restix_cache_path, write_raw_cache_file
 
 
 class RestixAction:
@@ -67,6 +74,7 @@ class RestixAction:
         self.__options = {OPTION_HOST: platform.node(), OPTION_YEAR: str(datetime.date.today().year),
                           OPTION_HOME: os.path.expanduser('~'), OPTION_USER: current_user(),
                           OPTION_DRY_RUN: False, OPTION_BATCH: False}
+        self.__stdin_commands = []
         self.__temp_files = []
 
     def action_id(self) -> str:
@@ -81,6 +89,12 @@ class RestixAction:
         """
         return self.__local_config.restic_executable()
 
+    def metrics_path(self) -> str | None:
+        """
+        :returns: Verzeichnis für den Export von Kennzahlen; None, falls keine Kennzahlen exportiert werden sollen
+        """
+        return None if self.__local_config is None else self.__local_config.metrics_path()
+
     def set_config(self, config: LocalConfig):
         """
         :param config: lokale restix-Konfiguration
@@ -93,6 +107,17 @@ class RestixAction:
         """
         return self.__target_alias
 
+    def target_setting(self, name: str, default_value: Any = None) -> Any:
+        """
+        :param name: Name des Parameters in der Konfiguration des Backup-Ziels
+        :param default_value: Wert, falls der Parameter nicht definiert ist
+        :returns: Wert des Parameters für das Backup-Ziel dieser Aktion
+        """
+        if self.__local_config is None:
+            return default_value
+        _target = self.__local_config.targets().get(self.__target_alias)
+        return default_value if _target is None else _target.get(name, default_value)
+
     def option(self, option_name: str) -> str | bool | None:
         """
         :param option_name: Name der gewünschten Option
@@ -123,7 +148,12 @@ class RestixAction:
                     raise RestixException(E_RESTIX_VAR_NOT_DEFINED, _var_name)
                 option_value = option_value.replace(f'${{{_var_name}}}', str(_var_value))
         if option_name == OPTION_REPO:
-            if option_value.startswith('sftp:'):
+            _backend = repository_backend(option_value)
+            if _backend == RESTIC_BACKEND_REST:
+                # URL des REST-Servers, Pfad ohne doppelten Schrägstrich anhängen
+                _repo_path = '/'.join([option_value.rstrip('/'), self.option(OPTION_USER),
+                                       self.option(OPTION_HOST), self.option(OPTION_YEAR)])
+            elif _backend == RESTIC_BACKEND_SFTP:
                 _repo_path = '/'.join([option_value, self.option(OPTION_USER),
                                        self.option(OPTION_HOST), self.option(OPTION_YEAR)])
             else:
@@ -131,7 +161,7 @@ class RestixAction:
                                           self.option(OPTION_HOST), self.option(OPTION_YEAR))
             self.__options[option_name] = _repo_path
             return
-        if option_name == OPTION_BATCH or option_name == OPTION_DRY_RUN:
+        if option_name == OPTION_BATCH or option_name == OPTION_DRY_RUN or option_name == OPTION_WATCH:
             if not isinstance(option_value, bool):
                 raise RestixException(E_BOOL_OPT_REQUIRED, option_name)
         elif (option_name == OPTION_PASSWORD_FILE or option_name == OPTION_FILES_FROM or
@@ -158,6 +188,9 @@ class RestixAction:
             # Snapshot-IDs ist entweder 'latest' oder eine Hexadezimalzahl
             if option_value != 'latest' and not re.match(r'^[a-f0-9]+$', option_value, re.IGNORECASE):
                 raise RestixException(E_INVALID_SNAPSHOT_ID, option_value)
+        elif option_name == OPTION_OUTPUT:
+            if option_value not in CLI_OUTPUT_FORMATS:
+                raise RestixException(E_CLI_INVALID_OUTPUT_FORMAT, option_value)
         elif option_name == OPTION_YEAR:
             # Jahr muss aus vier Ziffern bestehen
             if not re.match(r'^[0-9]{4}$', option_value, re.IGNORECASE):
@@ -186,6 +219,9 @@ class RestixAction:
         _mandatory_options = _MANDATORY_OPTIONS.get(self.__action_id)
         if _mandatory_options is None:
             return
+        if self.__action_id == ACTION_BACKUP and len(self.__stdin_commands) > 0:
+            # Backup-Umfang kann ausschliesslich aus Befehlen bestehen
+            _mandatory_options = tuple(_o for _o in _mandatory_options if _o != OPTION_FILES_FROM)
         for _option in _mandatory_options:
             if self.option(_option) is None:
                 raise RestixException(E_MANDATORY_OPTION_MISSING, _option)
@@ -196,23 +232,35 @@ class RestixAction:
         """
         return self.__action_id == ACTION_BACKUP or self.__action_id == ACTION_RESTORE
 
+    def stdin_commands(self) -> list[dict]:
+        """
+        :returns: Befehle aus dem Backup-Umfang, deren Ausgabe gesichert wird
+        """
+        return self.__stdin_commands
+
+    def stdin_backup_command(self, stdin_command: dict, from_command: bool) -> list[str]:
+        """
+        :param stdin_command: Befehl aus dem Backup-Umfang, dessen Ausgabe gesichert wird
+        :param from_command: True, falls restic den Befehl selbst starten soll (Option --stdin-from-command);
+                             False, falls die Ausgabe über die Standard-Eingabe von restic übergeben wird
+        :returns: restic-Kommando zum Sichern der Ausgabe des Befehls
+        """
+        _cmd = self._base_command()
+        _cmd.extend((OPTION_STDIN_FILENAME, stdin_command[CFG_PAR_FILENAME]))
+        if from_command:
+            _cmd.extend((OPTION_STDIN_FROM_COMMAND, '--', *shlex.split(stdin_command[CFG_PAR_COMMAND])))
+        else:
+            _cmd.append(OPTION_STDIN)
+        return _cmd
+
     def to_restic_command(self) -> list[str]:
         """
         :returns: restic-Kommando für die Daten dieser Aktion.
         """
-        _cmd: list[str] = [self.__local_config.restic_executable(), self.__action_id,
-                           OPTION_REPO, self.option(OPTION_REPO)]
-        _pw_cmd = self.option(OPTION_PASSWORD_COMMAND)
-        if _pw_cmd is not None:
-            _cmd.extend([OPTION_PASSWORD_COMMAND, _pw_cmd])
-        else:
-            _cmd.extend([OPTION_PASSWORD_FILE, self.option(OPTION_PASSWORD_FILE)])
-        if self.option(OPTION_DRY_RUN):
-            _cmd.append(OPTION_DRY_RUN)
-        if self.option(OPTION_JSON):
-            _cmd.append(OPTION_JSON)
+        _cmd = self._base_command()
         if self.__action_id == ACTION_BACKUP:
-            _cmd.extend((OPTION_FILES_FROM, self.option(OPTION_FILES_FROM)))
+            if OPTION_FILES_FROM in self.__options:
+                _cmd.extend((OPTION_FILES_FROM, self.option(OPTION_FILES_FROM)))
             if OPTION_EXCLUDE_FILE in self.__options:
                 _cmd.extend((OPTION_EXCLUDE_FILE, self.option(OPTION_EXCLUDE_FILE)))
             return _cmd
@@ -242,31 +290,33 @@ class RestixAction:
         """
         :returns: Init-Aktion aus dieser Aktion.
         """
-        _init_action = RestixAction(ACTION_INIT, self.target_alias())
-        _init_action.__options[OPTION_REPO] = self.option(OPTION_REPO)
-        _init_action.__local_config = self.__local_config
-        _pw_cmd = self.option(OPTION_PASSWORD_COMMAND)
-        if _pw_cmd is not None:
-            _init_action.__options[OPTION_PASSWORD_COMMAND] = _pw_cmd
-        else:
-            _init_action.__options[OPTION_PASSWORD_FILE] = self.option(OPTION_PASSWORD_FILE)
-        return _init_action
+        return self._derived_action(ACTION_INIT)
 
     def snapshots_action(self) -> Self:
         """
         :returns: Snapshots-Aktion aus dieser Aktion.
         """
-        _snapshots_action = RestixAction(ACTION_SNAPSHOTS, self.target_alias())
-        _snapshots_action.__options[OPTION_REPO] = self.option(OPTION_REPO)
-        _snapshots_action.__local_config = self.__local_config
-        _pw_cmd = self.option(OPTION_PASSWORD_COMMAND)
-        if _pw_cmd is not None:
-            _snapshots_action.__options[OPTION_PASSWORD_COMMAND] = _pw_cmd
-        else:
-            _snapshots_action.__options[OPTION_PASSWORD_FILE] = self.option(OPTION_PASSWORD_FILE)
+        _snapshots_action = self._derived_action(ACTION_SNAPSHOTS)
         _snapshots_action.__options[OPTION_JSON] = True
         return _snapshots_action
 
+    def unlock_action(self) -> Self:
+        """
+        :returns: Unlock-Aktion aus dieser Aktion, entfernt nur veraltete Sperren.
+        """
+        return self._derived_action(ACTION_UNLOCK)
+
+    def lock_inspection_command(self, lock_id: str | None = None) -> list[str]:
+        """
+        Die Befehle legen selbst keine Sperre im Repository an.
+        :param lock_id: ID einer Sperre; bei None werden die IDs aller Sperren ausgegeben
+        :returns: restic-Kommando zum Auflisten der Sperren oder zur Ausgabe der Daten einer Sperre
+        """
+        _cmd = self._derived_action(ACTION_UNLOCK).to_restic_command()
+        _cmd[1:2] = [RESTIC_COMMAND_LIST, 'locks'] if lock_id is None else [RESTIC_COMMAND_CAT, 'lock', lock_id]
+        _cmd.append(OPTION_NO_LOCK)
+        return _cmd
+
     def set_basic_options(self, local_config: LocalConfig, options: dict | None):
         """
         Setzt die Optionen, die restic immer benötigt sowie die angegebenen benutzerdefinierten Optionen.
@@ -287,19 +337,18 @@ class RestixAction:
         if _credentials.get(CFG_PAR_TYPE) == CFG_VALUE_CREDENTIALS_TYPE_FILE:
             self.set_option(OPTION_PASSWORD_FILE, self._full_filename_of(_credentials.get(CFG_PAR_VALUE)))
         elif _credentials.get(CFG_PAR_TYPE) == CFG_VALUE_CREDENTIALS_TYPE_PGP:
+            # Passwort-Datei wird erst bei der Ausführung und nur einmal pro Sitzung entschlüsselt, restic erhält das
+            # Passwort über eine Pipe
             _file_path = self._full_filename_of(_credentials.get(CFG_PAR_VALUE))
-            _cmd = f'""gpg --decrypt {_file_path}""'
-            self.set_option(OPTION_PASSWORD_COMMAND, _cmd)
+            self.__options[OPTION_PASSWORD_FILE] = SecretBroker.instance().pgp_reference(_file_path)
         elif _credentials.get(CFG_PAR_TYPE) == CFG_VALUE_CREDENTIALS_TYPE_TEXT:
-            _f = tempfile.NamedTemporaryFile('wt', delete=False)
-            _f.write(_credentials.get(CFG_PAR_VALUE))
-            _f.close()
-            self.set_option(OPTION_PASSWORD_FILE, _f.name, True)
+            _key = f'{CFG_VALUE_CREDENTIALS_TYPE_TEXT}:{_credentials.get(CFG_PAR_ALIAS)}'
+            _secret_ref = SecretBroker.instance().put(_key, _credentials.get(CFG_PAR_VALUE))
+            self.__options[OPTION_PASSWORD_FILE] = _secret_ref
         elif _credentials.get(CFG_PAR_TYPE) == CFG_VALUE_CREDENTIALS_TYPE_PROMPT:
-            _f = tempfile.NamedTemporaryFile('wt', delete=False)
-            _f.write(options.get(OPTION_PASSWORD))
-            _f.close()
-            self.set_option(OPTION_PASSWORD_FILE, _f.name, True)
+            _key = f'{CFG_VALUE_CREDENTIALS_TYPE_PROMPT}:{_credentials.get(CFG_PAR_ALIAS)}'
+            _secret_ref = SecretBroker.instance().put(_key, options.get(OPTION_PASSWORD))
+            self.__options[OPTION_PASSWORD_FILE] = _secret_ref
         elif _credentials.get(CFG_PAR_TYPE) == CFG_VALUE_CREDENTIALS_TYPE_NONE:
             _restic_version = local_config.restic_version()
             if not _restic_version.empty_password_supported():
@@ -308,11 +357,16 @@ class RestixAction:
 
     def set_scope_options(self, scope: dict):
         """
-        Setzt die Optionen für die zu sichernden und zu ignorierenden Daten.
+        Setzt die Optionen für die zu sichernden und zu ignorierenden Daten sowie die Befehle, deren Ausgabe
+        gesichert wird.
         :param scope: Backup-Umfang aus der restix-Konfiguration
         """
-        _includes_file_path = self._full_filename_of(scope.get(CFG_PAR_INCLUDES))
-        self.set_option(OPTION_FILES_FROM, _includes_file_path)
+        self.__stdin_commands = scope.get(CFG_PAR_COMMANDS, [])
+        _includes_file_name = scope.get(CFG_PAR_INCLUDES)
+        if _includes_file_name is None:
+            # Backup-Umfang besteht nur aus Befehlen, deren Ausgabe gesichert wird
+            return
+        self.set_option(OPTION_FILES_FROM, self._full_filename_of(_includes_file_name))
         _excludes_file_name = scope.get(CFG_PAR_EXCLUDES)
         _ignores = scope.get(CFG_PAR_IGNORES)
         if _ignores is None or len(_ignores) == 0:
@@ -320,15 +374,12 @@ class RestixAction:
             if _excludes_file_name is not None and len(_excludes_file_name.strip()) > 0:
                 self.set_option(OPTION_EXCLUDE_FILE, self._full_filename_of(_excludes_file_name))
         else:
-            # Patterns für zu ignorierende Daten in die Excludes-Datei eintragen, falls eine definiert ist
-            _f = tempfile.NamedTemporaryFile('wt', delete=False)
-            for _item in _ignores:
-                _f.write(f'{_item}{os.linesep}')
+            # Patterns für zu ignorierende Daten und Inhalt der Excludes-Datei in einer generierten Datei zusammenfassen
+            _excludes = ''.join(f'{_item}\n' for _item in _ignores).encode('utf-8')
             if _excludes_file_name is not None and len(_excludes_file_name.strip()) > 0:
-                with open(self._full_filename_of(_excludes_file_name), 'r') as _exclude_file:
-                    _excludes = _exclude_file.readlines()
-                _f.writelines(_excludes)
-            self.set_option(OPTION_EXCLUDE_FILE, _f.name, True)
+                with open(self._full_filename_of(_excludes_file_name), 'rb') as _exclude_file:
+                    _excludes += _exclude_file.read()
+            self._set_generated_exclude_file(_excludes)
 
     def action_executed(self):
         """
@@ -342,6 +393,80 @@ class RestixAction:
                 pass
         self.__temp_files = []
 
+    def _set_generated_exclude_file(self, excludes: bytes):
+        """
+        Setzt die Option für eine generierte Excludes-Datei.
+        Die Datei wird unter dem Hash-Wert ihres Inhalts im restix-Cache-Verzeichnis abgelegt und damit nur erzeugt,
+        wenn sich der Backup-Umfang oder die Excludes-Datei geändert haben. Backup-Ziele mit gleichem Umfang teilen
+        sich die Datei. Kann das Cache-Verzeichnis nicht beschrieben werden, wird eine temporäre Datei benutzt.
+        Bei jeder Benutzung wird der Änderungszeitpunkt der Datei aktualisiert, beim Erzeugen einer neuen Datei werden
+        alle länger nicht mehr benutzten Excludes-Dateien gelöscht.
+        :param excludes: Inhalt der Excludes-Datei
+        """
+        _file_name = _EXCLUDES_CACHE_FILE_NAME_FMT.format(hashlib.sha256(excludes).hexdigest()[:32])
+        try:
+            _file_path = os.path.join(restix_cache_path(), _file_name)
+        except OSError:
+            _file_path = None
+        if _file_path is not None and os.path.isfile(_file_path):
+            try:
+                os.utime(_file_path)
+            except OSError:
+                pass
+        else:
+            _file_path = write_raw_cache_file(_file_name, excludes)
+            if _file_path is not None:
+                _remove_stale_exclude_files(os.path.dirname(_file_path))
+        if _file_path is not None:
+            self.set_option(OPTION_EXCLUDE_FILE, _file_path)
+            return
+        _f = tempfile.NamedTemporaryFile('wb', delete=False)
+        _f.write(excludes)
+        _f.close()
+        self.set_option(OPTION_EXCLUDE_FILE, _f.name, True)
+
+    def _base_command(self) -> list[str]:
+        """
+        :returns: restic-Kommando mit Repository, Zugangsdaten und allgemeinen Optionen dieser Aktion.
+        """
+        _cmd: list[str] = [self.__local_config.restic_executable(), self.__action_id,
+                           OPTION_REPO, self.option(OPTION_REPO)]
+        _pw_cmd = self.option(OPTION_PASSWORD_COMMAND)
+        if _pw_cmd is not None:
+            _cmd.extend([OPTION_PASSWORD_COMMAND, _pw_cmd])
+        else:
+            _cmd.extend([OPTION_PASSWORD_FILE, self.option(OPTION_PASSWORD_FILE)])
+        if self.target_setting(CFG_PAR_SSH_MULTIPLEXING, True):
+            # bei sftp-Repositories gemeinsame SSH-Verbindung für alle restic-Befehle der Sitzung benutzen
+            _sftp_cmd = SshMultiplexer.instance().sftp_command(self.option(OPTION_REPO))
+            if _sftp_cmd is not None:
+                _cmd.extend([OPTION_EXTENDED, f'{RESTIC_OPTION_SFTP_COMMAND}={_sftp_cmd}'])
+        _connections = self.target_setting(CFG_PAR_CONNECTIONS)
+        if _connections is not None:
+            # Anzahl paralleler Verbindungen zum Backend, z.B. rest.connections
+            _backend = repository_backend(self.option(OPTION_REPO))
+            _cmd.extend([OPTION_EXTENDED, f'{_backend}.{RESTIC_OPTION_CONNECTIONS}={_connections}'])
+        if self.option(OPTION_DRY_RUN):
+            _cmd.append(OPTION_DRY_RUN)
+        if self.option(OPTION_JSON):
+            _cmd.append(OPTION_JSON)
+        return _cmd
+
+    def _derived_action(self, action_id: str) -> Self:
+        """
+        :param action_id: ID der abgeleiteten Aktion
+        :returns: Aktion für dasselbe Repository mit denselben Zugangsdaten wie diese Aktion.
+        """
+        _action = RestixAction(action_id, self.target_alias())
+        _action.__options[OPTION_REPO] = self.option(OPTION_REPO)
+        _action.__local_config = self.__local_config
+        _pw_cmd = self.option(OPTION_PASSWORD_COMMAND)
+        if _pw_cmd is not None:
+            _action.__options[OPTION_PASSWORD_COMMAND] = _pw_cmd
+        else:
+            _action.__options[OPTION_PASSWORD_FILE] = self.option(OPTION_PASSWORD_FILE)
+        return _action
+
     def _full_filename_of(self, file_name: str) -> str:
         """
         :param file_name: Dateiname aus der Konfigurationsdatei
@@ -409,8 +534,8 @@ class RestixAction:
                     continue
                 if _arg == OPTION_VERSION:
                     return RestixAction(ACTION_VERSION, '')
-                if (_arg == OPTION_HOST or _arg == OPTION_PATTERN or _arg == OPTION_RESTORE_PATH or
-                        _arg == OPTION_SNAPSHOT or _arg == OPTION_YEAR):
+                if (_arg == OPTION_HOST or _arg == OPTION_OUTPUT or _arg == OPTION_PATTERN or
+                        _arg == OPTION_RESTORE_PATH or _arg == OPTION_SNAPSHOT or _arg == OPTION_YEAR):
                     if _arg in _specified_options:
                         raise RestixException(E_CLI_DUP_OPTION, _arg)
                     _option_value_expected = _arg
@@ -429,6 +554,10 @@ class RestixAction:
                     _action_id = ACTION_FORGET
                     _option_values[OPTION_KEEP_MONTHLY] = '1'
                     _option_values[OPTION_PRUNE] = True
+                elif _arg == CLI_COMMAND_WATCH:
+                    # Überwachung ist ein Backup, das bei Änderungen wiederholt wird
+                    _action_id = ACTION_BACKUP
+                    _option_values[OPTION_WATCH] = True
                 else:
                     _action_id = _arg
                 _action_processed = True
@@ -448,9 +577,36 @@ class RestixAction:
         return _action
 
 
-_STD_OPTIONS = {OPTION_REPO, OPTION_PASSWORD, OPTION_PASSWORD_COMMAND, OPTION_PASSWORD_FILE}
-_ACTION_OPTIONS = {ACTION_BACKUP: {OPTION_AUTO_CREATE, OPTION_BATCH, OPTION_DRY_RUN,
-                                   OPTION_EXCLUDE_FILE, OPTION_FILES_FROM},
+def repository_backend(repo: str) -> str:
+    """
+    :param repo: Repository in der Schreibweise von restic
+    :returns: Name des restic-Backends für das Repository, z.B. rest oder sftp
+    """
+    _prefix, _sep, _ = repo.partition(':')
+    return _prefix if _sep and _prefix in _REMOTE_BACKENDS else RESTIC_BACKEND_LOCAL
+
+
+def _remove_stale_exclude_files(cache_path: str):
+    """
+    Löscht alle generierten Excludes-Dateien im restix-Cache-Verzeichnis, die länger nicht mehr benutzt wurden.
+    Fehler werden ignoriert, da die Dateien jederzeit neu erzeugt werden können.
+    :param cache_path: restix-Cache-Verzeichnis
+    """
+    _min_mtime = time.time() - _EXCLUDES_CACHE_FILE_MAX_AGE
+    for _file_path in glob.glob(os.path.join(cache_path, _EXCLUDES_CACHE_FILE_NAME_FMT.format('*'))):
+        try:
+            if os.stat(_file_path).st_mtime < _min_mtime:
+                os.remove(_file_path)
+        except OSError:
+            pass
+
+
+# restic-Backends mit Präfix in der Repository-Angabe
+_REMOTE_BACKENDS = ('azure', 'b2', 'gs', 'rclone', RESTIC_BACKEND_REST, 's3', RESTIC_BACKEND_SFTP, 'swift')
+
+_STD_OPTIONS = {OPTION_REPO, OPTION_OUTPUT, OPTION_PASSWORD, OPTION_PASSWORD_COMMAND, OPTION_PASSWORD_FILE}
+_ACTION_OPTIONS = {ACTION_BACKUP: {OPTION_AUTO_CREATE, OPTION_BATCH, OPTION_DRY_RUN, OPTION_JSON,
+                                   OPTION_EXCLUDE_FILE, OPTION_FILES_FROM, OPTION_WATCH},
                    ACTION_FIND: {OPTION_HOST, OPTION_PATTERN, OPTION_JSON, OPTION_SNAPSHOT, OPTION_YEAR},
                    ACTION_FORGET: {OPTION_BATCH, OPTION_DRY_RUN, OPTION_HOST, OPTION_KEEP_MONTHLY,
                                    OPTION_PRUNE, OPTION_YEAR},
@@ -466,3 +622,9 @@ _MANDATORY_OPTIONS = {ACTION_BACKUP: (OPTION_FILES_FROM,),
                       ACTION_FIND: (OPTION_PATTERN, OPTION_SNAPSHOT),
                       ACTION_LS: (OPTION_SNAPSHOT,),
                       ACTION_RESTORE: (OPTION_SNAPSHOT, OPTION_RESTORE_PATH)}
+
+# Name generierter Excludes-Dateien im restix-Cache-Verzeichnis, Platzhalter ist der Hash-Wert des Inhalts
+_EXCLUDES_CACHE_FILE_NAME_FMT = 'excludes_{0}.list'
+
+# Zeit in Sekunden, nach der eine nicht mehr benutzte Excludes-Datei gelöscht wird
+_EXCLUDES_CACHE_FILE_MAX_AGE = 30 * 86400
@@ -38,40 +38,77 @@ Die Konfiguration erfolgt durch Dateien im Konfigurationsverzeichnis $HOME/.conf
 Alternativ kann das Verzeichnis durch Umgebungsvariable RESTIX_CONFIG_PATH festgelegt werden.
 """
 
-import copy
 import os.path
 import pathlib
 import re
 import shutil
 import tempfile
+import zlib
 
 import tomli
 import tomli_w
 
+from typing import Any, TYPE_CHECKING
+
 from restix.core import *
 from restix.core.messages import *
-from restix.core.restic_version import ResticVersion
 from restix.core.restix_exception import RestixException
-from restix.core.util import current_user, full_path_of, shell_cmd
+from restix.core.util import (current_user, full_path_of, platform_locale, read_cache_file, remove_cache_file,
+                              shell_cmd, write_cache_file)
+
+if TYPE_CHECKING:
+    # nur für Typ-Annotationen, restic_version importiert das Package packaging und wird im CLI selten gebraucht
+    from restix.core.restic_version import ResticVersion
 
 
 class LocalConfig(dict):
     """
     Lokale restix-Konfiguration.
+    Für jede Group wird ein nach Aliasname sortierter Index gehalten. Eine Konfiguration mit zu ersetzenden Variablen
+    (siehe for_cli) ist eine Sicht auf die Originaldaten, die Werte werden erst beim ersten Lesen ersetzt.
     """
-    def __init__(self, toml_data: dict, file_path: str, warnings: list[str]):
+    def __init__(self, toml_data: dict, file_path: str, warnings: list[str], variables: dict | None = None):
         """
         Konstruktor.
         :param toml_data: geparste Daten aus der Konfigurationsdatei
         :param file_path: Name der Konfigurationsdatei mit vollständigem Pfad
         :param warnings: Warnungen aus Konsistenzprüfung
+        :param variables: Namen und Werte von Variablen, die beim Lesen ersetzt werden sollen
         """
         super().__init__()
         self.__file_path = file_path
         self.__restic_version = None
         self.__warnings = warnings
+        self.__group_indexes = {}
+        self.__restic_executable = None
+        self.__variables = variables
+        self.__substituted_keys = set()
         self.update(toml_data.items())
 
+    def __getitem__(self, key: str) -> Any:
+        """
+        Bei einer Sicht mit Variablen wird der Wert beim ersten Lesen durch eine Kopie mit ersetzten Variablen
+        ausgetauscht; Teile ohne Variablen werden dabei nicht kopiert.
+        :param key: Name des Elements
+        :returns: Wert des Elements
+        :raises KeyError: falls das Element nicht existiert
+        """
+        _value = super().__getitem__(key)
+        if self.__variables is None or key in self.__substituted_keys:
+            return _value
+        _value = LocalConfig.substituted(_value, self.__variables)
+        super().__setitem__(key, _value)
+        self.__substituted_keys.add(key)
+        return _value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        :param key: Name des Elements
+        :param default: Rückgabewert, falls das Element nicht existiert
+        :returns: Wert des Elements
+        """
+        return self[key] if key in self else default
+
     def path(self) -> str:
         """
         :returns: Verzeichnis der restix-Konfiguration inklusive Pfad
@@ -80,14 +117,29 @@ class LocalConfig(dict):
 
     def restic_executable(self) -> str:
         """
+        Der Pfad wird nur neu ermittelt, wenn sich der Parameter in der Konfiguration geändert hat.
         :returns: Pfad des restic-Programms
         """
-        _executable = self.get(CFG_PAR_RESTIC) or RESTIC_EXECUTABLE
-        _executable = _executable.replace(f'${{{CFG_VAR_HOME}}}', str(pathlib.Path.home()))
+        _configured_executable = self.get(CFG_PAR_RESTIC) or RESTIC_EXECUTABLE
+        if self.__restic_executable is not None and self.__restic_executable[0] == _configured_executable:
+            return self.__restic_executable[1]
+        _executable = _configured_executable.replace(f'${{{CFG_VAR_HOME}}}', str(pathlib.Path.home()))
         _executable = _executable.replace(f'${{{CFG_VAR_USER}}}', current_user())
+        self.__restic_executable = (_configured_executable, _executable)
         return _executable
 
-    def restic_version(self) -> ResticVersion:
+    def metrics_path(self) -> str | None:
+        """
+        :returns: Verzeichnis für den Export von Kennzahlen (Prometheus Textfile-Collector); None, falls keine
+                  Kennzahlen exportiert werden sollen
+        """
+        _path = self.get(CFG_PAR_METRICS_PATH)
+        if _path is None or len(_path.strip()) == 0:
+            return None
+        _path = os.path.expanduser(_path)
+        return _path if os.path.isabs(_path) else os.path.join(self.path(), _path)
+
+    def restic_version(self) -> 'ResticVersion':
         """
         :returns: Version des lokal installierten restic-Programms
         :raises RestixException: falls keine Versions-Information verfügbar ist
@@ -96,7 +148,7 @@ class LocalConfig(dict):
             raise RestixException(E_INTERNAL_ERROR, localized_message(E_RESTIC_VERSION_NOT_AVAILABLE))
         return self.__restic_version
 
-    def set_restic_version(self, version: ResticVersion):
+    def set_restic_version(self, version: 'ResticVersion'):
         """
         :param version: Version des lokal installierten restic-Programms
         """
@@ -164,6 +216,8 @@ class LocalConfig(dict):
         for _target in self[CFG_GROUP_TARGET]:
             if _target.get(group) == alias:
                 raise RestixException(E_ALIAS_REFERENCED, alias)
+        # das Element wird anschließend vom Aufrufer gelöscht, der Index muss dann neu aufgebaut werden
+        self.__group_indexes.pop(group, None)
 
     def pre_check_rename(self, group: str, old_alias: str, new_alias: str):
         """
@@ -185,23 +239,38 @@ class LocalConfig(dict):
 
     def element_renamed(self, group: str, old_alias: str, new_alias: str):
         """
-        Passt die in Backup-Zielen referenzierten Elemente aufgrund einer Umbenennung an.
+        Passt den Index der Group und die in Backup-Zielen referenzierten Elemente aufgrund einer Umbenennung an.
         :param group: Group, in dem sich das umbenannte Element befindet
         :param old_alias: alter Aliasname der Zugriffsdaten
         :param new_alias: neuer Aliasname der Zugriffsdaten
         """
-        for _target in self[CFG_GROUP_TARGET].values():
+        _cached_index = self.__group_indexes.get(group)
+        if _cached_index is not None and old_alias in _cached_index[2]:
+            _elements = dict(_cached_index[2])
+            _elements[new_alias] = _elements.pop(old_alias)
+            self.__group_indexes[group] = (_cached_index[0], _cached_index[1], dict(sorted(_elements.items())))
+        else:
+            self.__group_indexes.pop(group, None)
+        for _target in self[CFG_GROUP_TARGET]:
             if _target.get(group) == old_alias:
                 _target[group] = new_alias
 
-    def for_cli(self, variables: dict):
+    def for_cli(self, variables: dict, in_place: bool = False):
         """
         :param variables: Namen und Werte der zu ersetzenden Variablen
-        :returns: Kopie der Konfiguration mit ersetzten Variablen
-        """
-        _config = copy.deepcopy(self)
-        LocalConfig.replace_variables(_config, variables)
-        return _config
+        :param in_place: True, falls die Variablen direkt in dieser Konfiguration ersetzt werden sollen; sinnvoll,
+                         wenn die Konfiguration nur für einen einzelnen Befehl gelesen wurde
+        :returns: Sicht auf die Konfiguration mit ersetzten Variablen bzw. diese Konfiguration, falls in_place
+                  gesetzt ist. Die Sicht kopiert ein Element erst beim ersten Lesen und nur, falls es Variablen enthält.
+        """
+        if not in_place:
+            _view = LocalConfig(self, self.__file_path, self.__warnings, variables)
+            _view.__restic_version = self.__restic_version
+            return _view
+        LocalConfig.replace_variables(self, variables)
+        self.__group_indexes.clear()
+        self.__restic_executable = None
+        return self
 
     def has_warnings(self) -> bool:
         """
@@ -226,33 +295,59 @@ class LocalConfig(dict):
                 _f.write(_toml_data)
         except IOError | OSError as _e:
             raise RestixException(E_WRITE_FILE_FAILED, _output_file_path, str(_e))
+        finally:
+            remove_cache_file(_config_cache_file_name(_output_file_path))
 
     def _group(self, group_name: str) -> dict:
         """
+        Der Index einer Group wird nur neu aufgebaut, wenn sich die Liste der Elemente oder deren Länge geändert hat.
+        Umbenennungen müssen über element_renamed gemeldet werden.
         :param group_name: gewünschte Group
         :returns: alle definierten Elemente der übergebenen Group, sortiert nach Aliasname
         """
+        _group_elements = self[group_name]
+        _cached_index = self.__group_indexes.get(group_name)
+        if (_cached_index is not None and _cached_index[0] is _group_elements and
+                _cached_index[1] == len(_group_elements)):
+            return _cached_index[2]
         _elements = {}
-        for _element in self[group_name]:
+        for _element in _group_elements:
             _elements[_element[CFG_PAR_ALIAS]] = _element
-        return dict(sorted(_elements.items()))
+        _index = dict(sorted(_elements.items()))
+        self.__group_indexes[group_name] = (_group_elements, len(_group_elements), _index)
+        return _index
 
     @classmethod
     def from_file(cls: Self, file_path: str) -> Self:
         """
         Erzeugt die lokale restix-Konfiguration aus einer TOML-Datei.
+        Die geprüften Daten und Warnungen werden im restix-Cache-Verzeichnis gespeichert und wiederverwendet, solange
+        Änderungszeit und Größe oder der Hashwert der Datei unverändert sind.
         :param file_path: Name der Konfigurationsdatei mit vollständigem Pfad
         :returns: lokale restix-Konfiguration.
         :raises RestixException: falls die Datei nicht gelesen oder verarbeitet werden kann
         """
         _file_contents = ''
         _file_path = os.path.abspath(file_path)
+        _cache_file_name = _config_cache_file_name(_file_path)
+        _cached = _read_config_cache(_cache_file_name)
+        _locale = platform_locale()
         try:
+            _stat = os.stat(_file_path)
+            _file_key = (_stat.st_mtime_ns, _stat.st_size, _locale)
+            if _cached is not None and _cached[0] == _file_key:
+                return LocalConfig(_cached[2], _file_path, _cached[3])
             with open(_file_path, mode='r', encoding='utf-8') as _f:
                 _file_contents = _f.read()
         except Exception as e:
             raise RestixException(E_CFG_READ_FILE_FAILED, _file_path, e)
-        return LocalConfig.from_str(_file_contents, _file_path)
+        _content_key = (zlib.crc32(_file_contents.encode('utf-8')), _locale)
+        if _cached is not None and _cached[1] == _content_key:
+            _cfg = LocalConfig(_cached[2], _file_path, _cached[3])
+        else:
+            _cfg = LocalConfig.from_str(_file_contents, _file_path)
+        write_cache_file(_cache_file_name, (_CFG_CACHE_FORMAT, _file_key, _content_key, dict(_cfg), _cfg.warnings()))
+        return _cfg
 
     @classmethod
     def from_str(cls: Self, data: str, file_path: str) -> Self:
@@ -284,6 +379,33 @@ class LocalConfig(dict):
         _cfg = LocalConfig(data, file_path, _warnings)
         return _cfg
 
+    @classmethod
+    def substituted(cls: Self, element: Any, variables: dict) -> Any:
+        """
+        Ersetzt Variablen in String-Werten des Elements, ohne das Element zu verändern.
+        Dictionaries und Listen werden nur kopiert, falls sich mindestens ein enthaltener Wert ändert.
+        :param element: Element
+        :param variables: zu ersetzende Variablen
+        :returns: Element mit ersetzten Variablen; das Element selbst, falls es keine Variablen enthält
+        """
+        if type(element) is str:
+            if element.find('${') < 0:
+                return element
+            for _var_name, _var_value in variables.items():
+                element = element.replace(f'${{{_var_name}}}', _var_value)
+            return element
+        if issubclass(element.__class__, dict):
+            _items = {_k: LocalConfig.substituted(_v, variables) for _k, _v in dict.items(element)}
+            if all(_items[_k] is _v for _k, _v in dict.items(element)):
+                return element
+            return _items
+        if type(element) is list:
+            _items = [LocalConfig.substituted(_v, variables) for _v in element]
+            if all(_new is _old for _new, _old in zip(_items, element)):
+                return element
+            return _items
+        return element
+
     @classmethod
     def replace_variables(cls: Self, element: dict|list|str, variables: dict) -> dict|list|str:
         """
@@ -462,6 +584,11 @@ def check_element(qualified_element_name: str, element_value: dict|list|str, ele
                     if _actual_value not in _ref_par_values:
                         continue
                 raise RestixException(E_CFG_MANDATORY_ELEM_MISSING, qualified_element_name, _k)
+    elif _expected_element_type == 'at':
+        # array of tables, jede Table wie ein dict prüfen
+        for _i, _item_value in enumerate(element_value):
+            _unsupported_elements.extend(check_element(f'{qualified_element_name}.[{_i}]', _item_value,
+                                                       ('t', *element_desc[1:]), file_name))
     return _unsupported_elements
 
 
@@ -470,7 +597,8 @@ def check_element_type(element_name: str, expected_type: str, par_value: dict|li
     """
     Prüft den Typ eines Elements (Group oder Parameter) der Konfigurationsdatei.
     :param element_name: Qualifizierter Name des Elements
-    :param expected_type: erwarteter TOML-Typ (a für Array, s für String, t für Table)
+    :param expected_type: erwarteter TOML-Typ (a für Array, b für Boolean, i für Integer, r für regulären Ausdruck,
+                          s für String, t für Table); bei Integer optional mit Mindestwert bzw. Wertebereich
     :param par_value: Wert des Elements
     :param file_name: Name der Konfigurationsdatei ohne Pfad.
     :raises RestixException: falls das Element nicht den erwarteten Typ oder Wert hat
@@ -484,6 +612,34 @@ def check_element_type(element_name: str, expected_type: str, par_value: dict|li
             if par_value.lower() not in _allowed_values:
                 raise RestixException(E_CFG_INVALID_ELEM_VALUE, element_name, expected_type[2:], file_name)
         return
+    if expected_type == 'r':
+        # regulärer Ausdruck, wird schon hier übersetzt, damit Fehler nicht erst während eines Backups auffallen
+        if type(par_value) is not str:
+            raise RestixException(E_CFG_INVALID_ELEM_TYPE, element_name, 'string', file_name)
+        try:
+            re.compile(par_value)
+        except re.error:
+            raise RestixException(E_CFG_INVALID_ELEM_VALUE, element_name, 'regular expression', file_name)
+        return
+    if expected_type == 'b':
+        # boolean
+        if type(par_value) is not bool:
+            raise RestixException(E_CFG_INVALID_ELEM_TYPE, element_name, 'boolean', file_name)
+        return
+    if expected_type.startswith('i'):
+        # integer, nur nicht-negative Werte sind sinnvoll; 'i:<n>' verlangt einen Mindestwert, 'i:<n>-<m>' einen
+        # Wert im angegebenen Bereich
+        if type(par_value) is not int:
+            raise RestixException(E_CFG_INVALID_ELEM_TYPE, element_name, 'integer', file_name)
+        _limits = expected_type[2:].split('-') if expected_type.find(':') > 0 else ['0']
+        _min_value = int(_limits[0])
+        if len(_limits) > 1:
+            _max_value = int(_limits[1])
+            if par_value < _min_value or par_value > _max_value:
+                raise RestixException(E_CFG_INVALID_ELEM_VALUE, element_name, f'{_min_value}-{_max_value}', file_name)
+        elif par_value < _min_value:
+            raise RestixException(E_CFG_INVALID_ELEM_VALUE, element_name, f'>= {_min_value}', file_name)
+        return
     if expected_type == 't':
         # table
         if type(par_value) is not dict:
@@ -530,6 +686,30 @@ def extract_groups(data: dict, file_path: str) -> dict:
     return _groups
 
 
+def _config_cache_file_name(file_path: str) -> str:
+    """
+    :param file_path: Name der Konfigurationsdatei
+    :returns: Name der Cache-Datei für die geprüfte Konfiguration ohne Pfad
+    """
+    return _CFG_CACHE_FILE_NAME_FMT.format(zlib.crc32(os.path.abspath(file_path).encode('utf-8')))
+
+
+def _read_config_cache(cache_file_name: str) -> tuple | None:
+    """
+    :param cache_file_name: Name der Cache-Datei ohne Pfad
+    :returns: Schlüssel und Hashwert der Konfigurationsdatei, geprüfte TOML-Daten und Warnungen;
+              None, falls die Cache-Datei nicht existiert oder nicht verwendbar ist
+    """
+    _cached = read_cache_file(cache_file_name)
+    if not isinstance(_cached, tuple) or len(_cached) != 5 or _cached[0] != _CFG_CACHE_FORMAT:
+        return None
+    return tuple(_cached[1]), tuple(_cached[2]), _cached[3], _cached[4]
+
+
+# Name und Format der Cache-Datei für geprüfte Konfigurationen
+_CFG_CACHE_FILE_NAME_FMT = 'config_{0:08x}.cache'
+_CFG_CACHE_FORMAT = 5
+
 # Pattern für Variablen im String-Wert von Parametern
 TOML_VAR_PATTERN = re.compile(r'\$\{(.*?)}')
 
@@ -546,17 +726,49 @@ _META_CREDENTIALS = {CFG_PAR_COMMENT: ('s', None, False, False, None),
                      CFG_PAR_ALIAS: ('s', None, True, True, None),
                      CFG_PAR_TYPE: (f's:{",".join(_ALLOWED_CREDENTIAL_TYPES)}', None, False, True, None),
                      CFG_PAR_VALUE: ('s', None, False, True, (CFG_PAR_TYPE, _VALUED_CREDENTIAL_TYPES))}
-_META_SCOPE = {CFG_PAR_COMMENT: ('s', None, False, False, None),
+_META_SCOPE_COMMAND = {CFG_PAR_COMMAND: ('s', None, False, True, None),
+                       CFG_PAR_FILENAME: ('s', None, False, True, None)}
+_META_SCOPE = {CFG_PAR_COMMANDS: ('at', _META_SCOPE_COMMAND, False, False, None),
+               CFG_PAR_COMMENT: ('s', None, False, False, None),
                CFG_PAR_EXCLUDES: ('s', None, False, False, None),
                CFG_PAR_IGNORES: ('as', None, False, False, None),
-               CFG_PAR_INCLUDES: ('s', None, False, True, None),
+               CFG_PAR_INCLUDES: ('s', None, False, True, (CFG_PAR_COMMANDS, (None,))),
                CFG_PAR_ALIAS: ('s', None, True, True, None)}
 _META_TARGET = {CFG_PAR_ALIAS: ('s', None, True, True, None),
+                CFG_PAR_APPEND_ONLY: ('b', None, False, False, None),
                 CFG_PAR_COMMENT: ('s', None, False, None),
+                CFG_PAR_CONNECTIONS: ('i', None, False, False, None),
+                CFG_PAR_CPU_AFFINITY: ('ai', None, False, False, None),
                 CFG_PAR_CREDENTIALS: ('s', None, False, True, None),
+                CFG_PAR_FORCE_AFTER_DAYS: ('i', None, False, False, None),
+                CFG_PAR_GOGC: ('i', None, False, False, None),
+                CFG_PAR_GOMAXPROCS: ('i', None, False, False, None),
+                CFG_PAR_GOMEMLIMIT: ('s', None, False, False, None),
+                CFG_PAR_HOOK_TIMEOUT: ('i', None, False, False, None),
+                CFG_PAR_IONICE_CLASS: (f's:{",".join(CFG_IONICE_CLASSES)}', None, False, False, None),
+                CFG_PAR_IONICE_PRIORITY: ('i:0-7', None, False, False, None),
                 CFG_PAR_LOCATION: ('s', None, False, True, None),
-                CFG_PAR_SCOPE: ('s', None, False, True, None)}
+                CFG_PAR_LOCK_WAIT: ('i', None, False, False, None),
+                CFG_PAR_NICE: ('i:0-19', None, False, False, None),
+                CFG_PAR_POST_HOOK: ('s', None, False, False, None),
+                CFG_PAR_PRE_HOOK: ('s', None, False, False, None),
+                CFG_PAR_REGRESSION_BAND: ('i', None, False, False, None),
+                CFG_PAR_REGRESSION_WINDOW: ('i', None, False, False, None),
+                CFG_PAR_RETRY_ATTEMPTS: ('i', None, False, False, None),
+                CFG_PAR_RETRY_CODES: ('ai', None, False, False, None),
+                CFG_PAR_RETRY_DELAY: ('i', None, False, False, None),
+                CFG_PAR_RETRY_PATTERNS: ('ar', None, False, False, None),
+                CFG_PAR_SCOPE: ('s', None, False, True, None),
+                CFG_PAR_SKIP_UNCHANGED: ('b', None, False, False, None),
+                CFG_PAR_SSH_MULTIPLEXING: ('b', None, False, False, None),
+                CFG_PAR_THROTTLE_INTERVAL: ('i:1', None, False, False, None),
+                CFG_PAR_THROTTLE_MAX_PAUSE: ('i', None, False, False, None),
+                CFG_PAR_THROTTLE_RESUME: ('i', None, False, False, None),
+                CFG_PAR_THROTTLE_THRESHOLD: ('i', None, False, False, None),
+                CFG_PAR_UNLOCK_STALE: ('b', None, False, False, None),
+                CFG_PAR_WATCH_DELAY: ('i', None, False, False, None)}
 _META_ROOT = {CFG_GROUP_CREDENTIALS: ('t', _META_CREDENTIALS, False, True, None),
               CFG_GROUP_SCOPE: ('t', _META_SCOPE, False, True, None),
               CFG_GROUP_TARGET: ('t', _META_TARGET, False, True, None),
+              CFG_PAR_METRICS_PATH: ('s', None, True, False, None),
               CFG_PAR_RESTIC: ('s', None, True, False, None)}
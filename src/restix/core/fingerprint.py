@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Fingerprints von Backup-Umfängen.
+Ein Fingerprint fasst die Pfade aller Verzeichnisse und Dateien eines Backup-Umfangs sowie Änderungszeit, Grösse und
+Inode-Änderungszeit aller Dateien zusammen. Damit lässt sich vor einem Backup ohne Aufruf von restic feststellen, ob sich seit der letzten
+erfolgreichen Sicherung etwas geändert hat.
+"""
+
+import datetime
+import fnmatch
+import glob
+import hashlib
+import os
+import stat
+import tempfile
+
+import tomli
+import tomli_w
+
+from restix.core import RESTIX_FINGERPRINTS_FN
+from restix.core.util import restix_data_path
+
+
+# Attribute eines Eintrags in der Fingerprint-Datei
+_ATTR_FINGERPRINT = 'fingerprint'
+_ATTR_TIMESTAMP = 'timestamp'
+
+
+class ExcludeFilter:
+    """
+    Bildet die Auswertung von Exclude-Patterns durch restic nach.
+    Patterns ohne führenden Slash passen auf beliebige Teilpfade, '**' steht für beliebig viele Verzeichnisebenen.
+    Enthalten die Patterns Negationen ('!'), wird nichts ausgeschlossen. Der Fingerprint umfasst dann mehr Daten als
+    restic sichert, was höchstens zu einem unnötigen Backup führt.
+    """
+    def __init__(self, patterns: list[str], fixed_patterns: list[str] | None = None):
+        """
+        Konstruktor.
+        :param patterns: Exclude-Patterns
+        :param fixed_patterns: Exclude-Patterns, die auch bei Negationen gelten
+        """
+        super().__init__()
+        self.__patterns = []
+        if len([_p for _p in patterns if _p.startswith('!')]) > 0:
+            patterns = []
+        for _pattern in patterns + ([] if fixed_patterns is None else fixed_patterns):
+            _pattern = os.path.expandvars(_pattern).replace(os.sep, '/')
+            _components = [_c for _c in _pattern.split('/') if len(_c) > 0]
+            if len(_components) == 0:
+                continue
+            if not _pattern.startswith('/'):
+                _components.insert(0, '**')
+            self.__patterns.append(_components)
+
+    def is_excluded(self, path: str) -> bool:
+        """
+        :param path: absoluter Pfad einer Datei oder eines Verzeichnisses
+        :returns: True, falls restic den Pfad aufgrund der Patterns nicht sichert
+        """
+        _path_components = [_c for _c in path.replace(os.sep, '/').split('/') if len(_c) > 0]
+        for _pattern in self.__patterns:
+            if _components_match(_pattern, _path_components):
+                return True
+        return False
+
+
+class FingerprintStore:
+    """
+    Persistente Ablage der Fingerprints der zuletzt erfolgreich gesicherten Backup-Umfänge, je restic-Repository.
+    """
+    def __init__(self, file_path: str | None = None):
+        """
+        Konstruktor.
+        :param file_path: Name der Datei mit den Fingerprints; bei None die Standard-Datei im Daten-Verzeichnis
+        """
+        super().__init__()
+        self.__file_path = os.path.join(restix_data_path(), RESTIX_FINGERPRINTS_FN) if file_path is None \
+            else file_path
+
+    def is_unchanged(self, repo: str, fingerprint: str, force_after_days: int | None) -> tuple[bool, str | None]:
+        """
+        Prüft, ob ein Backup übersprungen werden kann.
+        :param repo: restic-Repository
+        :param fingerprint: aktueller Fingerprint des Backup-Umfangs
+        :param force_after_days: Anzahl Tage, nach denen in jedem Fall ein Backup ausgeführt wird
+        :returns: True und Zeitpunkt der letzten Sicherung, falls sich der Backup-Umfang nicht geändert hat und ein
+                  Backup nicht erzwungen wird; ansonsten False und None
+        """
+        _entry = self._read().get(repo)
+        if _entry is None or _entry.get(_ATTR_FINGERPRINT) != fingerprint:
+            return False, None
+        _timestamp = _entry.get(_ATTR_TIMESTAMP)
+        if not isinstance(_timestamp, datetime.datetime):
+            return False, None
+        if force_after_days is not None and force_after_days > 0:
+            if datetime.datetime.now() - _timestamp >= datetime.timedelta(days=force_after_days):
+                return False, None
+        return True, _timestamp.strftime('%Y-%m-%d %H:%M')
+
+    def update(self, repo: str, fingerprint: str):
+        """
+        Speichert den Fingerprint nach einem erfolgreichen Backup.
+        :param repo: restic-Repository
+        :param fingerprint: Fingerprint des gesicherten Backup-Umfangs
+        :raises OSError: falls die Datei nicht geschrieben werden kann
+        """
+        _data = self._read()
+        _data[repo] = {_ATTR_FINGERPRINT: fingerprint, _ATTR_TIMESTAMP: datetime.datetime.now().replace(microsecond=0)}
+        # Datei atomar ersetzen, da mehrere Backups parallel laufen können
+        _dir_path = os.path.dirname(self.__file_path)
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=_dir_path, delete=False) as _f:
+            _f.write(tomli_w.dumps(_data))
+        os.replace(_f.name, self.__file_path)
+
+    def _read(self) -> dict:
+        """
+        :returns: Inhalt der Fingerprint-Datei; leeres Dictionary, falls die Datei nicht existiert oder korrupt ist
+        """
+        try:
+            with open(self.__file_path, 'rb') as _f:
+                return tomli.load(_f)
+        except (OSError, tomli.TOMLDecodeError):
+            return {}
+
+
+def scope_fingerprint(includes_file_path: str, excludes_file_path: str | None) -> str:
+    """
+    Berechnet den Fingerprint eines Backup-Umfangs.
+    Die Definition des Backup-Umfangs geht mit in den Fingerprint ein, Änderungen an Include- oder Exclude-Dateien
+    führen also immer zu einem Backup.
+    :param includes_file_path: Datei mit den zu sichernden Pfaden (Format wie bei restic --files-from)
+    :param excludes_file_path: optional Datei mit den auszuschliessenden Pfaden (Format wie bei restic --exclude-file)
+    :returns: Fingerprint als Hex-String
+    :raises OSError: falls eine der Dateien nicht gelesen werden kann
+    """
+    _hash = hashlib.sha256()
+    _includes = read_pattern_file(includes_file_path)
+    _excludes = [] if excludes_file_path is None else read_pattern_file(excludes_file_path)
+    for _line in _includes:
+        _hash.update(f'+{_line}\n'.encode('utf-8', 'surrogateescape'))
+    for _line in _excludes:
+        _hash.update(f'-{_line}\n'.encode('utf-8', 'surrogateescape'))
+    _exclude_filter = ExcludeFilter(_excludes)
+    for _root in include_roots(_includes):
+        _fingerprint_tree(_root, _exclude_filter, _hash)
+    return _hash.hexdigest()
+
+
+def include_roots(includes: list[str]) -> list[str]:
+    """
+    :param includes: Einträge einer Include-Datei, ggf. mit Wildcards
+    :returns: absolute Pfade aller Include-Einträge, Wildcards expandiert wie von restic
+    """
+    _roots = []
+    for _include in includes:
+        _paths = sorted(glob.glob(_include)) if glob.has_magic(_include) else [_include]
+        _roots.extend([os.path.abspath(_p) for _p in _paths])
+    return _roots
+
+
+def _fingerprint_tree(root_path: str, exclude_filter: ExcludeFilter, hash_obj):
+    """
+    Nimmt Metadaten aller nicht ausgeschlossenen Elemente unterhalb eines Include-Pfads in den Hash auf.
+    Dateiinhalte werden nicht gelesen.
+    :param root_path: Include-Pfad
+    :param exclude_filter: Filter für auszuschliessende Elemente
+    :param hash_obj: Hash, in den die Metadaten einfliessen
+    """
+    if exclude_filter.is_excluded(root_path):
+        return
+    try:
+        _root_stat = os.lstat(root_path)
+    except OSError as _e:
+        hash_obj.update(f'{root_path}\0!{_e.errno}\n'.encode('utf-8', 'surrogateescape'))
+        return
+    _update_hash(hash_obj, root_path, _root_stat)
+    if not stat.S_ISDIR(_root_stat.st_mode):
+        return
+    _pending_dirs = [root_path]
+    while len(_pending_dirs) > 0:
+        _dir_path = _pending_dirs.pop()
+        try:
+            with os.scandir(_dir_path) as _it:
+                _entries = sorted(_it, key=lambda _entry: _entry.name)
+        except OSError as _e:
+            hash_obj.update(f'{_dir_path}\0!{_e.errno}\n'.encode('utf-8', 'surrogateescape'))
+            continue
+        for _entry in _entries:
+            if exclude_filter.is_excluded(_entry.path):
+                continue
+            try:
+                _entry_stat = _entry.stat(follow_symlinks=False)
+            except OSError as _e:
+                hash_obj.update(f'{_entry.path}\0!{_e.errno}\n'.encode('utf-8', 'surrogateescape'))
+                continue
+            _update_hash(hash_obj, _entry.path, _entry_stat)
+            if stat.S_ISDIR(_entry_stat.st_mode):
+                _pending_dirs.append(_entry.path)
+
+
+def _update_hash(hash_obj, path: str, path_stat: os.stat_result):
+    """
+    Nimmt die Metadaten eines Elements in den Hash auf.
+    Bei Verzeichnissen werden die Zeitstempel nicht berücksichtigt, da sie sich auch beim Anlegen ausgeschlossener
+    Dateien ändern. Hinzugefügte, gelöschte oder umbenannte Elemente sind über ihre Pfade erfasst.
+    :param hash_obj: Hash
+    :param path: Pfad des Elements
+    :param path_stat: Metadaten des Elements
+    """
+    if stat.S_ISDIR(path_stat.st_mode):
+        _data = f'{path}\0{path_stat.st_mode}\n'
+    else:
+        _data = (f'{path}\0{path_stat.st_mode}\0{path_stat.st_size}\0{path_stat.st_mtime_ns}\0'
+                 f'{path_stat.st_ctime_ns}\n')
+    hash_obj.update(_data.encode('utf-8', 'surrogateescape'))
+
+
+def _components_match(pattern: list[str], path: list[str]) -> bool:
+    """
+    :param pattern: Bestandteile eines Exclude-Patterns
+    :param path: Bestandteile eines Pfads
+    :returns: True, falls das Pattern auf den gesamten Pfad passt
+    """
+    if len(pattern) == 0:
+        return len(path) == 0
+    if pattern[0] == '**':
+        for _i in range(len(path) + 1):
+            if _components_match(pattern[1:], path[_i:]):
+                return True
+        return False
+    if len(path) == 0 or not fnmatch.fnmatchcase(path[0], pattern[0]):
+        return False
+    return _components_match(pattern[1:], path[1:])
+
+
+def read_pattern_file(file_path: str) -> list[str]:
+    """
+    :param file_path: Name einer Include- oder Exclude-Datei
+    :returns: alle Einträge der Datei ohne Leerzeilen und Kommentare
+    :raises OSError: falls die Datei nicht gelesen werden kann
+    """
+    with open(file_path, 'r', encoding='utf-8', errors='surrogateescape') as _f:
+        return [_l.strip() for _l in _f if len(_l.strip()) > 0 and not _l.strip().startswith('#')]
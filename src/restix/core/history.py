@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Auswertung von Backups und lokale Historie der ausgeführten Backups.
+Die Zusammenfassung, die restic am Ende eines Backups mit Option --json ausgibt, wird je Backup-Ziel in einer
+SQLite-Datenbank im restix-Daten-Verzeichnis gespeichert. Daraus lassen sich Entwicklung von Laufzeit, Durchsatz und
+Datenzuwachs ablesen.
+"""
+
+import datetime
+import json
+import os
+import sqlite3
+import statistics
+
+from contextlib import closing
+
+from restix.core import RESTIX_HISTORY_FN
+from restix.core.util import restix_data_path
+
+
+# Attribute der summary-Nachricht von restic backup --json
+_ATTR_DATA_ADDED = 'data_added'
+_ATTR_FILES_CHANGED = 'files_changed'
+_ATTR_FILES_NEW = 'files_new'
+_ATTR_FILES_UNMODIFIED = 'files_unmodified'
+_ATTR_MESSAGE_TYPE = 'message_type'
+_ATTR_SNAPSHOT_ID = 'snapshot_id'
+_ATTR_TOTAL_BYTES_PROCESSED = 'total_bytes_processed'
+_ATTR_TOTAL_DURATION = 'total_duration'
+_ATTR_TOTAL_FILES_PROCESSED = 'total_files_processed'
+
+# Kennzahlen eines Backups, die auf Regressionen geprüft werden
+REGRESSION_DATA_ADDED = 'data_added'
+REGRESSION_DURATION = 'duration'
+REGRESSION_THROUGHPUT = 'throughput'
+
+# Erlaubte Abweichung vom Median der vorherigen Backups in Prozent
+DEFAULT_REGRESSION_BAND = 50
+
+# Anzahl vorheriger Backups, aus denen der Median berechnet wird
+DEFAULT_REGRESSION_WINDOW = 10
+
+# Mindestanzahl vorheriger Backups für die Prüfung auf Regressionen
+MIN_REGRESSION_RUNS = 3
+
+# Mindestabweichungen von Dauer (Sekunden) und hinzugefügter Datenmenge (Bytes), damit bei sehr kurzen oder
+# kleinen Backups nicht jede Schwankung gemeldet wird
+_MIN_DURATION_INCREASE = 60.0
+_MIN_DATA_ADDED_INCREASE = 64 << 20
+
+# Nachrichtentyp der Zusammenfassung
+_MESSAGE_TYPE_SUMMARY = 'summary'
+
+# Spalten der Tabelle mit den Backups, in der Reihenfolge der Attribute einer Zusammenfassung
+_SUMMARY_COLUMNS = (_ATTR_FILES_NEW, _ATTR_FILES_CHANGED, _ATTR_FILES_UNMODIFIED, _ATTR_DATA_ADDED,
+                    _ATTR_TOTAL_FILES_PROCESSED, _ATTR_TOTAL_BYTES_PROCESSED, _ATTR_TOTAL_DURATION,
+                    _ATTR_SNAPSHOT_ID)
+
+_SQL_CREATE_TABLE = f"""CREATE TABLE IF NOT EXISTS backup_runs (
+                           id INTEGER PRIMARY KEY,
+                           target TEXT NOT NULL,
+                           repo TEXT NOT NULL,
+                           finished TEXT NOT NULL,
+                           {_ATTR_FILES_NEW} INTEGER NOT NULL,
+                           {_ATTR_FILES_CHANGED} INTEGER NOT NULL,
+                           {_ATTR_FILES_UNMODIFIED} INTEGER NOT NULL,
+                           {_ATTR_DATA_ADDED} INTEGER NOT NULL,
+                           {_ATTR_TOTAL_FILES_PROCESSED} INTEGER NOT NULL,
+                           {_ATTR_TOTAL_BYTES_PROCESSED} INTEGER NOT NULL,
+                           {_ATTR_TOTAL_DURATION} REAL NOT NULL,
+                           {_ATTR_SNAPSHOT_ID} TEXT)"""
+_SQL_CREATE_INDEX = 'CREATE INDEX IF NOT EXISTS backup_runs_target ON backup_runs (target, finished)'
+_SQL_INSERT = f"""INSERT INTO backup_runs (target, repo, finished, {', '.join(_SUMMARY_COLUMNS)})
+                  VALUES ({', '.join('?' * (len(_SUMMARY_COLUMNS) + 3))})"""
+_SQL_SELECT = f"""SELECT finished, {', '.join(_SUMMARY_COLUMNS)} FROM backup_runs
+                  WHERE target = ? ORDER BY finished DESC, id DESC LIMIT ?"""
+
+
+class BackupSummary:
+    """
+    Zusammenfassung eines von restic ausgeführten Backups.
+    """
+    def __init__(self, data: dict, finished: datetime.datetime | None = None):
+        """
+        Konstruktor.
+        :param data: Daten der summary-Nachricht von restic backup --json
+        :param finished: Zeitpunkt, an dem das Backup beendet wurde; bei None der aktuelle Zeitpunkt
+        """
+        super().__init__()
+        self.__data = data
+        self.__finished = datetime.datetime.now().replace(microsecond=0) if finished is None else finished
+        self.__regressions = []
+
+    def finished(self) -> datetime.datetime:
+        """
+        :returns: Zeitpunkt, an dem das Backup beendet wurde
+        """
+        return self.__finished
+
+    def files_new(self) -> int:
+        """
+        :returns: Anzahl neuer Dateien
+        """
+        return self.__data.get(_ATTR_FILES_NEW, 0)
+
+    def files_changed(self) -> int:
+        """
+        :returns: Anzahl geänderter Dateien
+        """
+        return self.__data.get(_ATTR_FILES_CHANGED, 0)
+
+    def files_unmodified(self) -> int:
+        """
+        :returns: Anzahl unveränderter Dateien
+        """
+        return self.__data.get(_ATTR_FILES_UNMODIFIED, 0)
+
+    def data_added(self) -> int:
+        """
+        :returns: dem Repository hinzugefügte Datenmenge in Bytes
+        """
+        return self.__data.get(_ATTR_DATA_ADDED, 0)
+
+    def total_files_processed(self) -> int:
+        """
+        :returns: Anzahl verarbeiteter Dateien
+        """
+        return self.__data.get(_ATTR_TOTAL_FILES_PROCESSED, 0)
+
+    def total_bytes_processed(self) -> int:
+        """
+        :returns: verarbeitete Datenmenge in Bytes
+        """
+        return self.__data.get(_ATTR_TOTAL_BYTES_PROCESSED, 0)
+
+    def total_duration(self) -> float:
+        """
+        :returns: Dauer des Backups in Sekunden
+        """
+        return self.__data.get(_ATTR_TOTAL_DURATION, 0.0)
+
+    def snapshot_id(self) -> str | None:
+        """
+        :returns: ID des erzeugten Snapshots; None bei einem simulierten Backup
+        """
+        return self.__data.get(_ATTR_SNAPSHOT_ID)
+
+    def throughput(self) -> float | None:
+        """
+        :returns: verarbeitete Bytes pro Sekunde; None, falls die Dauer nicht bekannt ist
+        """
+        _duration = self.total_duration()
+        return None if _duration <= 0 else self.total_bytes_processed() / _duration
+
+    def regressions(self) -> list[tuple[str, float, float]]:
+        """
+        :returns: gegenüber den vorherigen Backups erkannte Regressionen, siehe detect_regressions
+        """
+        return self.__regressions
+
+    def set_regressions(self, regressions: list[tuple[str, float, float]]):
+        """
+        :param regressions: gegenüber den vorherigen Backups erkannte Regressionen
+        """
+        self.__regressions = regressions
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BackupSummary):
+            return False
+        return self.__finished == other.__finished and self.column_values() == other.column_values()
+
+    def as_dict(self) -> dict:
+        """
+        :returns: Zusammenfassung als Dictionary mit Basistypen, z.B. für die Ausgabe im JSON-Format
+        """
+        _dict = {'finished': self.__finished.isoformat(), **dict(zip(_SUMMARY_COLUMNS, self.column_values())),
+                 'throughput': self.throughput()}
+        _dict['regressions'] = [{'metric': _metric, 'value': _value, 'median': _median}
+                                for _metric, _value, _median in self.__regressions]
+        return _dict
+
+    def column_values(self) -> tuple:
+        """
+        :returns: Werte der Zusammenfassung in der Reihenfolge der Spalten der Historie
+        """
+        return (self.files_new(), self.files_changed(), self.files_unmodified(), self.data_added(),
+                self.total_files_processed(), self.total_bytes_processed(), self.total_duration(),
+                self.snapshot_id())
+
+    @classmethod
+    def from_restic_output(cls, output: str) -> 'BackupSummary | None':
+        """
+        Sucht die Zusammenfassung in der Ausgabe von restic backup --json.
+        :param output: Standard-Ausgabe von restic
+        :returns: Zusammenfassung; None, falls die Ausgabe keine Zusammenfassung enthält
+        """
+        for _line in reversed(output.splitlines()):
+            _data = parse_json_message(_line)
+            if _data is not None and _data.get(_ATTR_MESSAGE_TYPE) == _MESSAGE_TYPE_SUMMARY:
+                return BackupSummary(_data)
+        return None
+
+
+class BackupHistory:
+    """
+    Lokale Historie der Backups, je Backup-Ziel.
+    """
+    def __init__(self, file_path: str | None = None):
+        """
+        Konstruktor.
+        :param file_path: Name der Datenbank-Datei; bei None die Standard-Datei im Daten-Verzeichnis
+        """
+        super().__init__()
+        self.__file_path = os.path.join(restix_data_path(), RESTIX_HISTORY_FN) if file_path is None \
+            else file_path
+
+    def add(self, target_alias: str, repo: str, summary: BackupSummary):
+        """
+        Fügt ein ausgeführtes Backup zur Historie hinzu.
+        :param target_alias: Aliasname des Backup-Ziels
+        :param repo: restic-Repository
+        :param summary: Zusammenfassung des Backups
+        :raises sqlite3.Error: falls die Datenbank nicht geschrieben werden kann
+        """
+        with closing(self._connect()) as _db, _db:
+            _db.execute(_SQL_INSERT, (target_alias, repo, summary.finished().isoformat(), *summary.column_values()))
+
+    def backups(self, target_alias: str, max_count: int = -1) -> list[BackupSummary]:
+        """
+        :param target_alias: Aliasname des Backup-Ziels
+        :param max_count: maximale Anzahl zurückzugebender Backups; -1 für alle
+        :returns: Zusammenfassungen der Backups zum Backup-Ziel, das jüngste zuerst
+        :raises sqlite3.Error: falls die Datenbank nicht gelesen werden kann
+        """
+        if not os.path.isfile(self.__file_path):
+            return []
+        with closing(self._connect()) as _db:
+            _rows = _db.execute(_SQL_SELECT, (target_alias, max_count)).fetchall()
+        return [BackupSummary(dict(zip(_SUMMARY_COLUMNS, _row[1:])), datetime.datetime.fromisoformat(_row[0]))
+                for _row in _rows]
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Öffnet die Datenbank und legt die Tabelle an, falls sie noch nicht existiert.
+        :returns: Verbindung zur Datenbank
+        """
+        _db = sqlite3.connect(self.__file_path, timeout=10)
+        _db.execute(_SQL_CREATE_TABLE)
+        _db.execute(_SQL_CREATE_INDEX)
+        return _db
+
+
+def parse_json_message(line: str) -> dict | None:
+    """
+    :param line: Ausgabe-Zeile von restic mit Option --json
+    :returns: Nachricht als Dictionary; None, falls die Zeile keine JSON-Nachricht enthält
+    """
+    if not line.startswith('{'):
+        return None
+    try:
+        _data = json.loads(line)
+    except ValueError:
+        return None
+    return _data if isinstance(_data, dict) else None
+
+
+def detect_regressions(summary: BackupSummary, previous_backups: list[BackupSummary],
+                       band: int = DEFAULT_REGRESSION_BAND) -> list[tuple[str, float, float]]:
+    """
+    Vergleicht ein Backup mit dem Median der vorherigen Backups zum gleichen Backup-Ziel.
+    Gemeldet werden ein Einbruch des Durchsatzes sowie ein Anstieg von Dauer oder hinzugefügter Datenmenge um mehr
+    als die erlaubte Abweichung.
+    :param summary: Zusammenfassung des aktuellen Backups
+    :param previous_backups: Zusammenfassungen der vorherigen Backups
+    :param band: erlaubte Abweichung vom Median in Prozent; 0 schaltet die Prüfung ab
+    :returns: Kennzahl, aktueller Wert und Median für jede erkannte Regression
+    """
+    if band <= 0 or len(previous_backups) < MIN_REGRESSION_RUNS:
+        return []
+    _factor = band / 100
+    _regressions = []
+    _throughputs = [_t for _t in (_b.throughput() for _b in previous_backups) if _t is not None]
+    _throughput = summary.throughput()
+    if len(_throughputs) >= MIN_REGRESSION_RUNS and _throughput is not None:
+        _median = statistics.median(_throughputs)
+        if _throughput < _median * (1 - _factor):
+            _regressions.append((REGRESSION_THROUGHPUT, _throughput, _median))
+    _median = statistics.median([_b.total_duration() for _b in previous_backups])
+    _duration = summary.total_duration()
+    if _duration > _median * (1 + _factor) and _duration - _median >= _MIN_DURATION_INCREASE:
+        _regressions.append((REGRESSION_DURATION, _duration, _median))
+    _median = statistics.median([_b.data_added() for _b in previous_backups])
+    _data_added = summary.data_added()
+    if _data_added > _median * (1 + _factor) and _data_added - _median >= _MIN_DATA_ADDED_INCREASE:
+        _regressions.append((REGRESSION_DATA_ADDED, _data_added, _median))
+    return _regressions
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Hooks, die vor und nach einem Backup ausgeführt werden.
+Ein Pre-Hook legt typischerweise einen LVM- oder btrfs-Snapshot an oder versetzt einen Dienst in einen konsistenten
+Zustand, restic liest dann aus dem eingefrorenen Stand. Der Post-Hook gibt diese Ressourcen wieder frei, er wird
+deshalb auch nach Fehlern und Abbruch des Backups ausgeführt.
+"""
+
+import os
+import shlex
+import signal
+import subprocess
+
+from typing import Callable, Self
+
+from restix.core import *
+from restix.core.action import RestixAction
+from restix.core.messages import *
+from restix.core.restix_exception import RestixException
+from restix.core.task import TaskMonitor
+
+
+# Standardwert für die maximale Laufzeit eines Hooks in Sekunden
+DEFAULT_HOOK_TIMEOUT = 300
+
+# Namen der Hooks
+HOOK_PRE = 'pre'
+HOOK_POST = 'post'
+
+# Ergebnis des Backups, wird dem Post-Hook übergeben
+BACKUP_RESULT_ABORTED = 'aborted'
+BACKUP_RESULT_FAILED = 'failed'
+BACKUP_RESULT_SUCCEEDED = 'succeeded'
+
+
+class BackupHooks:
+    """
+    Pre- und Post-Hook eines Backup-Ziels.
+    """
+    def __init__(self, pre_command: str | None, post_command: str | None, timeout: int = DEFAULT_HOOK_TIMEOUT,
+                 environment: dict | None = None, dry_run: bool = False):
+        """
+        Konstruktor.
+        :param pre_command: Befehl, der vor dem Backup ausgeführt wird
+        :param post_command: Befehl, der nach dem Backup ausgeführt wird
+        :param timeout: maximale Laufzeit eines Hooks in Sekunden
+        :param environment: zusätzliche Umgebungsvariablen mit Angaben zum Backup
+        :param dry_run: zeigt an, ob die Hooks nur protokolliert werden sollen
+        """
+        super().__init__()
+        self.__pre_command = pre_command
+        self.__post_command = post_command
+        self.__timeout = timeout
+        self.__environment = {} if environment is None else environment
+        self.__dry_run = dry_run
+
+    def defined(self) -> bool:
+        """
+        :returns: True, falls mindestens ein Hook definiert ist
+        """
+        return self.__pre_command is not None or self.__post_command is not None
+
+    def hook_environment(self, hook: str, backup_result: str | None = None) -> dict:
+        """
+        :param hook: Name des Hooks
+        :param backup_result: Ergebnis des Backups, nur für den Post-Hook
+        :returns: Umgebungsvariablen für den Hook
+        """
+        _env = dict(os.environ)
+        _env.update(self.__environment)
+        _env[ENVA_RESTIX_HOOK] = hook
+        if backup_result is not None:
+            _env[ENVA_RESTIX_RESULT] = backup_result
+        return _env
+
+    def run_pre_hook(self, task_monitor: TaskMonitor) -> bool:
+        """
+        Führt den Pre-Hook aus.
+        :param task_monitor: Fortschritt-Handler.
+        :returns: True, falls kein Pre-Hook definiert ist oder er erfolgreich ausgeführt wurde
+        :raises RestixException: falls das Backup abgebrochen werden soll
+        """
+        if self.__pre_command is None:
+            return True
+        return self._run_hook(HOOK_PRE, self.__pre_command, self.hook_environment(HOOK_PRE), task_monitor, False)
+
+    def run_post_hook(self, backup_result: str, task_monitor: TaskMonitor) -> bool:
+        """
+        Führt den Post-Hook aus, auch wenn der Abbruch des Backups angefordert wurde.
+        :param backup_result: Ergebnis des Backups
+        :param task_monitor: Fortschritt-Handler.
+        :returns: True, falls kein Post-Hook definiert ist oder er erfolgreich ausgeführt wurde
+        """
+        if self.__post_command is None:
+            return True
+        _env = self.hook_environment(HOOK_POST, backup_result)
+        return self._run_hook(HOOK_POST, self.__post_command, _env, task_monitor, True)
+
+    def _run_hook(self, hook: str, command: str, env: dict, task_monitor: TaskMonitor, ignore_abort: bool) -> bool:
+        """
+        Führt einen Hook aus und reicht dessen Ausgaben an den TaskMonitor weiter.
+        :param hook: Name des Hooks
+        :param command: auszuführender Befehl
+        :param env: Umgebungsvariablen für den Befehl
+        :param task_monitor: Fortschritt-Handler.
+        :param ignore_abort: zeigt an, ob der Hook auch bei angefordertem Abbruch vollständig ausgeführt wird
+        :returns: True, falls der Hook erfolgreich ausgeführt wurde
+        :raises RestixException: falls abgebrochen werden soll
+        """
+        _log, _log_text = task_monitor.log, task_monitor.log_text
+        if ignore_abort:
+            _log, _log_text = _abort_tolerant(_log), _abort_tolerant(_log_text)
+        if self.__dry_run:
+            _log(I_DRY_RUN_HOOK, hook, command)
+            return True
+        _log(I_RUNNING_HOOK, hook, command)
+        try:
+            # eigene Prozessgruppe, damit bei Zeitüberschreitung auch von Shell-Skripten gestartete Prozesse enden
+            _p = subprocess.Popen(shlex.split(command), stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                  stderr=subprocess.PIPE, env=env, universal_newlines=True,
+                                  start_new_session=os.name == 'posix')
+        except (OSError, ValueError) as _e:
+            _log(E_HOOK_FAILED, hook, command, str(_e))
+            return False
+        _stdout, _stderr, _timed_out = _wait_for_hook(_p, self.__timeout, task_monitor, ignore_abort)
+        for _line in _stdout.splitlines():
+            if len(_line.strip()) > 0:
+                _log_text(_line.strip(), SEVERITY_INFO)
+        for _line in _stderr.splitlines():
+            if len(_line.strip()) > 0:
+                _log_text(_line.strip(), SEVERITY_ERROR)
+        if _timed_out:
+            _log(E_HOOK_TIMED_OUT, hook, command, self.__timeout)
+            return False
+        if _p.returncode != 0:
+            _log(E_HOOK_FAILED, hook, command, f'rc={_p.returncode}')
+            return False
+        return True
+
+    @classmethod
+    def for_action(cls, action: RestixAction) -> Self:
+        """
+        :param action: auszuführendes Backup
+        :returns: Hooks des Backup-Ziels der Aktion
+        """
+        _environment = {ENVA_RESTIX_DRY_RUN: '1' if action.option(OPTION_DRY_RUN) is True else '0',
+                        ENVA_RESTIX_REPOSITORY: action.option(OPTION_REPO) or '',
+                        ENVA_RESTIX_SCOPE: action.target_setting(CFG_PAR_SCOPE, ''),
+                        ENVA_RESTIX_TARGET: action.target_alias() or ''}
+        return BackupHooks(action.target_setting(CFG_PAR_PRE_HOOK), action.target_setting(CFG_PAR_POST_HOOK),
+                           action.target_setting(CFG_PAR_HOOK_TIMEOUT, DEFAULT_HOOK_TIMEOUT), _environment,
+                           action.option(OPTION_DRY_RUN) is True)
+
+
+def _wait_for_hook(process: subprocess.Popen, timeout: int, task_monitor: TaskMonitor,
+                   ignore_abort: bool) -> tuple[str, str, bool]:
+    """
+    Wartet auf das Ende eines Hooks, prüft dabei jede Sekunde, ob abgebrochen werden soll.
+    :param process: laufender Hook
+    :param timeout: maximale Laufzeit in Sekunden
+    :param task_monitor: Fortschritt-Handler.
+    :param ignore_abort: zeigt an, ob ein angeforderter Abbruch ignoriert wird
+    :returns: Standard-Ausgabe, Standard-Error, True, falls der Hook wegen Zeitüberschreitung beendet wurde
+    :raises RestixException: falls abgebrochen werden soll
+    """
+    _remaining = timeout
+    while True:
+        try:
+            _stdout, _stderr = process.communicate(timeout=min(1, max(_remaining, 0)))
+            return _stdout, _stderr, False
+        except subprocess.TimeoutExpired:
+            _remaining -= 1
+        if not ignore_abort and task_monitor.abort_requested():
+            _kill_hook(process)
+            process.communicate()
+            raise RestixException(E_BACKGROUND_TASK_ABORTED)
+        if _remaining <= 0:
+            _kill_hook(process)
+            _stdout, _stderr = process.communicate()
+            return _stdout, _stderr, True
+
+
+def _kill_hook(process: subprocess.Popen):
+    """
+    Beendet einen Hook mitsamt aller von ihm gestarteten Prozesse. Diese halten sonst die Pipes für die Ausgaben offen,
+    und das Auslesen der Ausgaben würde bis zu ihrem Ende blockieren.
+    :param process: laufender Hook
+    """
+    if not hasattr(os, 'killpg'):
+        process.kill()
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        # Hook und alle gestarteten Prozesse sind bereits beendet
+        pass
+
+
+def _abort_tolerant(log_function: Callable) -> Callable:
+    """
+    :param log_function: Funktion des TaskMonitors zur Ausgabe einer Nachricht
+    :returns: Funktion, die Nachrichten auch nach angefordertem Abbruch ohne Exception ausgibt
+    """
+    def _log(*args):
+        try:
+            log_function(*args)
+        except RestixException:
+            # der TaskMonitor meldet einen angeforderten Abbruch, der Hook wird trotzdem zu Ende geführt
+            pass
+    return _log
@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Auftrags-Warteschlange für die restix GUI.
+Ein Auftrag beschreibt eine restic-Aktion (Backup, Forget, Unlock, Init oder Restore) für ein Backup-Ziel. Die
+Warteschlange wird im restix-Datenverzeichnis gespeichert und übersteht damit einen Neustart der GUI.
+Passwörter werden nicht gespeichert.
+"""
+
+import os
+import re
+import tempfile
+import time
+import uuid
+
+from typing import Self
+
+import tomli
+import tomli_w
+
+from restix.core import *
+from restix.core.messages import E_JOB_QUEUE_READ_FAILED, E_JOB_QUEUE_WRITE_FAILED
+from restix.core.restix_exception import RestixException
+from restix.core.util import restix_data_path
+
+# Aktionen, die als Auftrag ausgeführt werden können
+JOB_ACTIONS = (ACTION_BACKUP, ACTION_FORGET, ACTION_UNLOCK, ACTION_INIT, ACTION_RESTORE)
+
+# Optionen, die nicht in der Datei gespeichert werden
+_TRANSIENT_OPTIONS = (OPTION_PASSWORD,)
+
+# Verarbeitete Datenmenge in einer restic-Statusmeldung, z.B. '[0:12] 45.23%  1234 files 1.234 GiB, total ...'
+_PROCESSED_BYTES_PATTERN = re.compile(r'%\s+.*?(\d+(\.\d+)?) (B|KiB|MiB|GiB|TiB)\b')
+_UNIT_FACTORS = {'B': 1, 'KiB': 1 << 10, 'MiB': 1 << 20, 'GiB': 1 << 30, 'TiB': 1 << 40}
+
+# Attribute eines Auftrags in der Datei
+_ATTR_ACTION = 'action'
+_ATTR_CREATED = 'created'
+_ATTR_FINISHED = 'finished'
+_ATTR_ID = 'id'
+_ATTR_JOBS = 'jobs'
+_ATTR_OPTIONS = 'options'
+_ATTR_STARTED = 'started'
+_ATTR_STATE = 'state'
+_ATTR_SUMMARY = 'summary'
+_ATTR_TARGET = 'target'
+
+
+class Job:
+    """
+    Auftrag in der Warteschlange.
+    """
+    def __init__(self, action_id: str, target_alias: str, options: dict | None = None):
+        """
+        Konstruktor.
+        :param action_id: ID der Aktion
+        :param target_alias: Aliasname des Backup-Ziels
+        :param options: Optionen für die Aktion
+        """
+        super().__init__()
+        self.__id = uuid.uuid4().hex
+        self.__action_id = action_id
+        self.__target_alias = target_alias
+        self.__options = {} if options is None else dict(options)
+        self.__state = JOB_STATE_PENDING
+        self.__created = time.time()
+        self.__started = None
+        self.__finished = None
+        self.__summary = ''
+        self.__status_text = ''
+        self.__processed_bytes = None
+
+    def job_id(self) -> str:
+        """
+        :returns: eindeutige ID des Auftrags
+        """
+        return self.__id
+
+    def action_id(self) -> str:
+        """
+        :returns: ID der Aktion
+        """
+        return self.__action_id
+
+    def target_alias(self) -> str:
+        """
+        :returns: Aliasname des Backup-Ziels
+        """
+        return self.__target_alias
+
+    def options(self) -> dict:
+        """
+        :returns: Optionen für die Aktion
+        """
+        return self.__options
+
+    def state(self) -> str:
+        """
+        :returns: Status des Auftrags
+        """
+        return self.__state
+
+    def summary(self) -> str:
+        """
+        :returns: Zusammenfassung des Ergebnisses; leer, solange der Auftrag nicht beendet ist
+        """
+        return self.__summary
+
+    def status_text(self) -> str:
+        """
+        :returns: letzte Statusmeldung von restic während der Ausführung
+        """
+        return self.__status_text
+
+    def is_finished(self) -> bool:
+        """
+        :returns: True, falls der Auftrag beendet oder abgebrochen ist
+        """
+        return self.__state in (JOB_STATE_SUCCEEDED, JOB_STATE_FAILED, JOB_STATE_CANCELLED)
+
+    def duration(self, now: float | None = None) -> float | None:
+        """
+        :param now: aktueller Zeitpunkt; bei None die Systemzeit
+        :returns: Laufzeit des Auftrags in Sekunden; None, falls er noch nicht gestartet wurde
+        """
+        if self.__started is None:
+            return None
+        _end = self.__finished
+        if _end is None:
+            _end = time.time() if now is None else now
+        return max(0.0, _end - self.__started)
+
+    def throughput(self, now: float | None = None) -> float | None:
+        """
+        :param now: aktueller Zeitpunkt; bei None die Systemzeit
+        :returns: durchschnittlich verarbeitete Bytes pro Sekunde; None, falls nicht bekannt
+        """
+        _duration = self.duration(now)
+        if self.__processed_bytes is None or _duration is None or _duration <= 0:
+            return None
+        return self.__processed_bytes / _duration
+
+    def mark_running(self):
+        """
+        Markiert den Auftrag als gestartet.
+        """
+        self.__state = JOB_STATE_RUNNING
+        self.__started = time.time()
+        self.__finished = None
+        self.__summary = ''
+        self.__status_text = ''
+        self.__processed_bytes = None
+
+    def mark_finished(self, state: str, summary: str):
+        """
+        Markiert den Auftrag als beendet.
+        :param state: Endstatus (erfolgreich, fehlgeschlagen oder abgebrochen)
+        :param summary: Zusammenfassung des Ergebnisses
+        """
+        self.__state = state
+        self.__finished = time.time()
+        self.__summary = summary
+
+    def update_status(self, status_text: str):
+        """
+        Übernimmt eine Statusmeldung von restic und ermittelt daraus die bisher verarbeitete Datenmenge.
+        :param status_text: Statusmeldung
+        """
+        self.__status_text = status_text
+        _processed_bytes = processed_bytes(status_text)
+        if _processed_bytes is not None:
+            self.__processed_bytes = _processed_bytes
+
+    def to_dict(self) -> dict:
+        """
+        :returns: Daten des Auftrags zur Speicherung in der Datei, ohne Passwörter
+        """
+        _data = {_ATTR_ID: self.__id, _ATTR_ACTION: self.__action_id, _ATTR_TARGET: self.__target_alias,
+                 _ATTR_STATE: self.__state, _ATTR_CREATED: self.__created, _ATTR_SUMMARY: self.__summary,
+                 _ATTR_OPTIONS: {_k: _v for _k, _v in self.__options.items()
+                                 if _k not in _TRANSIENT_OPTIONS and _v is not None}}
+        if self.__started is not None:
+            _data[_ATTR_STARTED] = self.__started
+        if self.__finished is not None:
+            _data[_ATTR_FINISHED] = self.__finished
+        return _data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Self:
+        """
+        Erzeugt einen Auftrag aus den Daten der Datei. Ein Auftrag, der beim Beenden der GUI noch lief, wird
+        wieder als wartend eingestuft.
+        :param data: Daten des Auftrags
+        :returns: Auftrag
+        :raises KeyError: falls Pflichtattribute fehlen
+        """
+        _job = Job(data[_ATTR_ACTION], data[_ATTR_TARGET], data.get(_ATTR_OPTIONS))
+        _job.__id = data[_ATTR_ID]
+        _job.__created = data.get(_ATTR_CREATED, _job.__created)
+        _job.__summary = data.get(_ATTR_SUMMARY, '')
+        _state = data.get(_ATTR_STATE, JOB_STATE_PENDING)
+        if _state in (JOB_STATE_PENDING, JOB_STATE_RUNNING):
+            return _job
+        _job.__state = _state
+        _job.__started = data.get(_ATTR_STARTED)
+        _job.__finished = data.get(_ATTR_FINISHED)
+        return _job
+
+
+class JobQueue:
+    """
+    Persistente Warteschlange der Aufträge.
+    """
+    def __init__(self, file_path: str | None = None):
+        """
+        Konstruktor.
+        :param file_path: Name der Datei für die Warteschlange; bei None die Standard-Datei im Daten-Verzeichnis
+        """
+        super().__init__()
+        self.__file_path = os.path.join(restix_data_path(), RESTIX_JOB_QUEUE_FN) if file_path is None \
+            else file_path
+        self.__jobs = []
+
+    def jobs(self) -> list[Job]:
+        """
+        :returns: alle Aufträge in der Reihenfolge, in der sie angelegt wurden
+        """
+        return self.__jobs
+
+    def job(self, job_id: str) -> Job | None:
+        """
+        :param job_id: ID des Auftrags
+        :returns: Auftrag mit der angegebenen ID; None, falls nicht vorhanden
+        """
+        for _job in self.__jobs:
+            if _job.job_id() == job_id:
+                return _job
+        return None
+
+    def add(self, job: Job):
+        """
+        Fügt einen Auftrag am Ende der Warteschlange an.
+        :param job: Auftrag
+        """
+        self.__jobs.append(job)
+
+    def remove(self, job_id: str) -> bool:
+        """
+        Entfernt einen Auftrag, der gerade nicht ausgeführt wird.
+        :param job_id: ID des Auftrags
+        :returns: True, falls der Auftrag entfernt wurde
+        """
+        _job = self.job(job_id)
+        if _job is None or _job.state() == JOB_STATE_RUNNING:
+            return False
+        self.__jobs.remove(_job)
+        return True
+
+    def remove_finished(self):
+        """
+        Entfernt alle beendeten Aufträge.
+        """
+        self.__jobs = [_job for _job in self.__jobs if not _job.is_finished()]
+
+    def running_jobs(self) -> list[Job]:
+        """
+        :returns: alle laufenden Aufträge
+        """
+        return [_job for _job in self.__jobs if _job.state() == JOB_STATE_RUNNING]
+
+    def next_pending_job(self) -> Job | None:
+        """
+        Ermittelt den nächsten auszuführenden Auftrag. Aufträge für Backup-Ziele, für die bereits ein Auftrag läuft,
+        werden übersprungen, da restic ein Repository nicht gleichzeitig bearbeiten kann.
+        :returns: ältester wartender Auftrag für ein freies Backup-Ziel; None, falls es keinen gibt
+        """
+        _busy_targets = {_job.target_alias() for _job in self.running_jobs()}
+        for _job in self.__jobs:
+            if _job.state() == JOB_STATE_PENDING and _job.target_alias() not in _busy_targets:
+                return _job
+        return None
+
+    def save(self):
+        """
+        Speichert die Warteschlange.
+        :raises RestixException: falls die Datei nicht geschrieben werden kann
+        """
+        _data = {_ATTR_JOBS: [_job.to_dict() for _job in self.__jobs]}
+        try:
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(self.__file_path),
+                                             delete=False) as _f:
+                _f.write(tomli_w.dumps(_data))
+            os.replace(_f.name, self.__file_path)
+        except (OSError, TypeError, ValueError) as _e:
+            raise RestixException(E_JOB_QUEUE_WRITE_FAILED, self.__file_path, str(_e))
+
+    @classmethod
+    def from_file(cls, file_path: str | None = None) -> Self:
+        """
+        Liest die Warteschlange aus der Datei. Existiert die Datei nicht, ist die Warteschlange leer.
+        :param file_path: Name der Datei; bei None die Standard-Datei im Daten-Verzeichnis
+        :returns: Warteschlange
+        :raises RestixException: falls die Datei nicht gelesen werden kann
+        """
+        _queue = JobQueue(file_path)
+        try:
+            with open(_queue.__file_path, 'rb') as _f:
+                _data = tomli.load(_f)
+            for _job_data in _data.get(_ATTR_JOBS, []):
+                _queue.add(Job.from_dict(_job_data))
+        except FileNotFoundError:
+            pass
+        except (OSError, KeyError, TypeError, tomli.TOMLDecodeError) as _e:
+            raise RestixException(E_JOB_QUEUE_READ_FAILED, _queue.__file_path, str(_e))
+        return _queue
+
+
+def processed_bytes(status_text: str) -> int | None:
+    """
+    :param status_text: Statusmeldung von restic
+    :returns: bisher verarbeitete Datenmenge in Bytes; None, falls die Meldung keine Datenmenge enthält
+    """
+    _match = _PROCESSED_BYTES_PATTERN.search(status_text)
+    if _match is None:
+        return None
+    return int(float(_match.group(1)) * _UNIT_FACTORS[_match.group(3)])
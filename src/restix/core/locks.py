@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Auswertung der Sperren in einem restic-Repository.
+restic legt für jeden Befehl eine Sperre im Repository an. Stürzt ein restic-Prozess ab oder wird der Rechner
+ausgeschaltet, bleibt die Sperre bestehen und nachfolgende Befehle schlagen fehl. Eine Sperre gilt wie bei restic als
+veraltet, wenn sie länger nicht aktualisiert wurde oder wenn der Prozess auf dem eigenen Rechner nicht mehr existiert.
+"""
+
+import datetime
+import json
+import os
+import platform
+
+
+# Attribute einer Sperre in der Ausgabe von restic cat lock
+_ATTR_EXCLUSIVE = 'exclusive'
+_ATTR_HOSTNAME = 'hostname'
+_ATTR_PID = 'pid'
+_ATTR_TIME = 'time'
+_ATTR_USERNAME = 'username'
+
+# Alter in Sekunden, ab dem eine Sperre als veraltet gilt. restic aktualisiert aktive Sperren alle 5 Minuten und
+# betrachtet Sperren nach 30 Minuten ohne Aktualisierung als veraltet.
+STALE_LOCK_AGE = 30 * 60
+
+# Maximale Wartezeit in Minuten auf die Freigabe aktiver Sperren anderer Prozesse
+DEFAULT_LOCK_WAIT = 30
+
+# Erste und maximale Pause in Sekunden zwischen zwei Prüfungen beim Warten auf die Freigabe von Sperren
+LOCK_WAIT_INITIAL_DELAY = 10
+LOCK_WAIT_MAX_DELAY = 300
+
+
+class RepositoryLock:
+    """
+    Sperre in einem restic-Repository.
+    """
+    def __init__(self, lock_id: str, data: dict):
+        """
+        Konstruktor.
+        :param lock_id: ID der Sperre
+        :param data: Daten der Sperre aus der Ausgabe von restic cat lock
+        """
+        super().__init__()
+        self.__lock_id = lock_id
+        self.__data = data
+
+    def lock_id(self) -> str:
+        """
+        :returns: ID der Sperre
+        """
+        return self.__lock_id
+
+    def exclusive(self) -> bool:
+        """
+        :returns: True, falls es sich um eine exklusive Sperre handelt
+        """
+        return self.__data.get(_ATTR_EXCLUSIVE) is True
+
+    def hostname(self) -> str:
+        """
+        :returns: Name des Rechners, auf dem die Sperre angelegt wurde
+        """
+        return self.__data.get(_ATTR_HOSTNAME, '')
+
+    def username(self) -> str:
+        """
+        :returns: Name des Benutzers, der die Sperre angelegt hat
+        """
+        return self.__data.get(_ATTR_USERNAME, '')
+
+    def pid(self) -> int:
+        """
+        :returns: ID des restic-Prozesses, der die Sperre angelegt hat
+        """
+        return self.__data.get(_ATTR_PID, 0)
+
+    def time(self) -> datetime.datetime | None:
+        """
+        :returns: Zeitpunkt, an dem die Sperre angelegt oder zuletzt aktualisiert wurde; None, falls unbekannt
+        """
+        try:
+            return datetime.datetime.fromisoformat(self.__data[_ATTR_TIME])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def age(self, now: datetime.datetime | None = None) -> float | None:
+        """
+        :param now: Vergleichszeitpunkt; bei None der aktuelle Zeitpunkt
+        :returns: Alter der Sperre in Sekunden; None, falls unbekannt
+        """
+        _time = self.time()
+        if _time is None:
+            return None
+        if now is None:
+            now = datetime.datetime.now(datetime.timezone.utc)
+        return (now - _time).total_seconds()
+
+    def is_stale(self, now: datetime.datetime | None = None, hostname: str | None = None) -> bool:
+        """
+        :param now: Vergleichszeitpunkt; bei None der aktuelle Zeitpunkt
+        :param hostname: Name des eigenen Rechners; bei None wird er ermittelt
+        :returns: True, falls die Sperre zu alt ist oder der Prozess auf dem eigenen Rechner nicht mehr existiert
+        """
+        _age = self.age(now)
+        if _age is not None and _age > STALE_LOCK_AGE:
+            return True
+        if hostname is None:
+            hostname = platform.node()
+        if self.hostname() != hostname or self.pid() <= 0:
+            return False
+        return not _process_exists(self.pid())
+
+    def conflicts_with(self, exclusive: bool) -> bool:
+        """
+        :param exclusive: zeigt an, ob der geplante Befehl eine exklusive Sperre benötigt
+        :returns: True, falls der geplante Befehl wegen dieser Sperre nicht ausgeführt werden kann
+        """
+        return exclusive or self.exclusive()
+
+    @classmethod
+    def from_restic_output(cls, lock_id: str, output: str):
+        """
+        :param lock_id: ID der Sperre
+        :param output: Ausgabe von restic cat lock
+        :returns: Sperre; None, falls die Ausgabe nicht ausgewertet werden kann
+        """
+        try:
+            _data = json.loads(output)
+        except ValueError:
+            return None
+        return RepositoryLock(lock_id, _data) if isinstance(_data, dict) else None
+
+
+def lock_ids(output: str) -> list[str]:
+    """
+    :param output: Ausgabe von restic list locks
+    :returns: IDs der Sperren im Repository
+    """
+    return [_line.strip() for _line in output.splitlines() if len(_line.strip()) > 0]
+
+
+def _process_exists(pid: int) -> bool:
+    """
+    :param pid: Prozess-ID
+    :returns: True, falls auf diesem Rechner ein Prozess mit der angegebenen ID existiert
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Prozess existiert, gehört aber einem anderen Benutzer
+        return True
+    return True
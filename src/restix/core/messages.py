@@ -34,19 +34,27 @@
 
 """
 Lokalisierte Nachrichten.
+Die Textdateien mit den Nachrichten werden beim ersten Lesen in eine Cache-Datei im restix-Cache-Verzeichnis
+übersetzt. Die Cache-Datei ist über Änderungszeit, Größe und Hashwert an die Textdatei gebunden.
 """
 
 import os
+import string
+import zlib
 
 from typing import Self
 
-from restix.core.util import platform_locale
+from restix.core.util import platform_locale, read_cache_file, write_cache_file
 
 
 # Allgemeine Nachrichten
 E_ALIAS_NAME_ALREADY_USED = 'e-alias-name-already-used'
 E_ALIAS_NAME_EMPTY = 'e-alias-name-empty'
 E_ALIAS_REFERENCED = 'e-alias-referenced'
+E_BACKUP_HISTORY_READ_FAILED = 'e-backup-history-read-failed'
+E_HOOK_FAILED = 'e-hook-failed'
+E_HOOK_TIMED_OUT = 'e-hook-timed-out'
+E_REPO_APPEND_ONLY = 'e-repo-append-only'
 E_RESTIX_TARGET_NOT_DEFINED = 'e-restix-target-not-defined'
 E_RESTIX_VAR_NOT_DEFINED = 'e-restix-var-not-defined'
 E_BACKGROUND_TASK_ABORTED = 'e-background-task-aborted'
@@ -66,6 +74,8 @@ E_INVALID_HOSTNAME = 'e-invalid-hostname'
 E_INVALID_OPTION = 'e-invalid-option'
 E_INVALID_SNAPSHOT_ID = 'e-invalid-snapshot-id'
 E_INVALID_YEAR = 'e-invalid-year'
+E_JOB_QUEUE_READ_FAILED = 'e-job-queue-read-failed'
+E_JOB_QUEUE_WRITE_FAILED = 'e-job-queue-write-failed'
 E_MANDATORY_OPTION_MISSING = 'e-mandatory-option-missing'
 E_NO_PASSWORD_NOT_SUPPORTED = 'e-no-password-not-supported'
 E_NO_SNAPSHOT_DESC_FROM_RESTIC = 'e-no-snapshot-desc-from-restic'
@@ -76,13 +86,45 @@ E_RESTIC_VERSION_NOT_RECOGNIZED = 'e-restic-version-not-recognized'
 E_RESTORE_DRY_RUN_NOT_SUPPORTED = 'e-restore-dry-run-not-supported'
 E_RESTORE_INCLUDE_NOT_SUPPORTED = 'e-restore-include-not-supported'
 E_RESTORE_NOTHING_SELECTED = 'e-restore-nothing-selected'
+E_SECRET_DECRYPTION_FAILED = 'e-secret-decryption-failed'
+E_SECRET_NOT_AVAILABLE = 'e-secret-not-available'
+E_STDIN_COMMAND_FAILED = 'e-stdin-command-failed'
 E_UNSUPPORTED_RESTIC_VERSION = 'e-unsupported-restic-version'
+E_WATCH_FAILED = 'e-watch-failed'
+E_WATCH_NOT_SUPPORTED = 'e-watch-not-supported'
+E_WATCH_NO_INCLUDES = 'e-watch-no-includes'
 E_WRITE_FILE_FAILED = 'e-write-file-failed'
+I_BACKUP_PAUSED = 'i-backup-paused'
+I_BACKUP_RESUMED = 'i-backup-resumed'
+I_BACKUP_SKIPPED_UNCHANGED = 'i-backup-skipped-unchanged'
+I_BACKUP_SUMMARY = 'i-backup-summary'
 I_DRY_RUN_CREATE_REPO = 'i-dry-run-create-repo'
+I_DRY_RUN_HOOK = 'i-dry-run-hook'
+I_DRY_RUN_STDIN_COMMAND = 'i-dry-run-stdin-command'
 I_OVERWRITE_FILE = 'i-overwrite-file'
+I_REPO_STALE_LOCKS_REMOVED = 'i-repo-stale-locks-removed'
+I_RESTIC_RETRY_SUCCEEDED = 'i-restic-retry-succeeded'
+I_RUNNING_HOOK = 'i-running-hook'
 I_RUNNING_RESTIC_CMD = 'i-running-restic-cmd'
+I_WAITING_FOR_REPO_LOCK = 'i-waiting-for-repo-lock'
+I_WATCH_CHANGES_DETECTED = 'i-watch-changes-detected'
+I_WATCH_STARTED = 'i-watch-started'
+I_WATCH_STOPPED = 'i-watch-stopped'
 W_AUTO_CREATE_NOT_SUPPORTED = 'w-auto-create-not-supported'
+W_BACKUP_DATA_ADDED_INCREASED = 'w-backup-data-added-increased'
+W_BACKUP_DURATION_INCREASED = 'w-backup-duration-increased'
+W_BACKUP_HISTORY_NOT_SAVED = 'w-backup-history-not-saved'
+W_BACKUP_PAUSE_LIMIT_REACHED = 'w-backup-pause-limit-reached'
+W_BACKUP_THROUGHPUT_DROPPED = 'w-backup-throughput-dropped'
 W_CANT_DRY_RUN_BACKUP_WITHOUT_REPO = 'w-cant-dry-run-backup-without-repo'
+W_METRICS_NOT_WRITTEN = 'w-metrics-not-written'
+W_REPO_LOCK_WAIT_EXPIRED = 'w-repo-lock-wait-expired'
+W_REPO_STALE_LOCKS_FOUND = 'w-repo-stale-locks-found'
+W_REPO_STALE_LOCKS_NOT_REMOVED = 'w-repo-stale-locks-not-removed'
+W_RESTIC_ATTEMPT_FAILED = 'w-restic-attempt-failed'
+W_SCOPE_FINGERPRINT_FAILED = 'w-scope-fingerprint-failed'
+W_SCOPE_FINGERPRINT_NOT_SAVED = 'w-scope-fingerprint-not-saved'
+W_WATCH_LIMIT_REACHED = 'w-watch-limit-reached'
 
 # Fehlermeldungen zur Konfiguration
 E_CFG_CONFIG_FILE_NOT_FOUND = 'e-cfg-config-file-not-found'
@@ -104,6 +146,9 @@ E_CFG_READ_FILE_FAILED = 'e-cfg-read-file-failed'
 W_CFG_ELEM_IGNORED = 'w-cfg-elem-ignored'
 
 # CLI texts
+T_CLI_BACKUP_HISTORY_EMPTY = 't-cli-backup-history-empty'
+T_CLI_BACKUP_HISTORY_HEADER = 't-cli-backup-history-header'
+T_CLI_BACKUP_HISTORY_INFO = 't-cli-backup-history-info'
 T_CLI_BACKUP_TARGETS_HEADER = 't-cli-backup-targets-header'
 T_CLI_BACKUP_TARGET_INFO = 't-cli-backup-target-info'
 T_CLI_CONFIRM_BACKUP = 't-cli-confirm-backup'
@@ -112,6 +157,7 @@ T_CLI_CONFIRM_INIT = 't-cli-confirm-init'
 T_CLI_CONFIRM_RESTORE = 't-cli-confirm-restore'
 T_CLI_CONFIRM_UNLOCK = 't-cli-confirm-unlock'
 T_CLI_ENTER_PASSWORD = 't-cli-enter-password'
+T_CLI_HELP_HISTORY = 't-cli-help-history'
 T_CLI_PROMPT_FOR_CONFIRMATION = 't-cli-prompt-for-confirmation'
 T_CLI_HELP_BACKUP = 't-cli-help-backup'
 T_CLI_HELP_CLEANUP = 't-cli-help-cleanup'
@@ -121,15 +167,18 @@ T_CLI_HELP_LS = 't-cli-help-ls'
 T_CLI_HELP_RESTORE = 't-cli-help-restore'
 T_CLI_HELP_SHAPSHOTS = 't-cli-help-snapshots'
 T_CLI_HELP_UNLOCK = 't-cli-help-unlock'
+T_CLI_HELP_WATCH = 't-cli-help-watch'
 T_CLI_RESTIX_VERSION = 't-cli-restix-version'
 T_CLI_USAGE_INFO = 't-cli-usage-info'
 T_CLI_YES_CHAR = 't-cli-yes-char'
 
 # CLI messages
+E_CLI_BATCH_REQUIRED = 'e-cli-batch-required'
 E_CLI_COMMAND_MISSING = 'e-cli-command-missing'
 E_CLI_DUP_OPTION = 'e-cli-dup-option'
 E_CLI_INVALID_COMMAND = 'e-cli-invalid-command'
 E_CLI_INVALID_OPTION = 'e-cli-invalid-option'
+E_CLI_INVALID_OUTPUT_FORMAT = 'e-cli-invalid-output-format'
 E_CLI_INVALID_PATH_SPEC = 'e-cli-invalid-path-spec'
 E_CLI_INVALID_TARGET = 'e-cli-invalid-target'
 E_CLI_NON_EXISTING_PATH = 'e-cli-non-existing-path'
@@ -231,6 +280,7 @@ L_WIZ_PAGE_TITLE_CREATE_CONFIG_5 = 'l-wiz-page-title-create-config-5'
 L_WIZ_TITLE_CREATE_CONFIG = 'l-wiz-title-create-config'
 
 # GUI labels
+L_ACTION = 'l-action'
 L_ADD = 'l-add'
 L_ADOPT_SELECTION = 'l-adopt-selection'
 L_ALIAS = 'l-alias'
@@ -238,6 +288,7 @@ L_ASCII_ARMOR = 'l-ascii-armor'
 L_AUTO_CREATE = 'l-auto-create'
 L_BACKUP = 'l-backup'
 L_CANCEL = 'l-cancel'
+L_CANCEL_JOB = 'l-cancel-job'
 L_COMMENT = 'l-comment'
 L_CONFIGURATION = 'l-configuration'
 L_CREATE_ENCRYPTED_FILE = 'l-create-encrypted-file'
@@ -251,6 +302,7 @@ L_DO_RESTORE = 'l-do-restore'
 L_DO_UNLOCK_REPO = 'l-do-unlock-repo'
 L_DO_YEAR_END = 'l-do-year-end'
 L_DRY_RUN = 'l-dry-run'
+L_DURATION = 'l-duration'
 L_EDIT = 'l-edit'
 L_ELEMENT = 'l-element'
 L_EMAIL = 'l-email'
@@ -262,6 +314,12 @@ L_FULL = 'l-full'
 L_HOST = 'l-host'
 L_IGNORES = 'l-ignores'
 L_INFO = 'l-info'
+L_JOBS = 'l-jobs'
+L_JOB_STATE_CANCELLED = 'l-job-state-cancelled'
+L_JOB_STATE_FAILED = 'l-job-state-failed'
+L_JOB_STATE_PENDING = 'l-job-state-pending'
+L_JOB_STATE_RUNNING = 'l-job-state-running'
+L_JOB_STATE_SUCCEEDED = 'l-job-state-succeeded'
 L_LIBRARIES = 'l-libraries'
 L_LICENSE = 'l-license'
 L_LOCAL_TARGET = 'l-local-target'
@@ -269,9 +327,15 @@ L_LOCATION = 'l-location'
 L_MAINTENANCE = 'l-maintenance'
 L_NEW = 'l-new'
 L_NEW_ALIAS = 'l-new-alias'
+L_NEW_JOB = 'l-new-job'
 L_OK = 'l-ok'
 L_OPTIONS = 'l-options'
+L_PARALLEL_JOBS = 'l-parallel-jobs'
 L_PASSWORD = 'l-password'
+L_PROGRESS = 'l-progress'
+L_QUEUE = 'l-queue'
+L_REMOVE_FINISHED_JOBS = 'l-remove-finished-jobs'
+L_REMOVE_JOB = 'l-remove-job'
 L_RENAME = 'l-rename'
 L_RESTIX = 'l-restix'
 L_RESTORE = 'l-restore'
@@ -285,10 +349,17 @@ L_SEARCH = 'l-search'
 L_SELECT = 'l-select'
 L_SELECT_ELEMENTS = 'l-select-elements'
 L_SHOW_ALL_ELEMENTS = 'l-show-all-elements'
+L_SHOW_ALL_MESSAGES = 'l-show-all-messages'
+L_SHOW_ERRORS_ONLY = 'l-show-errors-only'
+L_SHOW_WARNINGS_AND_ERRORS = 'l-show-warnings-and-errors'
 L_SNAPSHOT = 'l-snapshot'
 L_SOME = 'l-some'
+L_START_QUEUE = 'l-start-queue'
+L_STATE = 'l-state'
+L_STOP_QUEUE = 'l-stop-queue'
 L_TARGET = 'l-target'
 L_TARGETS = 'l-targets'
+L_THROUGHPUT = 'l-throughput'
 L_TYPE = 'l-type'
 L_UPDATE = 'l-update'
 L_YEAR = 'l-year'
@@ -323,6 +394,17 @@ T_DO_BAK_BACKUP = 't-do-bak-backup'
 T_DO_MNT_INIT_REPO = 't-do-mnt-init-repo'
 T_DO_MNT_UNLOCK_REPO = 't-do-mnt-unlock-repo'
 T_DO_MNT_YEAR_END = 't-do-mnt-year-end'
+T_JOB_ACTION = 't-job-action'
+T_JOB_ADD = 't-job-add'
+T_JOB_CANCEL = 't-job-cancel'
+T_JOB_DRY_RUN = 't-job-dry-run'
+T_JOB_PARALLELISM = 't-job-parallelism'
+T_JOB_REMOVE = 't-job-remove'
+T_JOB_REMOVE_FINISHED = 't-job-remove-finished'
+T_JOB_RESTORE_PATH = 't-job-restore-path'
+T_JOB_TARGET = 't-job-target'
+T_JOB_TOGGLE_QUEUE = 't-job-toggle-queue'
+T_MESSAGE_FILTER = 't-message-filter'
 T_RST_DO_RESTORE = 't-do-rst-restore'
 T_OPT_BAK_AUTO_CREATE = 't-opt-bak-auto-create'
 T_OPT_BAK_DRY_RUN = 't-opt-bak-dry-run'
@@ -349,6 +431,8 @@ W_GUI_WRITE_GUI_SETTINGS_FAILED = 'w-gui-write-gui-settings-failed'
 
 # intern
 _MSG_FILE_NAME_FMT = 'messages_{0}.txt'
+_MSG_CACHE_FILE_NAME_FMT = 'messages_{0}_{1:08x}.cache'
+_MSG_CACHE_FORMAT = 1
 _DEFAULT_LOCALE = 'en'
 _EMSG_INST_CORRUPT = 'restix installation is corrupt: {0}'
 _EMSG_NO_MSG_FILE_FOUND = 'Could not find localized message definition files'
@@ -365,8 +449,7 @@ def localized_message(msg_id: str, *args) -> str:
     :param args: Argumente für die Nachricht
     :returns: lokalisierte Nachricht für angegebene Message-ID und Argumente
     """
-    global _MESSAGE_TABLE
-    return _MESSAGE_TABLE.message_for(msg_id, *args)
+    return _message_table().message_for(msg_id, *args)
 
 
 def localized_label(label_id: str) -> str:
@@ -374,8 +457,18 @@ def localized_label(label_id: str) -> str:
     :param label_id: Resource-ID des Labels
     :returns: lokalisierter Label für ein GUI-Element
     """
+    return _message_table().label_for(label_id)
+
+
+def _message_table() -> 'MessageTable':
+    """
+    Die Tabelle wird erst beim ersten Zugriff gelesen, damit Importe des Moduls ohne Ausgabe von Texten billig bleiben.
+    :returns: Tabelle mit allen lokalisierten Nachrichten für die lokale Plattform
+    """
     global _MESSAGE_TABLE
-    return _MESSAGE_TABLE.label_for(label_id)
+    if _MESSAGE_TABLE is None:
+        _MESSAGE_TABLE = MessageTable.for_locale(platform_locale())
+    return _MESSAGE_TABLE
 
 
 class MessageTable(dict):
@@ -384,6 +477,8 @@ class MessageTable(dict):
     Jede Nachricht muss in einer eigenen Zeile definiert werden, beginnend mit der Message ID, gefolgt von einem
     Leerzeichen und dem Format-String der Nachricht. Durch Backslash am Zeilenende kann sich der Format-String
     über mehrere Zeilen erstrecken. Zeilen, die mit einem #-Zeichen beginnen werden ignoriert.
+    Beim Erzeugen werden Zeilenumbrüche (\\n) ersetzt und die Format-Strings geprüft, damit eine Abfrage nur noch
+    einen Zugriff auf das Dictionary erfordert.
     """
     def __init__(self, messages: str):
         """
@@ -391,6 +486,8 @@ class MessageTable(dict):
         :param messages: lokalisierte Nachrichten
         """
         super().__init__()
+        self.__arg_counts = {}
+        self.__invalid_formats = set()
         msg_id = None
         msg_text = ''
         msg_list = messages.split(os.linesep)
@@ -419,6 +516,7 @@ class MessageTable(dict):
             self.update({msg_id: msg_text})
             msg_id = None
             msg_text = ''
+        self._compile()
 
     def message_for(self, msg_id: str, *args) -> str:
         """
@@ -431,9 +529,14 @@ class MessageTable(dict):
         :returns: lokalisierte Nachricht für angegebene Message-ID und Argumente
         """
         _fmt_str = self.get(msg_id)
-        if _fmt_str is None:
+        if _fmt_str is None or msg_id in self.__invalid_formats:
+            return msg_id
+        _arg_count = self.__arg_counts.get(msg_id)
+        if _arg_count is None:
+            # Nachricht ohne geschweifte Klammern, Formatierung ist überflüssig
+            return _fmt_str
+        if len(args) < _arg_count:
             return msg_id
-        _fmt_str = _fmt_str.replace(r'\n', os.linesep)
         try:
             return _fmt_str.format(*args)
         except (KeyError, IndexError, ValueError):
@@ -447,6 +550,67 @@ class MessageTable(dict):
         _label = self.get(label_id)
         return label_id if _label is None else _label
 
+    def compiled(self) -> tuple[dict, dict, tuple]:
+        """
+        :returns: Inhalt der Tabelle in einer mit marshal speicherbaren Form
+        """
+        return dict(self), self.__arg_counts, tuple(self.__invalid_formats)
+
+    def _compile(self):
+        """
+        Ersetzt Zeilenumbrüche in allen Nachrichten und ermittelt für jeden Format-String die Anzahl benötigter
+        Argumente. Format-Strings mit Syntaxfehlern oder benannten Platzhaltern werden als ungültig markiert.
+        """
+        for _msg_id, _text in self.items():
+            self[_msg_id] = _text.replace(r'\n', os.linesep)
+        for _msg_id, _text in self.items():
+            if '{' not in _text and '}' not in _text:
+                continue
+            try:
+                self.__arg_counts[_msg_id] = _required_arg_count(_text)
+            except ValueError:
+                self.__invalid_formats.add(_msg_id)
+
+    @classmethod
+    def from_compiled(cls: Self, compiled: tuple[dict, dict, tuple]) -> Self:
+        """
+        :param compiled: Inhalt einer Tabelle, wie er von Methode compiled geliefert wird
+        :returns: Tabelle mit den übergebenen Nachrichten
+        """
+        _texts, _arg_counts, _invalid_formats = compiled
+        _table = MessageTable('')
+        _table.update(_texts)
+        _table.__arg_counts.update(_arg_counts)
+        _table.__invalid_formats.update(_invalid_formats)
+        return _table
+
+    @classmethod
+    def from_catalog(cls: Self, file_path: str, locale: str) -> Self:
+        """
+        Liest die Nachrichten aus der Cache-Datei, falls diese zur Textdatei passt. Ansonsten wird die Textdatei
+        verarbeitet und die Cache-Datei neu geschrieben. Fehler beim Zugriff auf die Cache-Datei werden ignoriert.
+        :param file_path: Name der Textdatei mit den Nachrichten inklusive Pfad
+        :param locale: locale-Code der Sprache (z.B. 'en')
+        :returns: Tabelle mit den Nachrichten aus der Datei
+        :raises IOError: falls die Textdatei nicht gelesen werden kann
+        """
+        _stat = os.stat(file_path)
+        _file_key = (_stat.st_mtime_ns, _stat.st_size)
+        _cache_file_name = _catalog_cache_file_name(file_path, locale)
+        _cached = _read_catalog_cache(_cache_file_name)
+        if _cached is not None and _cached[0] == _file_key:
+            return MessageTable.from_compiled(_cached[2])
+        with open(file_path, mode='r', newline=os.linesep, encoding='utf-8') as _f:
+            _msgs = _f.read()
+        _hash = zlib.crc32(_msgs.encode('utf-8'))
+        if _cached is not None and _cached[1] == _hash:
+            # nur die Änderungszeit hat sich geändert, z.B. nach Neuinstallation
+            _table = MessageTable.from_compiled(_cached[2])
+        else:
+            _table = MessageTable(_msgs)
+        write_cache_file(_cache_file_name, (_MSG_CACHE_FORMAT, _file_key, _hash, _table.compiled()))
+        return _table
+
     @classmethod
     def for_locale(cls, locale: str | None) -> Self:
         """
@@ -464,13 +628,54 @@ class MessageTable(dict):
         if not os.path.isfile(_msgs_file_path):
             raise RuntimeError(_EMSG_INST_CORRUPT.format(_EMSG_NO_MSG_FILE_FOUND))
         try:
-            with open(_msgs_file_path, mode='r', newline=os.linesep, encoding='utf-8') as _f:
-                _msgs = _f.read()
-            return MessageTable(_msgs)
+            return MessageTable.from_catalog(_msgs_file_path, _locale)
         except IOError as e:
             _cause = _EMSG_READ_MSG_FILE_FAILED.format(_msgs_file_path, str(e))
             raise RuntimeError(_EMSG_INST_CORRUPT.format(_cause))
 
 
-# Tabelle mit allen lokalisierten Nachrichten für die lokale Plattform
-_MESSAGE_TABLE = MessageTable.for_locale(platform_locale())
+def _required_arg_count(format_str: str) -> int:
+    """
+    :param format_str: Format-String einer Nachricht
+    :returns: Anzahl der Argumente, die zum Formatieren der Nachricht mindestens nötig sind
+    :raises ValueError: falls der Format-String nicht mit Positions-Argumenten formatiert werden kann
+    """
+    _arg_count = 0
+    _auto_index = 0
+    for _literal, _field_name, _format_spec, _conversion in string.Formatter().parse(format_str):
+        if _field_name is None:
+            continue
+        _arg_name = _field_name.split('.')[0].split('[')[0]
+        if len(_arg_name) == 0:
+            _auto_index += 1
+            _arg_count = max(_arg_count, _auto_index)
+        elif _arg_name.isdigit():
+            _arg_count = max(_arg_count, int(_arg_name) + 1)
+        else:
+            raise ValueError(_arg_name)
+    return _arg_count
+
+
+def _catalog_cache_file_name(file_path: str, locale: str) -> str:
+    """
+    :param file_path: Name der Textdatei mit den Nachrichten inklusive Pfad
+    :param locale: locale-Code der Sprache
+    :returns: Name der Cache-Datei ohne Pfad
+    """
+    return _MSG_CACHE_FILE_NAME_FMT.format(locale, zlib.crc32(os.path.abspath(file_path).encode('utf-8')))
+
+
+def _read_catalog_cache(cache_file_name: str) -> tuple | None:
+    """
+    :param cache_file_name: Name der Cache-Datei ohne Pfad
+    :returns: Schlüssel der Textdatei, Hashwert der Textdatei und Inhalt der Tabelle;
+              None, falls die Cache-Datei nicht existiert oder nicht verwendbar ist
+    """
+    _cached = read_cache_file(cache_file_name)
+    if not isinstance(_cached, tuple) or len(_cached) != 4 or _cached[0] != _MSG_CACHE_FORMAT:
+        return None
+    return tuple(_cached[1]), _cached[2], _cached[3]
+
+
+# Tabelle mit allen lokalisierten Nachrichten für die lokale Plattform, wird beim ersten Zugriff gelesen
+_MESSAGE_TABLE = None
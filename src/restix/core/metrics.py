@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Export von Kennzahlen der restix-Aktionen für den Textfile-Collector des Prometheus node_exporter.
+Je Backup-Ziel wird eine Datei restix_<Backup-Ziel>.prom geschrieben, die Kennzahlen sind nach Host und Jahr
+unterschieden. Bei jeder Aktion werden nur die betroffenen Kennzahlen aktualisiert, alle anderen bleiben erhalten.
+"""
+
+import os
+import re
+import time
+
+from restix.core import OPTION_HOST, OPTION_YEAR
+from restix.core.action import RestixAction
+
+
+# Kennzahlen mit Beschreibung
+METRIC_BACKUP_DATA_ADDED = 'restix_backup_data_added_bytes'
+METRIC_BACKUP_DURATION = 'restix_backup_duration_seconds'
+METRIC_BACKUP_FILES_PROCESSED = 'restix_backup_files_processed'
+METRIC_LAST_SUCCESS = 'restix_last_success_timestamp_seconds'
+METRIC_RESTIC_CHECK_OK = 'restix_restic_check_ok'
+METRIC_RESTIC_EXIT_CODE = 'restix_restic_exit_code'
+METRIC_SNAPSHOTS = 'restix_snapshots'
+_METRIC_HELP = {METRIC_BACKUP_DATA_ADDED: 'Data added to the repository by the last backup.',
+                METRIC_BACKUP_DURATION: 'Duration of the last backup.',
+                METRIC_BACKUP_FILES_PROCESSED: 'Files processed by the last backup.',
+                METRIC_LAST_SUCCESS: 'Time of the last successful action.',
+                METRIC_RESTIC_CHECK_OK: 'Whether the installed restic version supports the last action.',
+                METRIC_RESTIC_EXIT_CODE: 'Return code of the last restic command.',
+                METRIC_SNAPSHOTS: 'Number of snapshots in the repository.'}
+
+# Kennzahlen, die zusätzlich nach Aktion unterschieden werden
+_ACTION_METRICS = {METRIC_LAST_SUCCESS, METRIC_RESTIC_EXIT_CODE}
+
+# Zeile einer Kennzahl in der Datei, z.B. 'restix_snapshots{target="srv",host="pc",year="2025"} 12'
+_METRIC_LINE_PATTERN = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{.*})?\s+(\S+)$')
+
+# Zeichen, die in Dateinamen durch einen Unterstrich ersetzt werden
+_UNSAFE_FILE_NAME_CHARS = re.compile(r'[^a-zA-Z0-9_.-]')
+
+
+class MetricsExporter:
+    """
+    Schreibt Kennzahlen in Dateien für den Textfile-Collector.
+    """
+    def __init__(self, dir_path: str):
+        """
+        Konstruktor.
+        :param dir_path: Verzeichnis des Textfile-Collectors
+        """
+        super().__init__()
+        self.__dir_path = dir_path
+
+    def update(self, target_alias: str, labels: dict[str, str], values: dict[str, float], action_id: str):
+        """
+        Aktualisiert Kennzahlen eines Backup-Ziels.
+        Die Datei wird atomar ersetzt, damit der node_exporter nie eine unvollständige Datei liest.
+        :param target_alias: Aliasname des Backup-Ziels
+        :param labels: Labels der Kennzahlen, z.B. Host und Jahr
+        :param values: neue Werte, nach Name der Kennzahl
+        :param action_id: ID der ausgeführten Aktion, wird bei Kennzahlen je Aktion als Label verwendet
+        :raises OSError: falls die Datei nicht geschrieben werden kann
+        """
+        _file_path = os.path.join(self.__dir_path, f'restix_{_UNSAFE_FILE_NAME_CHARS.sub("_", target_alias)}.prom')
+        _metrics = _read_metrics(_file_path)
+        _labels = _format_labels({'target': target_alias, **labels})
+        _action_labels = _format_labels({'target': target_alias, **labels, 'action': action_id})
+        for _name, _value in values.items():
+            _metrics[(_name, _action_labels if _name in _ACTION_METRICS else _labels)] = _format_value(_value)
+        _lines = []
+        _current_name = None
+        for (_name, _labels), _value in sorted(_metrics.items()):
+            if _name != _current_name:
+                _current_name = _name
+                if _name in _METRIC_HELP:
+                    _lines.append(f'# HELP {_name} {_METRIC_HELP[_name]}')
+                _lines.append(f'# TYPE {_name} gauge')
+            _lines.append(f'{_name}{_labels} {_value}')
+        os.makedirs(self.__dir_path, exist_ok=True)
+        # temporäre Datei ohne Endung .prom, damit der node_exporter sie ignoriert
+        _temp_file_path = f'{_file_path}.{os.getpid()}'
+        try:
+            with open(_temp_file_path, 'w', encoding='utf-8') as _f:
+                _f.write('\n'.join(_lines) + '\n')
+            os.replace(_temp_file_path, _file_path)
+        except OSError:
+            try:
+                os.remove(_temp_file_path)
+            except OSError:
+                pass
+            raise
+
+
+def export_action_metrics(action: RestixAction, values: dict[str, float], succeeded: bool = False):
+    """
+    Exportiert Kennzahlen einer Aktion, falls in der restix-Konfiguration ein Verzeichnis dafür angegeben ist.
+    :param action: ausgeführte Aktion
+    :param values: Werte der Kennzahlen, nach Name der Kennzahl
+    :param succeeded: zeigt an, ob die Aktion erfolgreich war; setzt dann den Zeitpunkt des letzten Erfolgs
+    :raises OSError: falls die Datei nicht geschrieben werden kann
+    """
+    _dir_path = action.metrics_path()
+    if _dir_path is None:
+        return
+    if succeeded:
+        values = {**values, METRIC_LAST_SUCCESS: time.time()}
+    _labels = {'host': action.option(OPTION_HOST) or '', 'year': action.option(OPTION_YEAR) or ''}
+    MetricsExporter(_dir_path).update(action.target_alias(), _labels, values, action.action_id())
+
+
+def _read_metrics(file_path: str) -> dict[tuple[str, str], str]:
+    """
+    :param file_path: Name der Datei mit vollständigem Pfad
+    :returns: Kennzahlen aus der Datei, nach Name und Labels; leer, falls die Datei nicht existiert
+    """
+    _metrics = {}
+    try:
+        with open(file_path, 'r', encoding='utf-8') as _f:
+            for _line in _f:
+                _match = _METRIC_LINE_PATTERN.match(_line.strip())
+                if _match is not None:
+                    _metrics[(_match.group(1), _match.group(2) or '')] = _match.group(3)
+    except (OSError, UnicodeDecodeError):
+        pass
+    return _metrics
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    """
+    :param labels: Labels einer Kennzahl
+    :returns: Labels im Textformat von Prometheus
+    """
+    _pairs = []
+    for _name, _value in labels.items():
+        _value = str(_value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        _pairs.append(f'{_name}="{_value}"')
+    return '{' + ','.join(_pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    """
+    :param value: Wert einer Kennzahl
+    :returns: Wert im Textformat von Prometheus
+    """
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
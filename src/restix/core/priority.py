@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+CPU- und I/O-Priorität der von restix gestarteten Prozesse.
+Nice-Level, CPU-Affinität und I/O-Priorität setzen die Programme nice, taskset und ionice, die dem Befehl
+vorangestellt werden, falls sie installiert sind. Damit erben alle Threads der Go-Laufzeitumgebung die Einstellungen,
+ohne dass restix im Kindprozess zwischen fork und exec Python-Code ausführen muss. Die Go-Laufzeitumgebung wird über
+Umgebungsvariablen begrenzt.
+"""
+
+import os
+import shutil
+
+from typing import Self
+
+from restix.core import *
+from restix.core.action import RestixAction
+
+
+# I/O-Scheduling-Klassen von ionice
+IONICE_CLASSES = {CFG_VALUE_IONICE_CLASS_REALTIME: 1, CFG_VALUE_IONICE_CLASS_BEST_EFFORT: 2,
+                  CFG_VALUE_IONICE_CLASS_IDLE: 3}
+
+
+class ProcessPriority:
+    """
+    Priorität und Ressourcen-Grenzen für Kindprozesse.
+    """
+    def __init__(self, nice: int | None = None, ionice_class: str | None = None, ionice_priority: int | None = None,
+                 cpu_affinity: list[int] | None = None, go_environment: dict | None = None):
+        """
+        Konstruktor.
+        :param nice: Nice-Level (0 bis 19), der Prozess läuft mindestens mit diesem Level
+        :param ionice_class: I/O-Scheduling-Klasse (realtime, best-effort oder idle)
+        :param ionice_priority: Priorität innerhalb der I/O-Scheduling-Klasse (0 bis 7)
+        :param cpu_affinity: Nummern der CPUs, auf denen der Prozess laufen darf
+        :param go_environment: Umgebungsvariablen für die Go-Laufzeitumgebung
+        """
+        super().__init__()
+        self.__nice = nice
+        # die Prüfung der Konfiguration ignoriert Groß- und Kleinschreibung
+        self.__ionice_class = None if ionice_class is None else ionice_class.lower()
+        self.__ionice_priority = ionice_priority
+        self.__cpu_affinity = None if cpu_affinity is None or len(cpu_affinity) == 0 else set(cpu_affinity)
+        self.__go_environment = {} if go_environment is None else go_environment
+
+    def command(self, cmd: list[str]) -> list[str]:
+        """
+        :param cmd: auszuführender Befehl
+        :returns: Befehl, ggf. mit vorangestelltem nice, taskset und ionice
+        """
+        if os.name != 'posix':
+            return cmd
+        _cmd = []
+        _nice = shutil.which('nice') if self.__nice is not None else None
+        if _nice is not None:
+            # die Priorität wird nur gesenkt, zum Erhöhen fehlen normalerweise die Rechte
+            _increment = self.__nice - os.getpriority(os.PRIO_PROCESS, 0)
+            if _increment > 0:
+                _cmd.extend((_nice, '-n', str(_increment)))
+        _taskset = shutil.which('taskset') if self.__cpu_affinity is not None else None
+        if _taskset is not None and hasattr(os, 'sched_getaffinity'):
+            # nicht vorhandene oder für restix gesperrte CPUs werden ignoriert
+            _cpus = sorted(self.__cpu_affinity & os.sched_getaffinity(0))
+            if len(_cpus) > 0:
+                _cmd.extend((_taskset, '-c', ','.join(str(_cpu) for _cpu in _cpus)))
+        _ionice = shutil.which('ionice') if self.__ionice_class is not None else None
+        if _ionice is not None:
+            _cmd.extend((_ionice, '-c', str(IONICE_CLASSES[self.__ionice_class])))
+            if self.__ionice_priority is not None and self.__ionice_class != CFG_VALUE_IONICE_CLASS_IDLE:
+                _cmd.extend(('-n', str(self.__ionice_priority)))
+        _cmd.extend(cmd)
+        return _cmd
+
+    def popen_arguments(self) -> dict:
+        """
+        :returns: zusätzliche Argumente für subprocess.Popen bzw. subprocess.run
+        """
+        if len(self.__go_environment) == 0:
+            return {}
+        _env = dict(os.environ)
+        _env.update(self.__go_environment)
+        return {'env': _env}
+
+    @classmethod
+    def for_action(cls, action: RestixAction) -> Self:
+        """
+        :param action: auszuführende Aktion
+        :returns: Priorität für die Kindprozesse der Aktion
+        """
+        _go_environment = {}
+        for _par, _var in ((CFG_PAR_GOGC, ENVA_GOGC), (CFG_PAR_GOMAXPROCS, ENVA_GOMAXPROCS),
+                           (CFG_PAR_GOMEMLIMIT, ENVA_GOMEMLIMIT)):
+            _value = action.target_setting(_par)
+            if _value is not None:
+                _go_environment[_var] = str(_value)
+        return ProcessPriority(action.target_setting(CFG_PAR_NICE), action.target_setting(CFG_PAR_IONICE_CLASS),
+                               action.target_setting(CFG_PAR_IONICE_PRIORITY),
+                               action.target_setting(CFG_PAR_CPU_AFFINITY), _go_environment)
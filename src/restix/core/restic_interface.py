@@ -37,22 +37,87 @@ Schnittstelle zu restic.
 """
 
 import json
+import re
+import shlex
+import sqlite3
 import subprocess
+import tempfile
+import time
 
 from datetime import datetime
+from typing import IO
 
 from restix.core import *
 from restix.core.action import RestixAction
+from restix.core.fingerprint import FingerprintStore, scope_fingerprint
+from restix.core.history import (BackupHistory, BackupSummary, DEFAULT_REGRESSION_BAND, DEFAULT_REGRESSION_WINDOW,
+                                 REGRESSION_DURATION, REGRESSION_THROUGHPUT, detect_regressions, parse_json_message)
+from restix.core.hooks import BACKUP_RESULT_ABORTED, BACKUP_RESULT_FAILED, BACKUP_RESULT_SUCCEEDED, BackupHooks
+from restix.core.locks import (DEFAULT_LOCK_WAIT, LOCK_WAIT_INITIAL_DELAY, LOCK_WAIT_MAX_DELAY, RepositoryLock,
+                               lock_ids)
 from restix.core.messages import *
+from restix.core.metrics import (METRIC_BACKUP_DATA_ADDED, METRIC_BACKUP_DURATION, METRIC_BACKUP_FILES_PROCESSED,
+                                 METRIC_RESTIC_CHECK_OK, METRIC_RESTIC_EXIT_CODE, METRIC_SNAPSHOTS,
+                                 export_action_metrics)
+from restix.core.priority import ProcessPriority
 from restix.core.restic_version import ResticVersion
 from restix.core.restix_exception import RestixException
+from restix.core.retry import RetryPolicy
+from restix.core.secret_broker import secrets_handed_over
 from restix.core.snapshot import Snapshot, SnapshotElement
 from restix.core.task import TaskMonitor, TaskResult
+from restix.core.throttle import BackupThrottle
+from restix.core.util import format_byte_count
+
+
+# Fortschritt-Zeile von restic bei Ausgabe ohne Terminal, z.B. '[0:05] 12.34%  100 files 1.2 GiB, ...'
+_RESTIC_STATUS_PATTERN = re.compile(r'^\[(\d+:)?\d+:\d+]\s+(\d+(\.\d+)?)%')
+
+# Attribute und Nachrichtentypen der Ausgabe von restic mit Option --json
+_JSON_ATTR_ERROR = 'error'
+_JSON_ATTR_ITEM = 'item'
+_JSON_ATTR_MESSAGE = 'message'
+_JSON_ATTR_MESSAGE_TYPE = 'message_type'
+_JSON_MESSAGE_TYPE_ERROR = 'error'
+_JSON_MESSAGE_TYPE_STATUS = 'status'
+_JSON_MESSAGE_TYPE_SUMMARY = 'summary'
 
 
 def run_backup(action: RestixAction, task_monitor: TaskMonitor) -> TaskResult:
     """
-    Sichert lokale Daten in einem restic-Repository.
+    Sichert lokale Daten und die Ausgabe der Befehle im Backup-Umfang in einem restic-Repository.
+    Für jeden Befehl legt restic einen eigenen Snapshot an. In die Historie gehen nur Backups der Dateien ein.
+    Pre- und Post-Hook des Backup-Ziels werden vor bzw. nach dem Backup ausgeführt, der Post-Hook auch nach Fehlern
+    und Abbruch.
+    :param action: Daten des auszuführenden Backups.
+    :param task_monitor: Fortschritt-Handler.
+    :returns: Ergebnis der Ausführung.
+    :raises RestixException: falls das Backup fehlschlägt
+    """
+    _hooks = BackupHooks.for_action(action)
+    if not _hooks.defined():
+        return _run_backup(action, task_monitor)
+    _backup_result = BACKUP_RESULT_FAILED
+    _result = TaskResult(TASK_FAILED, '')
+    try:
+        if _hooks.run_pre_hook(task_monitor):
+            _result = _run_backup(action, task_monitor)
+            if _result.task_succeeded():
+                _backup_result = BACKUP_RESULT_SUCCEEDED
+    except RestixException as _e:
+        if _e.id() == E_BACKGROUND_TASK_ABORTED:
+            _backup_result = BACKUP_RESULT_ABORTED
+        raise
+    finally:
+        # Post-Hook gibt z.B. einen vom Pre-Hook angelegten Snapshot frei, er muss in jedem Fall ausgeführt werden
+        if not _hooks.run_post_hook(_backup_result, task_monitor):
+            _result = TaskResult(TASK_FAILED, '')
+    return _result
+
+
+def _run_backup(action: RestixAction, task_monitor: TaskMonitor) -> TaskResult:
+    """
+    Führt ein Backup ohne Hooks aus.
     :param action: Daten des auszuführenden Backups.
     :param task_monitor: Fortschritt-Handler.
     :returns: Ergebnis der Ausführung.
@@ -61,10 +126,23 @@ def run_backup(action: RestixAction, task_monitor: TaskMonitor) -> TaskResult:
     _auto_create = action.option(OPTION_AUTO_CREATE) is True
     _dry_run = action.option(OPTION_DRY_RUN) is True
     _repo = action.option(OPTION_REPO)
-    _status = _repo_status(action)
+    _backup_files = action.option(OPTION_FILES_FROM) is not None
+    _fingerprint = None
+    if _backup_files and action.target_setting(CFG_PAR_SKIP_UNCHANGED, False):
+        # Backup überspringen, falls sich seit der letzten Sicherung nichts geändert hat
+        _fingerprint = _scope_fingerprint(action, task_monitor)
+        if _fingerprint is not None:
+            _unchanged, _last_backup = FingerprintStore().is_unchanged(
+                _repo, _fingerprint, action.target_setting(CFG_PAR_FORCE_AFTER_DAYS))
+            if _unchanged:
+                task_monitor.log(I_BACKUP_SKIPPED_UNCHANGED, _repo, _last_backup)
+                _backup_files = False
+    if not _backup_files and len(action.stdin_commands()) == 0:
+        return TaskResult(TASK_SUCCEEDED, '')
+    _status, _snapshot_count = _repo_status(action)
     if _status == 1:
-        # Repository existiert
-        pass
+        # Repository existiert, veraltete Sperren entfernen und ggf. auf Freigabe aktiver Sperren warten
+        _prepare_repo_locks(action, task_monitor, False)
     elif _status == 0:
         # Repository existiert nicht
         if not _auto_create:
@@ -82,25 +160,130 @@ def run_backup(action: RestixAction, task_monitor: TaskMonitor) -> TaskResult:
         task_monitor.log(I_RUNNING_RESTIC_CMD, ' '.join(_restic_cmd))
         _rc, _, _ = _execute_restic_command(_restic_cmd, task_monitor)
         if _rc != RESTIC_RC_OK:
+            _export_metrics(action, {METRIC_RESTIC_EXIT_CODE: _rc}, task_monitor)
             _detail_msg = localized_message(E_COULD_CREATE_REPO, _repo, _rc)
             task_monitor.log(E_BACKGROUND_TASK_FAILED, _detail_msg)
             return TaskResult(TASK_FAILED, '')
     else:
         # Fehler bei restic-Befehl
+        _export_metrics(action, {METRIC_RESTIC_EXIT_CODE: _status}, task_monitor)
         _detail_msg = localized_message(E_COULD_NOT_DETERMINE_REPO_STATUS, _repo, _status)
         task_monitor.log(E_BACKGROUND_TASK_FAILED, _detail_msg)
         return TaskResult(TASK_FAILED, '')
-    # Backup ausführen
+    # Backup ausführen, die Ausgabe im JSON-Format enthält am Ende eine Zusammenfassung
+    action.set_option(OPTION_JSON, True)
+    _summary = None
+    _new_snapshot_count = 0
+    if _backup_files:
+        _result = _run_files_backup(action, _fingerprint, task_monitor)
+        if not _result.task_succeeded():
+            return _result
+        _summary = _result.details()
+        _new_snapshot_count += 1
+    if len(action.stdin_commands()) > 0:
+        _restic_version = ResticVersion.from_version_command(determine_version(action.restic_executable()))
+        for _stdin_command in action.stdin_commands():
+            if not _run_stdin_backup(action, _stdin_command, _restic_version.stdin_from_command_supported(),
+                                     task_monitor):
+                if not _dry_run:
+                    _export_metrics(action, {METRIC_RESTIC_EXIT_CODE: RESTIC_RC_CMD_FAILED}, task_monitor)
+                return TaskResult(TASK_FAILED, '')
+            _new_snapshot_count += 1
+    if not _dry_run:
+        # Kennzahlen erst exportieren, wenn alle Teile des Backups gesichert wurden
+        _metrics = {METRIC_RESTIC_EXIT_CODE: RESTIC_RC_OK}
+        if _summary is not None:
+            _metrics.update({METRIC_BACKUP_DURATION: _summary.total_duration(),
+                             METRIC_BACKUP_DATA_ADDED: _summary.data_added(),
+                             METRIC_BACKUP_FILES_PROCESSED: _summary.total_files_processed()})
+        if _snapshot_count is not None:
+            _metrics[METRIC_SNAPSHOTS] = _snapshot_count + _new_snapshot_count
+        _export_metrics(action, _metrics, task_monitor, True)
+    return TaskResult(TASK_SUCCEEDED, '', _summary)
+
+
+def _run_files_backup(action: RestixAction, fingerprint: str | None, task_monitor: TaskMonitor) -> TaskResult:
+    """
+    Sichert die Dateien im Backup-Umfang, das Repository muss existieren.
+    Kennzahlen werden nur bei einem Fehler exportiert, bei Erfolg erst nach den Backups der Befehlsausgaben.
+    :param action: Daten des auszuführenden Backups.
+    :param fingerprint: Fingerprint des Backup-Umfangs, falls unveränderte Backup-Umfänge übersprungen werden
+    :param task_monitor: Fortschritt-Handler.
+    :returns: Ergebnis der Ausführung, enthält bei Erfolg die Zusammenfassung des Backups
+    :raises RestixException: falls das Backup abgebrochen werden soll
+    """
+    _dry_run = action.option(OPTION_DRY_RUN) is True
+    _repo = action.option(OPTION_REPO)
     _restic_cmd = action.to_restic_command()
     task_monitor.log(I_RUNNING_RESTIC_CMD, ' '.join(_restic_cmd))
-    _rc, _, _ = _execute_restic_command(action.to_restic_command(), task_monitor, True)
+    _rc, _stdout, _ = _execute_restic_command(_restic_cmd, task_monitor, True, RetryPolicy.for_action(action),
+                                              priority=ProcessPriority.for_action(action),
+                                              throttle=BackupThrottle.for_action(action))
     if _rc == RESTIC_RC_OK:
-        return TaskResult(TASK_SUCCEEDED, '')
+        _summary = BackupSummary.from_restic_output(_stdout)
+        if fingerprint is not None and not _dry_run:
+            try:
+                FingerprintStore().update(_repo, fingerprint)
+            except OSError as _e:
+                task_monitor.log(W_SCOPE_FINGERPRINT_NOT_SAVED, _repo, str(_e))
+        if _summary is not None and not _dry_run:
+            _record_backup(action, _summary, task_monitor)
+        return TaskResult(TASK_SUCCEEDED, '', _summary)
+    if not _dry_run:
+        _export_metrics(action, {METRIC_RESTIC_EXIT_CODE: _rc}, task_monitor)
     _detail_msg = localized_message(E_BACKUP_FAILED, _repo, _rc)
     task_monitor.log(E_BACKGROUND_TASK_FAILED, _detail_msg)
     return TaskResult(TASK_FAILED, '')
 
 
+def _run_stdin_backup(action: RestixAction, stdin_command: dict, from_command: bool, task_monitor: TaskMonitor) -> bool:
+    """
+    Sichert die Ausgabe eines Befehls aus dem Backup-Umfang ohne Zwischendatei.
+    :param action: Daten des auszuführenden Backups.
+    :param stdin_command: Befehl aus dem Backup-Umfang
+    :param from_command: True, falls restic den Befehl selbst starten und dessen Return code prüfen kann; False, falls
+                         die Ausgabe über eine Pipe an restic übergeben werden muss
+    :param task_monitor: Fortschritt-Handler.
+    :returns: True, falls die Ausgabe erfolgreich gesichert wurde
+    :raises RestixException: falls das Backup abgebrochen werden soll
+    """
+    _repo = action.option(OPTION_REPO)
+    _command = stdin_command[CFG_PAR_COMMAND]
+    if action.option(OPTION_DRY_RUN):
+        # der Befehl würde auch bei dry-run vollständig ausgeführt
+        task_monitor.log(I_DRY_RUN_STDIN_COMMAND, _command, stdin_command[CFG_PAR_FILENAME])
+        return True
+    _restic_cmd = action.stdin_backup_command(stdin_command, from_command)
+    task_monitor.log(I_RUNNING_RESTIC_CMD, ' '.join(_restic_cmd))
+    _priority = ProcessPriority.for_action(action)
+    _throttle = BackupThrottle.for_action(action)
+    if from_command:
+        _rc, _, _ = _execute_restic_command(_restic_cmd, task_monitor, True, RetryPolicy.for_action(action),
+                                            priority=_priority, throttle=_throttle)
+    else:
+        # ohne Zwischendatei ist keine Wiederholung möglich
+        with tempfile.TemporaryFile() as _command_stderr:
+            try:
+                _p = subprocess.Popen(_priority.command(shlex.split(_command)), stdout=subprocess.PIPE,
+                                      stderr=_command_stderr, **_priority.popen_arguments())
+            except OSError as _e:
+                task_monitor.log(E_STDIN_COMMAND_FAILED, _command, str(_e))
+                return False
+            _rc, _, _ = _execute_restic_command(_restic_cmd, task_monitor, True, stdin=_p.stdout, priority=_priority,
+                                                throttle=_throttle)
+            _command_rc = _p.wait()
+            if _command_rc != 0:
+                # restic hat den Snapshot trotzdem angelegt, er enthält aber nur einen Teil der Ausgabe
+                _command_stderr.seek(0)
+                _reason = _command_stderr.read().decode('utf-8', errors='replace').strip() or f'rc={_command_rc}'
+                task_monitor.log(E_STDIN_COMMAND_FAILED, _command, _reason)
+                return False
+    if _rc != RESTIC_RC_OK:
+        task_monitor.log(E_BACKGROUND_TASK_FAILED, localized_message(E_BACKUP_FAILED, _repo, _rc))
+        return False
+    return True
+
+
 def run_forget(action: RestixAction, task_monitor: TaskMonitor) -> TaskResult:
     """
     Löscht Snapshots aus einem Repository.
@@ -108,14 +291,29 @@ def run_forget(action: RestixAction, task_monitor: TaskMonitor) -> TaskResult:
     :param task_monitor: Fortschritt-Handler.
     :returns: Ergebnis der Ausführung.
     """
+    if action.target_setting(CFG_PAR_APPEND_ONLY, False):
+        # Server erlaubt nur das Hinzufügen von Daten, das Löschen muss mit Zugang ohne diese Einschränkung erfolgen
+        return TaskResult(TASK_FAILED, localized_message(E_REPO_APPEND_ONLY, action.option(OPTION_REPO)))
     try:
+        # prune benötigt eine exklusive Sperre
+        _prepare_repo_locks(action, task_monitor, action.option(OPTION_PRUNE) is True)
         _restic_cmd = action.to_restic_command()
         task_monitor.log(I_RUNNING_RESTIC_CMD, ' '.join(_restic_cmd))
         _repo = action.option(OPTION_REPO)
-        execute_restic_command(_restic_cmd, task_monitor)
-        return TaskResult(TASK_SUCCEEDED, '')
+        execute_restic_command(_restic_cmd, task_monitor, retry_policy=RetryPolicy.for_action(action),
+                               priority=ProcessPriority.for_action(action))
     except Exception as _e:
+        if not action.option(OPTION_DRY_RUN):
+            _export_metrics(action, {METRIC_RESTIC_EXIT_CODE: RESTIC_RC_CMD_FAILED}, task_monitor)
         return TaskResult(TASK_FAILED, str(_e))
+    if not action.option(OPTION_DRY_RUN) and action.metrics_path() is not None:
+        # Anzahl der verbliebenen Snapshots nur ermitteln, wenn Kennzahlen exportiert werden
+        _metrics = {METRIC_RESTIC_EXIT_CODE: RESTIC_RC_OK}
+        _status, _snapshot_count = _repo_status(action)
+        if _snapshot_count is not None:
+            _metrics[METRIC_SNAPSHOTS] = _snapshot_count
+        _export_metrics(action, _metrics, task_monitor, True)
+    return TaskResult(TASK_SUCCEEDED, '')
 
 
 def run_init(action: RestixAction, task_monitor: TaskMonitor) -> TaskResult:
@@ -157,7 +355,8 @@ def run_restore(action: RestixAction, task_monitor: TaskMonitor) -> TaskResult:
         _msg = localized_message(I_GUI_RESTORING_SOME_DATA_TO_PATH, _repo, _restore_path)
     task_monitor.log_text(_msg)
     try:
-        execute_restic_command(action.to_restic_command(), task_monitor)
+        execute_restic_command(action.to_restic_command(), task_monitor, retry_policy=RetryPolicy.for_action(action),
+                               priority=ProcessPriority.for_action(action))
         return TaskResult(TASK_SUCCEEDED, localized_message(I_GUI_DATA_RESTORED, _repo))
     except Exception as _e:
         task_monitor.log(E_BACKGROUND_TASK_FAILED, str(_e))
@@ -173,7 +372,7 @@ def run_snapshots(action: RestixAction, task_monitor: TaskMonitor) -> TaskResult
     :raises RestixException: falls die Ausführung fehlschlägt
     """
     try:
-        execute_restic_command(action.to_restic_command(), task_monitor)
+        execute_restic_command(action.to_restic_command(), task_monitor, retry_policy=RetryPolicy.for_action(action))
         return TaskResult(TASK_SUCCEEDED, '')
     except Exception as _e:
         task_monitor.log(E_BACKGROUND_TASK_FAILED, str(_e))
@@ -191,13 +390,14 @@ def run_unlock(action: RestixAction, task_monitor: TaskMonitor) -> TaskResult:
     _repo = action.option(OPTION_REPO)
     task_monitor.log(I_GUI_UNLOCKING_REPO, _repo)
     try:
-        execute_restic_command(action.to_restic_command(), task_monitor)
+        execute_restic_command(action.to_restic_command(), task_monitor, retry_policy=RetryPolicy.for_action(action))
         return TaskResult(TASK_SUCCEEDED, localized_message(I_GUI_REPO_UNLOCKED, _repo))
     except Exception as _e:
         return TaskResult(TASK_FAILED, str(_e))
 
 
-def execute_restic_command(cmd: list[str], task_monitor: TaskMonitor, potential_long_runner: bool = False):
+def execute_restic_command(cmd: list[str], task_monitor: TaskMonitor, potential_long_runner: bool = False,
+                           retry_policy: RetryPolicy | None = None, priority: ProcessPriority | None = None):
     """
     Führt einen restic-Befehl aus.
     Bei potenziell lang laufenden Befehlen werden die Fortschritt-Nachrichten sofort an den TaskMonitor weitergeleitet,
@@ -205,30 +405,11 @@ def execute_restic_command(cmd: list[str], task_monitor: TaskMonitor, potential_
     :param cmd: auszuführender restic-Befehl
     :param task_monitor: Fortschritt-Handler.
     :param potential_long_runner: zeigt an, ob die Ausführung sehr lange dauern kann.
+    :param retry_policy: optional Regeln für die Wiederholung nach vorübergehenden Fehlern
+    :param priority: optional CPU- und I/O-Priorität für restic
     :raises RestixException: falls die Ausführung fehlschlägt
     """
-    if potential_long_runner:
-        # potenziell lang laufender restic-Befehl, Ausgaben gleich an den TaskMonitor weiterreichen
-        _p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
-        for _line in iter(_p.stdout.readline, ""):
-            _pure_line = _line.strip()
-            if len(_pure_line) > 0:
-                task_monitor.log_text(_pure_line, SEVERITY_INFO)
-        for _line in iter(_p.stderr.readline, ""):
-            _pure_line = _line.strip()
-            if len(_pure_line) > 0:
-                task_monitor.log_text(_pure_line, SEVERITY_ERROR)
-        _rc = _p.wait()
-    else:
-        # kurz laufender restic-Befehl, Ausgaben erst am Ende aufsammeln
-        res = subprocess.run(cmd, capture_output=True, encoding='utf-8')
-        if len(res.stderr) > 0:
-            _pure_output = os.linesep.join([_s for _s in res.stderr.split(os.linesep) if _s])
-            task_monitor.log_text(_pure_output, SEVERITY_ERROR)
-        if len(res.stdout) > 0:
-            _pure_output = os.linesep.join([_s for _s in res.stdout.split(os.linesep) if _s])
-            task_monitor.log_text(_pure_output, SEVERITY_INFO)
-        _rc = res.returncode
+    _rc, _, _ = _execute_restic_command(cmd, task_monitor, potential_long_runner, retry_policy, priority=priority)
     if _rc == 0:
         return
     _restic_cmd = ' '.join(cmd)
@@ -245,8 +426,8 @@ def execute_restic_command(cmd: list[str], task_monitor: TaskMonitor, potential_
     elif _rc == 130:
         _exception_id = E_RESTIC_CMD_INTERRUPTED
     else:
-        raise RestixException(E_RESTIC_CMD_FAILED, _restic_cmd)
-    raise RestixException(_exception_id, _restic_cmd)
+        _exception_id = E_RESTIC_CMD_FAILED
+    raise RestixException(_exception_id, _restic_cmd, restic_rc=_rc)
 
 
 def determine_version(restic_executable: str) -> str:
@@ -364,6 +545,23 @@ def check_restic_for_action(action: RestixAction, credentials: dict) -> str | No
     :returns: lokalisierte Warnung, bei None gibt es keine Beanstandungen.
     :raises RestixException: falls restic nicht installiert ist oder die Version nicht unterstützt wird
     """
+    try:
+        _warning = _check_restic_for_action(action, credentials)
+    except RestixException:
+        _export_metrics(action, {METRIC_RESTIC_CHECK_OK: 0})
+        raise
+    _export_metrics(action, {METRIC_RESTIC_CHECK_OK: 1})
+    return _warning
+
+
+def _check_restic_for_action(action: RestixAction, credentials: dict) -> str | None:
+    """
+    Prüft, ob die installierte restic-Version Probleme mit dem übergebenen Befehl hat.
+    :param action: restix-Befehl
+    :param credentials: Zugangsdaten für restic Repository
+    :returns: lokalisierte Warnung, bei None gibt es keine Beanstandungen.
+    :raises RestixException: falls restic nicht installiert ist oder die Version nicht unterstützt wird
+    """
     _restic_version = ResticVersion.from_version_command(determine_version(action.restic_executable()))
     if not _restic_version.suitable_for_restix():
         raise RestixException(E_UNSUPPORTED_RESTIC_VERSION, _restic_version.version())
@@ -388,50 +586,309 @@ def check_restic_for_action(action: RestixAction, credentials: dict) -> str | No
     return None
 
 
-def _repo_status(action: RestixAction) -> int:
+def _scope_fingerprint(action: RestixAction, task_monitor: TaskMonitor) -> str | None:
+    """
+    :param action: Backup-Aktion
+    :param task_monitor: Fortschritt-Handler.
+    :returns: Fingerprint des Backup-Umfangs; None, falls er nicht ermittelt werden kann
+    """
+    try:
+        return scope_fingerprint(action.option(OPTION_FILES_FROM), action.option(OPTION_EXCLUDE_FILE))
+    except OSError as _e:
+        task_monitor.log(W_SCOPE_FINGERPRINT_FAILED, str(_e))
+        return None
+
+
+def _record_backup(action: RestixAction, summary: BackupSummary, task_monitor: TaskMonitor):
+    """
+    Prüft ein erfolgreiches Backup auf Regressionen gegenüber den vorherigen Backups zum gleichen Backup-Ziel und
+    fügt es zur Historie hinzu. Erkannte Regressionen werden als Warnung gemeldet und in der Zusammenfassung vermerkt.
+    :param action: Backup-Aktion
+    :param summary: Zusammenfassung des Backups
+    :param task_monitor: Fortschritt-Handler.
+    """
+    _repo = action.option(OPTION_REPO)
+    _history = BackupHistory()
+    try:
+        _window = action.target_setting(CFG_PAR_REGRESSION_WINDOW, DEFAULT_REGRESSION_WINDOW)
+        _previous_backups = _history.backups(action.target_alias(), _window)
+        _history.add(action.target_alias(), _repo, summary)
+    except (OSError, sqlite3.Error) as _e:
+        task_monitor.log(W_BACKUP_HISTORY_NOT_SAVED, _repo, str(_e))
+        return
+    _band = action.target_setting(CFG_PAR_REGRESSION_BAND, DEFAULT_REGRESSION_BAND)
+    summary.set_regressions(detect_regressions(summary, _previous_backups, _band))
+    _run_count = len(_previous_backups)
+    for _metric, _value, _median in summary.regressions():
+        if _metric == REGRESSION_THROUGHPUT:
+            task_monitor.log(W_BACKUP_THROUGHPUT_DROPPED, _repo, format_byte_count(_value),
+                             format_byte_count(_median), _run_count)
+        elif _metric == REGRESSION_DURATION:
+            task_monitor.log(W_BACKUP_DURATION_INCREASED, _repo, f'{_value:.0f}', f'{_median:.0f}', _run_count)
+        else:
+            task_monitor.log(W_BACKUP_DATA_ADDED_INCREASED, _repo, format_byte_count(_value),
+                             format_byte_count(_median), _run_count)
+
+
+def _prepare_repo_locks(action: RestixAction, task_monitor: TaskMonitor, exclusive: bool):
+    """
+    Prüft vor lang laufenden Befehlen die Sperren im Repository. Veraltete Sperren werden entfernt, sofern das für
+    das Backup-Ziel nicht abgeschaltet wurde. Auf die Freigabe aktiver Sperren, die den Befehl blockieren, wird mit
+    wachsenden Pausen gewartet. Läuft die maximale Wartezeit ab, wird der Befehl trotzdem gestartet und restic meldet
+    den Fehler.
+    :param action: auszuführende Aktion
+    :param task_monitor: Fortschritt-Handler.
+    :param exclusive: zeigt an, ob der Befehl eine exklusive Sperre benötigt
+    :raises RestixException: falls der Befehl abgebrochen werden soll
+    """
+    _repo = action.option(OPTION_REPO)
+    _deadline = time.monotonic() + 60 * action.target_setting(CFG_PAR_LOCK_WAIT, DEFAULT_LOCK_WAIT)
+    _delay = LOCK_WAIT_INITIAL_DELAY
+    _stale_locks_handled = False
+    while True:
+        _locks = _repo_locks(action)
+        _stale_locks = [_lock for _lock in _locks if _lock.is_stale()]
+        if len(_stale_locks) > 0 and not _stale_locks_handled:
+            _stale_locks_handled = True
+            if action.option(OPTION_DRY_RUN) or not action.target_setting(CFG_PAR_UNLOCK_STALE, True):
+                task_monitor.log(W_REPO_STALE_LOCKS_FOUND, _repo, len(_stale_locks))
+            else:
+                _unlock_cmd = action.unlock_action().to_restic_command()
+                _rc, _, _stderr = _execute_restic_command(_unlock_cmd, TaskMonitor(None, True))
+                if _rc == RESTIC_RC_OK:
+                    task_monitor.log(I_REPO_STALE_LOCKS_REMOVED, _repo, len(_stale_locks))
+                else:
+                    task_monitor.log(W_REPO_STALE_LOCKS_NOT_REMOVED, _repo, _stderr.strip())
+        _blocking_locks = [_lock for _lock in _locks if not _lock.is_stale() and _lock.conflicts_with(exclusive)]
+        if len(_blocking_locks) == 0:
+            return
+        _remaining = _deadline - time.monotonic()
+        if _remaining <= 0:
+            task_monitor.log(W_REPO_LOCK_WAIT_EXPIRED, _repo)
+            return
+        _delay = min(_delay, _remaining)
+        _lock = _blocking_locks[0]
+        task_monitor.log(I_WAITING_FOR_REPO_LOCK, _repo, _lock.username(), _lock.hostname(), _lock.pid(),
+                         int(_delay))
+        _wait(_delay, task_monitor)
+        _delay = min(2 * _delay, LOCK_WAIT_MAX_DELAY)
+
+
+def _repo_locks(action: RestixAction) -> list[RepositoryLock]:
+    """
+    :param action: Aktion mit den Daten des Repositories
+    :returns: alle Sperren im Repository; leere Liste, falls die Sperren nicht ermittelt werden können
+    """
+    _silent_monitor = TaskMonitor(None, True)
+    _rc, _stdout, _ = _execute_restic_command(action.lock_inspection_command(), _silent_monitor)
+    if _rc != RESTIC_RC_OK:
+        return []
+    _locks = []
+    for _lock_id in lock_ids(_stdout):
+        _rc, _stdout, _ = _execute_restic_command(action.lock_inspection_command(_lock_id), _silent_monitor)
+        if _rc != RESTIC_RC_OK:
+            # Sperre wurde inzwischen freigegeben
+            continue
+        _lock = RepositoryLock.from_restic_output(_lock_id, _stdout)
+        if _lock is not None:
+            _locks.append(_lock)
+    return _locks
+
+
+def _repo_status(action: RestixAction) -> tuple[int, int | None]:
     """
     :param action: Backup-Aktion
-    :returns: 1: repo existiert, 0: repo existiert nicht, andere Werte: Fehler bei restic-Befehl
+    :returns: Status (1: repo existiert, 0: repo existiert nicht, andere Werte: Fehler bei restic-Befehl) und Anzahl
+              der Snapshots im Repository, falls bekannt
     """
     _snapshots_action = action.snapshots_action()
     _silent_monitor = TaskMonitor(None, True)
-    _rc, _, _ = _execute_restic_command(_snapshots_action.to_restic_command(), _silent_monitor)
-    if _rc == RESTIC_RC_OK: return 1
-    if _rc == RESTIC_RC_REPO_DOES_NOT_EXIST: return 0
-    return _rc
+    _rc, _stdout, _ = _execute_restic_command(_snapshots_action.to_restic_command(), _silent_monitor)
+    if _rc == RESTIC_RC_OK:
+        try:
+            _snapshots = json.loads(_stdout)
+        except ValueError:
+            return 1, None
+        return 1, len(_snapshots) if isinstance(_snapshots, list) else None
+    if _rc == RESTIC_RC_REPO_DOES_NOT_EXIST: return 0, None
+    return _rc, None
 
 
-def _execute_restic_command(cmd: list[str], task_monitor: TaskMonitor,
-                            potential_long_runner: bool = False) -> tuple[int, str, str]:
+def _export_metrics(action: RestixAction, values: dict[str, float], task_monitor: TaskMonitor | None = None,
+                    succeeded: bool = False):
     """
-    Führt einen restic-Befehl aus.
+    Exportiert Kennzahlen einer Aktion, falls dies in der restix-Konfiguration eingestellt ist.
+    Fehler beim Schreiben werden als Warnung gemeldet, die Aktion selbst ist davon nicht betroffen.
+    :param action: ausgeführte Aktion
+    :param values: Werte der Kennzahlen, nach Name der Kennzahl
+    :param task_monitor: optional Fortschritt-Handler für Warnungen
+    :param succeeded: zeigt an, ob die Aktion erfolgreich war
+    """
+    try:
+        export_action_metrics(action, values, succeeded)
+    except OSError as _e:
+        if task_monitor is not None:
+            task_monitor.log(W_METRICS_NOT_WRITTEN, action.metrics_path(), str(_e))
+
+
+def _log_output_line(line: str, task_monitor: TaskMonitor) -> bool:
+    """
+    Leitet eine Zeile der Standard-Ausgabe von restic an den TaskMonitor weiter.
+    Fortschritt-Zeilen werden als Status-Nachricht weitergeleitet, damit sie zusammengefasst werden können.
+    Nachrichten im JSON-Format werden in die gleichen Texte umgesetzt, die restic ohne Option --json ausgibt.
+    :param line: Ausgabe-Zeile
+    :param task_monitor: Fortschritt-Handler.
+    :returns: True, falls es sich um eine Fortschritt-Zeile handelt
+    """
+    _message = parse_json_message(line)
+    if _message is not None:
+        _message_type = _message.get(_JSON_ATTR_MESSAGE_TYPE)
+        if _message_type == _JSON_MESSAGE_TYPE_STATUS:
+            line = _json_status_text(_message)
+        elif _message_type == _JSON_MESSAGE_TYPE_SUMMARY:
+            _summary = BackupSummary(_message)
+            task_monitor.log(I_BACKUP_SUMMARY, _summary.files_new(), _summary.files_changed(),
+                             _summary.files_unmodified(), format_byte_count(_summary.data_added()),
+                             f'{_summary.total_duration():.1f}', _summary.snapshot_id() or '-')
+            return False
+        elif _message_type == _JSON_MESSAGE_TYPE_ERROR:
+            _error = _message.get(_JSON_ATTR_ERROR)
+            _text = _error.get(_JSON_ATTR_MESSAGE, line) if isinstance(_error, dict) else line
+            _item = _message.get(_JSON_ATTR_ITEM)
+            task_monitor.log_text(_text if _item is None else f'{_item}: {_text}', SEVERITY_ERROR)
+            return False
+    _status_match = _RESTIC_STATUS_PATTERN.match(line)
+    if _status_match is None:
+        task_monitor.log_text(line, SEVERITY_INFO)
+        return False
+    task_monitor.log_status(line, min(100, int(float(_status_match.group(2)))))
+    return True
+
+
+def _json_status_text(message: dict) -> str:
+    """
+    :param message: Status-Nachricht von restic backup --json
+    :returns: Fortschritt-Zeile im Format der Ausgabe von restic ohne Option --json
+    """
+    _minutes, _seconds = divmod(int(message.get('seconds_elapsed', 0)), 60)
+    _hours, _minutes = divmod(_minutes, 60)
+    _elapsed = f'{_hours}:{_minutes:02d}:{_seconds:02d}' if _hours > 0 else f'{_minutes}:{_seconds:02d}'
+    _percent = float(message.get('percent_done', 0)) * 100
+    return (f'[{_elapsed}] {_percent:.2f}%  {message.get("files_done", 0)} files '
+            f'{format_byte_count(message.get("bytes_done", 0))}, total {message.get("total_files", 0)} files '
+            f'{format_byte_count(message.get("total_bytes", 0))}, {message.get("error_count", 0)} errors')
+
+
+def _execute_restic_command(cmd: list[str], task_monitor: TaskMonitor, potential_long_runner: bool = False,
+                            retry_policy: RetryPolicy | None = None, stdin: IO | None = None,
+                            priority: ProcessPriority | None = None,
+                            throttle: BackupThrottle | None = None) -> tuple[int, str, str]:
+    """
+    Führt einen restic-Befehl aus und wiederholt ihn ggf. nach vorübergehenden Fehlern.
     Bei potenziell lang laufenden Befehlen werden die Fortschritt-Nachrichten sofort an den TaskMonitor weitergeleitet,
     ansonsten erst nach der Befehlsausführung.
     :param cmd: auszuführender restic-Befehl
     :param task_monitor: Fortschritt-Handler.
     :param potential_long_runner: zeigt an, ob die Ausführung sehr lange dauern kann.
+    :param retry_policy: optional Regeln für die Wiederholung nach vorübergehenden Fehlern
+    :param stdin: optional Standard-Eingabe für restic, wird nach dem Start von restic geschlossen; darf nur ohne
+                  Regeln für die Wiederholung angegeben werden
+    :param priority: optional CPU- und I/O-Priorität für restic
+    :param throttle: optional Drosselung abhängig von der Systemlast, nur für potenziell lang laufende Befehle
+    :returns: Tupel mit restic-Return code, Inhalt Standard-Ausgabe, Inhalt Standard-Error des letzten Versuchs.
+    :raises RestixException: falls der Befehl während der Pause vor einem erneuten Versuch abgebrochen werden soll
+    """
+    _attempt = 1
+    while True:
+        _started = time.monotonic()
+        _rc, _stdout, _stderr = _run_restic_command(cmd, task_monitor, potential_long_runner, stdin, priority,
+                                                     throttle)
+        _duration = int(time.monotonic() - _started)
+        if _rc == RESTIC_RC_OK:
+            if _attempt > 1:
+                task_monitor.log(I_RESTIC_RETRY_SUCCEEDED, _attempt, _duration)
+            return _rc, _stdout, _stderr
+        _delay = None if retry_policy is None else retry_policy.retry_delay(_attempt, _rc, _stderr)
+        if _delay is None:
+            return _rc, _stdout, _stderr
+        task_monitor.log(W_RESTIC_ATTEMPT_FAILED, _attempt, retry_policy.max_attempts(), _duration, _rc, _delay)
+        _wait(_delay, task_monitor)
+        _attempt += 1
+
+
+def _run_restic_command(cmd: list[str], task_monitor: TaskMonitor, potential_long_runner: bool = False,
+                        stdin: IO | None = None, priority: ProcessPriority | None = None,
+                        throttle: BackupThrottle | None = None) -> tuple[int, str, str]:
+    """
+    Führt einen restic-Befehl einmal aus.
+    :param cmd: auszuführender restic-Befehl
+    :param task_monitor: Fortschritt-Handler.
+    :param potential_long_runner: zeigt an, ob die Ausführung sehr lange dauern kann.
+    :param stdin: optional Standard-Eingabe für restic, wird nach dem Start von restic geschlossen
+    :param priority: optional CPU- und I/O-Priorität für restic
+    :param throttle: optional Drosselung abhängig von der Systemlast, nur für potenziell lang laufende Befehle
     :returns: Tupel mit restic-Return code, Inhalt Standard-Ausgabe, Inhalt Standard-Error.
     """
     _stdout = []
     _stderr = []
-    if potential_long_runner:
-        # potenziell lang laufender restic-Befehl, Ausgaben gleich an den TaskMonitor weiterreichen
-        _p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
-        for _line in iter(_p.stdout.readline, ""):
-            _stdout.append(_line.strip())
-            task_monitor.log_text(_line.strip(), SEVERITY_INFO)
-        for _line in iter(_p.stderr.readline, ""):
-            _stderr.append(_line.strip())
-            task_monitor.log_text(_line.strip(), SEVERITY_ERROR)
-        _rc = _p.wait()
-        _stdout = os.linesep.join(_stdout)
-        _stderr = os.linesep.join(_stderr)
-    else:
-        # kurz laufender restic-Befehl, Ausgaben erst am Ende aufsammeln
-        res = subprocess.run(cmd, capture_output=True, encoding='utf-8')
-        if len(res.stderr) > 0: task_monitor.log_text(res.stderr, SEVERITY_ERROR)
-        _stdout = res.stdout
-        if len(res.stdout) > 0: task_monitor.log_text(res.stdout, SEVERITY_INFO)
-        _stderr = res.stderr
-        _rc = res.returncode
+    _popen_args = {} if priority is None else priority.popen_arguments()
+    with secrets_handed_over(cmd) as (_cmd, _fds):
+        if priority is not None:
+            _cmd = priority.command(_cmd)
+        if potential_long_runner:
+            # potenziell lang laufender restic-Befehl, Ausgaben gleich an den TaskMonitor weiterreichen
+            _p = subprocess.Popen(_cmd, stdin=stdin, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                  universal_newlines=True, pass_fds=_fds, **_popen_args)
+            if stdin is not None:
+                # nur restic darf die Eingabe lesen, damit der schreibende Prozess ein Ende von restic bemerkt
+                stdin.close()
+            if throttle is not None:
+                throttle.start(_p, task_monitor)
+            try:
+                for _line in iter(_p.stdout.readline, ""):
+                    _pure_line = _line.strip()
+                    # Fortschritt-Zeilen werden nicht aufgehoben, bei langen Backups wären das sehr viele
+                    if len(_pure_line) > 0 and not _log_output_line(_pure_line, task_monitor):
+                        _stdout.append(_pure_line)
+                for _line in iter(_p.stderr.readline, ""):
+                    _pure_line = _line.strip()
+                    if len(_pure_line) > 0:
+                        _stderr.append(_pure_line)
+                        task_monitor.log_text(_pure_line, SEVERITY_ERROR)
+                _rc = _p.wait()
+            finally:
+                if throttle is not None:
+                    # ein angehaltenes restic wird auch bei Abbruch fortgesetzt
+                    throttle.stop()
+            _stdout = os.linesep.join(_stdout)
+            _stderr = os.linesep.join(_stderr)
+        else:
+            # kurz laufender restic-Befehl, Ausgaben erst am Ende aufsammeln
+            res = subprocess.run(_cmd, stdin=stdin, capture_output=True, encoding='utf-8', pass_fds=_fds,
+                                 **_popen_args)
+            if stdin is not None:
+                stdin.close()
+            if len(res.stderr) > 0:
+                _pure_output = os.linesep.join([_s for _s in res.stderr.split(os.linesep) if _s])
+                task_monitor.log_text(_pure_output, SEVERITY_ERROR)
+            if len(res.stdout) > 0:
+                _pure_output = os.linesep.join([_s for _s in res.stdout.split(os.linesep) if _s])
+                task_monitor.log_text(_pure_output, SEVERITY_INFO)
+            _stdout = res.stdout
+            _stderr = res.stderr
+            _rc = res.returncode
     return _rc, _stdout, _stderr
+
+
+def _wait(seconds: float, task_monitor: TaskMonitor):
+    """
+    Wartet die angegebene Zeit, prüft dabei jede Sekunde, ob abgebrochen werden soll.
+    :param seconds: Wartezeit in Sekunden
+    :param task_monitor: Fortschritt-Handler.
+    :raises RestixException: falls abgebrochen werden soll
+    """
+    _wait_until = time.monotonic() + seconds
+    while time.monotonic() < _wait_until:
+        task_monitor.check_abort()
+        time.sleep(min(1.0, max(0.0, _wait_until - time.monotonic())))
+    task_monitor.check_abort()
@@ -97,6 +97,12 @@ class ResticVersion:
         """
         return self.__version >= Version('0.17')
 
+    def stdin_from_command_supported(self) -> bool:
+        """
+        :returns: True, falls die restic-Version die Option --stdin-from-command für backup-Befehle unterstützt
+        """
+        return self.__version >= Version('0.17')
+
     def suitable_for_restix(self) -> bool:
         """
         :returns: True, falls die restic-Version für restix benutzt werden kann
@@ -45,13 +45,16 @@ class RestixException(Exception):
     """
     restix-Exception.
     """
-    def __init__(self, exception_id: str, *args: Any):
+    def __init__(self, exception_id: str, *args: Any, restic_rc: int | None = None):
         """
         Konstruktor.
         :param exception_id: Exception-ID
         :param args: optionale Argumente
+        :param restic_rc: Return code von restic, falls die Exception durch einen fehlgeschlagenen restic-Befehl
+                          ausgelöst wurde
         """
         super().__init__(exception_id, args)
+        self.__restic_rc = restic_rc
 
     def id(self) -> str:
         """
@@ -59,6 +62,12 @@ class RestixException(Exception):
         """
         return self.args[0]
 
+    def restic_rc(self) -> int | None:
+        """
+        :returns: Return code von restic; None, falls die Exception nicht von restic ausgelöst wurde
+        """
+        return self.__restic_rc
+
     def __str__(self) -> str:
         """
         :returns: Daten dieser Exception in lokalisierter Form.
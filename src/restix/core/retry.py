@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Wiederholung von restic-Befehlen nach vorübergehenden Fehlern.
+Typische Ursachen sind Sperren anderer Prozesse im Repository sowie Verbindungsabbrüche und Timeouts bei entfernten
+Repositories. Ein wiederholtes Backup ist günstig, da restic bereits hochgeladene Daten wiederverwendet.
+"""
+
+import re
+
+from typing import Self
+
+from restix.core import (CFG_PAR_RETRY_ATTEMPTS, CFG_PAR_RETRY_CODES, CFG_PAR_RETRY_DELAY, CFG_PAR_RETRY_PATTERNS,
+                         RESTIC_RC_CMD_FAILED, RESTIC_RC_REPO_LOCK_FAILED)
+from restix.core.action import RestixAction
+
+
+# Standardwerte für die Anzahl der Versuche und die Pause in Sekunden vor dem ersten erneuten Versuch
+DEFAULT_RETRY_ATTEMPTS = 1
+DEFAULT_RETRY_DELAY = 30
+
+# Maximale Pause in Sekunden zwischen zwei Versuchen
+MAX_RETRY_DELAY = 600
+
+# Return codes von restic, die immer als vorübergehender Fehler gelten
+DEFAULT_RETRY_CODES = [RESTIC_RC_REPO_LOCK_FAILED]
+
+# Muster in der Fehlerausgabe von restic, bei denen ein allgemeiner Fehler als vorübergehend gilt
+DEFAULT_RETRY_PATTERNS = [r'connection reset', r'connection refused', r'broken pipe', r'timed? ?out',
+                          r'unexpected EOF', r'connection (was )?(closed|lost)', r'no route to host',
+                          r'temporary failure in name resolution', r'repository is already locked']
+
+
+class RetryPolicy:
+    """
+    Regeln für die Wiederholung eines restic-Befehls.
+    """
+    def __init__(self, max_attempts: int = DEFAULT_RETRY_ATTEMPTS, delay: int = DEFAULT_RETRY_DELAY,
+                 return_codes: list[int] | None = None, patterns: list[str] | None = None):
+        """
+        Konstruktor.
+        :param max_attempts: maximale Anzahl der Versuche, 1 bedeutet keine Wiederholung
+        :param delay: Pause in Sekunden vor dem ersten erneuten Versuch, wird danach jeweils verdoppelt
+        :param return_codes: Return codes, die als vorübergehender Fehler gelten; bei None die Standardwerte
+        :param patterns: reguläre Ausdrücke für die Fehlerausgabe, bei denen ein allgemeiner Fehler als vorübergehend
+                         gilt; bei None die Standardwerte
+        """
+        super().__init__()
+        self.__max_attempts = max(1, max_attempts)
+        self.__delay = delay
+        self.__return_codes = set(DEFAULT_RETRY_CODES if return_codes is None else return_codes)
+        _patterns = DEFAULT_RETRY_PATTERNS if patterns is None else patterns
+        self.__patterns = [re.compile(_p, re.IGNORECASE) for _p in _patterns]
+
+    def max_attempts(self) -> int:
+        """
+        :returns: maximale Anzahl der Versuche
+        """
+        return self.__max_attempts
+
+    def is_transient(self, rc: int, stderr: str) -> bool:
+        """
+        :param rc: Return code von restic
+        :param stderr: Fehlerausgabe von restic
+        :returns: True, falls es sich um einen vorübergehenden Fehler handelt
+        """
+        if rc in self.__return_codes:
+            return True
+        if rc != RESTIC_RC_CMD_FAILED:
+            return False
+        return any(_p.search(stderr) is not None for _p in self.__patterns)
+
+    def retry_delay(self, attempt: int, rc: int, stderr: str) -> int | None:
+        """
+        :param attempt: Nummer des fehlgeschlagenen Versuchs, beginnend mit 1
+        :param rc: Return code von restic
+        :param stderr: Fehlerausgabe von restic
+        :returns: Pause in Sekunden vor dem nächsten Versuch; None, falls der Befehl nicht wiederholt werden soll
+        """
+        if attempt >= self.__max_attempts or not self.is_transient(rc, stderr):
+            return None
+        return min(self.__delay * (2 ** (attempt - 1)), MAX_RETRY_DELAY)
+
+    @classmethod
+    def for_action(cls, action: RestixAction) -> Self:
+        """
+        :param action: auszuführende Aktion
+        :returns: Regeln für die Wiederholung von restic-Befehlen für das Backup-Ziel der Aktion
+        """
+        return RetryPolicy(action.target_setting(CFG_PAR_RETRY_ATTEMPTS, DEFAULT_RETRY_ATTEMPTS),
+                           action.target_setting(CFG_PAR_RETRY_DELAY, DEFAULT_RETRY_DELAY),
+                           action.target_setting(CFG_PAR_RETRY_CODES), action.target_setting(CFG_PAR_RETRY_PATTERNS))
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Sitzungsweite Verwaltung von Passwörtern für restic-Repositories.
+Passwörter werden einmal pro Prozess ermittelt (bei pgp-verschlüsselten Dateien durch einen einzigen Aufruf von gpg,
+erst bei der ersten Übergabe an restic und damit im Thread der Hintergrund-Task) und nur im Speicher gehalten. An restic werden sie über eine geerbte Pipe übergeben, die restic als Passwort-Datei liest.
+In Aktionen steht anstelle des Passworts nur eine Referenz, die erst bei der Ausführung des restic-Befehls aufgelöst
+wird.
+"""
+
+import atexit
+import os
+import subprocess
+import tempfile
+import threading
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from restix.core.messages import *
+from restix.core.restix_exception import RestixException
+
+
+# Präfix für Referenzen auf Passwörter im Broker
+_SECRET_REF_PREFIX = 'restix-secret:'
+
+# Präfix für die Schlüssel von Passwörtern aus pgp-verschlüsselten Dateien
+_PGP_KEY_PREFIX = 'pgp:'
+
+# Verzeichnis mit den Datei-Deskriptoren des eigenen Prozesses
+_FD_DIR = '/dev/fd'
+
+# Grösse, bis zu der ein Passwort ohne Blockieren in eine Pipe geschrieben werden kann
+_MAX_PIPE_SECRET_SIZE = 4096
+
+
+class SecretBroker:
+    """
+    Hält die Passwörter der aktuellen Sitzung im Speicher.
+    Der Speicher wird nach Möglichkeit gegen Auslagern gesperrt und beim Beenden des Prozesses überschrieben.
+    Passwörter werden im GUI-Thread abgelegt und in den Threads der Hintergrund-Tasks gelesen, alle Zugriffe sind
+    deshalb durch ein Lock geschützt.
+    """
+    def __init__(self):
+        """
+        Konstruktor.
+        """
+        super().__init__()
+        self.__secrets = {}
+        self.__lock = threading.Lock()
+        # eigenes Lock für gpg, damit das Warten auf die Passphrase andere Zugriffe nicht blockiert
+        self.__decryption_lock = threading.Lock()
+
+    def put(self, key: str, value: str) -> str:
+        """
+        Legt ein Passwort ab, ein bereits vorhandenes Passwort mit gleichem Schlüssel wird ersetzt.
+        :param key: Schlüssel des Passworts, z.B. Typ und Alias der Zugangsdaten
+        :param value: Passwort
+        :returns: Referenz auf das Passwort
+        """
+        _buffer = _locked_buffer(bytearray(value.encode('utf-8')))
+        with self.__lock:
+            self._discard(key)
+            self.__secrets[key] = _buffer
+        return f'{_SECRET_REF_PREFIX}{key}'
+
+    def pgp_reference(self, file_path: str) -> str:
+        """
+        Liefert die Referenz auf das Passwort aus einer pgp-verschlüsselten Datei.
+        Die Datei wird erst beim ersten Zugriff auf das Passwort entschlüsselt, gpg wartet ggf. auf die Eingabe der
+        Passphrase und darf deshalb nicht beim Anlegen einer Aktion im GUI-Thread laufen.
+        :param file_path: Name der verschlüsselten Datei mit vollständigem Pfad
+        :returns: Referenz auf das Passwort
+        """
+        return f'{_SECRET_REF_PREFIX}{_PGP_KEY_PREFIX}{file_path}'
+
+    @contextmanager
+    def locked_secret(self, reference: str) -> Iterator[bytearray | None]:
+        """
+        Stellt ein Passwort bereit. Solange der Kontext aktiv ist, kann das Passwort nicht ersetzt oder überschrieben
+        werden; der Kontext muss deshalb kurz gehalten werden.
+        :param reference: Referenz auf ein Passwort
+        :returns: Passwort; None, falls kein Passwort zur Referenz existiert
+        :raises RestixException: falls eine pgp-verschlüsselte Datei nicht entschlüsselt werden kann
+        """
+        if not is_secret_reference(reference):
+            yield None
+            return
+        _key = reference[len(_SECRET_REF_PREFIX):]
+        if _key.startswith(_PGP_KEY_PREFIX):
+            self._decrypt(_key)
+        with self.__lock:
+            yield self.__secrets.get(_key)
+
+    def clear(self):
+        """
+        Überschreibt und entfernt alle Passwörter.
+        """
+        with self.__lock:
+            for _key in list(self.__secrets.keys()):
+                self._discard(_key)
+
+    def _decrypt(self, key: str):
+        """
+        Entschlüsselt eine pgp-verschlüsselte Passwort-Datei, falls dies noch nicht geschehen ist.
+        Greifen mehrere Threads gleichzeitig auf die Datei zu, wird gpg nur einmal aufgerufen.
+        :param key: Schlüssel des Passworts
+        :raises RestixException: falls die Datei nicht entschlüsselt werden kann
+        """
+        with self.__decryption_lock:
+            with self.__lock:
+                if key in self.__secrets:
+                    return
+            _buffer = _decrypted_buffer(key[len(_PGP_KEY_PREFIX):])
+            with self.__lock:
+                self._discard(key)
+                self.__secrets[key] = _buffer
+
+    def _discard(self, key: str):
+        """
+        Überschreibt und entfernt ein Passwort. Muss mit gesetztem Lock aufgerufen werden.
+        :param key: Schlüssel des Passworts
+        """
+        _buffer = self.__secrets.pop(key, None)
+        if _buffer is None:
+            return
+        # erst überschreiben, nach Aufheben der Sperre könnte der Speicher ausgelagert werden
+        _buffer[:] = bytes(len(_buffer))
+        _unlock_buffer(_buffer)
+
+    @classmethod
+    def instance(cls) -> 'SecretBroker':
+        """
+        :returns: Broker der aktuellen Sitzung
+        """
+        global _BROKER
+        with _BROKER_LOCK:
+            if _BROKER is None:
+                _BROKER = SecretBroker()
+                atexit.register(_BROKER.clear)
+            return _BROKER
+
+
+def is_secret_reference(value: str | None) -> bool:
+    """
+    :param value: Wert einer Option
+    :returns: True, falls der Wert eine Referenz auf ein Passwort im Broker ist
+    """
+    return isinstance(value, str) and value.startswith(_SECRET_REF_PREFIX)
+
+
+@contextmanager
+def secrets_handed_over(cmd: list[str]) -> Iterator[tuple[list[str], tuple[int, ...]]]:
+    """
+    Ersetzt Referenzen auf Passwörter in einem restic-Befehl durch Dateinamen, über die restic das Passwort lesen kann.
+    Unter Linux ist das eine Pipe, deren Lese-Ende an restic vererbt wird; auf Systemen ohne /dev/fd wird das Passwort
+    für die Dauer des Befehls in eine temporäre Datei geschrieben.
+    :param cmd: restic-Befehl, ggf. mit Referenzen auf Passwörter
+    :returns: Befehl mit aufgelösten Referenzen und die an restic zu vererbenden Datei-Deskriptoren
+    :raises RestixException: falls eine Referenz nicht aufgelöst werden kann
+    """
+    if not any(is_secret_reference(_arg) for _arg in cmd):
+        yield cmd, ()
+        return
+    _broker = SecretBroker.instance()
+    _resolved_cmd = []
+    _fds = []
+    _temp_files = []
+    try:
+        for _arg in cmd:
+            if not is_secret_reference(_arg):
+                _resolved_cmd.append(_arg)
+                continue
+            with _broker.locked_secret(_arg) as _secret:
+                if _secret is None:
+                    raise RestixException(E_SECRET_NOT_AVAILABLE, _arg[len(_SECRET_REF_PREFIX):])
+                if os.path.isdir(_FD_DIR) and len(_secret) < _MAX_PIPE_SECRET_SIZE:
+                    _read_fd, _write_fd = os.pipe()
+                    _fds.append(_read_fd)
+                    try:
+                        os.write(_write_fd, _secret)
+                    finally:
+                        os.close(_write_fd)
+                    _resolved_cmd.append(f'{_FD_DIR}/{_read_fd}')
+                else:
+                    _fd, _file_path = tempfile.mkstemp()
+                    _temp_files.append(_file_path)
+                    with os.fdopen(_fd, 'wb') as _f:
+                        _f.write(_secret)
+                    _resolved_cmd.append(_file_path)
+        yield _resolved_cmd, tuple(_fds)
+    finally:
+        for _fd in _fds:
+            os.close(_fd)
+        for _file_path in _temp_files:
+            try:
+                os.remove(_file_path)
+            except OSError:
+                pass
+
+
+def _decrypted_buffer(file_path: str) -> bytearray:
+    """
+    Entschlüsselt eine pgp-verschlüsselte Passwort-Datei.
+    :param file_path: Name der verschlüsselten Datei mit vollständigem Pfad
+    :returns: gegen Auslagern gesperrter Puffer mit dem Passwort
+    :raises RestixException: falls die Datei nicht entschlüsselt werden kann
+    """
+    try:
+        _res = subprocess.run(['gpg', '--decrypt', file_path], capture_output=True)
+    except OSError as _e:
+        raise RestixException(E_SECRET_DECRYPTION_FAILED, file_path, _e)
+    if _res.returncode != 0:
+        raise RestixException(E_SECRET_DECRYPTION_FAILED, file_path, _res.stderr.decode('utf-8', 'replace').strip())
+    return _locked_buffer(bytearray(_res.stdout))
+
+
+def _locked_buffer(buffer: bytearray) -> bytearray:
+    """
+    Sperrt den Speicher eines Puffers gegen Auslagern, soweit das Betriebssystem dies erlaubt.
+    :param buffer: Puffer
+    :returns: übergebener Puffer
+    """
+    _mlock_call('mlock', buffer)
+    return buffer
+
+
+def _unlock_buffer(buffer: bytearray):
+    """
+    Hebt die Sperre des Speichers eines Puffers auf.
+    :param buffer: Puffer
+    """
+    _mlock_call('munlock', buffer)
+
+
+def _mlock_call(function_name: str, buffer: bytearray):
+    """
+    Ruft mlock oder munlock der C-Bibliothek für einen Puffer auf. Fehler werden ignoriert.
+    :param function_name: Name der Funktion
+    :param buffer: Puffer
+    """
+    if len(buffer) == 0:
+        return
+    try:
+        import ctypes
+        import ctypes.util
+        _libc = ctypes.CDLL(ctypes.util.find_library('c'))
+        _view = (ctypes.c_char * len(buffer)).from_buffer(buffer)
+        getattr(_libc, function_name)(ctypes.c_void_p(ctypes.addressof(_view)), ctypes.c_size_t(len(buffer)))
+        del _view
+    except (AttributeError, ImportError, OSError, TypeError, ValueError):
+        pass
+
+
+# Broker der aktuellen Sitzung, wird beim ersten Aufruf von SecretBroker.instance angelegt
+_BROKER = None
+_BROKER_LOCK = threading.Lock()
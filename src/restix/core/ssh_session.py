@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Gemeinsame SSH-Verbindungen für Repositories vom Typ sftp.
+restic baut für jeden Befehl eine eigene SSH-Verbindung auf. Bei Abläufen mit mehreren restic-Befehlen (Prüfung des
+Repositories, Backup, Anzeige von Snapshots und Dateien in der GUI) kostet jeder Verbindungsaufbau 0,5 bis 2 Sekunden.
+Deshalb wird je Host eine SSH-Master-Verbindung (ControlMaster) aufgebaut, die alle restic-Befehle des Prozesses über
+die Option sftp.command mitbenutzen. Beim Beenden des Prozesses werden die Master-Verbindungen beendet.
+"""
+
+import atexit
+import shlex
+import shutil
+import subprocess
+import tempfile
+import urllib.parse
+
+
+# Standard-Programm für SSH
+SSH_EXECUTABLE = 'ssh'
+
+# Sekunden, die eine Master-Verbindung ohne Benutzung bestehen bleibt, falls der Prozess nicht regulär endet
+_CONTROL_PERSIST = 600
+
+# Timeout in Sekunden für das Beenden einer Master-Verbindung
+_EXIT_TIMEOUT = 5
+
+# Präfixe für sftp-Repositories in restic
+_SFTP_PREFIX = 'sftp:'
+_SFTP_URL_PREFIX = 'sftp://'
+
+
+class SshMultiplexer:
+    """
+    Verwaltet die SSH-Master-Verbindungen der aktuellen Sitzung.
+    """
+    def __init__(self, ssh_executable: str = SSH_EXECUTABLE):
+        """
+        Konstruktor.
+        :param ssh_executable: SSH-Programm
+        """
+        super().__init__()
+        self.__ssh_executable = ssh_executable
+        self.__control_dir = None
+        self.__hosts = set()
+
+    def sftp_command(self, repo: str) -> str | None:
+        """
+        :param repo: Repository in der Schreibweise von restic, z.B. sftp:user@host:/srv/restic
+        :returns: Kommando für die restic-Option sftp.command, das eine gemeinsame SSH-Verbindung benutzt;
+                  None, falls das Repository nicht vom Typ sftp ist
+        """
+        _host_args = sftp_host_args(repo)
+        if _host_args is None:
+            return None
+        if self.__control_dir is None:
+            # ein Unix-Socket ist auf ca. 100 Zeichen begrenzt, deshalb kein langer Pfad
+            self.__control_dir = tempfile.mkdtemp(prefix='restix-ssh-')
+        self.__hosts.add(_host_args)
+        _cmd = [self.__ssh_executable, *_host_args[:-1], *self._control_options(), _host_args[-1], '-s', 'sftp']
+        return shlex.join(_cmd)
+
+    def close(self):
+        """
+        Beendet alle Master-Verbindungen und entfernt das Verzeichnis mit den Sockets.
+        """
+        for _host_args in self.__hosts:
+            _cmd = [self.__ssh_executable, *_host_args[:-1], '-o', f'ControlPath={self._control_path()}',
+                    '-O', 'exit', _host_args[-1]]
+            try:
+                subprocess.run(_cmd, capture_output=True, timeout=_EXIT_TIMEOUT)
+            except (OSError, subprocess.SubprocessError):
+                # Master-Verbindung beendet sich spätestens nach Ablauf von ControlPersist
+                pass
+        self.__hosts.clear()
+        if self.__control_dir is not None:
+            shutil.rmtree(self.__control_dir, ignore_errors=True)
+            self.__control_dir = None
+
+    def _control_path(self) -> str:
+        """
+        :returns: Socket-Pfad der Master-Verbindungen; %C wird von ssh durch einen Hash aus Host, Port und User ersetzt
+        """
+        return f'{self.__control_dir}/%C'
+
+    def _control_options(self) -> list[str]:
+        """
+        :returns: SSH-Optionen für die Benutzung einer gemeinsamen Master-Verbindung
+        """
+        return ['-o', 'ControlMaster=auto', '-o', f'ControlPath={self._control_path()}',
+                '-o', f'ControlPersist={_CONTROL_PERSIST}']
+
+    @classmethod
+    def instance(cls) -> 'SshMultiplexer':
+        """
+        :returns: Verwaltung der SSH-Master-Verbindungen der aktuellen Sitzung
+        """
+        global _MULTIPLEXER
+        if _MULTIPLEXER is None:
+            _MULTIPLEXER = SshMultiplexer()
+            atexit.register(_MULTIPLEXER.close)
+        return _MULTIPLEXER
+
+
+def sftp_host_args(repo: str) -> tuple[str, ...] | None:
+    """
+    Ermittelt die SSH-Argumente für den Host eines sftp-Repositories, wie restic sie ohne Option sftp.command
+    verwendet.
+    :param repo: Repository in der Schreibweise von restic
+    :returns: Optionen für Port und User sowie als letztes Element der Host; None, falls das Repository nicht vom Typ
+              sftp ist oder der Host nicht ermittelt werden kann
+    """
+    if repo is None or not repo.startswith(_SFTP_PREFIX):
+        return None
+    if repo.startswith(_SFTP_URL_PREFIX):
+        # sftp://user@host:port//pfad
+        try:
+            _url = urllib.parse.urlsplit(repo)
+            _host, _port, _user = _url.hostname, _url.port, _url.username
+        except ValueError:
+            return None
+        if not _host:
+            return None
+        _args = []
+        if _port is not None:
+            _args.extend(('-p', str(_port)))
+        if _user is not None:
+            _args.extend(('-l', _user))
+        return *_args, _host
+    # sftp:user@host:pfad
+    _host, _sep, _ = repo[len(_SFTP_PREFIX):].partition(':')
+    if not _sep or not _host:
+        return None
+    _user, _at, _host_name = _host.rpartition('@')
+    return ('-l', _user, _host_name) if _at else (_host,)
+
+
+_MULTIPLEXER = None
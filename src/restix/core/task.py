@@ -37,11 +37,13 @@ Informationen und Ergebnis eines asynchron ausgeführten Hintergrund-Prozesses.
 """
 
 import threading
+import time
 
 from abc import abstractmethod
+from collections.abc import Callable
 from typing import Any
 
-from restix.core import SEVERITY_INFO, TASK_SUCCEEDED
+from restix.core import SEVERITY_ERROR, SEVERITY_INFO, TASK_SUCCEEDED
 from restix.core.messages import E_BACKGROUND_TASK_ABORTED, localized_message
 from restix.core.restix_exception import RestixException
 
@@ -50,17 +52,24 @@ class TaskProgress:
     """
     Informationen über den Fortschritt eines Hintergrund-Prozesses.
     """
-    def __init__(self, completion_status: int, message_severity: str, message_text: str):
+    def __init__(self, completion_status: int, message_severity: str, message_text: str,
+                 status_update: bool = False, message_id: str | None = None):
         """
         Konstruktor.
         :param completion_status: Fortschritt-Status in Prozent.
         :param message_severity: Schweregrad der Nachricht ('e' für Fehler, 'i' für Information, 'w' für Warnung).
         :param message_text: Text der Nachricht.
+        :param status_update: zeigt an, ob die Nachricht nur den aktuellen Stand beschreibt und durch die nächste
+                              Status-Nachricht überholt ist
+        :param message_id: ID der Nachricht; None bei Texten, die nicht aus dem Nachrichtenkatalog stammen (z.B.
+                           Ausgaben von restic)
         """
         super().__init__()
         self.__completion_status = completion_status
         self.__message_severity = message_severity
         self.__message_text = message_text
+        self.__status_update = status_update
+        self.__message_id = message_id
 
     def completion_status(self) -> int:
         """
@@ -80,20 +89,34 @@ class TaskProgress:
         """
         return self.__message_text
 
+    def is_status_update(self) -> bool:
+        """
+        :returns: True, falls die Nachricht nur den aktuellen Stand beschreibt.
+        """
+        return self.__status_update
+
+    def message_id(self) -> str | None:
+        """
+        :returns: ID der Nachricht; None, falls die Nachricht nicht aus dem Nachrichtenkatalog stammt
+        """
+        return self.__message_id
+
 
 class TaskResult:
     """
     Ergebnis eines Hintergrund-Prozesses.
     """
-    def __init__(self, code: int, summary: str):
+    def __init__(self, code: int, summary: str, details: Any = None):
         """
         Konstruktor.
         :param code: Ergebnis-Code (0 für ok, 1 für fehlgeschlagen)
         :param summary: Zusammenfassung des Ergebnisses
+        :param details: optional weitere Ergebnisdaten, z.B. die ermittelten Snapshots
         """
         super().__init__()
         self.__code = code
         self.__summary = summary
+        self.__details = details
 
     def task_succeeded(self) -> bool:
         """
@@ -107,6 +130,12 @@ class TaskResult:
         """
         return self.__summary
 
+    def details(self) -> Any:
+        """
+        :returns: weitere Ergebnisdaten; None, falls keine vorhanden sind
+        """
+        return self.__details
+
 
 class TaskExecutor:
     """
@@ -127,6 +156,79 @@ class TaskExecutor:
         pass
 
 
+class ProgressAggregator:
+    """
+    Sammelt Fortschritt-Nachrichten und liefert sie gebündelt aus, höchstens mit der angegebenen Frequenz.
+    Von aufeinanderfolgenden Status-Nachrichten innerhalb eines Bündels wird nur die letzte ausgeliefert,
+    Fehlermeldungen werden sofort ausgeliefert.
+    """
+    def __init__(self, delivery_fn: Callable[[list[TaskProgress]], None], max_deliveries_per_second: float):
+        """
+        Konstruktor.
+        :param delivery_fn: Funktion, an die die gebündelten Nachrichten übergeben werden
+        :param max_deliveries_per_second: maximale Anzahl Auslieferungen pro Sekunde
+        """
+        super().__init__()
+        self.__delivery_fn = delivery_fn
+        self.__interval = 1.0 / max_deliveries_per_second
+        self.__pending = []
+        self.__status_index = -1
+        self.__latest_delivery = 0.0
+        self.__timer = None
+        self.__lock = threading.Lock()
+
+    def add(self, progress_data: TaskProgress):
+        """
+        Nimmt eine Fortschritt-Nachricht entgegen.
+        :param progress_data: Fortschritt-Nachricht
+        """
+        with self.__lock:
+            if progress_data.is_status_update():
+                if self.__status_index >= 0:
+                    # vorherige Status-Nachricht ist überholt
+                    del self.__pending[self.__status_index]
+                self.__status_index = len(self.__pending)
+            self.__pending.append(progress_data)
+            _now = time.monotonic()
+            if progress_data.message_severity() == SEVERITY_ERROR or _now - self.__latest_delivery >= self.__interval:
+                self._deliver()
+            elif self.__timer is None:
+                # restliche Nachrichten spätestens nach Ablauf des Intervalls ausliefern
+                self.__timer = threading.Timer(self.__interval - (_now - self.__latest_delivery), self._timer_expired)
+                self.__timer.daemon = True
+                self.__timer.start()
+
+    def flush(self):
+        """
+        Liefert alle noch nicht ausgelieferten Nachrichten sofort aus.
+        """
+        with self.__lock:
+            self._deliver()
+
+    def _timer_expired(self):
+        """
+        Liefert die gesammelten Nachrichten nach Ablauf des Intervalls aus.
+        """
+        with self.__lock:
+            self.__timer = None
+            self._deliver()
+
+    def _deliver(self):
+        """
+        Liefert die gesammelten Nachrichten aus. Muss mit gesperrtem Lock aufgerufen werden.
+        """
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        if len(self.__pending) == 0:
+            return
+        _batch = self.__pending
+        self.__pending = []
+        self.__status_index = -1
+        self.__latest_delivery = time.monotonic()
+        self.__delivery_fn(_batch)
+
+
 class TaskMonitor:
     """
     Überwacht die Ausführung eines Hintergrund-Prozesses.
@@ -176,7 +278,7 @@ class TaskMonitor:
         """
         _severity = msg_id[0]
         _msg = localized_message(msg_id, *msg_args)
-        self.log_text(_msg, _severity)
+        self._emit(TaskProgress(50, _severity, _msg, False, msg_id))
 
     def log_text(self, msg: str, severity: str = SEVERITY_INFO):
         """
@@ -186,10 +288,29 @@ class TaskMonitor:
         :param severity: Schweregrad der Nachricht.
         :raises RestixException: falls der Hintergrund-Prozess abgebrochen werden soll.
         """
+        self._emit(TaskProgress(50, severity, msg))
+
+    def log_status(self, msg: str, completion_status: int = 50):
+        """
+        Sendet eine Status-Nachricht an den registrierten Handler. Status-Nachrichten beschreiben nur den aktuellen
+        Stand, der Handler muss nur die jeweils letzte anzeigen. Falls kein Handler registriert wurde, wird die
+        Nachricht auf der Konsole ausgegeben.
+        :param msg: Status-Nachricht
+        :param completion_status: Fortschritt in Prozent
+        :raises RestixException: falls der Hintergrund-Prozess abgebrochen werden soll.
+        """
+        self._emit(TaskProgress(completion_status, SEVERITY_INFO, msg, True))
+
+    def _emit(self, progress_data: TaskProgress):
+        """
+        Sendet eine Fortschritt-Nachricht an den registrierten Handler oder gibt sie auf der Konsole aus.
+        :param progress_data: Fortschritt-Nachricht
+        :raises RestixException: falls der Hintergrund-Prozess abgebrochen werden soll.
+        """
         if not self.__silent:
             if self.__progress_handler is None:
-                print(msg)
+                print(progress_data.message_text())
             else:
-                self.__progress_handler.emit_progress(TaskProgress(50, severity, msg))
+                self.__progress_handler.emit_progress(progress_data)
         if self.abort_requested():
             raise RestixException(E_BACKGROUND_TASK_ABORTED)
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Drosselung laufender Backups abhängig von der Systemlast.
+Während restic läuft, wird die Last in regelmäßigen Abständen geprüft. Überschreitet sie die Schwelle, wird restic
+mit SIGSTOP angehalten und mit SIGCONT fortgesetzt, sobald die Last unter die Schwelle zum Fortsetzen fällt.
+Als Maß dient die Pressure Stall Information des Kernels (Anteil der Zeit in Prozent, in der Prozesse auf CPU oder
+I/O warten), ohne diese die Load Average im Verhältnis zur Anzahl der CPUs.
+"""
+
+import os
+import re
+import signal
+import subprocess
+import threading
+import time
+
+from abc import abstractmethod
+from typing import Self
+
+from restix.core import *
+from restix.core.action import RestixAction
+from restix.core.messages import *
+from restix.core.restix_exception import RestixException
+from restix.core.task import TaskMonitor
+
+
+# Standardwerte für das Intervall der Lastprüfung und die maximale Dauer einer Pause in Sekunden
+DEFAULT_THROTTLE_INTERVAL = 5
+DEFAULT_THROTTLE_MAX_PAUSE = 600
+
+# Dateien mit den Lastwerten des Kernels
+PRESSURE_DIR = '/proc/pressure'
+LOADAVG_FILE = '/proc/loadavg'
+
+
+class LoadSource:
+    """
+    Abstrakte Quelle für die Systemlast.
+    """
+    def __init__(self):
+        """
+        Konstruktor.
+        """
+        super().__init__()
+
+    @abstractmethod
+    def load(self) -> float | None:
+        """
+        :returns: aktuelle Systemlast in Prozent; None, falls sie nicht ermittelt werden kann
+        """
+        pass
+
+
+class PressureLoadSource(LoadSource):
+    """
+    Systemlast aus der Pressure Stall Information des Kernels.
+    """
+    def __init__(self, resources: tuple[str, ...] = ('cpu', 'io'), pressure_dir: str = PRESSURE_DIR):
+        """
+        Konstruktor.
+        :param resources: auszuwertende Ressourcen, der höchste Wert zählt
+        :param pressure_dir: Verzeichnis mit den Dateien der Pressure Stall Information
+        """
+        super().__init__()
+        self.__files = [os.path.join(pressure_dir, _r) for _r in resources]
+
+    def load(self) -> float | None:
+        """
+        :returns: höchster Anteil der Zeit in Prozent, in der mindestens ein Prozess in den letzten 10 Sekunden auf
+                  eine der Ressourcen gewartet hat; None, falls die Dateien nicht gelesen werden können
+        """
+        _values = []
+        for _file in self.__files:
+            try:
+                with open(_file, 'r') as _f:
+                    _match = _PRESSURE_PATTERN.search(_f.read())
+            except OSError:
+                continue
+            if _match is not None:
+                _values.append(float(_match.group(1)))
+        return max(_values) if len(_values) > 0 else None
+
+
+class LoadAverageLoadSource(LoadSource):
+    """
+    Systemlast aus der Load Average der letzten Minute.
+    """
+    def __init__(self, loadavg_file: str = LOADAVG_FILE):
+        """
+        Konstruktor.
+        :param loadavg_file: Datei mit der Load Average
+        """
+        super().__init__()
+        self.__loadavg_file = loadavg_file
+
+    def load(self) -> float | None:
+        """
+        :returns: Load Average der letzten Minute in Prozent der Anzahl CPUs; None, falls sie nicht gelesen werden kann
+        """
+        try:
+            with open(self.__loadavg_file, 'r') as _f:
+                _load = float(_f.read().split()[0])
+        except (OSError, IndexError, ValueError):
+            return None
+        return _load * 100 / (os.cpu_count() or 1)
+
+
+class BackupThrottle:
+    """
+    Hält einen laufenden Prozess bei hoher Systemlast an und setzt ihn bei niedriger Last fort.
+    """
+    def __init__(self, source: LoadSource, threshold: int, resume_threshold: int | None = None,
+                 interval: float = DEFAULT_THROTTLE_INTERVAL, max_pause: int = DEFAULT_THROTTLE_MAX_PAUSE):
+        """
+        Konstruktor.
+        :param source: Quelle der Systemlast
+        :param threshold: Systemlast in Prozent, ab der der Prozess angehalten wird
+        :param resume_threshold: Systemlast in Prozent, unter der der Prozess fortgesetzt wird; bei None die Hälfte
+                                 der Schwelle zum Anhalten
+        :param interval: Abstand der Lastprüfungen in Sekunden, mindestens eine Sekunde
+        :param max_pause: maximale Dauer einer Pause in Sekunden, danach wird der Prozess trotz Last fortgesetzt
+        """
+        super().__init__()
+        self.__source = source
+        self.__threshold = threshold
+        self.__resume_threshold = threshold / 2 if resume_threshold is None else resume_threshold
+        self.__interval = max(1.0, interval)
+        self.__max_pause = max_pause
+        self.__process = None
+        self.__task_monitor = None
+        self.__paused_since = None
+        self.__stop_event = threading.Event()
+        self.__thread = None
+
+    def start(self, process: subprocess.Popen, task_monitor: TaskMonitor):
+        """
+        Beginnt mit der Überwachung der Systemlast für einen laufenden Prozess.
+        :param process: zu drosselnder Prozess
+        :param task_monitor: Fortschritt-Handler für die Protokollierung der Entscheidungen
+        """
+        self.__process = process
+        self.__task_monitor = task_monitor
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(target=self._watch, daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """
+        Beendet die Überwachung, ein angehaltener Prozess wird fortgesetzt.
+        """
+        self.__stop_event.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+        if self.__paused_since is not None:
+            self._resume()
+
+    def is_paused(self) -> bool:
+        """
+        :returns: True, falls der Prozess gerade angehalten ist
+        """
+        return self.__paused_since is not None
+
+    def check(self):
+        """
+        Prüft die Systemlast und hält den Prozess an bzw. setzt ihn fort.
+        """
+        if self.__process is None or self.__process.poll() is not None:
+            return
+        _load = self.__source.load()
+        if self.__paused_since is None:
+            if _load is not None and _load > self.__threshold:
+                self._log(I_BACKUP_PAUSED, round(_load, 1), self.__threshold)
+                self._send_signal(signal.SIGSTOP)
+                self.__paused_since = time.monotonic()
+            return
+        if time.monotonic() - self.__paused_since >= self.__max_pause:
+            self._log(W_BACKUP_PAUSE_LIMIT_REACHED, self.__max_pause)
+            self._resume()
+        elif _load is not None and _load < self.__resume_threshold:
+            self._log(I_BACKUP_RESUMED, round(_load, 1))
+            self._resume()
+
+    def _watch(self):
+        """
+        Prüft die Systemlast im festgelegten Intervall, bis die Überwachung beendet wird.
+        """
+        while not self.__stop_event.wait(self.__interval):
+            if self.__process.poll() is not None:
+                return
+            self.check()
+
+    def _resume(self):
+        """
+        Setzt den angehaltenen Prozess fort.
+        """
+        self._send_signal(signal.SIGCONT)
+        self.__paused_since = None
+
+    def _send_signal(self, sig: int):
+        """
+        Sendet ein Signal an den überwachten Prozess.
+        :param sig: Signal
+        """
+        try:
+            self.__process.send_signal(sig)
+        except OSError:
+            # Prozess ist bereits beendet
+            pass
+
+    def _log(self, msg_id: str, *msg_args):
+        """
+        Protokolliert eine Entscheidung.
+        :param msg_id: ID der Nachricht
+        :param msg_args: Argumente für die Nachricht
+        """
+        try:
+            self.__task_monitor.log(msg_id, *msg_args)
+        except RestixException:
+            # Abbruch wird vom Thread behandelt, der restic gestartet hat
+            pass
+
+    @classmethod
+    def for_action(cls, action: RestixAction, source: LoadSource | None = None) -> Self | None:
+        """
+        :param action: auszuführende Aktion
+        :param source: Quelle der Systemlast; bei None die Pressure Stall Information oder die Load Average
+        :returns: Drosselung für das Backup-Ziel der Aktion; None, falls keine Drosselung konfiguriert ist oder das
+                  Betriebssystem das Anhalten von Prozessen nicht unterstützt
+        """
+        _threshold = action.target_setting(CFG_PAR_THROTTLE_THRESHOLD)
+        if _threshold is None or not hasattr(signal, 'SIGSTOP'):
+            return None
+        if source is None:
+            source = system_load_source()
+        return BackupThrottle(source, _threshold, action.target_setting(CFG_PAR_THROTTLE_RESUME),
+                              action.target_setting(CFG_PAR_THROTTLE_INTERVAL, DEFAULT_THROTTLE_INTERVAL),
+                              action.target_setting(CFG_PAR_THROTTLE_MAX_PAUSE, DEFAULT_THROTTLE_MAX_PAUSE))
+
+
+def system_load_source() -> LoadSource:
+    """
+    :returns: Pressure Stall Information, falls der Kernel sie bereitstellt, ansonsten die Load Average
+    """
+    _pressure_source = PressureLoadSource()
+    if _pressure_source.load() is not None:
+        return _pressure_source
+    # Kernel ohne Pressure Stall Information oder mit deaktivierter Erfassung
+    return LoadAverageLoadSource()
+
+
+# Pattern für den Anteil der Wartezeit in den letzten 10 Sekunden in einer Datei der Pressure Stall Information
+_PRESSURE_PATTERN = re.compile(r'^some avg10=(\d+(?:\.\d+)?)', re.MULTILINE)
@@ -37,13 +37,16 @@ Hilfsfunktionen für restix.
 """
 
 import locale
+import marshal
 import os
 import platform
 import re
 import subprocess
 
-from typing import NoReturn
+from typing import Any, NoReturn
 
+from restix.core import (ENVA_WIN_LOCAL_APP_DATA, ENVA_XDG_CACHE_HOME, ENVA_XDG_DATA_HOME, RESTIX_CACHE_SUBDIR,
+                         RESTIX_DATA_SUBDIR)
 
 # Defaultwerte
 DEFAULT_LOCALE = 'de'
@@ -97,6 +100,107 @@ def full_config_path_of(file_path: str, config_dir_path: str) -> str | None:
     return os.path.join(config_dir_path, file_path)
 
 
+def restix_cache_path() -> str:
+    """
+    Gibt das Verzeichnis für Daten zurück, die jederzeit neu erzeugt werden können (z.B. generierte Dateien).
+    Unter Linux ist dies $XDG_CACHE_HOME/restix bzw. ~/.cache/restix, unter Windows %LOCALAPPDATA%/restix/cache.
+    Das Verzeichnis wird bei Bedarf angelegt.
+    :returns: Cache-Verzeichnis von restix
+    """
+    _win_app_data = os.environ.get(ENVA_WIN_LOCAL_APP_DATA)
+    if platform.system().lower() == OS_WINDOWS and _win_app_data is not None:
+        _path = os.path.join(_win_app_data, 'restix', 'cache')
+    else:
+        _base_path = os.environ.get(ENVA_XDG_CACHE_HOME)
+        _path = os.path.join(os.path.expanduser('~'), *RESTIX_CACHE_SUBDIR) if not _base_path \
+            else os.path.join(_base_path, 'restix')
+    os.makedirs(_path, 0o700, True)
+    return _path
+
+
+def restix_data_path() -> str:
+    """
+    Gibt das Verzeichnis für Laufzeitdaten zurück, die über mehrere restix-Aufrufe hinweg erhalten bleiben müssen.
+    Unter Linux ist dies $XDG_DATA_HOME/restix bzw. ~/.local/share/restix, unter Windows %LOCALAPPDATA%/restix.
+    Das Verzeichnis wird bei Bedarf angelegt.
+    :returns: Daten-Verzeichnis von restix
+    """
+    _win_app_data = os.environ.get(ENVA_WIN_LOCAL_APP_DATA)
+    if platform.system().lower() == OS_WINDOWS and _win_app_data is not None:
+        _path = os.path.join(_win_app_data, 'restix')
+    else:
+        _base_path = os.environ.get(ENVA_XDG_DATA_HOME)
+        _path = os.path.join(os.path.expanduser('~'), *RESTIX_DATA_SUBDIR) if not _base_path \
+            else os.path.join(_base_path, 'restix')
+    os.makedirs(_path, 0o700, True)
+    return _path
+
+
+def read_cache_file(file_name: str) -> Any:
+    """
+    Liest eine mit marshal gespeicherte Datei aus dem restix-Cache-Verzeichnis.
+    :param file_name: Name der Cache-Datei ohne Pfad
+    :returns: gespeicherte Daten; None, falls die Datei nicht existiert oder nicht gelesen werden kann
+    """
+    try:
+        with open(os.path.join(restix_cache_path(), file_name), 'rb') as _f:
+            return marshal.loads(_f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def write_cache_file(file_name: str, data: Any):
+    """
+    Speichert Daten mit marshal im restix-Cache-Verzeichnis.
+    Da Cache-Dateien jederzeit neu erzeugt werden können, werden Fehler ignoriert.
+    :param file_name: Name der Cache-Datei ohne Pfad
+    :param data: zu speichernde Daten, nur Basistypen sind erlaubt
+    """
+    try:
+        _raw_data = marshal.dumps(data)
+    except ValueError:
+        return
+    write_raw_cache_file(file_name, _raw_data)
+
+
+def write_raw_cache_file(file_name: str, data: bytes) -> str | None:
+    """
+    Speichert eine Datei unverändert im restix-Cache-Verzeichnis.
+    Die Datei wird zuerst unter einem temporären Namen geschrieben und dann umbenannt, damit parallel laufende
+    restix-Prozesse nie eine unvollständige Datei sehen. Fehler werden ignoriert.
+    :param file_name: Name der Cache-Datei ohne Pfad
+    :param data: Inhalt der Datei
+    :returns: Name der Cache-Datei mit vollständigem Pfad; None, falls die Datei nicht geschrieben werden konnte
+    """
+    try:
+        _file_path = os.path.join(restix_cache_path(), file_name)
+    except OSError:
+        return None
+    _temp_file_path = f'{_file_path}.{os.getpid()}'
+    try:
+        with open(_temp_file_path, 'wb') as _f:
+            _f.write(data)
+        os.replace(_temp_file_path, _file_path)
+        return _file_path
+    except OSError:
+        try:
+            os.remove(_temp_file_path)
+        except OSError:
+            pass
+    return None
+
+
+def remove_cache_file(file_name: str):
+    """
+    Löscht eine Datei aus dem restix-Cache-Verzeichnis, falls sie existiert.
+    :param file_name: Name der Cache-Datei ohne Pfad
+    """
+    try:
+        os.remove(os.path.join(restix_cache_path(), file_name))
+    except OSError:
+        pass
+
+
 def shell_cmd(cmd: list[str], runtime_env: dict = None) -> tuple[int, str, str]:
     """
     Führt den übergebenen Befehl in der Shell aus.
@@ -112,6 +216,18 @@ def shell_cmd(cmd: list[str], runtime_env: dict = None) -> tuple[int, str, str]:
     return _res.returncode, _res.stdout, _res.stderr
 
 
+def format_byte_count(byte_count: int | float) -> str:
+    """
+    Formatiert eine Datenmenge wie restic, z.B. '1.234 GiB'.
+    :param byte_count: Datenmenge in Bytes
+    :returns: Datenmenge mit passender Einheit
+    """
+    for _factor, _unit in ((1 << 40, 'TiB'), (1 << 30, 'GiB'), (1 << 20, 'MiB'), (1 << 10, 'KiB')):
+        if byte_count >= _factor:
+            return f'{byte_count / _factor:.3f} {_unit}'
+    return f'{int(byte_count)} B'
+
+
 def platform_locale() -> str:
     """
     :returns: Sprache des lokalen Hosts, zwei Kleinbuchstaben (z.B. 'de'); 'de', falls die Sprache nicht ermittelt
@@ -131,16 +247,22 @@ def platform_locale() -> str:
 
 def current_user() -> str:
     """
+    Der Name wird nur beim ersten Aufruf ermittelt, da er sich während der Laufzeit nicht ändert.
     :returns: Name des aktuell angemeldeten Benutzers.
     :raises RuntimeError: falls das lokale Betriebssystem nicht unterstützt wird.
     """
+    global _CURRENT_USER
+    if _CURRENT_USER is not None:
+        return _CURRENT_USER
     _operating_system = platform.system().lower()
     if _operating_system == OS_LINUX:
         import pwd
-        return pwd.getpwuid(os.getuid()).pw_name
+        _CURRENT_USER = pwd.getpwuid(os.getuid()).pw_name
+        return _CURRENT_USER
     elif _operating_system == OS_WINDOWS:
         import win32api
-        return win32api.GetUserName()
+        _CURRENT_USER = win32api.GetUserName()
+        return _CURRENT_USER
     _raise_exception(_E_OS_NOT_SUPPORTED)
 
 
@@ -174,3 +296,6 @@ def _raise_exception(exception_id: str) -> NoReturn:
 _E_OS_NOT_SUPPORTED = 'e-os-not-supported'
 _ERROR_MSGS = {_E_OS_NOT_SUPPORTED: {'de': 'Betriebssystem wird nicht unterstützt',
                                      'en': 'Operating system not supported'}}
+
+# Name des aktuell angemeldeten Benutzers, wird beim ersten Aufruf von current_user ermittelt
+_CURRENT_USER = None
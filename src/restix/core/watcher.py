@@ -0,0 +1,414 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Ereignisgesteuerte Sicherung.
+Überwacht die Include-Pfade eines Backup-Umfangs auf Änderungen und startet ein Backup, sobald sich relevante Daten
+geändert haben und für eine gewisse Zeit keine weiteren Änderungen erfolgt sind.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import platform
+import select
+import struct
+import threading
+import time
+
+from abc import abstractmethod
+from typing import Callable
+
+from restix.core import *
+from restix.core.action import RestixAction
+from restix.core.fingerprint import ExcludeFilter, include_roots, read_pattern_file
+from restix.core.messages import *
+from restix.core.restic_interface import run_backup
+from restix.core.restix_exception import RestixException
+from restix.core.task import TaskMonitor, TaskResult
+from restix.core.util import restix_cache_path, restix_data_path
+
+
+# Wartezeit ohne weitere Änderungen, bevor ein Backup gestartet wird (Sekunden)
+DEFAULT_DEBOUNCE_SECONDS = 30.0
+
+# maximale Verzögerung eines Backups bei ständigen Änderungen, als Vielfaches der Wartezeit
+_MAX_DELAY_FACTOR = 10
+
+# maximale Anzahl geänderter Verzeichnisse, die einzeln protokolliert werden
+_MAX_REPORTED_SUBTREES = 10
+
+# inotify-Konstanten aus <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_DONT_FOLLOW = 0x02000000
+_IN_EXCL_UNLINK = 0x04000000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = (_IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE |
+               _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_DONT_FOLLOW | _IN_EXCL_UNLINK)
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class ChangeSource:
+    """
+    Abstrakte Quelle für Änderungen im Dateisystem.
+    """
+    def __init__(self):
+        """
+        Konstruktor.
+        """
+        super().__init__()
+
+    @abstractmethod
+    def add_tree(self, root_path: str, exclude_filter: ExcludeFilter) -> int:
+        """
+        Überwacht ein Verzeichnis inklusive aller Unterverzeichnisse oder eine einzelne Datei.
+        :param root_path: Pfad des Verzeichnisses oder der Datei
+        :param exclude_filter: Filter für nicht zu überwachende Elemente
+        :returns: Anzahl der überwachten Elemente
+        """
+        pass
+
+    @abstractmethod
+    def read_changes(self, timeout: float) -> list[str]:
+        """
+        Wartet auf Änderungen.
+        :param timeout: maximale Wartezeit in Sekunden
+        :returns: Pfade der geänderten Elemente; leere Liste, falls innerhalb der Wartezeit nichts geändert wurde
+        """
+        pass
+
+    @abstractmethod
+    def close(self):
+        """
+        Beendet die Überwachung und gibt alle Ressourcen frei.
+        """
+        pass
+
+
+class InotifyChangeSource(ChangeSource):
+    """
+    Quelle für Änderungen im Dateisystem auf Basis von Linux inotify.
+    """
+    def __init__(self, task_monitor: TaskMonitor):
+        """
+        Konstruktor.
+        :param task_monitor: Fortschritt-Handler für Warnungen
+        :raises RestixException: falls inotify auf dem lokalen System nicht verfügbar ist
+        """
+        super().__init__()
+        if platform.system().lower() != 'linux':
+            raise RestixException(E_WATCH_NOT_SUPPORTED, platform.system())
+        self.__task_monitor = task_monitor
+        self.__libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.__fd = self.__libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.__fd < 0:
+            raise RestixException(E_WATCH_FAILED, os.strerror(ctypes.get_errno()))
+        self.__watches = {}
+        self.__exclude_filter = None
+        self.__limit_reported = False
+
+    def add_tree(self, root_path: str, exclude_filter: ExcludeFilter) -> int:
+        """
+        Überwacht ein Verzeichnis inklusive aller Unterverzeichnisse oder eine einzelne Datei.
+        :param root_path: Pfad des Verzeichnisses oder der Datei
+        :param exclude_filter: Filter für nicht zu überwachende Elemente
+        :returns: Anzahl der neu überwachten Elemente
+        """
+        self.__exclude_filter = exclude_filter
+        if exclude_filter.is_excluded(root_path):
+            return 0
+        _count = 0
+        _pending_paths = [root_path]
+        while len(_pending_paths) > 0:
+            _path = _pending_paths.pop()
+            if not self._add_watch(_path):
+                continue
+            _count += 1
+            if not os.path.isdir(_path) or os.path.islink(_path):
+                continue
+            try:
+                with os.scandir(_path) as _it:
+                    for _entry in _it:
+                        if _entry.is_dir(follow_symlinks=False) and not exclude_filter.is_excluded(_entry.path):
+                            _pending_paths.append(_entry.path)
+            except OSError:
+                pass
+        return _count
+
+    def read_changes(self, timeout: float) -> list[str]:
+        """
+        Wartet auf Änderungen.
+        Neu angelegte Verzeichnisse werden automatisch in die Überwachung aufgenommen.
+        :param timeout: maximale Wartezeit in Sekunden
+        :returns: Pfade der geänderten Elemente; leere Liste, falls innerhalb der Wartezeit nichts geändert wurde
+        """
+        _readable, _, _ = select.select([self.__fd], [], [], timeout)
+        if len(_readable) == 0:
+            return []
+        _changes = []
+        while True:
+            try:
+                _buffer = os.read(self.__fd, 65536)
+            except BlockingIOError:
+                break
+            _pos = 0
+            while _pos + _EVENT_HEADER.size <= len(_buffer):
+                _wd, _mask, _cookie, _name_len = _EVENT_HEADER.unpack_from(_buffer, _pos)
+                _pos += _EVENT_HEADER.size
+                _name = _buffer[_pos:_pos + _name_len].rstrip(b'\0')
+                _pos += _name_len
+                if _mask & _IN_Q_OVERFLOW:
+                    # Ereignisse verloren gegangen, alle überwachten Pfade als geändert betrachten
+                    _changes.extend(self.__watches.values())
+                    continue
+                _watched_path = self.__watches.get(_wd)
+                if _watched_path is None:
+                    continue
+                if _mask & _IN_IGNORED:
+                    del self.__watches[_wd]
+                    continue
+                _path = _watched_path if len(_name) == 0 else os.path.join(_watched_path, os.fsdecode(_name))
+                _changes.append(_path)
+                if _mask & _IN_ISDIR and _mask & (_IN_CREATE | _IN_MOVED_TO) and self.__exclude_filter is not None:
+                    self.add_tree(_path, self.__exclude_filter)
+        return _changes
+
+    def close(self):
+        """
+        Beendet die Überwachung und gibt alle Ressourcen frei.
+        """
+        if self.__fd >= 0:
+            os.close(self.__fd)
+            self.__fd = -1
+        self.__watches = {}
+
+    def _add_watch(self, path: str) -> bool:
+        """
+        Nimmt einen Pfad in die Überwachung auf.
+        :param path: Pfad eines Verzeichnisses oder einer Datei
+        :returns: True, falls der Pfad überwacht wird
+        """
+        _wd = self.__libc.inotify_add_watch(self.__fd, os.fsencode(path), _WATCH_MASK)
+        if _wd >= 0:
+            self.__watches[_wd] = path
+            return True
+        _errno = ctypes.get_errno()
+        if _errno == errno.ENOSPC and not self.__limit_reported:
+            # Systemlimit fs.inotify.max_user_watches erreicht
+            self.__limit_reported = True
+            self.__task_monitor.log(W_WATCH_LIMIT_REACHED, path)
+        return False
+
+
+class BackupWatcher:
+    """
+    Startet Backups aufgrund von Änderungen im Dateisystem.
+    Pro Backup-Ziel läuft maximal ein Backup, währenddessen auftretende Änderungen werden gesammelt und im
+    anschliessenden Backup gesichert.
+    """
+    def __init__(self, change_source: ChangeSource, exclude_filter: ExcludeFilter,
+                 backup_function: Callable[[list[str]], TaskResult], task_monitor: TaskMonitor,
+                 debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS):
+        """
+        Konstruktor.
+        :param change_source: Quelle für Änderungen im Dateisystem
+        :param exclude_filter: Filter für Änderungen, die kein Backup auslösen
+        :param backup_function: Funktion zum Ausführen des Backups, erhält die geänderten Verzeichnisse
+        :param task_monitor: Fortschritt-Handler, ein Abbruch beendet die Überwachung
+        :param debounce_seconds: Wartezeit ohne weitere Änderungen, bevor ein Backup gestartet wird
+        """
+        super().__init__()
+        self.__change_source = change_source
+        self.__exclude_filter = exclude_filter
+        self.__backup_function = backup_function
+        self.__task_monitor = task_monitor
+        self.__debounce_seconds = debounce_seconds
+        self.__pending_paths = set()
+        self.__first_change_time = None
+        self.__last_change_time = None
+        self.__backup_thread = None
+        self.__changed_subtrees = []
+
+    def changed_subtrees(self) -> list[list[str]]:
+        """
+        :returns: geänderte Verzeichnisse aller bisher gestarteten Backups
+        """
+        return self.__changed_subtrees
+
+    def backup_in_progress(self) -> bool:
+        """
+        :returns: True, falls gerade ein Backup läuft
+        """
+        return self.__backup_thread is not None and self.__backup_thread.is_alive()
+
+    def run(self):
+        """
+        Überwacht das Dateisystem, bis über den TaskMonitor ein Abbruch angefordert wird.
+        """
+        try:
+            while not self.__task_monitor.abort_requested():
+                self.process_changes(self.__change_source.read_changes(self.__poll_interval()))
+        finally:
+            if self.__backup_thread is not None:
+                self.__backup_thread.join()
+            self.__change_source.close()
+
+    def process_changes(self, changed_paths: list[str]):
+        """
+        Nimmt Änderungen entgegen und startet ggf. ein Backup.
+        :param changed_paths: Pfade der geänderten Elemente
+        """
+        _now = time.monotonic()
+        _relevant_paths = [_p for _p in changed_paths if not self.__exclude_filter.is_excluded(_p)]
+        if len(_relevant_paths) > 0:
+            self.__pending_paths.update(_relevant_paths)
+            self.__last_change_time = _now
+            if self.__first_change_time is None:
+                self.__first_change_time = _now
+        if len(self.__pending_paths) == 0 or self.backup_in_progress():
+            return
+        _quiet = _now - self.__last_change_time >= self.__debounce_seconds
+        _overdue = _now - self.__first_change_time >= self.__debounce_seconds * _MAX_DELAY_FACTOR
+        if _quiet or _overdue:
+            self._start_backup()
+
+    def _start_backup(self):
+        """
+        Startet ein Backup für alle bisher gesammelten Änderungen.
+        """
+        _subtrees = changed_subtrees(self.__pending_paths)
+        self.__pending_paths = set()
+        self.__first_change_time = None
+        self.__changed_subtrees.append(_subtrees)
+        _reported_subtrees = ', '.join(_subtrees[:_MAX_REPORTED_SUBTREES])
+        if len(_subtrees) > _MAX_REPORTED_SUBTREES:
+            _reported_subtrees = f'{_reported_subtrees}, ...'
+        self.__task_monitor.log(I_WATCH_CHANGES_DETECTED, len(_subtrees), _reported_subtrees)
+        self.__backup_thread = threading.Thread(target=self._run_backup, args=(_subtrees,), daemon=True)
+        self.__backup_thread.start()
+
+    def _run_backup(self, subtrees: list[str]):
+        """
+        Führt das Backup im Hintergrund aus.
+        :param subtrees: geänderte Verzeichnisse
+        """
+        try:
+            self.__backup_function(subtrees)
+        except RestixException as _e:
+            if _e.id() != E_BACKGROUND_TASK_ABORTED:
+                self.__task_monitor.log_text(str(_e), SEVERITY_ERROR)
+
+    def __poll_interval(self) -> float:
+        """
+        :returns: maximale Wartezeit auf die nächste Änderung in Sekunden
+        """
+        if len(self.__pending_paths) == 0:
+            return 1.0
+        return min(1.0, self.__debounce_seconds)
+
+
+def changed_subtrees(paths: set[str] | list[str]) -> list[str]:
+    """
+    Reduziert geänderte Pfade auf die Menge der obersten geänderten Verzeichnisse.
+    :param paths: Pfade geänderter Elemente
+    :returns: sortierte Liste der Verzeichnisse, in denen sich etwas geändert hat
+    """
+    _dirs = sorted({_p if os.path.isdir(_p) and not os.path.islink(_p) else os.path.dirname(_p) for _p in paths})
+    _subtrees = []
+    for _dir in _dirs:
+        if len(_subtrees) > 0 and (_dir == _subtrees[-1] or _dir.startswith(_subtrees[-1].rstrip(os.sep) + os.sep)):
+            continue
+        _subtrees.append(_dir)
+    return _subtrees
+
+
+def watch_target(action: RestixAction, task_monitor: TaskMonitor,
+                 backup_function: Callable[[list[str]], TaskResult] | None = None,
+                 change_source: ChangeSource | None = None, debounce_seconds: float | None = None):
+    """
+    Überwacht die Include-Pfade einer Backup-Aktion und sichert Änderungen, bis ein Abbruch angefordert oder das
+    Programm mit Strg+C beendet wird.
+    Beim Start wird einmal gesichert, um Änderungen seit dem letzten Lauf zu erfassen.
+    :param action: Backup-Aktion mit gesetzten Scope-Optionen
+    :param task_monitor: Fortschritt-Handler
+    :param backup_function: Funktion zum Ausführen des Backups; bei None wird run_backup verwendet
+    :param change_source: Quelle für Änderungen; bei None wird inotify verwendet
+    :param debounce_seconds: Wartezeit ohne weitere Änderungen, bevor ein Backup gestartet wird; bei None der Wert
+                             aus der Konfiguration des Backup-Ziels
+    :raises RestixException: falls die Überwachung nicht gestartet werden kann
+    """
+    if debounce_seconds is None:
+        debounce_seconds = float(action.target_setting(CFG_PAR_WATCH_DELAY, DEFAULT_DEBOUNCE_SECONDS))
+    if backup_function is None:
+        backup_function = lambda _subtrees: run_backup(action, task_monitor)
+    if action.option(OPTION_FILES_FROM) is None:
+        # Backup-Umfang besteht nur aus Befehlen, es gibt nichts zu überwachen
+        raise RestixException(E_WATCH_NO_INCLUDES, action.target_alias())
+    _excludes_file_path = action.option(OPTION_EXCLUDE_FILE)
+    try:
+        _excludes = [] if _excludes_file_path is None else read_pattern_file(_excludes_file_path)
+        _roots = include_roots(read_pattern_file(action.option(OPTION_FILES_FROM)))
+    except OSError as _e:
+        raise RestixException(E_WATCH_FAILED, str(_e))
+    # Änderungen durch restic und restix selbst dürfen kein Backup auslösen
+    _restic_cache_path = os.environ.get(ENVA_RESTIC_CACHE_DIR) or \
+        os.path.join(os.path.dirname(restix_cache_path()), RESTIC_EXECUTABLE)
+    _own_paths = [restix_cache_path(), restix_data_path(), _restic_cache_path]
+    _exclude_filter = ExcludeFilter(_excludes, _own_paths)
+    _change_source = InotifyChangeSource(task_monitor) if change_source is None else change_source
+    try:
+        _watch_count = 0
+        for _root in _roots:
+            _watch_count += _change_source.add_tree(_root, _exclude_filter)
+        task_monitor.log(I_WATCH_STARTED, _watch_count, action.target_alias())
+        _watcher = BackupWatcher(_change_source, _exclude_filter, backup_function, task_monitor, debounce_seconds)
+        backup_function(_roots)
+        _watcher.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        _change_source.close()
+    if not task_monitor.abort_requested():
+        task_monitor.log(I_WATCH_STOPPED, action.target_alias())
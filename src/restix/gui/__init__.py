@@ -60,7 +60,7 @@ WIDE_CONTENT_MARGIN = 20
 # Minimale Größen
 MIN_COMBO_WIDTH = 240
 MIN_MAIN_WIN_HEIGHT = 640
-MIN_MAIN_WIN_WIDTH = 6 * 128 + 64
+MIN_MAIN_WIN_WIDTH = 7 * 128 + 64
 MIN_MESSAGE_PANE_HEIGHT = 144
 
 # Style für die Umrahmung aller GroupBoxes
@@ -72,6 +72,7 @@ BUTTON_ICON_BACKUP = 'svn-commit.png'
 BUTTON_ICON_CONFIGURATION = 'configure.png'
 BUTTON_ICON_EXIT = 'application-exit.png'
 BUTTON_ICON_INFO = 'dialog-information.png'
+BUTTON_ICON_JOBS = 'job-queue.png'
 BUTTON_ICON_MAINTENANCE = 'system-run.png'
 BUTTON_ICON_RESTORE = 'svn-update.png'
 
@@ -96,6 +97,38 @@ EDITOR_STYLE = 'background-color: white'
 # Style für die Texteingabe-Felder
 TEXT_FIELD_STYLE = 'background-color: white'
 
+# maximale Anzahl an Aktualisierungen der Nachrichten-Ausgabe pro Sekunde während einer Hintergrund-Task
+MAX_PROGRESS_UPDATES_PER_SECOND = 10
+
+# Ausführungsspuren für Hintergrund-Tasks: lang laufende Repository-Operationen und interaktive Abfragen
+TASK_LANE_INTERACTIVE = 'interactive'
+TASK_LANE_REPOSITORY = 'repository'
+
+# maximale Anzahl gleichzeitig ausgeführter Hintergrund-Tasks pro Ausführungsspur
+MAX_INTERACTIVE_TASKS = 4
+MAX_REPOSITORY_TASKS = 4
+
+# Prioritäten für Hintergrund-Tasks, Tasks mit höherer Priorität werden bevorzugt gestartet
+TASK_PRIORITY_LOW = -10
+TASK_PRIORITY_NORMAL = 0
+TASK_PRIORITY_HIGH = 10
+
+# Standardwert für die Anzahl gleichzeitig ausgeführter Aufträge der Auftrags-Warteschlange
+DEFAULT_JOB_PARALLELISM = 1
+
+# Intervall in Millisekunden, in dem Laufzeit und Durchsatz der laufenden Aufträge aktualisiert werden
+JOB_REFRESH_INTERVAL = 1000
+
+# Standardwert für die maximale Anzahl an Nachrichten, die in der Nachrichten-Ausgabe vorgehalten werden
+DEFAULT_MESSAGE_LIMIT = 10000
+
+# Rotierende Protokolldatei mit allen Nachrichten der Nachrichten-Ausgabe
+MESSAGE_LOG_SUBDIR = 'logs'
+MESSAGE_LOG_FN = 'messages.log'
+MESSAGE_LOG_MAX_BYTES = 5 * 1024 * 1024
+MESSAGE_LOG_BACKUP_COUNT = 5
+MESSAGE_LOG_BUFFER_CAPACITY = 1000
+
 # Anzahl angezeigter Jahre in der Vergangenheit bei den Comboboxen zur Jahresauswahl
 PAST_YEARS_COUNT = 10
 
@@ -36,7 +36,7 @@
 GUI-Bereich für den Backup.
 """
 
-from PySide6.QtCore import Qt, QThreadPool
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QGridLayout, QGroupBox, QSizePolicy, QWidget
 
 from restix.core import *
@@ -113,7 +113,7 @@ class BackupPane(ResticActionPane):
                                                         self.restix_config, _options)
             self.__worker = Worker.for_action(_backup_action)
             self.__worker.connect_signals(self.handle_progress, self.handle_finish, self.handle_result, self.handle_error)
-            QThreadPool.globalInstance().start(self.__worker)
+            self.start_worker(self.__worker, _backup_action)
         except BaseException:
             self.button_pane.action_stopped()
 
@@ -123,4 +123,4 @@ class BackupPane(ResticActionPane):
         """
         super().cancel_button_clicked()
         if self.__worker is not None:
-            self.__worker.abort()
+            self.cancel_worker(self.__worker)
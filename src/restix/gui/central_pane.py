@@ -36,9 +36,14 @@
 Zentraler Arbeitsbereich der restix GUI.
 """
 
-from copy import deepcopy
-
+import logging
 import os.path
+import time
+
+import tomli
+import tomli_w
+
+from collections.abc import Callable
 
 from PySide6.QtCore import QPoint
 from PySide6.QtWidgets import (QApplication, QDialog, QMenu, QMessageBox, QSizePolicy,
@@ -52,6 +57,7 @@ from restix.gui import *
 from restix.gui.backup_pane import BackupPane
 from restix.gui.configuration_pane import ConfigurationPane
 from restix.gui.dialogs import AboutDialog, PdfViewerDialog, SaveConfigDialog
+from restix.gui.job_queue_pane import JobQueuePane
 from restix.gui.maintenance_pane import MaintenancePane
 from restix.gui.model import ConfigModelFactory
 from restix.gui.panes import ActionSelectionPane
@@ -72,9 +78,11 @@ class CentralPane(QWidget):
         """
         super().__init__(parent)
         self.__config = local_config
-        self.__original_config = deepcopy(local_config)
+        self.__config_snapshot = _config_snapshot(local_config)
         self.__gui_settings = gui_settings
         self.__model_factory = ConfigModelFactory(local_config)
+        self.__panes = {}
+        self.__construction_times = {}
         self.__layout = QVBoxLayout(self)
         self.__layout.setSpacing(DEFAULT_SPACING)
         self.__layout.setContentsMargins(SMALL_CONTENT_MARGIN, SMALL_CONTENT_MARGIN,
@@ -82,6 +90,7 @@ class CentralPane(QWidget):
         _actions = ((BUTTON_ICON_BACKUP, L_BACKUP, self._backup_selected, False),
                     (BUTTON_ICON_RESTORE, L_RESTORE, self._restore_selected, False),
                     (BUTTON_ICON_MAINTENANCE, L_MAINTENANCE, self._maintenance_selected, False),
+                    (BUTTON_ICON_JOBS, L_JOBS, self._jobs_selected, False),
                     (BUTTON_ICON_CONFIGURATION, L_CONFIGURATION, self._config_selected, False),
                     (BUTTON_ICON_INFO, L_INFO, self._info_selected, True),
                     (BUTTON_ICON_EXIT, L_EXIT, QApplication.instance().quit, False))
@@ -96,46 +105,76 @@ class CentralPane(QWidget):
     def save_config(self):
         """
         Speichert die lokale restix-Konfiguration, falls sie geändert wurde.
+        Wird das Speichern abgelehnt, werden die Änderungen verworfen.
+        Bereits erzeugte Panes werden in beiden Fällen über die Änderung informiert.
+        """
+        _current_snapshot = _config_snapshot(self.__config)
+        if _current_snapshot == self.__config_snapshot:
+            return
+        _dlg = SaveConfigDialog(self)
+        if _dlg.exec() == QDialog.DialogCode.Accepted:
+            try:
+                self.__config.to_file(_dlg.save_as_file_path())
+            except RestixException as _e:
+                QMessageBox.critical(self, localized_label(L_MBOX_TITLE_ERROR), str(_e),
+                                     QMessageBox.StandardButton.Ok)
+                return
+            self.__config_snapshot = _current_snapshot
+        else:
+            # Inhalt ersetzen statt neues Objekt erzeugen, alle Panes referenzieren dieselbe Konfiguration
+            self.__config.clear()
+            self.__config.update(tomli.loads(self.__config_snapshot))
+            self.__model_factory = ConfigModelFactory(self.__config)
+            self.__panes.pop(L_CONFIGURATION, None)
+        self.config_changed()
+
+    def config_changed(self):
+        """
+        Informiert alle bereits erzeugten Panes über eine Änderung der restix-Konfiguration.
         """
-        if self.__original_config != self.__config:
-            _dlg = SaveConfigDialog(self)
-            if _dlg.exec() == QDialog.DialogCode.Accepted:
-                try:
-                    self.__config.to_file(_dlg.save_as_file_path())
-                except RestixException as _e:
-                    QMessageBox.critical(self, localized_label(L_MBOX_TITLE_ERROR), str(_e),
-                                         QMessageBox.StandardButton.Ok)
-                    return
-                self.__original_config = deepcopy(self.__config)
-            else:
-                self.__config = deepcopy(self.__original_config)
+        for _label_id, _pane in self.__panes.items():
+            if _label_id != L_CONFIGURATION:
+                _pane.config_changed()
+
+    def construction_times(self) -> dict:
+        """
+        :returns: Dauer der Erzeugung in Sekunden für jede bisher erzeugte Pane, Key ist die Button-Label-ID
+        """
+        return dict(self.__construction_times)
 
     def _backup_selected(self):
         """
         Zeigt die GUI-Bereiche für Backup an.
         """
         self.save_config()
-        self._activate_pane(BackupPane(self, self.__config, self.__gui_settings), L_BACKUP)
+        self._activate_cached_pane(L_BACKUP, lambda: BackupPane(self, self.__config, self.__gui_settings))
 
     def _restore_selected(self):
         """
         Zeigt die GUI-Bereiche für Restore an.
         """
         self.save_config()
-        self._activate_pane(RestorePane(self, self.__config, self.__gui_settings), L_RESTORE)
+        self._activate_cached_pane(L_RESTORE, lambda: RestorePane(self, self.__config, self.__gui_settings))
 
     def _maintenance_selected(self):
         """
         Zeigt die GUI-Bereiche für Wartung an.
         """
         self.save_config()
-        self._activate_pane(MaintenancePane(self, self.__config, self.__gui_settings), L_MAINTENANCE)
+        self._activate_cached_pane(L_MAINTENANCE, lambda: MaintenancePane(self, self.__config, self.__gui_settings))
+
+    def _jobs_selected(self):
+        """
+        Zeigt die GUI-Bereiche für die Auftrags-Warteschlange an.
+        """
+        self.save_config()
+        self._activate_cached_pane(L_JOBS, lambda: JobQueuePane(self, self.__config, self.__gui_settings))
 
     def _config_selected(self):
         """
         Zeigt die GUI-Bereiche für Konfiguration an.
         """
-        self._activate_pane(ConfigurationPane(self, self.__model_factory), L_CONFIGURATION)
+        self._activate_cached_pane(L_CONFIGURATION, lambda: ConfigurationPane(self, self.__model_factory))
 
     def _info_selected(self, mouse_x: int, mouse_y: int):
         """
@@ -153,16 +192,40 @@ class CentralPane(QWidget):
         _context_menu.addAction(localized_label(L_MENU_ABOUT)).triggered.connect(self._show_about)
         _context_menu.exec(QPoint(mouse_x, mouse_y))
 
+    def _activate_cached_pane(self, button_label_id: str, pane_factory: Callable[[], QWidget]):
+        """
+        Zeigt die zu einem Image-Button gehörende Pane an.
+        Die Pane wird erst bei der ersten Auswahl erzeugt und danach wiederverwendet, damit laufende Aktionen
+        und deren Ausgaben beim Wechsel in andere Bereiche erhalten bleiben.
+        :param button_label_id: Resource-ID des zur Pane gehörenden Image-Buttons
+        :param pane_factory: erzeugt die Pane
+        """
+        _pane = self.__panes.get(button_label_id)
+        if _pane is None:
+            _start_time = time.perf_counter()
+            _pane = pane_factory()
+            _duration = time.perf_counter() - _start_time
+            self.__construction_times[button_label_id] = _duration
+            _LOGGER.debug('pane %s created in %.3f s', button_label_id, _duration)
+            self.__panes[button_label_id] = _pane
+        self._activate_pane(_pane, button_label_id)
+
     def _activate_pane(self, pane: QWidget, button_label_id: str):
         """
         Zeigt die übergebene Pane als Work-Pane an.
         :param pane: neue Work-Pane
         :param button_label_id: Resource-ID des zur Pane gehörenden Image-Buttons
         """
+        if pane is self.__work_pane:
+            self.__action_selection_pane.action_selected(button_label_id)
+            return
         self.__work_pane.hide()
         pane.show()
         self.__layout.replaceWidget(self.__work_pane, pane)
         self.update()
+        if not any(self.__work_pane is _p for _p in self.__panes.values()):
+            # Willkommens-Pane oder verworfene Konfigurations-Pane wird nicht mehr benötigt
+            self.__work_pane.deleteLater()
         self.__work_pane = pane
         self.__action_selection_pane.action_selected(button_label_id)
 
@@ -187,4 +250,14 @@ class CentralPane(QWidget):
         _about_dlg.exec()
 
 
+def _config_snapshot(local_config: LocalConfig) -> str:
+    """
+    :param local_config: lokale restix-Konfiguration
+    :returns: Inhalt der Konfiguration im TOML-Format, dient zur Erkennung von Änderungen
+    """
+    return tomli_w.dumps(local_config)
+
+
+_LOGGER = logging.getLogger(__name__)
+
 _WELCOME_PANE_STYLE = f'border-image: url({RESTIX_ASSETS_DIR}:restix_background.jpg)'
@@ -531,7 +531,8 @@ class ElementSelectorPane(QWidget):
         _dlg = RenameElementDialog(self, self.__group, self.__combo.currentText(), _local_config)
         if _dlg.exec() == QDialog.DialogCode.Accepted:
             _index = self.__combo.model().index(self.__combo.currentIndex(), 0)
-            _element_data = self.__combo.model().data(_index, Qt.ItemDataRole.UserRole)
+            # Kopie ändern, damit das Model die Umbenennung erkennt und an die Konfiguration meldet
+            _element_data = dict(self.__combo.model().data(_index, Qt.ItemDataRole.UserRole))
             _element_data[CFG_PAR_ALIAS] = _dlg.get_new_alias()
             self.__combo.model().setData(_index, _element_data)
 
@@ -616,6 +617,7 @@ class ScopeDetailPane(QListView):
         self.__config_path = config_path
         self.__includes_file_name = None
         self.__excludes_file_name = None
+        self.__commands = None
         self.setStyleSheet(CONFIG_LIST_VIEW_STYLE)
         _layout = QFormLayout(self)
         _layout.setContentsMargins(WIDE_CONTENT_MARGIN, WIDE_CONTENT_MARGIN, WIDE_CONTENT_MARGIN, WIDE_CONTENT_MARGIN)
@@ -662,7 +664,12 @@ class ScopeDetailPane(QListView):
         """
         :returns: Backup-Umfang
         """
-        _data = {CFG_PAR_COMMENT: self.__comment_text.text(), CFG_PAR_INCLUDES: self.__includes_file_name}
+        _data = {CFG_PAR_COMMENT: self.__comment_text.text()}
+        if self.__includes_file_name is not None:
+            _data[CFG_PAR_INCLUDES] = self.__includes_file_name
+        if self.__commands is not None:
+            # Befehle können nur in der Konfigurationsdatei bearbeitet werden
+            _data[CFG_PAR_COMMANDS] = self.__commands
         if self.__alias_text is not None:
             _data[CFG_PAR_ALIAS] = self.__alias_text.text()
         if self.__excludes_file_name is not None:
@@ -680,7 +687,8 @@ class ScopeDetailPane(QListView):
         if self.__alias_text is not None:
             self.__alias_text.setText(scope_data[CFG_PAR_ALIAS])
         self.__comment_text.setText(scope_data[CFG_PAR_COMMENT])
-        self.__includes_file_name = scope_data[CFG_PAR_INCLUDES]
+        self.__includes_file_name = scope_data.get(CFG_PAR_INCLUDES)
+        self.__commands = scope_data.get(CFG_PAR_COMMANDS)
         self.__excludes_file_name = scope_data.get(CFG_PAR_EXCLUDES)
         self.__ignores_list.clear()
         _ignores = scope_data.get(CFG_PAR_IGNORES)
@@ -55,9 +55,11 @@ from restix.core import *
 from restix.core.action import RestixAction
 from restix.core.config import LocalConfig
 from restix.core.messages import *
-from restix.core.restic_interface import find_snapshot_elements, list_snapshot_elements
 from restix.core.snapshot import Snapshot
+from restix.core.task import TaskResult
 from restix.gui import *
+from restix.gui.scheduler import TaskScheduler
+from restix.gui.worker import Worker
 
 
 class TextFileViewerDialog(QDialog):
@@ -108,6 +110,7 @@ class SnapshotViewerDialog(QDialog):
         self.__year = year
         self.__selected_elements = []
         self.__pw = pw
+        self.__lookup_worker = None
         self.setWindowTitle(localized_message(L_DLG_TITLE_SNAPSHOT_VIEWER, snapshot_id, hostname, year))
         _parent_rect = parent.contentsRect()
         self.setGeometry(_parent_rect.x() + _SNAPSHOT_VIEWER_OFFSET, _parent_rect.y() + _SNAPSHOT_VIEWER_OFFSET,
@@ -136,12 +139,12 @@ class SnapshotViewerDialog(QDialog):
         _group_layout = QVBoxLayout(_group)
         _group_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
         _viewer_buttons_layout = QHBoxLayout()
-        _show_all_button = QPushButton(localized_label(L_SHOW_ALL_ELEMENTS))
-        _show_all_button.clicked.connect(self._show_full_snapshot)
-        _viewer_buttons_layout.addWidget(_show_all_button)
-        _search_button = QPushButton(localized_label(L_SEARCH))
-        _search_button.clicked.connect(self._show_filtered_snapshot)
-        _viewer_buttons_layout.addWidget(_search_button)
+        self.__show_all_button = QPushButton(localized_label(L_SHOW_ALL_ELEMENTS))
+        self.__show_all_button.clicked.connect(self._show_full_snapshot)
+        _viewer_buttons_layout.addWidget(self.__show_all_button)
+        self.__search_button = QPushButton(localized_label(L_SEARCH))
+        self.__search_button.clicked.connect(self._show_filtered_snapshot)
+        _viewer_buttons_layout.addWidget(self.__search_button)
         self.__search_field = QLineEdit()
         self.__search_field.setStyleSheet(_STYLE_INPUT_FIELD)
         self.__search_field.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
@@ -204,11 +207,7 @@ class SnapshotViewerDialog(QDialog):
         if self.__pw is not None:
             _options[OPTION_PASSWORD] = self.__pw
         _action = RestixAction.for_action_id(ACTION_LS, self.__target_alias, self.__local_config, _options)
-        _snapshot = list_snapshot_elements(_action)
-        _element_tree = _snapshot.element_tree()
-        _tree_items = self._tree_items_for(_element_tree, os.sep)
-        self.__tree_viewer.clear()
-        self.__tree_viewer.addTopLevelItems(_tree_items)
+        self._start_lookup(_action, self._full_snapshot_listed)
 
     def _show_filtered_snapshot(self):
         """
@@ -219,14 +218,68 @@ class SnapshotViewerDialog(QDialog):
         if self.__pw is not None:
             _options[OPTION_PASSWORD] = self.__pw
         _action = RestixAction.for_action_id(ACTION_FIND, self.__target_alias, self.__local_config, _options)
-        _elements = find_snapshot_elements(_action)
+        self._start_lookup(_action, self._filtered_snapshot_listed)
+
+    def _start_lookup(self, action: RestixAction, result_slot: Callable):
+        """
+        Startet die Abfrage des Snapshot-Inhalts im Hintergrund, damit der Dialog bedienbar bleibt.
+        Die Buttons zum Anzeigen und Suchen sind bis zum Ende der Abfrage gesperrt.
+        :param action: ls- oder find-Aktion
+        :param result_slot: Handler für das Ergebnis der Abfrage
+        """
+        self.__lookup_worker = Worker.for_lookup(action)
+        self.__lookup_worker.connect_signals(None, self._lookup_finished, result_slot, self._lookup_failed)
+        self.__show_all_button.setEnabled(False)
+        self.__search_button.setEnabled(False)
+        TaskScheduler.instance().submit(self.__lookup_worker, TASK_LANE_INTERACTIVE, None, TASK_PRIORITY_HIGH)
+
+    def _full_snapshot_listed(self, result: TaskResult):
+        """
+        Wird aufgerufen, wenn alle Elemente des Snapshots ermittelt wurden.
+        :param result: Ergebnis der Abfrage mit dem Snapshot als Details
+        """
+        self._show_element_tree(result.details().element_tree())
+
+    def _filtered_snapshot_listed(self, result: TaskResult):
+        """
+        Wird aufgerufen, wenn die zum Filter passenden Elemente des Snapshots ermittelt wurden.
+        :param result: Ergebnis der Abfrage mit den gefundenen Elementen als Details
+        """
         _snapshot = Snapshot(self.__snapshot_id, datetime.datetime.now(), '')
-        _snapshot.add_elements(_elements)
-        _element_tree = _snapshot.element_tree()
-        _tree_items = self._tree_items_for(_element_tree, os.sep)
+        _snapshot.add_elements(result.details())
+        self._show_element_tree(_snapshot.element_tree())
+
+    def _show_element_tree(self, element_tree: dict):
+        """
+        Zeigt die übergebenen Elemente im Viewer an.
+        :param element_tree: Elemente des Snapshots als Baum
+        """
+        _tree_items = self._tree_items_for(element_tree, os.sep)
         self.__tree_viewer.clear()
         self.__tree_viewer.addTopLevelItems(_tree_items)
 
+    def _lookup_failed(self, exception: Exception):
+        """
+        Wird aufgerufen, wenn die Abfrage des Snapshot-Inhalts fehlgeschlagen ist.
+        :param exception: Ursache des Fehlschlags
+        """
+        QMessageBox.critical(self, localized_label(L_MBOX_TITLE_ERROR), str(exception), QMessageBox.StandardButton.Ok)
+
+    def _lookup_finished(self):
+        """
+        Wird aufgerufen, wenn die Abfrage des Snapshot-Inhalts beendet ist. Gibt die Buttons wieder frei.
+        """
+        self.__show_all_button.setEnabled(True)
+        self.__search_button.setEnabled(True)
+
+    def reject(self):
+        """
+        Bricht eine laufende Abfrage ab und schließt das Dialogfenster.
+        """
+        if self.__lookup_worker is not None:
+            TaskScheduler.instance().cancel(self.__lookup_worker)
+        super().reject()
+
     def _adopt_selection(self):
         """
         Übernimmt die im Viewer ausgewählten Elemente in eine interne Variable und schließt das Dialogfenster.
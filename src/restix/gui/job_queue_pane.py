@@ -0,0 +1,527 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+GUI-Bereich für die Auftrags-Warteschlange.
+"""
+
+import time
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QObject, QPersistentModelIndex, Qt, QTimer
+from PySide6.QtGui import QBrush
+from PySide6.QtWidgets import (QAbstractItemView, QDialog, QGridLayout, QGroupBox, QHBoxLayout, QHeaderView,
+                               QMessageBox, QPushButton, QSizePolicy, QSpinBox, QTableView, QWidget)
+
+from restix.core import *
+from restix.core.action import RestixAction
+from restix.core.config import LocalConfig
+from restix.core.job_queue import Job, JobQueue
+from restix.core.messages import *
+from restix.core.restix_exception import RestixException
+from restix.core.task import TaskResult
+from restix.gui import *
+from restix.gui.dialogs import PasswordDialog
+from restix.gui.panes import (create_checkbox, create_combo, create_dir_selector, option_label, MessagePane)
+from restix.gui.scheduler import TaskScheduler
+from restix.gui.settings import GuiSettings
+from restix.gui.worker import Worker
+
+# Auswählbare Aktionen mit Label-ID
+_JOB_ACTION_LABELS = {ACTION_BACKUP: L_BACKUP, ACTION_RESTORE: L_RESTORE, ACTION_FORGET: L_DO_YEAR_END,
+                      ACTION_UNLOCK: L_DO_UNLOCK_REPO, ACTION_INIT: L_DO_INIT_REPO}
+
+# Label-IDs für den Status eines Auftrags
+_JOB_STATE_LABELS = {JOB_STATE_PENDING: L_JOB_STATE_PENDING, JOB_STATE_RUNNING: L_JOB_STATE_RUNNING,
+                     JOB_STATE_SUCCEEDED: L_JOB_STATE_SUCCEEDED, JOB_STATE_FAILED: L_JOB_STATE_FAILED,
+                     JOB_STATE_CANCELLED: L_JOB_STATE_CANCELLED}
+
+
+class JobTableModel(QAbstractTableModel):
+    """
+    Model für die Aufträge in der Warteschlange.
+    """
+    HEADER_TEXTS = (L_TARGET, L_ACTION, L_STATE, L_DURATION, L_THROUGHPUT, L_PROGRESS)
+
+    def __init__(self, job_queue: JobQueue):
+        """
+        Konstruktor.
+        :param job_queue: die Auftrags-Warteschlange
+        """
+        super().__init__()
+        self.__job_queue = job_queue
+        self.__state_brushes = {JOB_STATE_RUNNING: QBrush(Qt.GlobalColor.blue),
+                                JOB_STATE_FAILED: QBrush(Qt.GlobalColor.red),
+                                JOB_STATE_SUCCEEDED: QBrush(Qt.GlobalColor.darkGreen)}
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, /, role = ...) -> str | QBrush | None:
+        """
+        :param index: Zelle in der TableView
+        :param role: Typ der gewünschten Information (Text oder Farbe)
+        :returns: Inhalt oder Farbe einer Zelle
+        """
+        _job = self.job(index.row())
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._cell_text(_job, index.column())
+        if role == Qt.ItemDataRole.ForegroundRole and index.column() == 2:
+            return self.__state_brushes.get(_job.state())
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, /, role = ...) -> str | None:
+        """
+        :param section: Spalte der TableView
+        :param orientation: Orientierung der Überschriften (horizontal oder vertikal)
+        :param role: Typ der gewünschten Information (Text oder Style)
+        :returns: Text für die Überschrift der angegebenen Spalte
+        """
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return localized_label(JobTableModel.HEADER_TEXTS[section])
+        return None
+
+    def rowCount(self, /, parent = ...) -> int:
+        """
+        :returns: Anzahl der Aufträge
+        """
+        return len(self.__job_queue.jobs())
+
+    def columnCount(self, /, parent = ...) -> int:
+        """
+        :returns: Anzahl der Spalten im Model
+        """
+        return len(JobTableModel.HEADER_TEXTS)
+
+    def job(self, row: int) -> Job:
+        """
+        :param row: Zeile im Model
+        :returns: Auftrag in der angegebenen Zeile
+        """
+        return self.__job_queue.jobs()[row]
+
+    def jobs_changed(self):
+        """
+        Wird aufgerufen, wenn Aufträge hinzugefügt oder entfernt wurden.
+        """
+        self.beginResetModel()
+        self.endResetModel()
+
+    def job_changed(self, job: Job):
+        """
+        Wird aufgerufen, wenn sich Status oder Fortschritt eines Auftrags geändert haben.
+        :param job: der geänderte Auftrag
+        """
+        if job not in self.__job_queue.jobs():
+            return
+        _row = self.__job_queue.jobs().index(job)
+        self.dataChanged.emit(self.index(_row, 0), self.index(_row, self.columnCount() - 1))
+
+    @staticmethod
+    def _cell_text(job: Job, column: int) -> str:
+        """
+        :param job: Auftrag
+        :param column: Spalte
+        :returns: Text für die angegebene Spalte des Auftrags
+        """
+        if column == 0:
+            return job.target_alias()
+        if column == 1:
+            return localized_label(_JOB_ACTION_LABELS.get(job.action_id(), L_ACTION))
+        if column == 2:
+            return localized_label(_JOB_STATE_LABELS[job.state()])
+        if column == 3:
+            _duration = job.duration()
+            return '' if _duration is None else time.strftime('%H:%M:%S', time.gmtime(_duration))
+        if column == 4:
+            _throughput = job.throughput()
+            return '' if _throughput is None else f'{_throughput / (1 << 20):.1f} MiB/s'
+        return job.summary() if job.is_finished() else job.status_text()
+
+
+class _JobRunner(QObject):
+    """
+    Verbindet die Signale des Workers eines Auftrags mit der Pane der Warteschlange.
+    Lebt im GUI-Thread, die Signale des Workers werden deshalb im GUI-Thread verarbeitet.
+    """
+    def __init__(self, pane: 'JobQueuePane', job: Job, worker: Worker):
+        """
+        Konstruktor.
+        :param pane: Pane der Auftrags-Warteschlange
+        :param job: ausgeführter Auftrag
+        :param worker: Worker, der den Auftrag ausführt
+        """
+        super().__init__(pane)
+        self.job = job
+        self.worker = worker
+        self.__pane = pane
+        self.__result = None
+        worker.connect_signals(self.handle_progress, self.handle_finish, self.handle_result, self.handle_error)
+
+    def handle_progress(self, progress_infos: list):
+        """
+        Übernimmt Fortschritt-Nachrichten des Workers.
+        :param progress_infos: Fortschritt-Nachrichten
+        """
+        self.__pane.job_progress(self, progress_infos)
+
+    def handle_result(self, result: TaskResult):
+        """
+        Merkt sich das Ergebnis des Workers.
+        :param result: Ergebnis der Ausführung
+        """
+        self.__result = result
+
+    def handle_error(self, exception: Exception):
+        """
+        Merkt sich den Fehler, mit dem der Worker abgebrochen ist.
+        :param exception: Ursache des Fehlschlags
+        """
+        self.__result = TaskResult(TASK_FAILED, str(exception))
+
+    def handle_finish(self):
+        """
+        Meldet das Ende des Auftrags an die Pane.
+        """
+        self.__pane.job_finished(self, self.__result)
+
+
+class JobQueuePane(QWidget):
+    """
+    Pane für die Auftrags-Warteschlange. Aufträge für beliebige Backup-Ziele werden angelegt und mit einstellbarer
+    Parallelität abgearbeitet, Aufträge für dasselbe Backup-Ziel immer nacheinander.
+    """
+    def __init__(self, parent: QWidget, local_config: LocalConfig, gui_settings: GuiSettings):
+        """
+        Konstruktor.
+        :param parent: zentrale restix Pane
+        :param local_config: lokale restix-Konfiguration
+        :param gui_settings: GUI-Einstellungen des Benutzers
+        """
+        super().__init__(parent)
+        self.__local_config = local_config
+        self.__gui_settings = gui_settings
+        self.__runners = []
+        self.__passwords = {}
+        self.__queue_active = False
+        try:
+            self.__job_queue = JobQueue.from_file()
+        except RestixException as _e:
+            QMessageBox.warning(self, localized_label(L_MBOX_TITLE_WARNING), str(_e), QMessageBox.StandardButton.Ok)
+            self.__job_queue = JobQueue()
+        _layout = QGridLayout(self)
+        _layout.setSpacing(5)
+        _layout.setColumnStretch(1, 1)
+        _layout.addWidget(self._create_new_job_pane(), 0, 0)
+        _layout.addWidget(self._create_queue_control_pane(), 0, 1)
+        self.__model = JobTableModel(self.__job_queue)
+        self.__table_view = QTableView(self)
+        self.__table_view.setModel(self.__model)
+        self.__table_view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.__table_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.__table_view.horizontalHeader().setStretchLastSection(True)
+        self.__table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.__table_view.setStyleSheet(TARGET_TABLE_STYLE)
+        _layout.addWidget(self.__table_view, 1, 0, 1, -1)
+        self.__message_pane = MessagePane(self, gui_settings.message_limit())
+        _layout.addWidget(self.__message_pane, 2, 0, 1, -1)
+        self.__refresh_timer = QTimer(self)
+        self.__refresh_timer.setInterval(JOB_REFRESH_INTERVAL)
+        self.__refresh_timer.timeout.connect(self._refresh_running_jobs)
+        self.__refresh_timer.start()
+
+    def config_changed(self):
+        """
+        Aktualisiert die Auswahl der Backup-Ziele nach einer Änderung der restix-Konfiguration.
+        Aufträge in der Warteschlange bleiben unverändert.
+        """
+        _current_alias = self.__target_combo.currentText()
+        self.__target_combo.clear()
+        for _target_alias in self.__local_config.targets():
+            self.__target_combo.addItem(_target_alias)
+        _index = self.__target_combo.findText(_current_alias)
+        if _index >= 0:
+            self.__target_combo.setCurrentIndex(_index)
+
+    def job_progress(self, runner: _JobRunner, progress_infos: list):
+        """
+        Verarbeitet Fortschritt-Nachrichten eines laufenden Auftrags.
+        Statusmeldungen von restic aktualisieren die Fortschritt-Spalte, alle anderen Nachrichten werden mit dem
+        Backup-Ziel als Präfix ausgegeben.
+        :param runner: Verbindung zum Worker des Auftrags
+        :param progress_infos: Fortschritt-Nachrichten
+        """
+        for _progress_info in progress_infos:
+            if _progress_info.is_status_update():
+                runner.job.update_status(_progress_info.message_text())
+            else:
+                self.__message_pane.show_message(_progress_info.message_severity(),
+                                                 f'[{runner.job.target_alias()}] {_progress_info.message_text()}')
+        self.__model.job_changed(runner.job)
+
+    def job_finished(self, runner: _JobRunner, result: TaskResult | None):
+        """
+        Wird aufgerufen, wenn ein Auftrag beendet ist. Startet ggf. weitere Aufträge.
+        :param runner: Verbindung zum Worker des Auftrags
+        :param result: Ergebnis des Auftrags
+        """
+        self.__runners.remove(runner)
+        runner.deleteLater()
+        _job = runner.job
+        if _job.state() == JOB_STATE_RUNNING:
+            if result is not None and result.task_succeeded():
+                _job.mark_finished(JOB_STATE_SUCCEEDED, result.summary())
+            else:
+                _job.mark_finished(JOB_STATE_FAILED, '' if result is None else result.summary())
+        _severity = SEVERITY_INFO if _job.state() == JOB_STATE_SUCCEEDED else SEVERITY_ERROR
+        self.__message_pane.show_message(_severity, f'[{_job.target_alias()}] {_job.summary()}')
+        self.__passwords.pop(_job.job_id(), None)
+        self.__model.job_changed(_job)
+        self._save_queue()
+        self._dispatch()
+
+    def _create_new_job_pane(self) -> QGroupBox:
+        """
+        :returns: Bereich zum Anlegen eines Auftrags
+        """
+        _group = QGroupBox(localized_label(L_NEW_JOB), self)
+        _group.setStyleSheet(GROUP_BOX_STYLE)
+        _layout = QGridLayout(_group)
+        _layout.setContentsMargins(WIDE_CONTENT_MARGIN, WIDE_CONTENT_MARGIN, WIDE_CONTENT_MARGIN, WIDE_CONTENT_MARGIN)
+        _layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        self.__target_combo = create_combo(_layout, L_TARGET, T_JOB_TARGET)
+        for _target_alias in self.__local_config.targets():
+            self.__target_combo.addItem(_target_alias)
+        self.__action_combo = create_combo(_layout, L_ACTION, T_JOB_ACTION)
+        for _action_id, _label_id in _JOB_ACTION_LABELS.items():
+            self.__action_combo.addItem(localized_label(_label_id), _action_id)
+        self.__restore_path_selector = create_dir_selector(_layout, L_RESTORE_PATH, T_JOB_RESTORE_PATH)
+        self.__dry_run_option = create_checkbox(_layout, L_DRY_RUN, T_JOB_DRY_RUN, False)
+        _add_button = QPushButton(localized_label(L_ADD))
+        _add_button.setToolTip(localized_label(T_JOB_ADD))
+        _add_button.clicked.connect(self._add_job)
+        _layout.addWidget(_add_button, _layout.rowCount(), 1)
+        return _group
+
+    def _create_queue_control_pane(self) -> QGroupBox:
+        """
+        :returns: Bereich zur Steuerung der Warteschlange
+        """
+        _group = QGroupBox(localized_label(L_QUEUE), self)
+        _group.setStyleSheet(GROUP_BOX_STYLE)
+        _layout = QGridLayout(_group)
+        _layout.setContentsMargins(WIDE_CONTENT_MARGIN, WIDE_CONTENT_MARGIN, WIDE_CONTENT_MARGIN, WIDE_CONTENT_MARGIN)
+        _layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        _tooltip = localized_label(T_JOB_PARALLELISM)
+        _layout.addWidget(option_label(L_PARALLEL_JOBS, _tooltip), 0, 0)
+        self.__parallelism_spin = QSpinBox()
+        self.__parallelism_spin.setRange(1, MAX_REPOSITORY_TASKS)
+        self.__parallelism_spin.setValue(min(self.__gui_settings.job_parallelism(), MAX_REPOSITORY_TASKS))
+        self.__parallelism_spin.setToolTip(_tooltip)
+        self.__parallelism_spin.valueChanged.connect(self._parallelism_changed)
+        _layout.addWidget(self.__parallelism_spin, 0, 1)
+        self.__toggle_button = QPushButton(localized_label(L_START_QUEUE))
+        self.__toggle_button.setToolTip(localized_label(T_JOB_TOGGLE_QUEUE))
+        self.__toggle_button.setStyleSheet(ACTION_BUTTON_STYLE)
+        self.__toggle_button.clicked.connect(self._toggle_queue)
+        _layout.addWidget(self.__toggle_button, 1, 0, 1, 2)
+        _buttons_layout = QHBoxLayout()
+        for _label_id, _tooltip_id, _handler in ((L_CANCEL_JOB, T_JOB_CANCEL, self._cancel_job),
+                                                 (L_REMOVE_JOB, T_JOB_REMOVE, self._remove_job),
+                                                 (L_REMOVE_FINISHED_JOBS, T_JOB_REMOVE_FINISHED,
+                                                  self._remove_finished_jobs)):
+            _button = QPushButton(localized_label(_label_id))
+            _button.setToolTip(localized_label(_tooltip_id))
+            _button.setSizePolicy(QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Maximum)
+            _button.clicked.connect(_handler)
+            _buttons_layout.addWidget(_button)
+        _layout.addLayout(_buttons_layout, 2, 0, 1, 2)
+        return _group
+
+    def _add_job(self):
+        """
+        Wird aufgerufen, wenn der 'Hinzufügen'-Button geklickt wurde. Legt einen Auftrag mit den gewählten Daten an.
+        """
+        _target_alias = self.__target_combo.currentText()
+        if len(_target_alias) == 0:
+            QMessageBox.information(self, localized_label(L_MBOX_TITLE_INFO),
+                                    localized_message(I_GUI_NO_TARGET_SELECTED), QMessageBox.StandardButton.Ok)
+            return
+        _action_id = self.__action_combo.currentData()
+        _options = {}
+        if self.__dry_run_option.isChecked():
+            _options[OPTION_DRY_RUN] = True
+        if _action_id == ACTION_FORGET:
+            # Jahresabschluss wie in der Wartung
+            _options[OPTION_KEEP_MONTHLY] = '1'
+            _options[OPTION_PRUNE] = True
+        elif _action_id == ACTION_RESTORE:
+            _restore_path = self.__restore_path_selector.selected_path()
+            if _restore_path is None:
+                _restore_path = os.path.abspath(os.sep)
+            _options[OPTION_SNAPSHOT] = RESTIC_SNAPSHOT_LATEST
+            _options[OPTION_RESTORE_PATH] = _restore_path
+        self.__job_queue.add(Job(_action_id, _target_alias, _options))
+        self.__model.jobs_changed()
+        self._save_queue()
+        self._dispatch()
+
+    def _cancel_job(self):
+        """
+        Wird aufgerufen, wenn der 'Auftrag abbrechen'-Button geklickt wurde.
+        """
+        _job = self._selected_job()
+        if _job is None:
+            return
+        for _runner in self.__runners:
+            if _runner.job is _job:
+                _job.mark_finished(JOB_STATE_CANCELLED, localized_message(E_BACKGROUND_TASK_ABORTED))
+                if TaskScheduler.instance().cancel(_runner.worker) and _runner in self.__runners:
+                    # Worker wurde vor seinem Start verworfen, ohne Freigabe wäre der Platz in der Warteschlange
+                    # dauerhaft belegt
+                    self.__runners.remove(_runner)
+                    _runner.deleteLater()
+                    self.__passwords.pop(_job.job_id(), None)
+                    self._dispatch()
+                self.__model.job_changed(_job)
+                self._save_queue()
+                return
+        if _job.state() == JOB_STATE_PENDING:
+            _job.mark_finished(JOB_STATE_CANCELLED, '')
+            self.__model.job_changed(_job)
+            self._save_queue()
+
+    def _remove_job(self):
+        """
+        Wird aufgerufen, wenn der 'Auftrag entfernen'-Button geklickt wurde.
+        """
+        _job = self._selected_job()
+        if _job is not None and self.__job_queue.remove(_job.job_id()):
+            self.__model.jobs_changed()
+            self._save_queue()
+
+    def _remove_finished_jobs(self):
+        """
+        Wird aufgerufen, wenn der 'Beendete Aufträge entfernen'-Button geklickt wurde.
+        """
+        self.__job_queue.remove_finished()
+        self.__model.jobs_changed()
+        self._save_queue()
+
+    def _toggle_queue(self):
+        """
+        Wird aufgerufen, wenn der Button zum Starten bzw. Anhalten der Warteschlange geklickt wurde.
+        Laufende Aufträge werden beim Anhalten nicht abgebrochen.
+        """
+        self.__queue_active = not self.__queue_active
+        if self.__queue_active:
+            self.__toggle_button.setText(localized_label(L_STOP_QUEUE))
+            self.__toggle_button.setStyleSheet(CANCEL_BUTTON_STYLE)
+            self._dispatch()
+        else:
+            self.__toggle_button.setText(localized_label(L_START_QUEUE))
+            self.__toggle_button.setStyleSheet(ACTION_BUTTON_STYLE)
+
+    def _parallelism_changed(self, value: int):
+        """
+        Wird aufgerufen, wenn der Benutzer die Anzahl paralleler Aufträge geändert hat.
+        :param value: Anzahl paralleler Aufträge
+        """
+        self.__gui_settings.set_job_parallelism(value)
+        self._dispatch()
+
+    def _dispatch(self):
+        """
+        Startet wartende Aufträge, solange die eingestellte Parallelität nicht erreicht ist.
+        """
+        while self.__queue_active and len(self.__runners) < self.__parallelism_spin.value():
+            _job = self.__job_queue.next_pending_job()
+            if _job is None:
+                return
+            self._start_job(_job)
+
+    def _start_job(self, job: Job):
+        """
+        Startet einen Auftrag. Bei Zugangsdaten vom Typ prompt wird das Passwort abgefragt.
+        :param job: zu startender Auftrag
+        """
+        _options = dict(job.options())
+        try:
+            _credentials = self.__local_config.credentials_for_target(job.target_alias())
+            if _credentials.get(CFG_PAR_TYPE) == CFG_VALUE_CREDENTIALS_TYPE_PROMPT:
+                _pw = self.__passwords.get(job.job_id())
+                if _pw is None:
+                    _pw_dlg = PasswordDialog(self)
+                    if _pw_dlg.exec() != QDialog.DialogCode.Accepted:
+                        job.mark_finished(JOB_STATE_CANCELLED, '')
+                        self.__model.job_changed(job)
+                        self._save_queue()
+                        return
+                    _pw = _pw_dlg.password()
+                    self.__passwords[job.job_id()] = _pw
+                _options[OPTION_PASSWORD] = _pw
+            _action = RestixAction.for_action_id(job.action_id(), job.target_alias(), self.__local_config, _options)
+            _worker = Worker.for_action(_action)
+        except RestixException as _e:
+            job.mark_finished(JOB_STATE_FAILED, str(_e))
+            self.__model.job_changed(job)
+            self._save_queue()
+            return
+        job.mark_running()
+        _runner = _JobRunner(self, job, _worker)
+        self.__runners.append(_runner)
+        self.__model.job_changed(job)
+        self._save_queue()
+        TaskScheduler.instance().submit(_worker, TASK_LANE_REPOSITORY, _action.option(OPTION_REPO))
+
+    def _refresh_running_jobs(self):
+        """
+        Aktualisiert Laufzeit und Durchsatz der laufenden Aufträge.
+        """
+        for _runner in self.__runners:
+            self.__model.job_changed(_runner.job)
+
+    def _selected_job(self) -> Job | None:
+        """
+        :returns: ausgewählter Auftrag; None, falls nichts ausgewählt wurde
+        """
+        _selection = self.__table_view.selectionModel().selectedRows()
+        if len(_selection) == 0:
+            return None
+        return self.__model.job(_selection[0].row())
+
+    def _save_queue(self):
+        """
+        Speichert die Warteschlange, Fehler werden im Nachrichtenbereich ausgegeben.
+        """
+        try:
+            self.__job_queue.save()
+        except RestixException as _e:
+            self.__message_pane.show_message(SEVERITY_WARNING, str(_e))
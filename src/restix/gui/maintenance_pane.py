@@ -39,7 +39,7 @@ GUI-Bereich für die Wartung.
 import datetime
 import platform
 
-from PySide6.QtCore import Qt, QThreadPool
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QGridLayout, QGroupBox, QMessageBox, QWidget
 
 from restix.core import *
@@ -131,7 +131,7 @@ class MaintenancePane(ResticActionPane):
             QMessageBox.information(self, localized_label(L_MBOX_TITLE_ERROR), str(_e), QMessageBox.StandardButton.Ok)
             self.button_pane.action_stopped()
             return
-        QThreadPool.globalInstance().start(self.__worker)
+        self.start_worker(self.__worker, _init_action)
 
     def _unlock_repo_clicked(self):
         """
@@ -151,7 +151,7 @@ class MaintenancePane(ResticActionPane):
             QMessageBox.information(self, localized_label(L_MBOX_TITLE_ERROR), str(_e), QMessageBox.StandardButton.Ok)
             self.button_pane.action_stopped()
             return
-        QThreadPool.globalInstance().start(self.__worker)
+        self.start_worker(self.__worker, _unlock_action)
 
     def _year_end_clicked(self):
         """
@@ -175,7 +175,7 @@ class MaintenancePane(ResticActionPane):
             QMessageBox.information(self, localized_label(L_MBOX_TITLE_ERROR), str(_e), QMessageBox.StandardButton.Ok)
             self.button_pane.action_stopped()
             return
-        QThreadPool.globalInstance().start(self.__worker)
+        self.start_worker(self.__worker, _forget_action)
 
     def cancel_button_clicked(self):
         """
@@ -183,4 +183,4 @@ class MaintenancePane(ResticActionPane):
         """
         super().cancel_button_clicked()
         if self.__worker is not None:
-            self.__worker.abort()
+            self.cancel_worker(self.__worker)
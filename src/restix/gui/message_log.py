@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Model für die Nachrichten-Ausgabe der restix GUI.
+Die Nachrichten werden in einem Ringpuffer begrenzter Größe gehalten, die älteste Nachricht wird verdrängt, sobald
+der Puffer voll ist. Zusätzlich werden alle Nachrichten in eine rotierende Protokolldatei geschrieben, damit die
+vollständige Ausgabe auch nach Verdrängung aus dem Ringpuffer noch nachvollzogen werden kann.
+"""
+
+import logging
+import logging.handlers
+import os
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QPersistentModelIndex, QSortFilterProxyModel, Qt
+from PySide6.QtGui import QBrush
+
+from restix.core import SEVERITY_ERROR, SEVERITY_INFO, SEVERITY_WARNING
+from restix.core.util import restix_data_path
+from restix.gui import (MESSAGE_LOG_BACKUP_COUNT, MESSAGE_LOG_BUFFER_CAPACITY, MESSAGE_LOG_FN, MESSAGE_LOG_MAX_BYTES,
+                        MESSAGE_LOG_SUBDIR)
+
+# Rolle, unter der das Model den Schweregrad einer Nachricht liefert
+SEVERITY_ROLE = Qt.ItemDataRole.UserRole
+
+# Name des Loggers für die Protokolldatei
+_MESSAGE_LOGGER_NAME = 'restix.gui.messages'
+
+# Log-Level für die Schweregrade der Nachrichten
+_LOG_LEVELS = {SEVERITY_ERROR: logging.ERROR, SEVERITY_WARNING: logging.WARNING, SEVERITY_INFO: logging.INFO}
+
+
+class MessageLogModel(QAbstractListModel):
+    """
+    Model für die Nachrichten-Ausgabe, die Nachrichten liegen in einem Ringpuffer fester Größe.
+    """
+    def __init__(self, max_message_count: int, logger: logging.Logger | None = None):
+        """
+        Konstruktor.
+        :param max_message_count: maximale Anzahl vorgehaltener Nachrichten
+        :param logger: optional Logger, an den alle Nachrichten zusätzlich ausgegeben werden
+        """
+        super().__init__()
+        self.__capacity = max(1, max_message_count)
+        self.__entries = [None] * self.__capacity
+        self.__first = 0
+        self.__count = 0
+        self.__logger = logger
+        self.__brushes = {SEVERITY_ERROR: QBrush(Qt.GlobalColor.red), SEVERITY_WARNING: QBrush(Qt.GlobalColor.blue),
+                          SEVERITY_INFO: QBrush(Qt.GlobalColor.black)}
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, /, role = ...) -> str | QBrush | None:
+        """
+        :param index: Zeile in der ListView
+        :param role: Typ der gewünschten Information (Text, Farbe oder Schweregrad)
+        :returns: Text, Farbe oder Schweregrad der Nachricht
+        """
+        if not index.isValid() or index.row() >= self.__count:
+            return None
+        _severity, _text = self.message(index.row())
+        if role == Qt.ItemDataRole.DisplayRole:
+            return _text
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self.__brushes.get(_severity, self.__brushes[SEVERITY_INFO])
+        if role == SEVERITY_ROLE:
+            return _severity
+        return None
+
+    def rowCount(self, /, parent = ...) -> int:
+        """
+        :returns: Anzahl der vorgehaltenen Nachrichten
+        """
+        return self.__count
+
+    def capacity(self) -> int:
+        """
+        :returns: maximale Anzahl vorgehaltener Nachrichten
+        """
+        return self.__capacity
+
+    def message(self, row: int) -> tuple[str, str]:
+        """
+        :param row: Zeile im Model
+        :returns: Schweregrad und Text der Nachricht in der angegebenen Zeile
+        """
+        return self.__entries[(self.__first + row) % self.__capacity]
+
+    def append(self, severity: str, text: str):
+        """
+        Fügt eine Nachricht an. Ist der Ringpuffer voll, wird die älteste Nachricht verdrängt.
+        :param severity: Schweregrad der Nachricht (Information, Warnung, Fehler).
+        :param text: Nachrichtentext
+        """
+        if self.__count == self.__capacity:
+            self.beginRemoveRows(QModelIndex(), 0, 0)
+            self.__entries[self.__first] = None
+            self.__first = (self.__first + 1) % self.__capacity
+            self.__count -= 1
+            self.endRemoveRows()
+        self.beginInsertRows(QModelIndex(), self.__count, self.__count)
+        self.__entries[(self.__first + self.__count) % self.__capacity] = (severity, text)
+        self.__count += 1
+        self.endInsertRows()
+        self._log(severity, text)
+
+    def replace_last(self, text: str):
+        """
+        Ersetzt den Text der zuletzt angefügten Nachricht.
+        :param text: neuer Nachrichtentext
+        """
+        if self.__count == 0:
+            return
+        _pos = (self.__first + self.__count - 1) % self.__capacity
+        _severity = self.__entries[_pos][0]
+        self.__entries[_pos] = (_severity, text)
+        _index = self.index(self.__count - 1)
+        self.dataChanged.emit(_index, _index)
+        self._log(_severity, text)
+
+    def clear(self):
+        """
+        Löscht alle Nachrichten aus dem Model.
+        """
+        self.beginResetModel()
+        self.__entries = [None] * self.__capacity
+        self.__first = 0
+        self.__count = 0
+        self.endResetModel()
+
+    def flush_log(self):
+        """
+        Schreibt gepufferte Nachrichten in die Protokolldatei.
+        """
+        if self.__logger is None:
+            return
+        for _handler in self.__logger.handlers:
+            _handler.flush()
+
+    def _log(self, severity: str, text: str):
+        """
+        Gibt eine Nachricht an den Logger aus, falls einer definiert ist.
+        :param severity: Schweregrad der Nachricht (Information, Warnung, Fehler).
+        :param text: Nachrichtentext
+        """
+        if self.__logger is not None:
+            self.__logger.log(_LOG_LEVELS.get(severity, logging.INFO), text)
+
+
+class SeverityFilterModel(QSortFilterProxyModel):
+    """
+    Filter für die Nachrichten-Ausgabe, lässt nur Nachrichten mit bestimmten Schweregraden durch.
+    """
+    def __init__(self, source_model: MessageLogModel):
+        """
+        Konstruktor.
+        :param source_model: Model mit allen Nachrichten
+        """
+        super().__init__()
+        self.__severities = None
+        self.setSourceModel(source_model)
+
+    def set_severities(self, severities: tuple[str, ...] | None):
+        """
+        Setzt die Schweregrade der anzuzeigenden Nachrichten.
+        :param severities: anzuzeigende Schweregrade; None, falls alle Nachrichten angezeigt werden sollen
+        """
+        self.__severities = severities
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex | QPersistentModelIndex, /) -> bool:
+        """
+        :param source_row: Zeile im Model mit allen Nachrichten
+        :param source_parent: nicht verwendet
+        :returns: True, falls die Nachricht angezeigt werden soll
+        """
+        if self.__severities is None:
+            return True
+        return self.sourceModel().message(source_row)[0] in self.__severities
+
+
+def message_logger(log_dir: str | None = None) -> logging.Logger:
+    """
+    Liefert den Logger für die Protokolldatei der Nachrichten-Ausgabe.
+    Die Nachrichten werden im Speicher gepuffert und erst bei Fehlermeldungen, vollem Puffer oder explizitem flush
+    in die rotierende Protokolldatei geschrieben. Kann die Datei nicht angelegt werden, werden die Nachrichten
+    verworfen.
+    :param log_dir: optional Verzeichnis für die Protokolldatei; standardmäßig im restix-Datenverzeichnis
+    :returns: Logger für die Nachrichten-Ausgabe
+    """
+    _logger = logging.getLogger(_MESSAGE_LOGGER_NAME)
+    if _logger.handlers:
+        return _logger
+    _logger.setLevel(logging.INFO)
+    _logger.propagate = False
+    try:
+        if log_dir is None:
+            log_dir = os.path.join(restix_data_path(), MESSAGE_LOG_SUBDIR)
+        os.makedirs(log_dir, 0o700, True)
+        _file_handler = logging.handlers.RotatingFileHandler(os.path.join(log_dir, MESSAGE_LOG_FN),
+                                                             maxBytes=MESSAGE_LOG_MAX_BYTES,
+                                                             backupCount=MESSAGE_LOG_BACKUP_COUNT, encoding='utf-8')
+        _file_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+        _logger.addHandler(logging.handlers.MemoryHandler(MESSAGE_LOG_BUFFER_CAPACITY, logging.ERROR, _file_handler))
+    except OSError:
+        _logger.addHandler(logging.NullHandler())
+    return _logger
@@ -41,18 +41,22 @@ import time
 from collections.abc import Callable
 
 from PySide6.QtCore import QSize, Qt, Signal, QObject, QAbstractTableModel, QModelIndex
-from PySide6.QtGui import QMouseEvent, QBrush, QFont
+from PySide6.QtGui import QMouseEvent, QFont
 from PySide6.QtWidgets import (QAbstractItemView, QCheckBox, QComboBox, QDialog, QFileDialog, QGridLayout, QGroupBox,
-                               QLabel, QLineEdit, QListWidget, QListWidgetItem, QMessageBox, QPushButton,
+                               QLabel, QLineEdit, QListView, QMessageBox, QPushButton,
                                QSizePolicy, QTableView, QVBoxLayout, QWidget)
 
 from restix.core import *
+from restix.core.action import RestixAction
 from restix.core.config import LocalConfig
 from restix.core.messages import *
 from restix.core.task import TaskProgress, TaskResult
 from restix.gui import *
 from restix.gui.dialogs import PasswordDialog
+from restix.gui.message_log import MessageLogModel, SeverityFilterModel, message_logger
+from restix.gui.scheduler import TaskScheduler
 from restix.gui.settings import GuiSettings
+from restix.gui.worker import Worker
 
 
 class TargetModel(QAbstractTableModel):
@@ -114,6 +118,15 @@ class TargetModel(QAbstractTableModel):
         """
         return self._targets[index.row()]
 
+    def reload(self, local_config: LocalConfig):
+        """
+        Übernimmt die Backup-Ziele aus der übergebenen Konfiguration, z.B. nach Änderung der Konfiguration.
+        :param local_config: die restix-Konfiguration
+        """
+        self.beginResetModel()
+        self._targets = local_config.get(CFG_GROUP_TARGET)
+        self.endResetModel()
+
 
 class TargetTableView(QTableView):
     """
@@ -146,6 +159,20 @@ class TargetTableView(QTableView):
             return self._model.target(_selection[0])
         return None
 
+    def reload(self, local_config: LocalConfig):
+        """
+        Lädt die Backup-Ziele neu. Ein ausgewähltes Backup-Ziel bleibt ausgewählt, falls es noch existiert.
+        :param local_config: die restix-Konfiguration
+        """
+        _selected_target = self.selected_target()
+        _selected_alias = None if _selected_target is None else _selected_target[CFG_PAR_ALIAS]
+        self._model.reload(local_config)
+        self.resizeColumnsToContents()
+        for _row in range(self._model.rowCount()):
+            if self._model.target(self._model.index(_row, 0))[CFG_PAR_ALIAS] == _selected_alias:
+                self.selectRow(_row)
+                break
+
 
 class ImageButtonSignals(QObject):
     """
@@ -333,19 +360,41 @@ class ActionSelectionPane(QWidget):
 class MessagePane(QWidget):
     """
     Pane zur Ausgabe von Nachrichten.
+    Es werden höchstens die letzten max_message_count Nachrichten angezeigt, die vollständige Ausgabe steht in der
+    Protokolldatei im restix-Datenverzeichnis.
     """
-    def __init__(self, parent: QWidget):
+    # Filter für die Nachrichten-Ausgabe: Label-ID und anzuzeigende Schweregrade
+    SEVERITY_FILTERS = ((L_SHOW_ALL_MESSAGES, None),
+                        (L_SHOW_WARNINGS_AND_ERRORS, (SEVERITY_WARNING, SEVERITY_ERROR)),
+                        (L_SHOW_ERRORS_ONLY, (SEVERITY_ERROR,)))
+
+    def __init__(self, parent: QWidget, max_message_count: int = DEFAULT_MESSAGE_LIMIT):
         """
         Konstruktor.
         :param parent: übergeordnete Pane
+        :param max_message_count: maximale Anzahl angezeigter Nachrichten
         """
         super().__init__(parent)
         _layout = QVBoxLayout(self)
-        self.__messages = QListWidget(self)
         _layout.setContentsMargins(0, DEFAULT_CONTENT_MARGIN, 0, 0)
+        self.__filter_combo = QComboBox(self)
+        for _label_id, _severities in MessagePane.SEVERITY_FILTERS:
+            self.__filter_combo.addItem(localized_label(_label_id), _severities)
+        self.__filter_combo.setToolTip(localized_label(T_MESSAGE_FILTER))
+        self.__filter_combo.currentIndexChanged.connect(self._filter_changed)
+        _layout.addWidget(self.__filter_combo, alignment=Qt.AlignmentFlag.AlignRight)
+        self.__model = MessageLogModel(max_message_count, message_logger())
+        self.__filter_model = SeverityFilterModel(self.__model)
+        self.__messages = QListView(self)
+        self.__messages.setModel(self.__filter_model)
+        # alle Zeilen gleich hoch, damit die View nur die sichtbaren Zeilen vermessen muss
+        self.__messages.setUniformItemSizes(True)
+        self.__messages.setLayoutMode(QListView.LayoutMode.Batched)
+        self.__messages.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.__messages.setStyleSheet(MESSAGE_PANE_STYLE)
         self.__messages.setMinimumHeight(MIN_MESSAGE_PANE_HEIGHT)
         self.__messages.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.__last_is_status = False
         _layout.addWidget(self.__messages)
 
     def show_message(self, severity: str, text: str):
@@ -354,21 +403,39 @@ class MessagePane(QWidget):
         :param severity: Schweregrad der Nachricht (Information, Warnung, Fehler).
         :param text: Nachrichtentext
         """
-        _info = QListWidgetItem(text)
-        if severity == SEVERITY_ERROR:
-            _info.setForeground(QBrush(Qt.GlobalColor.red))
-        elif severity == SEVERITY_WARNING:
-            _info.setForeground(QBrush(Qt.GlobalColor.blue))
-        else:
-            _info.setForeground(QBrush(Qt.GlobalColor.black))
-        self.__messages.addItem(_info)
+        self.__model.append(severity, text)
+        self.__last_is_status = False
+        self.__model.flush_log()
+        self.__messages.scrollToBottom()
+
+    def show_progress(self, progress_infos: list[TaskProgress]):
+        """
+        Gibt mehrere Fortschritt-Nachrichten aus.
+        :param progress_infos: Fortschritt-Nachrichten
+        """
+        for _progress_info in progress_infos:
+            if _progress_info.is_status_update() and self.__last_is_status:
+                # vorherige Status-Nachricht ist überholt
+                self.__model.replace_last(_progress_info.message_text())
+                continue
+            self.__model.append(_progress_info.message_severity(), _progress_info.message_text())
+            self.__last_is_status = _progress_info.is_status_update()
         self.__messages.scrollToBottom()
 
     def clear(self):
         """
         Löscht alle Nachrichten aus der Pane.
         """
-        self.__messages.clear()
+        self.__last_is_status = False
+        self.__model.clear()
+
+    def _filter_changed(self, index: int):
+        """
+        Wird aufgerufen, wenn der Benutzer einen anderen Filter für die Nachrichten auswählt.
+        :param index: Index des gewählten Filters
+        """
+        self.__filter_model.set_severities(self.__filter_combo.itemData(index))
+        self.__messages.scrollToBottom()
 
 
 class ActionButtonPane(QWidget):
@@ -457,6 +524,12 @@ class TargetSelectionPane(QGroupBox):
             self.gui_settings.set_latest_target(_selected_target[CFG_PAR_ALIAS])
         return _selected_target
 
+    def config_changed(self):
+        """
+        Aktualisiert die Tabelle der Backup-Ziele nach einer Änderung der restix-Konfiguration.
+        """
+        self._table_view.reload(self.restix_config)
+
 
 class ResticActionPane(QWidget):
     """
@@ -490,7 +563,7 @@ class ResticActionPane(QWidget):
                                             start_handlers, self.cancel_button_clicked)
         self.pane_layout.addWidget(self.button_pane, 1, 1)
         # unten Ausgabetexte
-        self.message_pane = MessagePane(self)
+        self.message_pane = MessagePane(self, gui_settings.message_limit())
         self.pane_layout.addWidget(self.message_pane, 2, 0, 1, -1)
 
     def start_button_clicked(self) -> tuple[bool, str]:
@@ -523,6 +596,35 @@ class ResticActionPane(QWidget):
         """
         self.button_pane.action_stopped()
 
+    @staticmethod
+    def start_worker(worker: Worker, action: RestixAction):
+        """
+        Übergibt einen Worker für eine Repository-Operation an den Scheduler.
+        Läuft bereits eine andere Operation auf dem Repository der Aktion, wird der Worker erst danach gestartet.
+        :param worker: auszuführender Worker
+        :param action: vom Worker ausgeführte Aktion
+        """
+        TaskScheduler.instance().submit(worker, TASK_LANE_REPOSITORY, action.option(OPTION_REPO))
+
+    @staticmethod
+    def cancel_worker(worker: Worker):
+        """
+        Bricht einen Worker ab oder entfernt ihn aus der Warteschlange des Schedulers.
+        :param worker: abzubrechender Worker
+        """
+        TaskScheduler.instance().cancel(worker)
+
+    def config_changed(self):
+        """
+        Wird aufgerufen, wenn die restix-Konfiguration gespeichert oder verworfen wurde.
+        Aktualisiert nur die Auswahl der Backup-Ziele, laufende Aktionen und Ausgaben bleiben erhalten.
+        """
+        self.target_selection_pane.config_changed()
+        if self.target_selection_pane.selected_target() is None:
+            self.selected_target = None
+            return
+        self.target_selected()
+
     def target_selected(self):
         """
         Wird aufgerufen, wenn der Benutzer ein Backup-Ziel auswählt.
@@ -531,12 +633,12 @@ class ResticActionPane(QWidget):
         if self.__target_selected_handler is not None:
             self.__target_selected_handler()
 
-    def handle_progress(self, progress_info: TaskProgress):
+    def handle_progress(self, progress_infos: list[TaskProgress]):
         """
-        Zeigt eine Fortschritt-Nachricht in der MessagePane an.
-        :param progress_info: Daten der Fortschritt-Nachricht.
+        Zeigt Fortschritt-Nachrichten in der MessagePane an.
+        :param progress_infos: Daten der Fortschritt-Nachrichten.
         """
-        self.message_pane.show_message(progress_info.message_severity(), progress_info.message_text())
+        self.message_pane.show_progress(progress_infos)
 
     def handle_finish(self):
         """
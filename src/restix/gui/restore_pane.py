@@ -40,7 +40,7 @@ import datetime
 import platform
 import tempfile
 
-from PySide6.QtCore import Qt, QThreadPool
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QDialog, QGridLayout, QGroupBox, QMessageBox, QPushButton, QRadioButton, QWidget
 
 from restix.core import *
@@ -48,13 +48,13 @@ from restix.core.action import RestixAction
 from restix.core.restix_exception import RestixException
 from restix.core.config import LocalConfig
 from restix.core.messages import *
-from restix.core.restic_interface import determine_snapshots
-from restix.core.task import TaskMonitor
-from restix.gui import PAST_YEARS_COUNT, WIDE_CONTENT_MARGIN
+from restix.core.task import TaskResult
+from restix.gui import PAST_YEARS_COUNT, TASK_LANE_INTERACTIVE, TASK_PRIORITY_HIGH, WIDE_CONTENT_MARGIN
 from restix.gui.dialogs import PasswordDialog, SnapshotViewerDialog
 from restix.gui.panes import (create_checkbox, create_combo, create_dir_selector, create_text,
                               GROUP_BOX_STYLE, option_label, ResticActionPane)
 from restix.gui.settings import GuiSettings
+from restix.gui.scheduler import TaskScheduler
 from restix.gui.worker import Worker
 
 
@@ -72,6 +72,7 @@ class RestoreOptionsPane(QGroupBox):
         self.__local_config = local_config
         self.__target_alias = None
         self.__selected_elements = None
+        self.__lookup_worker = None
         self.__pw = ''
         self.setStyleSheet(GROUP_BOX_STYLE)
         _layout = QGridLayout(self)
@@ -162,14 +163,8 @@ class RestoreOptionsPane(QGroupBox):
         """
         if target is None:
             return
-        try:
-            self.__target_alias = target[CFG_PAR_ALIAS]
-            _snapshots = self._determine_snapshots()
-            self.fill_snapshot_combo(_snapshots)
-        except RestixException as _e:
-            QMessageBox.critical(self, localized_label(L_MBOX_TITLE_ERROR),
-                                 localized_message(E_RESTIC_CALL_FAILED, ACTION_SNAPSHOTS, str(_e)),
-                                 QMessageBox.StandardButton.Ok)
+        self.__target_alias = target[CFG_PAR_ALIAS]
+        self._request_snapshots()
 
     def _year_selected(self, index: int):
         """
@@ -178,13 +173,7 @@ class RestoreOptionsPane(QGroupBox):
         """
         if index < 0:
             return
-        try:
-            _snapshots = self._determine_snapshots()
-            self.fill_snapshot_combo(_snapshots)
-        except RestixException as _e:
-            QMessageBox.critical(self, localized_label(L_MBOX_TITLE_ERROR),
-                                 localized_message(E_RESTIC_CALL_FAILED, ACTION_SNAPSHOTS, str(_e)),
-                                 QMessageBox.StandardButton.Ok)
+        self._request_snapshots()
 
     def _host_edited(self):
         """
@@ -192,13 +181,7 @@ class RestoreOptionsPane(QGroupBox):
         """
         if len(self.__host_text.text()) == 0:
             return
-        try:
-            _snapshots = self._determine_snapshots()
-            self.fill_snapshot_combo(_snapshots)
-        except RestixException as _e:
-            QMessageBox.critical(self, localized_label(L_MBOX_TITLE_ERROR),
-                                 localized_message(E_RESTIC_CALL_FAILED, ACTION_SNAPSHOTS, str(_e)),
-                                 QMessageBox.StandardButton.Ok)
+        self._request_snapshots()
 
     def _scope_button_clicked(self):
         """
@@ -221,14 +204,14 @@ class RestoreOptionsPane(QGroupBox):
             return
         self.__selected_elements = _snapshot_viewer.selected_elements()
 
-    def _determine_snapshots(self) -> list[str]:
+    def _request_snapshots(self):
         """
-        Ermittelt die Snapshots in einem restic-Repository.
-        :returns: alle Snapshots im Repository für den aktuellen Benutzer, Jahr und Host
+        Startet die Ermittlung der Snapshots für das aktuelle Backup-Ziel, Jahr und Host im Hintergrund.
+        Eine noch laufende Ermittlung mit veralteten Parametern wird abgebrochen, ihr Ergebnis ignoriert.
         """
-        _year = self.__year_combo.currentText()
-        _host = self.__host_text.text()
-        _options = {OPTION_YEAR: _year, OPTION_HOST: _host}
+        if self.__target_alias is None:
+            return
+        _options = {OPTION_YEAR: self.__year_combo.currentText(), OPTION_HOST: self.__host_text.text()}
         _credentials = self.__local_config.credentials_for_target(self.__target_alias)
         if _credentials.get(CFG_PAR_TYPE) == CFG_VALUE_CREDENTIALS_TYPE_PROMPT:
             # Passwort einlesen
@@ -236,12 +219,47 @@ class RestoreOptionsPane(QGroupBox):
             if _pw_dlg.exec() == QDialog.DialogCode.Accepted:
                 self.__pw = _pw_dlg.password()
                 _options[OPTION_PASSWORD] = self.__pw
-        _snapshots_action = RestixAction.for_action_id(ACTION_SNAPSHOTS, self.__target_alias,
-                                                       self.__local_config, _options)
-        _snapshots = determine_snapshots(_snapshots_action, TaskMonitor(None, True))
-        _combo_data = [_s.combo_label() for _s in _snapshots]
+        if self.__lookup_worker is not None:
+            TaskScheduler.instance().cancel(self.__lookup_worker)
+        self.__snapshot_combo.clear()
+        try:
+            _snapshots_action = RestixAction.for_action_id(ACTION_SNAPSHOTS, self.__target_alias,
+                                                           self.__local_config, _options)
+            self.__lookup_worker = Worker.for_lookup(_snapshots_action)
+        except RestixException as _e:
+            self.__lookup_worker = None
+            self._snapshots_failed(_e)
+            return
+        self.__lookup_worker.connect_signals(None, None, self._snapshots_determined, self._snapshots_failed)
+        TaskScheduler.instance().submit(self.__lookup_worker, TASK_LANE_INTERACTIVE, None, TASK_PRIORITY_HIGH)
+
+    def _snapshots_determined(self, result: TaskResult):
+        """
+        Wird aufgerufen, wenn die Snapshots im Hintergrund ermittelt wurden. Befüllt die Combo-Box.
+        :param result: Ergebnis der Ermittlung mit den Snapshots als Details
+        """
+        if not self._is_current_lookup():
+            return
+        _combo_data = [_s.combo_label() for _s in result.details()]
         _combo_data.insert(0, RESTIC_SNAPSHOT_LATEST)
-        return _combo_data
+        self.fill_snapshot_combo(_combo_data)
+
+    def _snapshots_failed(self, exception: Exception):
+        """
+        Wird aufgerufen, wenn die Ermittlung der Snapshots fehlgeschlagen ist.
+        :param exception: Ursache des Fehlschlags
+        """
+        if self.__lookup_worker is not None and not self._is_current_lookup():
+            return
+        QMessageBox.critical(self, localized_label(L_MBOX_TITLE_ERROR),
+                             localized_message(E_RESTIC_CALL_FAILED, ACTION_SNAPSHOTS, str(exception)),
+                             QMessageBox.StandardButton.Ok)
+
+    def _is_current_lookup(self) -> bool:
+        """
+        :returns: True, falls das empfangene Signal von der zuletzt gestarteten Snapshot-Ermittlung stammt
+        """
+        return self.__lookup_worker is not None and self.sender() is self.__lookup_worker.signals()
 
 
 class RestorePane(ResticActionPane):
@@ -301,7 +319,7 @@ class RestorePane(ResticActionPane):
             QMessageBox.information(self, localized_label(L_MBOX_TITLE_ERROR), str(_e), QMessageBox.StandardButton.Ok)
             self.button_pane.action_stopped()
             return
-        QThreadPool.globalInstance().start(self.__worker)
+        self.start_worker(self.__worker, _restore_action)
 
     def cancel_button_clicked(self):
         """
@@ -309,7 +327,7 @@ class RestorePane(ResticActionPane):
         """
         super().cancel_button_clicked()
         if self.__worker is not None:
-            self.__worker.abort()
+            self.cancel_worker(self.__worker)
 
     def _target_selected(self):
         """
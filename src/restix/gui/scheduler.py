@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Scheduler für die Hintergrund-Tasks der restix GUI.
+Lang laufende Repository-Operationen (Backup, Restore, Wartung) und interaktive Abfragen (Snapshots ermitteln,
+Snapshot-Inhalt anzeigen) werden in getrennten Thread-Pools ausgeführt, damit eine Abfrage nie hinter einer
+stundenlangen Sicherung warten muss.
+Für Repository-Operationen gilt zusätzlich ein gegenseitiger Ausschluss pro Repository, Tasks für ein bereits
+belegtes Repository werden zurückgestellt, bis das Repository wieder frei ist.
+"""
+
+import itertools
+import threading
+
+from typing import Self
+
+from PySide6.QtCore import QRunnable, QThreadPool
+
+from restix.gui import (MAX_INTERACTIVE_TASKS, MAX_REPOSITORY_TASKS, TASK_LANE_INTERACTIVE, TASK_LANE_REPOSITORY,
+                        TASK_PRIORITY_NORMAL)
+from restix.gui.worker import Worker
+
+
+class _ScheduledTask(QRunnable):
+    """
+    Hülle um einen Worker, die den Scheduler nach Ende der Ausführung benachrichtigt.
+    """
+    def __init__(self, scheduler: 'TaskScheduler', worker: Worker, lane: str, repository: str | None,
+                 priority: int, sequence_number: int):
+        """
+        Konstruktor.
+        :param scheduler: der Scheduler
+        :param worker: auszuführender Worker
+        :param lane: Ausführungsspur
+        :param repository: Repository, auf das die Task exklusiv zugreift; None, falls kein Ausschluss nötig ist
+        :param priority: Priorität der Task
+        :param sequence_number: laufende Nummer zur Erhaltung der Reihenfolge bei gleicher Priorität
+        """
+        super().__init__()
+        self.worker = worker
+        self.lane = lane
+        self.repository = repository
+        self.priority = priority
+        self.sequence_number = sequence_number
+        self.__scheduler = scheduler
+
+    def run(self):
+        """
+        Führt den Worker aus und gibt anschließend das Repository frei.
+        """
+        try:
+            self.worker.run()
+        finally:
+            self.__scheduler._task_finished(self)
+
+
+class TaskScheduler:
+    """
+    Verteilt Worker auf die Ausführungsspuren für Repository-Operationen und interaktive Abfragen.
+    """
+    __instance = None
+    __instance_lock = threading.Lock()
+
+    def __init__(self, max_repository_tasks: int = MAX_REPOSITORY_TASKS,
+                 max_interactive_tasks: int = MAX_INTERACTIVE_TASKS):
+        """
+        Konstruktor.
+        :param max_repository_tasks: maximale Anzahl gleichzeitiger Repository-Operationen
+        :param max_interactive_tasks: maximale Anzahl gleichzeitiger interaktiver Abfragen
+        """
+        super().__init__()
+        self.__pools = {TASK_LANE_REPOSITORY: QThreadPool(), TASK_LANE_INTERACTIVE: QThreadPool()}
+        self.__pools[TASK_LANE_REPOSITORY].setMaxThreadCount(max_repository_tasks)
+        self.__pools[TASK_LANE_INTERACTIVE].setMaxThreadCount(max_interactive_tasks)
+        self.__lock = threading.Lock()
+        self.__sequence = itertools.count()
+        # Repositories, auf die gerade eine Task zugreift
+        self.__busy_repositories = set()
+        # Tasks, die auf die Freigabe ihres Repositories warten
+        self.__pending_tasks = []
+        # an einen Thread-Pool übergebene Tasks, Key ist die ID des Workers
+        self.__started_tasks = {}
+
+    def submit(self, worker: Worker, lane: str = TASK_LANE_REPOSITORY, repository: str | None = None,
+               priority: int = TASK_PRIORITY_NORMAL):
+        """
+        Übergibt einen Worker zur Ausführung.
+        :param worker: auszuführender Worker
+        :param lane: Ausführungsspur (Repository-Operation oder interaktive Abfrage)
+        :param repository: Repository, auf das eine Repository-Operation zugreift; bei interaktiven Abfragen ignoriert
+        :param priority: Priorität der Task, Tasks mit höherer Priorität werden bevorzugt gestartet
+        """
+        if lane != TASK_LANE_REPOSITORY:
+            # interaktive Abfragen lesen nur und benötigen keinen exklusiven Zugriff auf das Repository
+            repository = None
+        with self.__lock:
+            _task = _ScheduledTask(self, worker, lane, repository, priority, next(self.__sequence))
+            if repository is not None and repository in self.__busy_repositories:
+                self.__pending_tasks.append(_task)
+                return
+            self._start(_task)
+
+    def cancel(self, worker: Worker) -> bool:
+        """
+        Bricht die Ausführung eines Workers ab. Wartet der Worker noch auf seinen Start, wird er verworfen und sendet
+        sofort das Signal 'Finished'; andernfalls wird der Abbruch der laufenden Task angefordert.
+        :param worker: abzubrechender Worker
+        :returns: True, falls der Worker noch nicht gestartet war und verworfen wurde
+        """
+        _discarded = False
+        with self.__lock:
+            for _task in self.__pending_tasks:
+                if _task.worker is worker:
+                    self.__pending_tasks.remove(_task)
+                    _discarded = True
+                    break
+            else:
+                _task = self.__started_tasks.get(id(worker))
+                if _task is not None and self.__pools[_task.lane].tryTake(_task):
+                    self._release(_task)
+                    _discarded = True
+        if _discarded:
+            # außerhalb des Locks, die Empfänger des Signals dürfen neue Tasks übergeben
+            worker.discard()
+            return True
+        worker.abort()
+        return False
+
+    def pending_task_count(self) -> int:
+        """
+        :returns: Anzahl der Tasks, die auf die Freigabe ihres Repositories warten
+        """
+        with self.__lock:
+            return len(self.__pending_tasks)
+
+    def wait_for_done(self, timeout_msecs: int = -1) -> bool:
+        """
+        Wartet, bis alle Tasks beendet sind.
+        :param timeout_msecs: maximale Wartezeit in Millisekunden; -1 für unbegrenzt
+        :returns: True, falls alle Tasks beendet sind
+        """
+        _all_done = True
+        for _pool in self.__pools.values():
+            _all_done = _pool.waitForDone(timeout_msecs) and _all_done
+        return _all_done and self.pending_task_count() == 0
+
+    def _start(self, task: _ScheduledTask):
+        """
+        Übergibt eine Task an den Thread-Pool ihrer Ausführungsspur und belegt ggf. das Repository.
+        Muss mit gesetztem Lock aufgerufen werden.
+        :param task: zu startende Task
+        """
+        if task.repository is not None:
+            self.__busy_repositories.add(task.repository)
+        self.__started_tasks[id(task.worker)] = task
+        self.__pools[task.lane].start(task, task.priority)
+
+    def _release(self, task: _ScheduledTask):
+        """
+        Gibt das Repository einer beendeten Task frei und startet die Task mit der höchsten Priorität, die auf das
+        Repository gewartet hat. Muss mit gesetztem Lock aufgerufen werden.
+        :param task: beendete Task
+        """
+        self.__started_tasks.pop(id(task.worker), None)
+        if task.repository is None:
+            return
+        self.__busy_repositories.discard(task.repository)
+        _waiting_tasks = [_t for _t in self.__pending_tasks if _t.repository == task.repository]
+        if len(_waiting_tasks) == 0:
+            return
+        _next_task = min(_waiting_tasks, key=lambda _t: (-_t.priority, _t.sequence_number))
+        self.__pending_tasks.remove(_next_task)
+        self._start(_next_task)
+
+    def _task_finished(self, task: _ScheduledTask):
+        """
+        Wird im Thread der Task aufgerufen, nachdem deren Worker beendet ist.
+        :param task: beendete Task
+        """
+        with self.__lock:
+            self._release(task)
+
+    @classmethod
+    def instance(cls) -> Self:
+        """
+        :returns: der Scheduler der restix GUI
+        """
+        with cls.__instance_lock:
+            if cls.__instance is None:
+                cls.__instance = TaskScheduler()
+            return cls.__instance
@@ -48,6 +48,7 @@ from PySide6.QtCore import QRect
 from restix.core import RESTIX_GUI_SETTINGS_FILE_PATH
 from restix.core.messages import W_GUI_WRITE_GUI_SETTINGS_FAILED
 from restix.core.restix_exception import RestixException
+from restix.gui import DEFAULT_JOB_PARALLELISM, DEFAULT_MESSAGE_LIMIT
 
 
 class GuiSettings(dict):
@@ -61,12 +62,26 @@ class GuiSettings(dict):
         super().__init__()
         self.__is_modified = False
 
+    def job_parallelism(self) -> int:
+        """
+        :returns: Anzahl gleichzeitig ausgeführter Aufträge der Auftrags-Warteschlange
+        """
+        _value = self.get(_KEY_JOB_PARALLELISM)
+        return DEFAULT_JOB_PARALLELISM if not isinstance(_value, int) or _value <= 0 else _value
+
     def latest_target(self) -> str | None:
         """
         :returns: Alias-Name des zuletzt verwendeten Backup-Ziels
         """
         return self.get(_KEY_LATEST_TARGET)
 
+    def message_limit(self) -> int:
+        """
+        :returns: maximale Anzahl an Nachrichten, die in der Nachrichten-Ausgabe vorgehalten werden
+        """
+        _value = self.get(_KEY_MESSAGE_LIMIT)
+        return DEFAULT_MESSAGE_LIMIT if not isinstance(_value, int) or _value <= 0 else _value
+
     # noinspection PyArgumentList
     def win_geometry(self) -> QRect:
         """
@@ -75,6 +90,14 @@ class GuiSettings(dict):
         _value = self.get(_KEY_WIN_GEOMETRY)
         return _default_win_geometry() if _value is None else QRect(*_value)
 
+    def set_job_parallelism(self, parallelism: int):
+        """
+        Setzt die Anzahl gleichzeitig ausgeführter Aufträge der Auftrags-Warteschlange.
+        :param parallelism: Anzahl Aufträge
+        """
+        self[_KEY_JOB_PARALLELISM] = parallelism
+        self.__is_modified = True
+
     def set_latest_target(self, target_alias: str):
         """
         Setzt den Alias-Namen des zuletzt verwendeten Backup-Ziels.
@@ -147,5 +170,7 @@ _DEFAULT_WIN_HEIGHT = 720
 _DEFAULT_WIN_GEOMETRY = [0, 0, _DEFAULT_WIN_WIDTH, _DEFAULT_WIN_HEIGHT]
 
 # TOML-Keys der Datei mit den Einstellungen
+_KEY_JOB_PARALLELISM = 'job_parallelism'
 _KEY_LATEST_TARGET = 'latest_target'
+_KEY_MESSAGE_LIMIT = 'message_limit'
 _KEY_WIN_GEOMETRY = 'win_geometry'
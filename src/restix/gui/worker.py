@@ -41,7 +41,8 @@ from typing import Any
 from PySide6.QtCore import QObject, QRunnable, Signal
 
 from restix.core.restic_interface import *
-from restix.core.task import TaskExecutor, TaskMonitor, TaskProgress, TaskResult
+from restix.core.task import ProgressAggregator, TaskExecutor, TaskMonitor, TaskProgress, TaskResult
+from restix.gui import MAX_PROGRESS_UPDATES_PER_SECOND
 
 
 class WorkerSignals(QObject):
@@ -55,8 +56,8 @@ class WorkerSignals(QObject):
     error = Signal(RestixException)
     # detailliertes Ergebnis der Task
     result = Signal(TaskResult)
-    # Fortschritt der Task
-    progress = Signal(TaskProgress)
+    # Fortschritt der Task, Liste mit TaskProgress-Objekten
+    progress = Signal(list)
 
     def __init__(self):
         """
@@ -80,6 +81,7 @@ class Worker(QRunnable, TaskExecutor):
         self.__args = args
         self.__signals = WorkerSignals()
         self.__task_monitor = TaskMonitor(self)
+        self.__progress_aggregator = ProgressAggregator(self.__signals.progress.emit, MAX_PROGRESS_UPDATES_PER_SECOND)
 
     def abort(self):
         """
@@ -87,6 +89,12 @@ class Worker(QRunnable, TaskExecutor):
         """
         self.__task_monitor.request_abort()
 
+    def signals(self) -> WorkerSignals:
+        """
+        :returns: Signale des Workers
+        """
+        return self.__signals
+
     def connect_signals(self, progress_slot: Callable, finished_slot: Callable, result_slot: Callable, error_slot: Callable):
         """
         Bindet die Signale an die übergebenen Slots.
@@ -111,21 +119,34 @@ class Worker(QRunnable, TaskExecutor):
         """
         try:
             _result = self.__fn(*self.__args, self.__task_monitor)
+            self.__progress_aggregator.flush()
             self.__signals.result.emit(_result)
         except RestixException as _e:
+            self.__progress_aggregator.flush()
             self.__signals.error.emit(_e)
         except BaseException as _e:
+            self.__progress_aggregator.flush()
             _ex = RestixException(E_BACKGROUND_TASK_FAILED, str(_e))
             self.__signals.error.emit(_ex)
         self.__signals.finished.emit()
         self.__args[0].action_executed()
 
+    def discard(self):
+        """
+        Wird aufgerufen, wenn der Worker vor seinem Start verworfen wurde. Meldet das Ende wie nach einer Ausführung,
+        damit Empfänger des Signals 'Finished' nicht endlos warten, und gibt die temporären Dateien der Aktion frei.
+        """
+        self.__signals.finished.emit()
+        self.__args[0].action_executed()
+
     def emit_progress(self, progress_data: TaskProgress):
         """
         Sendet ein Progress-Signal an den zugeordneten Slot.
+        Die Nachrichten werden gebündelt und mit begrenzter Frequenz gesendet, damit die GUI bei umfangreichen
+        Ausgaben von restic bedienbar bleibt.
         :param progress_data: Informationen über den Fortschritt der Task.
         """
-        self.__signals.progress.emit(progress_data)
+        self.__progress_aggregator.add(progress_data)
 
     @classmethod
     def for_action(cls: Self, action: RestixAction) -> Self:
@@ -149,3 +170,54 @@ class Worker(QRunnable, TaskExecutor):
             return Worker(run_unlock, action)
         _emsg = localized_message(E_INVALID_ACTION, _action_id)
         raise RestixException(E_INTERNAL_ERROR, _emsg)
+
+    @classmethod
+    def for_lookup(cls: Self, action: RestixAction) -> Self:
+        """
+        Erzeugt einen Worker für eine interaktive Abfrage (Snapshots ermitteln, Snapshot-Inhalt anzeigen oder
+        durchsuchen). Das Abfrage-Ergebnis wird in den Details des TaskResult geliefert.
+        :param action: die vom Worker auszuführende Abfrage
+        :returns: Worker für die gewünschte Abfrage
+        """
+        _action_id = action.action_id()
+        if _action_id == ACTION_SNAPSHOTS:
+            return Worker(_lookup_snapshots, action)
+        elif _action_id == ACTION_LS:
+            return Worker(_lookup_snapshot_elements, action)
+        elif _action_id == ACTION_FIND:
+            return Worker(_find_snapshot_elements, action)
+        _emsg = localized_message(E_INVALID_ACTION, _action_id)
+        raise RestixException(E_INTERNAL_ERROR, _emsg)
+
+
+def _lookup_snapshots(action: RestixAction, task_monitor: TaskMonitor) -> TaskResult:
+    """
+    Ermittelt die Snapshots in einem Repository.
+    :param action: Snapshot-Aktion
+    :param task_monitor: Fortschritt-Handler.
+    :returns: Ergebnis mit allen Snapshots als Details
+    :raises RestixException: falls das Lesen der Snapshots fehlschlägt
+    """
+    return TaskResult(TASK_SUCCEEDED, '', determine_snapshots(action, task_monitor))
+
+
+def _lookup_snapshot_elements(action: RestixAction, task_monitor: TaskMonitor) -> TaskResult:
+    """
+    Ermittelt alle Elemente eines Snapshots.
+    :param action: ls-Aktion
+    :param task_monitor: Fortschritt-Handler.
+    :returns: Ergebnis mit dem Snapshot als Details
+    :raises RestixException: falls das Lesen des Snapshots fehlschlägt
+    """
+    return TaskResult(TASK_SUCCEEDED, '', list_snapshot_elements(action))
+
+
+def _find_snapshot_elements(action: RestixAction, task_monitor: TaskMonitor) -> TaskResult:
+    """
+    Sucht Elemente in einem Snapshot.
+    :param action: find-Aktion
+    :param task_monitor: Fortschritt-Handler.
+    :returns: Ergebnis mit den gefundenen Elementen als Details
+    :raises RestixException: falls das Lesen des Snapshots fehlschlägt
+    """
+    return TaskResult(TASK_SUCCEEDED, '', find_snapshot_elements(action))
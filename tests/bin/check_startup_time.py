@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Prüft die Startzeit des restix command line interface.
+Das Root-Verzeichnis der restix Source-Dateien muss in Umgebungsvariable RESTIX_SOURCE_PATH angegeben werden.
+Im Einzelnen werden folgende Prüfungen durchgeführt:
+- die Importzeit des CLI-Moduls (ermittelt mit python -X importtime) darf das Budget nicht überschreiten
+- die Laufzeit von 'restix --version' inklusive Start des Interpreters darf das Budget nicht überschreiten
+- Module, die nur zur Ausführung von restic-Befehlen benötigt werden, dürfen beim Start nicht importiert werden
+
+Gemessen wird der Median aus mehreren Läufen. Die Budgets können mit den Umgebungsvariablen
+RESTIX_IMPORT_BUDGET_MS und RESTIX_VERSION_BUDGET_MS überschrieben werden.
+Das Script liefert als Exit-Code 0 für ok, 1 für mindestens eine Prüfung fehlgeschlagen und 2 für Ausführungsfehler.
+Meldungen werden auf der Konsole ausgegeben.
+"""
+
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+
+CLI_MODULE = 'restix.cli.restix_cli'
+IMPORT_BUDGET_MS = 80
+VERSION_BUDGET_MS = 200
+RUN_COUNT = 9
+LAZY_MODULES = ('getpass', 'packaging.version', 'restix.core.history', 'restix.core.restic_interface',
+                'restix.core.restic_version', 'restix.core.task', 'restix.core.watcher', 'sqlite3')
+IMPORT_TIME_PATTERN = re.compile(r'^import time:\s+\d+\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+def measure_import(source_path: str) -> tuple[float, set[str]]:
+    """
+    Importiert das CLI-Modul in einem neuen Interpreter mit Option -X importtime.
+    :param source_path: Root-Verzeichnis der restix Source-Dateien
+    :returns: kumulierte Importzeit des CLI-Moduls in Millisekunden, Namen aller importierten Module
+    """
+    _env = dict(os.environ, PYTHONPATH=source_path)
+    _res = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {CLI_MODULE}'],
+                          capture_output=True, text=True, env=_env, check=True)
+    _import_time = None
+    _modules = set()
+    for _line in _res.stderr.splitlines():
+        _match = IMPORT_TIME_PATTERN.match(_line)
+        if _match is None:
+            continue
+        _modules.add(_match.group(3))
+        if _match.group(3) == CLI_MODULE:
+            _import_time = int(_match.group(1)) / 1000
+    if _import_time is None:
+        raise RuntimeError(f'Importzeit für Modul {CLI_MODULE} nicht gefunden')
+    return _import_time, _modules
+
+
+def measure_version_command(source_path: str) -> float:
+    """
+    Führt 'restix --version' in einem neuen Interpreter aus.
+    :param source_path: Root-Verzeichnis der restix Source-Dateien
+    :returns: Laufzeit in Millisekunden
+    """
+    _env = dict(os.environ, PYTHONPATH=source_path)
+    _cmd = [sys.executable, '-c', f'import sys; sys.argv = ["restix", "--version"]; '
+                                  f'from {CLI_MODULE} import cli_main; cli_main()']
+    _start_time = time.perf_counter()
+    subprocess.run(_cmd, capture_output=True, env=_env)
+    return (time.perf_counter() - _start_time) * 1000
+
+
+def check_budget(name: str, measurements: list[float], budget: float) -> int:
+    """
+    Vergleicht den Median der Messwerte mit dem Budget.
+    :param name: Bezeichnung der Messung
+    :param measurements: Messwerte in Millisekunden
+    :param budget: Budget in Millisekunden
+    :returns: 0, falls das Budget eingehalten wurde; ansonsten 1
+    """
+    _median = statistics.median(measurements)
+    print(f'{name}: Median {_median:.1f} ms, Minimum {min(measurements):.1f} ms, Budget {budget:.0f} ms')
+    if _median > budget:
+        print(f'{name} überschreitet das Budget')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    _rc = 0
+    try:
+        # benötigte Umgebungsvariablen einlesen
+        _source_path = os.environ.get('RESTIX_SOURCE_PATH')
+        if _source_path is None:
+            raise RuntimeError('Umgebungsvariable RESTIX_SOURCE_PATH ist nicht definiert')
+        _import_budget = float(os.environ.get('RESTIX_IMPORT_BUDGET_MS', IMPORT_BUDGET_MS))
+        _version_budget = float(os.environ.get('RESTIX_VERSION_BUDGET_MS', VERSION_BUDGET_MS))
+        # erster Lauf erzeugt ggf. die Bytecode-Dateien und wird nicht gewertet
+        _, _imported_modules = measure_import(_source_path)
+        _import_times = [measure_import(_source_path)[0] for _i in range(RUN_COUNT)]
+        _version_times = [measure_version_command(_source_path) for _i in range(RUN_COUNT)]
+        _rc = max(check_budget('Import CLI', _import_times, _import_budget),
+                  check_budget('restix --version', _version_times, _version_budget))
+        for _module in LAZY_MODULES:
+            if _module in _imported_modules:
+                print(f'Modul {_module} wird beim Start des CLI importiert')
+                _rc = 1
+    except Exception as e:
+        print(e)
+        sys.exit(2)
+    if _rc == 0:
+        print('Startzeit ist in Ordnung.')
+    sys.exit(_rc)
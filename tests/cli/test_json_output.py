@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests für cli.json_output.
+"""
+
+import contextlib
+import io
+import json
+import sys
+import unittest
+
+from restix.cli.json_output import JSON_OUTPUT_SCHEMA_VERSION, JsonOutput
+from restix.cli.restix_cli import cli_main
+from restix.core import ACTION_HELP, CLI_RC_FAILED, CLI_RC_OK, SEVERITY_WARNING
+from restix.core.messages import E_CLI_INVALID_TARGET, T_CLI_HELP_BACKUP, W_BACKUP_THROUGHPUT_DROPPED
+from restix.core.restix_exception import RestixException
+from restix.core.task import TaskMonitor
+
+
+class TestJsonOutput(unittest.TestCase):
+
+    def test_events(self):
+        """
+        Testet die Ausgabe von Ereignissen als einzelne JSON-Zeilen.
+        """
+        _stream = io.StringIO()
+        _output = JsonOutput(_stream)
+        _monitor = TaskMonitor(_output)
+        _monitor.log_status('[0:01] 10.00%  1 files 1.000 MiB, total 10 files 10.000 MiB, 0 errors', 10)
+        _monitor.log(W_BACKUP_THROUGHPUT_DROPPED, 'nas', '1 MiB', '10 MiB', 10)
+        _output.error(RestixException(E_CLI_INVALID_TARGET, 'nas'))
+        _output.result('backup', 'nas', CLI_RC_FAILED)
+        _events = [json.loads(_line) for _line in _stream.getvalue().splitlines()]
+        self.assertEqual(['progress', 'log', 'error', 'result'], [_e['event'] for _e in _events])
+        for _event in _events:
+            self.assertEqual(JSON_OUTPUT_SCHEMA_VERSION, _event['schema'])
+            self.assertIn('time', _event)
+        self.assertEqual(10, _events[0]['percent'])
+        self.assertEqual('warning', _events[1]['severity'])
+        self.assertEqual(W_BACKUP_THROUGHPUT_DROPPED, _events[1]['message_id'])
+        self.assertEqual(E_CLI_INVALID_TARGET, _events[2]['message_id'])
+        self.assertIsNone(_events[2]['restic_rc'])
+        self.assertEqual({'command': 'backup', 'target': 'nas', 'exit_code': CLI_RC_FAILED, 'data': None},
+                         {_k: _events[3][_k] for _k in ('command', 'target', 'exit_code', 'data')})
+        # Nachrichten ohne ID, z.B. Ausgaben von restic
+        _output.log_text('restic output', SEVERITY_WARNING)
+        _event = json.loads(_stream.getvalue().splitlines()[-1])
+        self.assertIsNone(_event['message_id'])
+
+    def test_help(self):
+        """
+        Testet die Ausgabe der Hilfe im JSON-Format.
+        """
+        _stream = io.StringIO()
+        _argv = sys.argv
+        sys.argv = ['restix', '--output', 'json', '--help', 'backup']
+        try:
+            with contextlib.redirect_stdout(_stream), self.assertRaises(SystemExit) as _exit:
+                cli_main()
+        finally:
+            sys.argv = _argv
+        self.assertEqual(CLI_RC_OK, _exit.exception.code)
+        _events = [json.loads(_line) for _line in _stream.getvalue().splitlines()]
+        self.assertEqual(['log', 'result'], [_e['event'] for _e in _events])
+        self.assertEqual(T_CLI_HELP_BACKUP, _events[0]['message_id'])
+        self.assertEqual({'command': ACTION_HELP, 'exit_code': CLI_RC_OK},
+                         {_k: _events[1][_k] for _k in ('command', 'exit_code')})
+
+
+if __name__ == '__main__':
+    unittest.main()
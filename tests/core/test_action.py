@@ -38,9 +38,13 @@ Testdateien liegen im Projektverzeichnis tests/testdata/action.
 """
 
 import os.path
+import tempfile
 import unittest
 
 from restix.core.action import *
+from restix.core.restic_interface import run_forget
+from restix.core.task import TaskMonitor
+from restix.core.util import restix_cache_path
 
 # Standard restix-Konfiguration für Unit-Tests
 STANDARD_CONFIG_FN = 'unittest.toml'
@@ -50,27 +54,52 @@ TARGET_SRV = 'target-srv'
 TARGET_EXTHDD = 'target-exthdd'
 TARGET_USBSTICK = 'target-usbstick'
 TARGET_DIR = 'target-dir'
+TARGET_REST = 'target-rest'
+TARGET_DB = 'target-db'
 
-EXPECTED_BACKUP_CMD_SRV = ['restic', 'backup', '--repo', 'sftp:myserver:data*', '--password-file', '*/pw.txt', '--files-from', '*/minimal.list']
-EXPECTED_BACKUP_CMD_EXTHDD = ['restic', 'backup', '--repo', '/media/${USER}/58af5a30-36b5-4f0b-bb8f-a70683ae3e7e/restix/*', '--password-file', '*/pw.txt', '--files-from', '*/full.list', '--exclude-file', '/tmp/*']
+EXPECTED_BACKUP_CMD_SRV = ['restic', 'backup', '--repo', 'sftp:myserver:data*', '--password-file', '*/pw.txt', '--option', 'sftp.command=ssh *', '--files-from', '*/minimal.list']
+EXPECTED_BACKUP_CMD_EXTHDD = ['restic', 'backup', '--repo', '/media/${USER}/58af5a30-36b5-4f0b-bb8f-a70683ae3e7e/restix/*', '--password-file', '*/pw.txt', '--files-from', '*/full.list', '--exclude-file', '*.list']
 EXPECTED_BACKUP_CMD_USBSTICK = ['restic', 'backup', '--repo', '/media/${USER}/USBSAVE/restix/*', '--password-file', '*/pw.txt', '--files-from', '*/full.list', '--exclude-file', '*/full_excludes.list']
-EXPECTED_BACKUP_CMD_DIR = ['restic', 'backup', '--repo', '/var/restix/*', '--password-file', '*/pw.txt', '--files-from', '*/full.list', '--exclude-file', '/tmp/*']
+EXPECTED_BACKUP_CMD_DIR = ['restic', 'backup', '--repo', '/var/restix/*', '--password-file', '*/pw.txt', '--files-from', '*/full.list', '--exclude-file', '*.list']
+
+EXPECTED_BACKUP_CMD_REST = ['restic', 'backup', '--repo', 'rest:https://backup.example.org:8000/${USER}/*', '--password-file',
+                            '*/pw.txt', '--option', 'rest.connections=10', '--files-from', '*/minimal.list']
+
+EXPECTED_STDIN_CMD_DB = ['restic', 'backup', '--repo', '/var/restix-db/*', '--password-file', '*/pw.txt',
+                         '--stdin-filename', 'mydb.dump', '--stdin']
+EXPECTED_STDIN_FROM_COMMAND_CMD_DB = ['restic', 'backup', '--repo', '/var/restix-db/*', '--password-file', '*/pw.txt',
+                                      '--stdin-filename', 'mydb.dump', '--stdin-from-command', '--',
+                                      'pg_dump', '--format=custom', 'my db']
 
 EXPECTED_INIT_CMD_DIR = ['restic', 'init', '--repo', '/var/restix/*', '--password-file', '*/pw.txt']
+EXPECTED_LIST_LOCKS_CMD_DIR = ['restic', 'list', 'locks', '--repo', '/var/restix/*', '--password-file', '*/pw.txt',
+                               '--no-lock']
+EXPECTED_CAT_LOCK_CMD_DIR = ['restic', 'cat', 'lock', 'a1b2', '--repo', '/var/restix/*', '--password-file', '*/pw.txt',
+                             '--no-lock']
 
 class TestAction(unittest.TestCase):
 
     original_config_path = ''
+    original_cache_home = None
+    cache_dir = None
 
     @classmethod
     def setUpClass(cls):
         cls.original_config_path = os.environ.get(ENVA_RESTIX_CONFIG_PATH)
         os.environ[ENVA_RESTIX_CONFIG_PATH] = cls.unit_test_home()
+        cls.original_cache_home = os.environ.get(ENVA_XDG_CACHE_HOME)
+        cls.cache_dir = tempfile.TemporaryDirectory()
+        os.environ[ENVA_XDG_CACHE_HOME] = cls.cache_dir.name
 
     @classmethod
     def tearDownClass(cls):
         if cls.original_config_path is not None:
             os.environ[ENVA_RESTIX_CONFIG_PATH] = cls.original_config_path
+        if cls.original_cache_home is None:
+            del os.environ[ENVA_XDG_CACHE_HOME]
+        else:
+            os.environ[ENVA_XDG_CACHE_HOME] = cls.original_cache_home
+        cls.cache_dir.cleanup()
 
     def test_backup_action(self):
         """
@@ -89,6 +118,78 @@ class TestAction(unittest.TestCase):
         # Test Ignores und Excludes
         _backup_action = RestixAction.for_action_id(ACTION_BACKUP, TARGET_DIR, _config, None)
         self.verify_restic_command(EXPECTED_BACKUP_CMD_DIR, _backup_action.to_restic_command())
+        # Test REST-Server mit Anzahl Verbindungen
+        _backup_action = RestixAction.for_action_id(ACTION_BACKUP, TARGET_REST, _config, None)
+        self.verify_restic_command(EXPECTED_BACKUP_CMD_REST, _backup_action.to_restic_command())
+
+    def test_append_only_repo(self):
+        """
+        Testet, dass aus einem Repository, das nur das Hinzufügen von Daten erlaubt, nichts gelöscht wird.
+        """
+        _config = TestAction.unittest_configuration()
+        _forget_action = RestixAction.for_action_id(ACTION_FORGET, TARGET_REST, _config, None)
+        _result = run_forget(_forget_action, TaskMonitor(None, True))
+        self.assertFalse(_result.task_succeeded())
+        self.assertIn(_forget_action.option(OPTION_REPO), _result.summary())
+
+    def test_stdin_backup_command(self):
+        """
+        Testet die Sicherung der Ausgabe von Befehlen über die Standard-Eingabe von restic.
+        """
+        _config = TestAction.unittest_configuration()
+        _backup_action = RestixAction.for_action_id(ACTION_BACKUP, TARGET_DB, _config, None)
+        self.assertIsNone(_backup_action.option(OPTION_FILES_FROM))
+        self.assertEqual(1, len(_backup_action.stdin_commands()))
+        _stdin_command = _backup_action.stdin_commands()[0]
+        self.verify_restic_command(EXPECTED_STDIN_CMD_DB, _backup_action.stdin_backup_command(_stdin_command, False))
+        self.verify_restic_command(EXPECTED_STDIN_FROM_COMMAND_CMD_DB,
+                                   _backup_action.stdin_backup_command(_stdin_command, True))
+
+    def test_generated_exclude_file(self):
+        """
+        Testet die Wiederverwendung generierter Excludes-Dateien.
+        """
+        _config = TestAction.unittest_configuration()
+        _first_action = RestixAction.for_action_id(ACTION_BACKUP, TARGET_DIR, _config, None)
+        _exclude_file_path = _first_action.option(OPTION_EXCLUDE_FILE)
+        self.assertEqual(restix_cache_path(), os.path.dirname(_exclude_file_path))
+        _inode = os.stat(_exclude_file_path).st_ino
+        _first_action.action_executed()
+        self.assertTrue(os.path.isfile(_exclude_file_path))
+        # gleicher Backup-Umfang, Datei wird nicht neu geschrieben, aber als benutzt markiert
+        os.utime(_exclude_file_path, (0, 0))
+        _second_action = RestixAction.for_action_id(ACTION_BACKUP, TARGET_DIR, _config, None)
+        self.assertEqual(_exclude_file_path, _second_action.option(OPTION_EXCLUDE_FILE))
+        self.assertEqual(_inode, os.stat(_exclude_file_path).st_ino)
+        self.assertGreater(os.stat(_exclude_file_path).st_mtime, 0)
+        # geänderte Ignores ergeben eine andere Datei
+        _scope = dict(_config.scope_for_target(TARGET_DIR))
+        _scope[CFG_PAR_IGNORES] = _scope[CFG_PAR_IGNORES] + ['*.bak']
+        _second_action.set_scope_options(_scope)
+        _changed_file_path = _second_action.option(OPTION_EXCLUDE_FILE)
+        self.assertNotEqual(_exclude_file_path, _changed_file_path)
+        with open(_changed_file_path, 'r') as _f:
+            self.assertIn('*.bak', _f.read().split('\n'))
+
+    def test_stale_exclude_files(self):
+        """
+        Testet das Löschen länger nicht mehr benutzter Excludes-Dateien.
+        """
+        _stale_file_path = os.path.join(restix_cache_path(), 'excludes_stale.list')
+        _recent_file_path = os.path.join(restix_cache_path(), 'excludes_recent.list')
+        for _file_path in (_stale_file_path, _recent_file_path):
+            with open(_file_path, 'w') as _f:
+                _f.write('*.tmp\n')
+        os.utime(_stale_file_path, (0, 0))
+        _config = TestAction.unittest_configuration()
+        _action = RestixAction.for_action_id(ACTION_BACKUP, TARGET_DIR, _config, None)
+        _scope = dict(_config.scope_for_target(TARGET_DIR))
+        _scope[CFG_PAR_IGNORES] = _scope[CFG_PAR_IGNORES] + ['*.stale']
+        _action.set_scope_options(_scope)
+        self.assertTrue(os.path.isfile(_action.option(OPTION_EXCLUDE_FILE)))
+        self.assertFalse(os.path.exists(_stale_file_path))
+        self.assertTrue(os.path.isfile(_recent_file_path))
+        os.remove(_recent_file_path)
 
     def test_init_action(self):
         """
@@ -99,6 +200,15 @@ class TestAction(unittest.TestCase):
         _init_action = RestixAction.for_action_id(ACTION_INIT, TARGET_DIR, _config, None)
         self.verify_restic_command(EXPECTED_INIT_CMD_DIR, _init_action.to_restic_command())
 
+    def test_lock_inspection_command(self):
+        """
+        Testet die Befehle zur Prüfung der Sperren eines Repositories.
+        """
+        _config = TestAction.unittest_configuration()
+        _backup_action = RestixAction.for_action_id(ACTION_BACKUP, TARGET_DIR, _config, None)
+        self.verify_restic_command(EXPECTED_LIST_LOCKS_CMD_DIR, _backup_action.lock_inspection_command())
+        self.verify_restic_command(EXPECTED_CAT_LOCK_CMD_DIR, _backup_action.lock_inspection_command('a1b2'))
+
     def verify_restic_command(self, expected_command: list[str], actual_command: list[str]):
         """
         Prüft, ob ein restic-Befehl der Erwartung entspricht.
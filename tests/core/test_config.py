@@ -39,6 +39,8 @@ Testdateien liegen im Projektverzeichnis tests/testdata/config.
 
 from pathlib import Path
 import os.path
+import shutil
+import tempfile
 import unittest
 
 from restix.core.config import *
@@ -124,6 +126,59 @@ class TestConfig(unittest.TestCase):
         _clone = _config.for_cli({'USER': 'unittest'})
         self._replacement_test(_clone.credentials(), VAR_CREDENTIALS)
         self._replacement_test(_clone.targets(), VAR_TARGETS)
+        # Original bleibt unverändert, Elemente ohne Variablen werden nicht kopiert
+        self.assertTrue(_config.targets()['usbstick'][CFG_PAR_LOCATION].find('${USER}') >= 0)
+        self.assertIs(_config.targets()['inetsrv'], _clone.targets()['inetsrv'])
+        # Ersetzung ohne Kopie
+        _same_config = _config.for_cli({'USER': 'unittest'}, True)
+        self.assertIs(_config, _same_config)
+        self._replacement_test(_config.targets(), VAR_TARGETS)
+
+    def test_config_cache(self):
+        """
+        Prüft das Wiederverwenden geprüfter Konfigurationen und die Indizes der Groups.
+        """
+        _original_cache_home = os.environ.get(ENVA_XDG_CACHE_HOME)
+        with tempfile.TemporaryDirectory() as _temp_dir:
+            os.environ[ENVA_XDG_CACHE_HOME] = os.path.join(_temp_dir, 'cache')
+            try:
+                _config_file_path = os.path.join(_temp_dir, RESTIX_CONFIG_FN)
+                shutil.copy(os.path.join(TestConfig.unit_test_home(), RESTIX_CONFIG_FN), _config_file_path)
+                _config = LocalConfig.from_file(_config_file_path)
+                _cache_dir = os.path.join(_temp_dir, 'cache', 'restix')
+                self.assertEqual(1, len(os.listdir(_cache_dir)))
+                _cached_config = LocalConfig.from_file(_config_file_path)
+                self.assertEqual(_config, _cached_config)
+                self.assertEqual(_config.warnings(), _cached_config.warnings())
+                # Index wird wiederverwendet und nach Hinzufügen eines Elements neu aufgebaut
+                self.assertIs(_cached_config.targets(), _cached_config.targets())
+                _new_target = dict(_cached_config[CFG_GROUP_TARGET][0], alias='aaa')
+                _cached_config[CFG_GROUP_TARGET].append(_new_target)
+                self.assertIs(_new_target, _cached_config.targets().get('aaa'))
+                self.assertEqual('aaa', next(iter(_cached_config.targets())))
+                # Speichern verwirft den Cache
+                _cached_config.to_file()
+                self.assertEqual(0, len(os.listdir(_cache_dir)))
+                self.assertIn('aaa', LocalConfig.from_file(_config_file_path).targets())
+            finally:
+                if _original_cache_home is None:
+                    del os.environ[ENVA_XDG_CACHE_HOME]
+                else:
+                    os.environ[ENVA_XDG_CACHE_HOME] = _original_cache_home
+
+    def test_element_renamed(self):
+        """
+        Prüft die Anpassung von Index und Referenzen beim Umbenennen eines Elements.
+        """
+        _config = TestConfig.unittest_configuration()
+        _scope = _config.scopes()['minimal']
+        _config.element_renamed(CFG_GROUP_SCOPE, 'minimal', 'basis')
+        _scope[CFG_PAR_ALIAS] = 'basis'
+        self.assertIs(_scope, _config.scopes()['basis'])
+        self.assertNotIn('minimal', _config.scopes())
+        self.assertEqual('basis', _config.scope_for_target('inetsrv')[CFG_PAR_ALIAS])
+        with self.assertRaises(RestixException):
+            _config.pre_check_remove(CFG_GROUP_SCOPE, 'basis')
 
     def _dataset_test(self, file_name_pattern: str):
         """
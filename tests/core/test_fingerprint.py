@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests für core.fingerprint.
+"""
+
+import datetime
+import os
+import tempfile
+import time
+import unittest
+
+import tomli_w
+
+from restix.core.fingerprint import ExcludeFilter, FingerprintStore, scope_fingerprint
+
+
+class TestFingerprint(unittest.TestCase):
+
+    def setUp(self):
+        self.__temp_dir = tempfile.TemporaryDirectory()
+        self.__root = self.__temp_dir.name
+        os.makedirs(os.path.join(self.__root, 'data', 'docs'))
+        os.makedirs(os.path.join(self.__root, 'data', '.cache'))
+        self.write_file(os.path.join('data', 'docs', 'a.txt'), 'a')
+        self.write_file(os.path.join('data', '.cache', 'c.bin'), 'c')
+        self.__includes = self.write_file('includes.list', f'# Kommentar{os.linesep}{self.__root}/data{os.linesep}')
+        self.__excludes = self.write_file('excludes.list', f'.cache{os.linesep}*.tmp{os.linesep}')
+
+    def tearDown(self):
+        self.__temp_dir.cleanup()
+
+    def test_exclude_filter(self):
+        """
+        Testet die Auswertung der Exclude-Patterns.
+        """
+        _filter = ExcludeFilter(['.git', '*.tmp', '/var/cache', 'build/out'])
+        self.assertTrue(_filter.is_excluded('/home/user/project/.git'))
+        self.assertTrue(_filter.is_excluded('/home/user/x.tmp'))
+        self.assertTrue(_filter.is_excluded('/var/cache'))
+        self.assertTrue(_filter.is_excluded('/home/user/build/out'))
+        self.assertFalse(_filter.is_excluded('/home/var/cache'))
+        self.assertFalse(_filter.is_excluded('/home/user/x.txt'))
+        # bei Negationen wird nichts ausgeschlossen
+        _filter = ExcludeFilter(['*.tmp', '!keep.tmp'])
+        self.assertFalse(_filter.is_excluded('/home/user/x.tmp'))
+
+    def test_scope_fingerprint(self):
+        """
+        Testet die Berechnung des Fingerprints.
+        """
+        _fp = scope_fingerprint(self.__includes, self.__excludes)
+        self.assertEqual(_fp, scope_fingerprint(self.__includes, self.__excludes))
+        # Änderungen an ausgeschlossenen Daten ändern den Fingerprint nicht
+        self.write_file(os.path.join('data', '.cache', 'd.bin'), 'd')
+        self.write_file(os.path.join('data', 'docs', 'e.tmp'), 'e')
+        self.assertEqual(_fp, scope_fingerprint(self.__includes, self.__excludes))
+        # Änderungen an gesicherten Daten ändern den Fingerprint
+        time.sleep(0.01)
+        self.write_file(os.path.join('data', 'docs', 'a.txt'), 'aa')
+        _changed_fp = scope_fingerprint(self.__includes, self.__excludes)
+        self.assertNotEqual(_fp, _changed_fp)
+        # Änderungen an der Definition des Backup-Umfangs ändern den Fingerprint
+        self.write_file('excludes.list', f'.cache{os.linesep}')
+        self.assertNotEqual(_changed_fp, scope_fingerprint(self.__includes, self.__excludes))
+
+    def test_fingerprint_store(self):
+        """
+        Testet das Speichern und Vergleichen von Fingerprints.
+        """
+        _file_path = os.path.join(self.__root, 'fingerprints.toml')
+        _store = FingerprintStore(_file_path)
+        self.assertFalse(_store.is_unchanged('/repo', 'abc', None)[0])
+        _store.update('/repo', 'abc')
+        self.assertTrue(_store.is_unchanged('/repo', 'abc', None)[0])
+        self.assertTrue(_store.is_unchanged('/repo', 'abc', 1)[0])
+        self.assertFalse(_store.is_unchanged('/repo', 'abd', None)[0])
+        self.assertFalse(_store.is_unchanged('/other-repo', 'abc', None)[0])
+        # erzwungenes Backup nach Ablauf der angegebenen Tage
+        _old_timestamp = datetime.datetime.now().replace(microsecond=0) - datetime.timedelta(days=3)
+        with open(_file_path, 'w') as _f:
+            _f.write(tomli_w.dumps({'/repo': {'fingerprint': 'abc', 'timestamp': _old_timestamp}}))
+        self.assertTrue(_store.is_unchanged('/repo', 'abc', 4)[0])
+        self.assertFalse(_store.is_unchanged('/repo', 'abc', 3)[0])
+
+    def write_file(self, relative_path: str, contents: str) -> str:
+        """
+        Schreibt eine Datei im temporären Testverzeichnis.
+        :param relative_path: Dateiname relativ zum Testverzeichnis
+        :param contents: Inhalt der Datei
+        :returns: Dateiname mit vollständigem Pfad
+        """
+        _file_path = os.path.join(self.__root, relative_path)
+        with open(_file_path, 'w') as _f:
+            _f.write(contents)
+        return _file_path
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests für core.history.
+"""
+
+import datetime
+import os
+import tempfile
+import unittest
+
+from restix.core.history import *
+
+# Ausgabe von restic backup --json, gekürzt
+RESTIC_BACKUP_OUTPUT = '''{"message_type":"status","percent_done":0,"total_files":1,"total_bytes":20}
+{"message_type":"status","percent_done":1,"total_files":12,"files_done":12,"total_bytes":3456,"bytes_done":3456}
+{"message_type":"summary","files_new":2,"files_changed":3,"files_unmodified":7,"dirs_new":0,"dirs_changed":1,\
+"dirs_unmodified":4,"data_blobs":5,"tree_blobs":2,"data_added":2048,"total_files_processed":12,\
+"total_bytes_processed":3456,"total_duration":1.5,"snapshot_id":"2f3a8c1d"}
+'''
+
+
+class TestHistory(unittest.TestCase):
+
+    def test_backup_summary(self):
+        """
+        Testet das Auslesen der Zusammenfassung aus der Ausgabe von restic.
+        """
+        _summary = BackupSummary.from_restic_output(RESTIC_BACKUP_OUTPUT)
+        self.assertIsNotNone(_summary)
+        self.assertEqual(2, _summary.files_new())
+        self.assertEqual(3, _summary.files_changed())
+        self.assertEqual(7, _summary.files_unmodified())
+        self.assertEqual(2048, _summary.data_added())
+        self.assertEqual(3456, _summary.total_bytes_processed())
+        self.assertEqual(1.5, _summary.total_duration())
+        self.assertEqual(2304.0, _summary.throughput())
+        self.assertEqual('2f3a8c1d', _summary.snapshot_id())
+        self.assertIsNone(BackupSummary.from_restic_output('snapshot 2f3a8c1d saved'))
+
+    def test_backup_history(self):
+        """
+        Testet Speichern und Lesen der Historie.
+        """
+        with tempfile.TemporaryDirectory() as _temp_dir:
+            _history = BackupHistory(os.path.join(_temp_dir, 'history.sqlite'))
+            self.assertEqual([], _history.backups('target'))
+            _first = BackupSummary.from_restic_output(RESTIC_BACKUP_OUTPUT)
+            _second = BackupSummary({'files_new': 1, 'total_duration': 2.0}, _first.finished() + datetime.timedelta(1))
+            _history.add('target', '/var/restix/target', _first)
+            _history.add('target', '/var/restix/target', _second)
+            _history.add('other', '/var/restix/other', _first)
+            self.assertEqual([_second, _first], _history.backups('target'))
+            self.assertEqual([_second], _history.backups('target', 1))
+            self.assertEqual([_first], _history.backups('other'))
+
+    def test_detect_regressions(self):
+        """
+        Testet die Erkennung von Regressionen gegenüber vorherigen Backups.
+        """
+        _previous = [BackupSummary({'total_bytes_processed': 1000 << 20, 'total_duration': _d,
+                                    'data_added': 10 << 20}) for _d in (100.0, 110.0, 90.0)]
+        _normal = BackupSummary({'total_bytes_processed': 1000 << 20, 'total_duration': 120.0,
+                                 'data_added': 12 << 20})
+        self.assertEqual([], detect_regressions(_normal, _previous))
+        # zu wenige vorherige Backups
+        _full_read = BackupSummary({'total_bytes_processed': 1000 << 20, 'total_duration': 400.0,
+                                    'data_added': 900 << 20})
+        self.assertEqual([], detect_regressions(_full_read, _previous[:2]))
+        _regressions = detect_regressions(_full_read, _previous)
+        self.assertEqual([REGRESSION_THROUGHPUT, REGRESSION_DURATION, REGRESSION_DATA_ADDED],
+                         [_r[0] for _r in _regressions])
+        self.assertEqual((REGRESSION_DURATION, 400.0, 100.0), _regressions[1])
+        # Abweichung innerhalb des Bands, bzw. Prüfung abgeschaltet
+        self.assertEqual([], detect_regressions(_full_read, _previous, 10000))
+        self.assertEqual([], detect_regressions(_full_read, _previous, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests für core.hooks.
+"""
+
+import os
+import shlex
+import sys
+import tempfile
+import time
+import unittest
+
+from restix.core import ENVA_RESTIX_HOOK, ENVA_RESTIX_RESULT, ENVA_RESTIX_TARGET
+from restix.core.hooks import BACKUP_RESULT_ABORTED, BACKUP_RESULT_FAILED, HOOK_POST, HOOK_PRE, BackupHooks
+from restix.core.task import TaskMonitor
+
+
+class TestHooks(unittest.TestCase):
+
+    def test_hook_environment(self):
+        """
+        Testet die Umgebungsvariablen für die Hooks.
+        """
+        _hooks = BackupHooks('true', None, environment={ENVA_RESTIX_TARGET: 'target-dir'})
+        self.assertTrue(_hooks.defined())
+        self.assertFalse(BackupHooks(None, None).defined())
+        _env = _hooks.hook_environment(HOOK_PRE)
+        self.assertEqual('target-dir', _env[ENVA_RESTIX_TARGET])
+        self.assertEqual(HOOK_PRE, _env[ENVA_RESTIX_HOOK])
+        self.assertNotIn(ENVA_RESTIX_RESULT, _env)
+        _env = _hooks.hook_environment(HOOK_POST, BACKUP_RESULT_FAILED)
+        self.assertEqual(BACKUP_RESULT_FAILED, _env[ENVA_RESTIX_RESULT])
+
+    def test_failing_hooks(self):
+        """
+        Testet fehlschlagende und zu lange laufende Hooks.
+        """
+        _monitor = TaskMonitor(None, True)
+        self.assertFalse(BackupHooks(_python_command('import sys; sys.exit(2)'), None).run_pre_hook(_monitor))
+        self.assertFalse(BackupHooks('restix-hook-does-not-exist', None).run_pre_hook(_monitor))
+        _hooks = BackupHooks(_python_command('import time; time.sleep(10)'), None, timeout=1)
+        self.assertFalse(_hooks.run_pre_hook(_monitor))
+        # dry-run führt keine Befehle aus
+        _hooks = BackupHooks(_python_command('import sys; sys.exit(2)'), None, dry_run=True)
+        self.assertTrue(_hooks.run_pre_hook(_monitor))
+
+    @unittest.skipUnless(hasattr(os, 'killpg'), 'nur unter POSIX')
+    def test_hook_timeout_with_child_process(self):
+        """
+        Testet, dass bei Zeitüberschreitung auch vom Hook gestartete Prozesse beendet werden.
+        """
+        _script = 'import subprocess, sys; subprocess.run([sys.executable, "-c", "import time; time.sleep(20)"])'
+        _started = time.monotonic()
+        self.assertFalse(BackupHooks(_python_command(_script), None, timeout=1).run_pre_hook(TaskMonitor(None, True)))
+        self.assertLess(time.monotonic() - _started, 10)
+
+    def test_post_hook_after_abort(self):
+        """
+        Testet, dass der Post-Hook auch nach Abbruch des Backups ausgeführt wird.
+        """
+        with tempfile.TemporaryDirectory() as _temp_dir:
+            _result_file = os.path.join(_temp_dir, 'result')
+            _script = f'import os; open({_result_file!r}, "w").write(os.environ["{ENVA_RESTIX_RESULT}"])'
+            _monitor = TaskMonitor(None, True)
+            _monitor.request_abort()
+            self.assertTrue(BackupHooks(None, _python_command(_script)).run_post_hook(BACKUP_RESULT_ABORTED, _monitor))
+            with open(_result_file, 'r') as _f:
+                self.assertEqual(BACKUP_RESULT_ABORTED, _f.read())
+
+
+def _python_command(script: str) -> str:
+    """
+    :param script: Python-Code
+    :returns: Befehl, der den Python-Code ausführt
+    """
+    return shlex.join([sys.executable, '-c', script])
+
+
+if __name__ == '__main__':
+    unittest.main()
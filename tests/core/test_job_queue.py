@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests für core.job_queue.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+
+from restix.core import *
+from restix.core.job_queue import Job, JobQueue, processed_bytes
+
+# Backup-Ziele
+TARGET_SRV = 'target-srv'
+TARGET_DIR = 'target-dir'
+
+
+class TestJobQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.__temp_dir = tempfile.TemporaryDirectory()
+        self.__file_path = os.path.join(self.__temp_dir.name, RESTIX_JOB_QUEUE_FN)
+
+    def tearDown(self):
+        self.__temp_dir.cleanup()
+
+    def test_roundtrip(self):
+        """
+        Testet Speichern und Laden der Warteschlange.
+        """
+        _queue = JobQueue(self.__file_path)
+        _running_job = Job(ACTION_BACKUP, TARGET_SRV, {OPTION_DRY_RUN: True, OPTION_PASSWORD: 'secret'})
+        _finished_job = Job(ACTION_UNLOCK, TARGET_DIR)
+        _queue.add(_running_job)
+        _queue.add(_finished_job)
+        _running_job.mark_running()
+        _finished_job.mark_running()
+        _finished_job.mark_finished(JOB_STATE_SUCCEEDED, 'ok')
+        _queue.save()
+        _loaded_queue = JobQueue.from_file(self.__file_path)
+        self.assertEqual(2, len(_loaded_queue.jobs()))
+        _job = _loaded_queue.job(_running_job.job_id())
+        # laufende Aufträge werden nach dem Laden erneut ausgeführt, Passwörter nicht gespeichert
+        self.assertEqual(JOB_STATE_PENDING, _job.state())
+        self.assertEqual({OPTION_DRY_RUN: True}, _job.options())
+        _job = _loaded_queue.job(_finished_job.job_id())
+        self.assertEqual(JOB_STATE_SUCCEEDED, _job.state())
+        self.assertEqual('ok', _job.summary())
+        self.assertIsNotNone(_job.duration())
+
+    def test_next_pending_job(self):
+        """
+        Testet die Auswahl des nächsten Auftrags.
+        """
+        _queue = JobQueue(self.__file_path)
+        _first_job = Job(ACTION_BACKUP, TARGET_SRV)
+        _second_job = Job(ACTION_FORGET, TARGET_SRV)
+        _third_job = Job(ACTION_BACKUP, TARGET_DIR)
+        for _job in (_first_job, _second_job, _third_job):
+            _queue.add(_job)
+        self.assertIs(_first_job, _queue.next_pending_job())
+        _first_job.mark_running()
+        # für dasselbe Backup-Ziel darf nur ein Auftrag laufen
+        self.assertIs(_third_job, _queue.next_pending_job())
+        self.assertFalse(_queue.remove(_first_job.job_id()))
+        _first_job.mark_finished(JOB_STATE_FAILED, 'failed')
+        self.assertIs(_second_job, _queue.next_pending_job())
+        _queue.remove_finished()
+        self.assertEqual([_second_job, _third_job], _queue.jobs())
+
+    def test_processed_bytes(self):
+        """
+        Testet die Ermittlung der verarbeiteten Datenmenge aus restic-Statusmeldungen.
+        """
+        self.assertEqual(int(1.5 * (1 << 30)),
+                         processed_bytes('[0:12] 45.23%  1234 files 1.500 GiB, total 5678 files 3.2 GiB, 0 errors'))
+        self.assertEqual(512, processed_bytes('[1:00:12] 10.00%  3 files/dirs 512 B, total 30 files/dirs 5 KiB'))
+        self.assertIsNone(processed_bytes('[0:00] 0 files 0 B'))
+        _job = Job(ACTION_BACKUP, TARGET_SRV)
+        _job.mark_running()
+        _job.update_status('[0:12] 45.23%  1234 files 100 MiB, total 5678 files 3.2 GiB, 0 errors')
+        self.assertAlmostEqual(10 * (1 << 20), _job.throughput(time.time() + 10), delta=1 << 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests für core.locks.
+"""
+
+import datetime
+import json
+import os
+import subprocess
+import unittest
+
+from restix.core.locks import STALE_LOCK_AGE, RepositoryLock, lock_ids
+
+_HOST = 'myhost'
+_NOW = datetime.datetime(2025, 3, 1, 2, 0, tzinfo=datetime.timezone.utc)
+
+
+class TestLocks(unittest.TestCase):
+
+    def test_stale_locks(self):
+        """
+        Testet die Erkennung veralteter Sperren.
+        """
+        # aktive Sperre auf anderem Rechner
+        _lock = self.lock('otherhost', 4711, 60)
+        self.assertFalse(_lock.is_stale(_NOW, _HOST))
+        self.assertEqual(60.0, _lock.age(_NOW))
+        # zu alte Sperre
+        _lock = self.lock('otherhost', 4711, STALE_LOCK_AGE + 1)
+        self.assertTrue(_lock.is_stale(_NOW, _HOST))
+        # Prozess auf dem eigenen Rechner existiert
+        _lock = self.lock(_HOST, os.getpid(), 60)
+        self.assertFalse(_lock.is_stale(_NOW, _HOST))
+        # Prozess auf dem eigenen Rechner existiert nicht mehr
+        _p = subprocess.Popen(['true'])
+        _p.wait()
+        _lock = self.lock(_HOST, _p.pid, 60)
+        self.assertTrue(_lock.is_stale(_NOW, _HOST))
+
+    def test_conflicts(self):
+        """
+        Testet die Prüfung, ob eine Sperre einen Befehl blockiert.
+        """
+        _lock = self.lock(_HOST, 1, 60)
+        self.assertFalse(_lock.conflicts_with(False))
+        self.assertTrue(_lock.conflicts_with(True))
+        _lock = self.lock(_HOST, 1, 60, True)
+        self.assertTrue(_lock.conflicts_with(False))
+
+    def test_restic_output(self):
+        """
+        Testet die Auswertung der Ausgaben von restic list locks und restic cat lock.
+        """
+        self.assertEqual(['a1b2', 'c3d4'], lock_ids('a1b2\n\nc3d4\n'))
+        self.assertEqual([], lock_ids(''))
+        self.assertIsNone(RepositoryLock.from_restic_output('a1b2', 'no json'))
+        _lock = RepositoryLock.from_restic_output('a1b2', json.dumps({'time': '2025-03-01T02:59:00.123456789+01:00',
+                                                                      'exclusive': True, 'hostname': _HOST,
+                                                                      'username': 'me', 'pid': 4711}))
+        self.assertEqual('a1b2', _lock.lock_id())
+        self.assertTrue(_lock.exclusive())
+        self.assertEqual('me', _lock.username())
+        self.assertAlmostEqual(59.876544, _lock.age(_NOW), 3)
+
+    @staticmethod
+    def lock(hostname: str, pid: int, age: int, exclusive: bool = False) -> RepositoryLock:
+        """
+        :param hostname: Name des Rechners
+        :param pid: Prozess-ID
+        :param age: Alter der Sperre in Sekunden
+        :param exclusive: zeigt an, ob die Sperre exklusiv ist
+        :returns: Sperre mit den angegebenen Daten
+        """
+        _time = _NOW - datetime.timedelta(seconds=age)
+        return RepositoryLock('a1b2', {'time': _time.isoformat(), 'exclusive': exclusive, 'hostname': hostname,
+                                       'username': 'me', 'pid': pid})
+
+
+if __name__ == '__main__':
+    unittest.main()
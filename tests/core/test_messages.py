@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests für core.messages.
+"""
+
+import os
+import tempfile
+import unittest
+
+from restix.core import ENVA_XDG_CACHE_HOME
+from restix.core.messages import MessageTable
+
+# Testdaten für eine Nachrichten-Datei
+_CATALOG = os.linesep.join(['# Kommentar', 'e-one Nachricht mit {0} und {1}', 'e-multi Erste Zeile\\n \\',
+                            '  zweite Zeile', 'e-invalid Fehlerhaft {0', 'e-named Benannt {name}',
+                            'l-plain Text ohne Argumente', ''])
+
+
+class TestMessages(unittest.TestCase):
+
+    def setUp(self):
+        self.__temp_dir = tempfile.TemporaryDirectory()
+        self.__original_cache_home = os.environ.get(ENVA_XDG_CACHE_HOME)
+        os.environ[ENVA_XDG_CACHE_HOME] = os.path.join(self.__temp_dir.name, 'cache')
+        self.__catalog_path = os.path.join(self.__temp_dir.name, 'messages_xx.txt')
+        self.write_catalog(_CATALOG)
+
+    def tearDown(self):
+        if self.__original_cache_home is None:
+            del os.environ[ENVA_XDG_CACHE_HOME]
+        else:
+            os.environ[ENVA_XDG_CACHE_HOME] = self.__original_cache_home
+        self.__temp_dir.cleanup()
+
+    def test_message_table(self):
+        """
+        Testet die vorab geprüften Format-Strings und ersetzten Zeilenumbrüche.
+        """
+        _table = MessageTable(_CATALOG)
+        self.assertEqual('Nachricht mit a und b', _table.message_for('e-one', 'a', 'b'))
+        self.assertEqual('e-one', _table.message_for('e-one', 'a'))
+        self.assertEqual(f'Erste Zeile{os.linesep}  zweite Zeile', _table.message_for('e-multi'))
+        self.assertEqual('e-invalid', _table.message_for('e-invalid', 'a'))
+        self.assertEqual('e-named', _table.message_for('e-named', 'a'))
+        self.assertEqual('Text ohne Argumente', _table.label_for('l-plain'))
+        self.assertEqual('e-unknown', _table.message_for('e-unknown'))
+
+    def test_catalog_cache(self):
+        """
+        Testet das Schreiben und Verwenden der Cache-Datei.
+        """
+        _table = MessageTable.from_catalog(self.__catalog_path, 'xx')
+        _cache_dir = os.path.join(os.environ[ENVA_XDG_CACHE_HOME], 'restix')
+        self.assertEqual(1, len(os.listdir(_cache_dir)))
+        _cached_table = MessageTable.from_catalog(self.__catalog_path, 'xx')
+        self.assertEqual(_table, _cached_table)
+        self.assertEqual('e-one', _cached_table.message_for('e-one', 'a'))
+        self.assertEqual('e-invalid', _cached_table.message_for('e-invalid', 'a'))
+        # geänderte Datei muss neu verarbeitet werden
+        self.write_catalog(_CATALOG.replace('Text ohne', 'Geänderter Text ohne'))
+        _stat = os.stat(self.__catalog_path)
+        os.utime(self.__catalog_path, ns=(_stat.st_atime_ns, _stat.st_mtime_ns + 1_000_000_000))
+        _changed_table = MessageTable.from_catalog(self.__catalog_path, 'xx')
+        self.assertEqual('Geänderter Text ohne Argumente', _changed_table.label_for('l-plain'))
+        self.assertEqual(1, len(os.listdir(_cache_dir)))
+
+    def write_catalog(self, contents: str):
+        """
+        Schreibt die Nachrichten-Datei für den Test.
+        :param contents: Inhalt der Datei
+        """
+        with open(self.__catalog_path, 'w', newline='', encoding='utf-8') as _f:
+            _f.write(contents)
+
+
+if __name__ == '__main__':
+    unittest.main()
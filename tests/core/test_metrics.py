@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests für core.metrics.
+"""
+
+import os
+import tempfile
+import unittest
+
+from restix.core.metrics import *
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_update(self):
+        """
+        Testet das Schreiben und Aktualisieren einer Datei für den Textfile-Collector.
+        """
+        with tempfile.TemporaryDirectory() as _temp_dir:
+            _exporter = MetricsExporter(_temp_dir)
+            _labels = {'host': 'pc', 'year': '2025'}
+            _exporter.update('my srv', _labels, {METRIC_RESTIC_EXIT_CODE: 0, METRIC_BACKUP_DURATION: 12.5,
+                                                 METRIC_SNAPSHOTS: 3}, 'backup')
+            _exporter.update('my srv', _labels, {METRIC_RESTIC_EXIT_CODE: 1, METRIC_SNAPSHOTS: 2}, 'forget')
+            self.assertEqual(['restix_my_srv.prom'], os.listdir(_temp_dir))
+            with open(os.path.join(_temp_dir, 'restix_my_srv.prom'), 'r') as _f:
+                _lines = _f.read().splitlines()
+            _base_labels = 'target="my srv",host="pc",year="2025"'
+            self.assertIn(f'{METRIC_BACKUP_DURATION}{{{_base_labels}}} 12.5', _lines)
+            self.assertIn(f'{METRIC_SNAPSHOTS}{{{_base_labels}}} 2', _lines)
+            self.assertIn(f'{METRIC_RESTIC_EXIT_CODE}{{{_base_labels},action="backup"}} 0', _lines)
+            self.assertIn(f'{METRIC_RESTIC_EXIT_CODE}{{{_base_labels},action="forget"}} 1', _lines)
+            self.assertEqual(1, _lines.count(f'# TYPE {METRIC_RESTIC_EXIT_CODE} gauge'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests für core.priority.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import unittest
+
+from restix.core import ENVA_GOGC, ENVA_GOMEMLIMIT
+from restix.core.priority import ProcessPriority
+
+
+class TestPriority(unittest.TestCase):
+
+    def test_default_priority(self):
+        """
+        Testet, dass ohne Angaben weder Befehl noch Prozess-Start verändert werden.
+        """
+        _priority = ProcessPriority()
+        self.assertEqual(['restic', 'backup'], _priority.command(['restic', 'backup']))
+        self.assertEqual({}, _priority.popen_arguments())
+
+    def test_ionice_command(self):
+        """
+        Testet das Voranstellen von ionice.
+        """
+        _cmd = ProcessPriority(ionice_class='best-effort', ionice_priority=7).command(['restic', 'backup'])
+        if len(_cmd) == 2:
+            self.skipTest('ionice ist nicht installiert')
+        self.assertEqual(['-c', '2', '-n', '7', 'restic', 'backup'], _cmd[1:])
+        _cmd = ProcessPriority(ionice_class='Idle', ionice_priority=7).command(['restic', 'backup'])
+        self.assertEqual(['-c', '3', 'restic', 'backup'], _cmd[1:])
+
+    @unittest.skipUnless(hasattr(os, 'sched_getaffinity'), 'nur unter Linux')
+    def test_child_priority(self):
+        """
+        Testet Nice-Level, CPU-Affinität und Umgebungsvariablen eines Kindprozesses.
+        """
+        if shutil.which('nice') is None or shutil.which('taskset') is None:
+            self.skipTest('nice oder taskset ist nicht installiert')
+        _cpu = min(os.sched_getaffinity(0))
+        _nice = max(os.getpriority(os.PRIO_PROCESS, 0), 15)
+        # nicht verfügbare CPUs werden ignoriert
+        _priority = ProcessPriority(nice=_nice, cpu_affinity=[_cpu, 9999],
+                                    go_environment={ENVA_GOGC: '50', ENVA_GOMEMLIMIT: '512MiB'})
+        _script = ('import os; print(os.getpriority(os.PRIO_PROCESS, 0), sorted(os.sched_getaffinity(0)), '
+                   f'os.environ["{ENVA_GOGC}"], os.environ["{ENVA_GOMEMLIMIT}"])')
+        _res = subprocess.run(_priority.command([sys.executable, '-c', _script]), capture_output=True,
+                              encoding='utf-8', **_priority.popen_arguments())
+        self.assertEqual(0, _res.returncode, _res.stderr)
+        self.assertEqual(f'{_nice} [{_cpu}] 50 512MiB', _res.stdout.strip())
+        # ohne verfügbare CPU bleibt der Befehl unverändert
+        self.assertEqual(['restic', 'backup'], ProcessPriority(cpu_affinity=[9999]).command(['restic', 'backup']))
+
+if __name__ == '__main__':
+    unittest.main()
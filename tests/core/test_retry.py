@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests für core.retry.
+"""
+
+import os
+import tempfile
+import unittest
+
+from restix.core import RESTIC_RC_CMD_FAILED, RESTIC_RC_OK, RESTIC_RC_REPO_LOCK_FAILED, RESTIC_RC_REPO_WRONG_PASSWORD
+from restix.core.restic_interface import _execute_restic_command
+from restix.core.retry import MAX_RETRY_DELAY, RetryPolicy
+from restix.core.task import TaskMonitor
+
+
+class TestRetry(unittest.TestCase):
+
+    def test_retry_policy(self):
+        """
+        Testet die Regeln für die Wiederholung von restic-Befehlen.
+        """
+        _policy = RetryPolicy(4, 30)
+        # Sperre im Repository und Verbindungsabbruch sind vorübergehende Fehler
+        self.assertTrue(_policy.is_transient(RESTIC_RC_REPO_LOCK_FAILED, ''))
+        self.assertTrue(_policy.is_transient(RESTIC_RC_CMD_FAILED, 'Fatal: ssh: Connection reset by peer'))
+        self.assertFalse(_policy.is_transient(RESTIC_RC_CMD_FAILED, 'Fatal: invalid id'))
+        self.assertFalse(_policy.is_transient(RESTIC_RC_REPO_WRONG_PASSWORD, 'connection reset'))
+        # Pause wird verdoppelt, nach dem letzten Versuch gibt es keine Wiederholung
+        self.assertEqual(30, _policy.retry_delay(1, RESTIC_RC_REPO_LOCK_FAILED, ''))
+        self.assertEqual(60, _policy.retry_delay(2, RESTIC_RC_REPO_LOCK_FAILED, ''))
+        self.assertEqual(120, _policy.retry_delay(3, RESTIC_RC_REPO_LOCK_FAILED, ''))
+        self.assertIsNone(_policy.retry_delay(4, RESTIC_RC_REPO_LOCK_FAILED, ''))
+        self.assertEqual(MAX_RETRY_DELAY, RetryPolicy(10, 500).retry_delay(2, RESTIC_RC_REPO_LOCK_FAILED, ''))
+        # benutzerdefinierte Return codes und Muster
+        _policy = RetryPolicy(2, 0, [RESTIC_RC_REPO_WRONG_PASSWORD], ['quota'])
+        self.assertTrue(_policy.is_transient(RESTIC_RC_REPO_WRONG_PASSWORD, ''))
+        self.assertFalse(_policy.is_transient(RESTIC_RC_REPO_LOCK_FAILED, ''))
+        self.assertTrue(_policy.is_transient(RESTIC_RC_CMD_FAILED, 'Quota exceeded'))
+        # Standard ist keine Wiederholung
+        self.assertIsNone(RetryPolicy().retry_delay(1, RESTIC_RC_REPO_LOCK_FAILED, ''))
+
+    def test_retried_command(self):
+        """
+        Testet die Wiederholung eines Befehls nach einem vorübergehenden Fehler.
+        """
+        with tempfile.TemporaryDirectory() as _temp_dir:
+            _counter_file = os.path.join(_temp_dir, 'attempts')
+            # erster Aufruf scheitert an einer Sperre, zweiter ist erfolgreich
+            _cmd = ['sh', '-c', f'echo x >> {_counter_file}; [ $(wc -l < {_counter_file}) -ge 2 ] || exit 11']
+            _rc, _, _ = _execute_restic_command(_cmd, TaskMonitor(None, True), False, RetryPolicy(3, 0))
+            self.assertEqual(RESTIC_RC_OK, _rc)
+            with open(_counter_file, 'r') as _f:
+                self.assertEqual(2, len(_f.readlines()))
+            # ohne Regeln keine Wiederholung
+            os.remove(_counter_file)
+            _rc, _, _ = _execute_restic_command(_cmd, TaskMonitor(None, True))
+            self.assertEqual(RESTIC_RC_REPO_LOCK_FAILED, _rc)
+
+
+if __name__ == '__main__':
+    unittest.main()
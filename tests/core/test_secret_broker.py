@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests für core.secret_broker.
+"""
+
+import subprocess
+import sys
+import unittest
+
+from restix.core.secret_broker import *
+
+
+class TestSecretBroker(unittest.TestCase):
+
+    def test_put_and_clear(self):
+        """
+        Testet das Ablegen und Überschreiben von Passwörtern.
+        """
+        _broker = SecretBroker()
+        _ref = _broker.put('text:unittest', 'geheim')
+        self.assertTrue(is_secret_reference(_ref))
+        self.assertFalse(is_secret_reference('/home/user/pw.txt'))
+        with _broker.locked_secret(_ref) as _secret:
+            self.assertEqual(b'geheim', bytes(_secret))
+        _broker.clear()
+        with _broker.locked_secret(_ref) as _cleared_secret:
+            self.assertIsNone(_cleared_secret)
+        self.assertEqual(bytes(6), bytes(_secret))
+
+    def test_secrets_handed_over(self):
+        """
+        Testet die Übergabe eines Passworts an einen Kindprozess.
+        """
+        _ref = SecretBroker.instance().put('text:unittest-hand-over', 'streng geheim')
+        _cmd = [sys.executable, '-c', 'import sys; print(open(sys.argv[2]).read())', '--password-file', _ref]
+        with secrets_handed_over(_cmd) as (_resolved_cmd, _fds):
+            self.assertNotIn(_ref, _resolved_cmd)
+            _res = subprocess.run(_resolved_cmd, capture_output=True, encoding='utf-8', pass_fds=_fds)
+        self.assertEqual(0, _res.returncode)
+        self.assertEqual('streng geheim', _res.stdout.strip())
+        SecretBroker.instance().clear()
+        with self.assertRaises(RestixException):
+            with secrets_handed_over(_cmd):
+                pass
+
+    def test_lazy_pgp_decryption(self):
+        """
+        Testet, dass pgp-verschlüsselte Dateien erst bei der Übergabe an restic entschlüsselt werden.
+        """
+        _ref = SecretBroker.instance().pgp_reference('/restix/unittest/does-not-exist.gpg')
+        self.assertTrue(is_secret_reference(_ref))
+        with self.assertRaises(RestixException):
+            with secrets_handed_over(['restic', '--password-file', _ref]):
+                pass
+
+
+if __name__ == '__main__':
+    unittest.main()
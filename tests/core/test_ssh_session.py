@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests für core.ssh_session.
+"""
+
+import os
+import shlex
+import stat
+import tempfile
+import unittest
+
+from restix.core.ssh_session import SshMultiplexer, sftp_host_args
+
+
+class TestSshSession(unittest.TestCase):
+
+    def test_sftp_host_args(self):
+        """
+        Testet die Ermittlung des Hosts aus einem sftp-Repository.
+        """
+        self.assertEqual(('myserver',), sftp_host_args('sftp:myserver:data/restix'))
+        self.assertEqual(('-l', 'backup', 'nas'), sftp_host_args('sftp:backup@nas:/srv/restic'))
+        self.assertEqual(('-p', '2222', '-l', 'backup', 'nas'), sftp_host_args('sftp://backup@nas:2222//srv/restic'))
+        self.assertEqual(('nas',), sftp_host_args('sftp://nas/restic'))
+        self.assertIsNone(sftp_host_args('/media/usb/restix'))
+        self.assertIsNone(sftp_host_args('rest:https://nas:8000/'))
+        self.assertIsNone(sftp_host_args('sftp:nas'))
+
+    def test_multiplexer(self):
+        """
+        Testet Kommando und Abbau der Master-Verbindungen mit einem Ersatz für ssh.
+        """
+        with tempfile.TemporaryDirectory() as _temp_dir:
+            _log_file = os.path.join(_temp_dir, 'ssh.log')
+            _ssh_file = os.path.join(_temp_dir, 'ssh')
+            with open(_ssh_file, 'w') as _f:
+                _f.write(f'#!/bin/sh\necho "$@" >> {_log_file}\n')
+            os.chmod(_ssh_file, stat.S_IRWXU)
+            _multiplexer = SshMultiplexer(_ssh_file)
+            self.assertIsNone(_multiplexer.sftp_command('/media/usb/restix'))
+            _cmd = shlex.split(_multiplexer.sftp_command('sftp:backup@nas:/srv/restic'))
+            self.assertEqual([_ssh_file, '-l', 'backup'], _cmd[:3])
+            self.assertEqual(['nas', '-s', 'sftp'], _cmd[-3:])
+            self.assertIn('ControlMaster=auto', _cmd)
+            _control_path = [_o for _o in _cmd if _o.startswith('ControlPath=')][0]
+            _control_dir = os.path.dirname(_control_path[len('ControlPath='):])
+            self.assertTrue(os.path.isdir(_control_dir))
+            # alle Repositories auf demselben Host benutzen dieselbe Verbindung
+            self.assertEqual(shlex.join(_cmd), _multiplexer.sftp_command('sftp:backup@nas:/srv/other'))
+            _multiplexer.close()
+            self.assertFalse(os.path.exists(_control_dir))
+            with open(_log_file, 'r') as _f:
+                _calls = _f.read().splitlines()
+            self.assertEqual([f'-l backup -o {_control_path} -O exit nas'], _calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests für core.task.
+"""
+
+import time
+import unittest
+
+from restix.core import SEVERITY_ERROR, SEVERITY_INFO
+from restix.core.task import ProgressAggregator, TaskProgress
+
+
+class TestTask(unittest.TestCase):
+
+    def test_progress_aggregator(self):
+        """
+        Testet das Bündeln von Fortschritt-Nachrichten.
+        """
+        _batches = []
+        _aggregator = ProgressAggregator(_batches.append, 10)
+        # erste Nachricht wird sofort ausgeliefert
+        _aggregator.add(TaskProgress(50, SEVERITY_INFO, 'line 1'))
+        self.assertEqual([['line 1']], self.texts_of(_batches))
+        # weitere Nachrichten werden gesammelt, von Status-Nachrichten nur die letzte
+        _aggregator.add(TaskProgress(10, SEVERITY_INFO, 'status 10%', True))
+        _aggregator.add(TaskProgress(50, SEVERITY_INFO, 'line 2'))
+        _aggregator.add(TaskProgress(20, SEVERITY_INFO, 'status 20%', True))
+        _aggregator.add(TaskProgress(30, SEVERITY_INFO, 'status 30%', True))
+        self.assertEqual(1, len(_batches))
+        # Fehlermeldungen werden sofort ausgeliefert
+        _aggregator.add(TaskProgress(50, SEVERITY_ERROR, 'error'))
+        self.assertEqual([['line 1'], ['line 2', 'status 30%', 'error']], self.texts_of(_batches))
+        # Rest wird spätestens nach Ablauf des Intervalls ausgeliefert
+        _aggregator.add(TaskProgress(50, SEVERITY_INFO, 'line 3'))
+        time.sleep(0.3)
+        self.assertEqual(['line 3'], self.texts_of(_batches)[-1])
+        # flush liefert sofort aus
+        _aggregator.add(TaskProgress(50, SEVERITY_INFO, 'line 4'))
+        _aggregator.flush()
+        self.assertEqual(['line 4'], self.texts_of(_batches)[-1])
+        _aggregator.flush()
+        self.assertEqual(4, len(_batches))
+
+    @staticmethod
+    def texts_of(batches: list[list[TaskProgress]]) -> list[list[str]]:
+        """
+        :param batches: ausgelieferte Bündel
+        :returns: Nachrichtentexte der Bündel
+        """
+        return [[_p.message_text() for _p in _batch] for _batch in batches]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests für core.throttle.
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from restix.core.task import TaskMonitor
+from restix.core.throttle import BackupThrottle, LoadAverageLoadSource, LoadSource, PressureLoadSource
+
+
+class FixedLoadSource(LoadSource):
+    """
+    Quelle mit vorgegebener Systemlast.
+    """
+    def __init__(self):
+        super().__init__()
+        self.value = None
+
+    def load(self) -> float | None:
+        return self.value
+
+
+class TestThrottle(unittest.TestCase):
+
+    def test_load_sources(self):
+        """
+        Testet das Lesen der Systemlast aus den Dateien des Kernels.
+        """
+        with tempfile.TemporaryDirectory() as _temp_dir:
+            with open(os.path.join(_temp_dir, 'cpu'), 'w') as _f:
+                _f.write('some avg10=12.50 avg60=3.00 avg300=1.00 total=1234\n')
+            with open(os.path.join(_temp_dir, 'io'), 'w') as _f:
+                _f.write('some avg10=47.10 avg60=3.00 avg300=1.00 total=1234\n'
+                         'full avg10=80.00 avg60=3.00 avg300=1.00 total=1234\n')
+            self.assertEqual(47.1, PressureLoadSource(pressure_dir=_temp_dir).load())
+            self.assertEqual(12.5, PressureLoadSource(('cpu', 'memory'), _temp_dir).load())
+            self.assertIsNone(PressureLoadSource(('memory',), _temp_dir).load())
+            _loadavg_file = os.path.join(_temp_dir, 'loadavg')
+            with open(_loadavg_file, 'w') as _f:
+                _f.write(f'{os.cpu_count() / 2} 0.11 0.09 2/71 24246\n')
+            self.assertAlmostEqual(50.0, LoadAverageLoadSource(_loadavg_file).load())
+
+    @unittest.skipUnless(hasattr(signal, 'SIGSTOP'), 'nur unter POSIX')
+    def test_pause_and_resume(self):
+        """
+        Testet Anhalten und Fortsetzen eines Prozesses abhängig von der Systemlast.
+        """
+        _source = FixedLoadSource()
+        _throttle = BackupThrottle(_source, 60, 30, interval=3600)
+        _p = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+        try:
+            _throttle.start(_p, TaskMonitor(None, True))
+            _source.value = 50
+            _throttle.check()
+            self.assertFalse(_throttle.is_paused())
+            _source.value = 75
+            _throttle.check()
+            self.assertTrue(_throttle.is_paused())
+            # zwischen den Schwellen bleibt der Prozess angehalten
+            _source.value = 40
+            _throttle.check()
+            self.assertTrue(_throttle.is_paused())
+            _source.value = 20
+            _throttle.check()
+            self.assertFalse(_throttle.is_paused())
+            # maximale Dauer einer Pause
+            _throttle = BackupThrottle(_source, 60, interval=3600, max_pause=0)
+            _throttle.start(_p, TaskMonitor(None, True))
+            _source.value = 90
+            _throttle.check()
+            self.assertTrue(_throttle.is_paused())
+            _throttle.check()
+            self.assertFalse(_throttle.is_paused())
+            # Beenden der Überwachung setzt einen angehaltenen Prozess fort
+            _throttle.check()
+            self.assertTrue(_throttle.is_paused())
+            _throttle.stop()
+            self.assertFalse(_throttle.is_paused())
+        finally:
+            _p.kill()
+            _p.wait()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests für core.watcher.
+"""
+
+import os
+import platform
+import tempfile
+import threading
+import time
+import unittest
+
+from restix.core.fingerprint import ExcludeFilter
+from restix.core.task import TaskMonitor, TaskResult
+from restix.core.watcher import *
+
+
+class TestWatcher(unittest.TestCase):
+
+    def test_changed_subtrees(self):
+        """
+        Testet die Reduktion geänderter Pfade auf die obersten geänderten Verzeichnisse.
+        """
+        with tempfile.TemporaryDirectory() as _root:
+            os.makedirs(os.path.join(_root, 'a', 'b'))
+            os.makedirs(os.path.join(_root, 'ab'))
+            _paths = [os.path.join(_root, 'a', 'b', 'x.txt'), os.path.join(_root, 'a'),
+                      os.path.join(_root, 'ab', 'y.txt'), os.path.join(_root, 'a', 'b')]
+            self.assertEqual([os.path.join(_root, 'a'), os.path.join(_root, 'ab')], changed_subtrees(_paths))
+
+    def test_debounce_and_back_pressure(self):
+        """
+        Testet, dass Änderungen gesammelt werden und pro Backup-Ziel maximal ein Backup läuft.
+        """
+        _release_backup = threading.Event()
+        _backups = []
+        _running = []
+
+        def _backup(subtrees: list[str]) -> TaskResult:
+            _running.append(1)
+            self.assertEqual(1, len(_running))
+            _backups.append(subtrees)
+            _release_backup.wait(5)
+            _running.pop()
+            return TaskResult(TASK_SUCCEEDED, '')
+
+        _watcher = BackupWatcher(_FakeChangeSource(), ExcludeFilter(['*.tmp']), _backup,
+                                 TaskMonitor(None, True), 0.05)
+        # ausgeschlossene Änderungen lösen kein Backup aus
+        _watcher.process_changes(['/data/x.tmp'])
+        time.sleep(0.06)
+        _watcher.process_changes([])
+        self.assertFalse(_watcher.backup_in_progress())
+        # Backup erst nach Ablauf der Wartezeit
+        _watcher.process_changes(['/data/a/x.txt'])
+        _watcher.process_changes(['/data/a/y.txt'])
+        self.assertFalse(_watcher.backup_in_progress())
+        time.sleep(0.06)
+        _watcher.process_changes([])
+        self.assertTrue(_watcher.backup_in_progress())
+        # Änderungen während eines laufenden Backups werden gesammelt
+        _watcher.process_changes(['/data/b/z.txt'])
+        time.sleep(0.06)
+        _watcher.process_changes(['/data/c/z.txt'])
+        time.sleep(0.06)
+        _watcher.process_changes([])
+        self.assertEqual(1, len(_backups))
+        _release_backup.set()
+        while _watcher.backup_in_progress():
+            time.sleep(0.01)
+        _watcher.process_changes([])
+        while _watcher.backup_in_progress():
+            time.sleep(0.01)
+        self.assertEqual([['/data/a'], ['/data/b', '/data/c']], _backups)
+        self.assertEqual(_backups, _watcher.changed_subtrees())
+
+    @unittest.skipUnless(platform.system().lower() == 'linux', 'inotify nur unter Linux verfügbar')
+    def test_inotify_change_source(self):
+        """
+        Testet die Erkennung von Änderungen mit inotify.
+        """
+        with tempfile.TemporaryDirectory() as _root:
+            os.makedirs(os.path.join(_root, 'sub'))
+            _source = InotifyChangeSource(TaskMonitor(None, True))
+            try:
+                self.assertEqual(2, _source.add_tree(_root, ExcludeFilter([])))
+                self.assertEqual([], _source.read_changes(0.01))
+                # neu angelegte Verzeichnisse werden automatisch überwacht
+                _new_dir = os.path.join(_root, 'sub', 'new')
+                os.makedirs(_new_dir)
+                self.assertIn(_new_dir, _source.read_changes(1.0))
+                _file_path = os.path.join(_new_dir, 'x.txt')
+                with open(_file_path, 'w') as _f:
+                    _f.write('x')
+                self.assertIn(_file_path, _source.read_changes(1.0))
+            finally:
+                _source.close()
+
+
+class _FakeChangeSource(ChangeSource):
+    """
+    Änderungsquelle ohne Anbindung an das Dateisystem.
+    """
+    def add_tree(self, root_path: str, exclude_filter: ExcludeFilter) -> int:
+        return 1
+
+    def read_changes(self, timeout: float) -> list[str]:
+        time.sleep(timeout)
+        return []
+
+    def close(self):
+        pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests für gui.message_log.
+"""
+import logging
+import os.path
+import tempfile
+import unittest
+
+from PySide6.QtCore import Qt
+
+from restix.core import SEVERITY_ERROR, SEVERITY_INFO, SEVERITY_WARNING
+from restix.gui import MESSAGE_LOG_FN
+from restix.gui.message_log import MessageLogModel, SeverityFilterModel, SEVERITY_ROLE, message_logger
+
+
+class TestMessageLog(unittest.TestCase):
+    def test_ring_buffer(self):
+        """
+        Testet die Verdrängung der ältesten Nachrichten bei vollem Ringpuffer.
+        """
+        _model = MessageLogModel(3)
+        for _i in range(5):
+            _model.append(SEVERITY_INFO, f'msg{_i}')
+        self.assertEqual(3, _model.rowCount())
+        self.assertEqual(['msg2', 'msg3', 'msg4'], [_model.index(_r).data() for _r in range(3)])
+        _model.replace_last('status')
+        self.assertEqual('status', _model.index(2).data(Qt.ItemDataRole.DisplayRole))
+        self.assertEqual(SEVERITY_INFO, _model.index(2).data(SEVERITY_ROLE))
+        _model.clear()
+        self.assertEqual(0, _model.rowCount())
+
+    def test_severity_filter(self):
+        """
+        Testet die Filterung der Nachrichten nach Schweregrad.
+        """
+        _model = MessageLogModel(10)
+        _model.append(SEVERITY_INFO, 'info')
+        _model.append(SEVERITY_WARNING, 'warning')
+        _model.append(SEVERITY_ERROR, 'error')
+        _filter = SeverityFilterModel(_model)
+        self.assertEqual(3, _filter.rowCount())
+        _filter.set_severities((SEVERITY_WARNING, SEVERITY_ERROR))
+        self.assertEqual(2, _filter.rowCount())
+        _filter.set_severities((SEVERITY_ERROR,))
+        self.assertEqual('error', _filter.index(0, 0).data())
+        _model.append(SEVERITY_INFO, 'info2')
+        _model.append(SEVERITY_ERROR, 'error2')
+        self.assertEqual(2, _filter.rowCount())
+
+    def test_log_file(self):
+        """
+        Testet die Ausgabe verdrängter Nachrichten in die Protokolldatei.
+        """
+        with tempfile.TemporaryDirectory() as _log_dir:
+            _logger = message_logger(_log_dir)
+            try:
+                _model = MessageLogModel(2, _logger)
+                for _i in range(5):
+                    _model.append(SEVERITY_INFO, f'msg{_i}')
+                _model.flush_log()
+                with open(os.path.join(_log_dir, MESSAGE_LOG_FN), 'r', encoding='utf-8') as _f:
+                    _lines = _f.readlines()
+                self.assertEqual(5, len(_lines))
+                self.assertTrue(_lines[0].rstrip().endswith('msg0'))
+            finally:
+                for _handler in list(_logger.handlers):
+                    _handler.close()
+                    _logger.removeHandler(_handler)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# restix - Datensicherung auf restic-Basis.
+#
+# Copyright (c) 2025, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests für gui.scheduler.
+"""
+import threading
+import unittest
+
+from restix.core import TASK_SUCCEEDED
+from restix.core.task import TaskMonitor, TaskResult
+from restix.gui import TASK_LANE_INTERACTIVE, TASK_LANE_REPOSITORY, TASK_PRIORITY_HIGH
+from restix.gui.scheduler import TaskScheduler
+from restix.gui.worker import Worker
+
+# Repository für Unit-Tests
+TEST_REPO = '/var/restix/unittest'
+
+# maximale Wartezeit in Sekunden
+WAIT_TIMEOUT = 5.0
+
+
+class _TestAction:
+    """
+    Minimale Aktion für die Unit-Tests.
+    """
+    def __init__(self, name: str, protocol: list, gate: threading.Event | None = None):
+        self.name = name
+        self.protocol = protocol
+        self.gate = gate
+        self.started = threading.Event()
+        self.executed = False
+
+    def action_executed(self):
+        self.executed = True
+
+
+def _run_test_action(action: _TestAction, task_monitor: TaskMonitor) -> TaskResult:
+    """
+    Protokolliert Start und Ende der Aktion, wartet ggf. auf die Freigabe durch den Test.
+    """
+    action.protocol.append(f'{action.name}-start')
+    action.started.set()
+    if action.gate is not None:
+        action.gate.wait(WAIT_TIMEOUT)
+    action.protocol.append(f'{action.name}-end')
+    return TaskResult(TASK_SUCCEEDED, '')
+
+
+class TestScheduler(unittest.TestCase):
+    def test_repository_exclusion(self):
+        """
+        Testet, dass Tasks für dasselbe Repository nacheinander ausgeführt werden.
+        """
+        _scheduler = TaskScheduler(2, 2)
+        _protocol = []
+        _gate = threading.Event()
+        _first = _TestAction('first', _protocol, _gate)
+        _scheduler.submit(Worker(_run_test_action, _first), TASK_LANE_REPOSITORY, TEST_REPO)
+        self.assertTrue(_first.started.wait(WAIT_TIMEOUT))
+        _scheduler.submit(Worker(_run_test_action, _TestAction('low', _protocol)), TASK_LANE_REPOSITORY, TEST_REPO)
+        _scheduler.submit(Worker(_run_test_action, _TestAction('high', _protocol)), TASK_LANE_REPOSITORY, TEST_REPO,
+                          TASK_PRIORITY_HIGH)
+        self.assertEqual(2, _scheduler.pending_task_count())
+        _gate.set()
+        self.assertTrue(_scheduler.wait_for_done(int(WAIT_TIMEOUT * 1000)))
+        self.assertEqual(['first-start', 'first-end', 'high-start', 'high-end', 'low-start', 'low-end'], _protocol)
+
+    def test_interactive_lane(self):
+        """
+        Testet, dass eine interaktive Abfrage nicht auf eine laufende Repository-Operation wartet.
+        """
+        _scheduler = TaskScheduler(1, 1)
+        _protocol = []
+        _gate = threading.Event()
+        _long_runner = _TestAction('backup', _protocol, _gate)
+        _scheduler.submit(Worker(_run_test_action, _long_runner), TASK_LANE_REPOSITORY, TEST_REPO)
+        self.assertTrue(_long_runner.started.wait(WAIT_TIMEOUT))
+        _lookup = _TestAction('lookup', _protocol)
+        _scheduler.submit(Worker(_run_test_action, _lookup), TASK_LANE_INTERACTIVE, TEST_REPO)
+        self.assertTrue(_lookup.started.wait(WAIT_TIMEOUT))
+        _gate.set()
+        self.assertTrue(_scheduler.wait_for_done(int(WAIT_TIMEOUT * 1000)))
+        self.assertEqual('backup-start', _protocol[0])
+        self.assertEqual('backup-end', _protocol[-1])
+
+    def test_cancel_pending(self):
+        """
+        Testet das Verwerfen einer Task, die auf die Freigabe ihres Repositories wartet.
+        """
+        _scheduler = TaskScheduler(2, 2)
+        _protocol = []
+        _gate = threading.Event()
+        _first = _TestAction('first', _protocol, _gate)
+        _scheduler.submit(Worker(_run_test_action, _first), TASK_LANE_REPOSITORY, TEST_REPO)
+        self.assertTrue(_first.started.wait(WAIT_TIMEOUT))
+        _waiting_action = _TestAction('waiting', _protocol)
+        _waiting_worker = Worker(_run_test_action, _waiting_action)
+        _finished = []
+        _waiting_worker.connect_signals(None, lambda: _finished.append(True), None, None)
+        _scheduler.submit(_waiting_worker, TASK_LANE_REPOSITORY, TEST_REPO)
+        self.assertTrue(_scheduler.cancel(_waiting_worker))
+        # verworfener Worker meldet sein Ende und gibt die temporären Dateien der Aktion frei
+        self.assertEqual([True], _finished)
+        self.assertTrue(_waiting_action.executed)
+        _gate.set()
+        self.assertTrue(_scheduler.wait_for_done(int(WAIT_TIMEOUT * 1000)))
+        self.assertEqual(['first-start', 'first-end'], _protocol)
+
+
+if __name__ == '__main__':
+    unittest.main()
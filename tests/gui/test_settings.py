@@ -42,6 +42,7 @@ import unittest
 from PySide6.QtCore import QRect
 
 from restix.core import RESTIX_GUI_SETTINGS_FILE_PATH
+from restix.gui import DEFAULT_JOB_PARALLELISM, DEFAULT_MESSAGE_LIMIT
 from restix.gui.settings import GuiSettings
 
 # Standard restix-Konfiguration für Unit-Tests
@@ -61,6 +62,8 @@ class TestSettings(unittest.TestCase):
         _settings.set_latest_target(STANDARD_TARGET)
         self.assertEqual(QRect(100, 100, 800, 600), _settings.win_geometry())
         self.assertEqual(STANDARD_TARGET, _settings.latest_target())
+        self.assertEqual(DEFAULT_MESSAGE_LIMIT, _settings.message_limit())
+        self.assertEqual(DEFAULT_JOB_PARALLELISM, _settings.job_parallelism())
 
     def test_roundtrip(self):
         """